@@ -0,0 +1,225 @@
+"""Per-campaign turn scheduler for the turn endpoints.
+
+Turns on the same campaign are serialized (FIFO): a second click while a turn is
+running waits for it instead of racing it through ``reserve_next_turn_number``.
+Different campaigns run in parallel up to ``TURN_MAX_CONCURRENT``. When a campaign's
+queue or the global queue is full, or a turn waits longer than
+``TURN_QUEUE_TIMEOUT_SECONDS``, the request is rejected with ``TurnRejected``
+(mapped to 429/503 + ``Retry-After`` by the handlers).
+
+State lives behind a ``threading.Lock`` and waiters are woken with
+``call_soon_threadsafe`` on their own loop, so one scheduler can serve several
+event loops (e.g. test clients) without binding asyncio primitives to any of them.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.app.config import (
+    TURN_MAX_CONCURRENT,
+    TURN_QUEUE_MAX,
+    TURN_QUEUE_PER_CAMPAIGN,
+    TURN_QUEUE_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Turn duration assumed for Retry-After before any turn has completed.
+_DEFAULT_TURN_SECONDS = 5.0
+_EMA_ALPHA = 0.2
+
+
+class TurnRejected(Exception):
+    """A turn could not be scheduled. status_code is 429 (campaign busy) or 503 (server busy)."""
+
+    def __init__(self, status_code: int, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+
+@dataclass
+class _Waiter:
+    campaign_id: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+class TurnLease:
+    """A granted turn slot. ``release()`` is idempotent."""
+
+    def __init__(self, scheduler: "TurnScheduler", campaign_id: str, wait_ms: int) -> None:
+        self._scheduler = scheduler
+        self.campaign_id = campaign_id
+        self.wait_ms = wait_ms
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._release(self.campaign_id, time.monotonic() - self._started)
+
+
+class TurnScheduler:
+    """FIFO turn queue: one running turn per campaign, max_concurrent turns overall."""
+
+    def __init__(
+        self,
+        max_concurrent: int = TURN_MAX_CONCURRENT,
+        max_queue_per_campaign: int = TURN_QUEUE_PER_CAMPAIGN,
+        max_queued: int = TURN_QUEUE_MAX,
+        queue_timeout_s: float = TURN_QUEUE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue_per_campaign = max(0, int(max_queue_per_campaign))
+        self.max_queued = max(0, int(max_queued))
+        self.queue_timeout_s = float(queue_timeout_s)
+        self._lock = threading.Lock()
+        self._running: set[str] = set()
+        self._waiters: deque[_Waiter] = deque()
+        self._turn_seconds = _DEFAULT_TURN_SECONDS
+        self._completed = 0
+        self._queued_turns = 0
+        self._wait_ms_total = 0
+        self._wait_ms_max = 0
+        self._rejected = {429: 0, 503: 0}
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    async def acquire(self, campaign_id: str) -> TurnLease:
+        """Wait for the campaign's turn slot; raises TurnRejected when overloaded."""
+        start = time.monotonic()
+        with self._lock:
+            if campaign_id not in self._running and len(self._running) < self.max_concurrent:
+                self._running.add(campaign_id)
+                return TurnLease(self, campaign_id, 0)
+            depth = self._campaign_depth(campaign_id)
+            if depth >= self.max_queue_per_campaign:
+                raise self._reject(
+                    429, f"Campaign {campaign_id} already has {depth} turn(s) queued.",
+                    self._turn_seconds * (depth + 1),
+                )
+            if len(self._waiters) >= self.max_queued:
+                raise self._reject(
+                    503, "Server is busy: turn queue is full.",
+                    self._turn_seconds * (len(self._waiters) + 1) / self.max_concurrent,
+                )
+            waiter = _Waiter(campaign_id, asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+            self._queued_turns += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.queue_timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    if isinstance(exc, asyncio.TimeoutError):
+                        raise self._reject(
+                            503, f"Turn waited {self.queue_timeout_s:.0f}s without a free slot.",
+                            self._turn_seconds,
+                        ) from None
+                    raise
+            # Granted in the same instant the wait ended: we own the slot.
+            if isinstance(exc, asyncio.CancelledError):
+                self._release(campaign_id, 0.0, count=False)
+                raise
+
+        wait_ms = int((time.monotonic() - start) * 1000)
+        with self._lock:
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        if wait_ms:
+            logger.info("turn_scheduler campaign_id=%s queue_wait_ms=%s", campaign_id, wait_ms)
+        return TurnLease(self, campaign_id, wait_ms)
+
+    def _release(self, campaign_id: str, turn_seconds: float, count: bool = True) -> None:
+        with self._lock:
+            self._running.discard(campaign_id)
+            if count:
+                self._completed += 1
+                self._turn_seconds += _EMA_ALPHA * (turn_seconds - self._turn_seconds)
+            self._grant_ready()
+
+    def _grant_ready(self) -> None:
+        """Hand free slots to the oldest waiters whose campaign is idle (lock held)."""
+        for waiter in list(self._waiters):
+            if len(self._running) >= self.max_concurrent:
+                break
+            if waiter.campaign_id in self._running:
+                continue
+            self._waiters.remove(waiter)
+            waiter.granted = True
+            self._running.add(waiter.campaign_id)
+            waiter.future.get_loop().call_soon_threadsafe(_resolve, waiter.future)
+
+    def _campaign_depth(self, campaign_id: str) -> int:
+        return sum(1 for w in self._waiters if w.campaign_id == campaign_id)
+
+    def _reject(self, status_code: int, message: str, retry_s: float) -> TurnRejected:
+        self._rejected[status_code] += 1
+        logger.warning("turn_scheduler rejected status=%s: %s", status_code, message)
+        return TurnRejected(status_code, message, max(1, math.ceil(retry_s)))
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def queue_depth(self, campaign_id: str | None = None) -> int:
+        """Waiting turns for campaign_id (all campaigns when None)."""
+        with self._lock:
+            if campaign_id is None:
+                return len(self._waiters)
+            return self._campaign_depth(campaign_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "max_concurrent": self.max_concurrent,
+                "running": len(self._running),
+                "queued": len(self._waiters),
+                "oldest_wait_ms": int((now - self._waiters[0].enqueued_at) * 1000) if self._waiters else 0,
+                "completed": self._completed,
+                "queued_turns": self._queued_turns,
+                "avg_wait_ms": int(self._wait_ms_total / self._queued_turns) if self._queued_turns else 0,
+                "max_wait_ms": self._wait_ms_max,
+                "avg_turn_ms": int(self._turn_seconds * 1000),
+                "rejected_429": self._rejected[429],
+                "rejected_503": self._rejected[503],
+            }
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_scheduler: TurnScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_turn_scheduler() -> TurnScheduler:
+    """Process-wide scheduler shared by /turn and /turn_stream."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TurnScheduler()
+        return _scheduler
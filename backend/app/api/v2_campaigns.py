@@ -9,23 +9,25 @@ import uuid
 import time
 from typing import Any
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
 
 from backend.app.constants import SUGGESTED_ACTIONS_TARGET
-from backend.app.config import DEFAULT_DB_PATH, DEV_CONTEXT_STATS, ENABLE_BIBLE_CASTING
+from backend.app.config import ASYNC_TURN_PIPELINE, DEFAULT_DB_PATH, DEV_CONTEXT_STATS, ENABLE_BIBLE_CASTING
 from backend.app.core.error_handling import log_error_with_context, create_error_response
 from backend.app.core.text_utils import normalize_identifier
 from backend.app.content.repository import CONTENT_REPOSITORY
-
-logger = logging.getLogger(__name__)
 from backend.app.db.connection import get_connection
-from backend.app.core.state_loader import build_initial_gamestate, load_player_by_id, load_campaign
+from backend.app.core.state_loader import apply_world_state_update, build_initial_gamestate, load_player_by_id, load_campaign
+from backend.app.core.world_state_store import set_world_state_keys
 from backend.app.core.companions import build_initial_companion_state, get_companion_by_id
 from backend.app.core.companion_reactions import affinity_to_mood_tag
 from backend.app.models.news import NEWS_FEED_MAX
 from backend.app.core.transcript_store import get_rendered_turns
-from backend.app.core.graph import run_turn
+from backend.app.api.turn_scheduler import TurnLease, TurnRejected, get_turn_scheduler
+from backend.app.core.graph import arun_turn, run_turn
 from backend.app.core.event_store import append_events, get_recent_public_rumors
 from backend.app.core.projections import apply_projection
 from backend.app.models.state import GameState, ActionSuggestion
@@ -41,6 +43,8 @@ from backend.app.core.story_position import (
 )
 from backend.app.prompts.registry import prompt_registry_snapshot
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/v2", tags=["v2-campaigns"])
 
 # Default location pool (starting_location is always included)
@@ -319,9 +323,13 @@ class CampaignListResponse(BaseModel):
     items: list[CampaignSummary]
 
 
-def _get_conn():
-    """Return DB connection. Migrations are applied once at API startup."""
-    return get_connection(DEFAULT_DB_PATH)
+def _get_conn(check_same_thread: bool = True):
+    """Return DB connection. Migrations are applied once at API startup.
+
+    Async turn handlers pass check_same_thread=False: the connection moves between
+    the event loop and worker threads (sequentially, never concurrently).
+    """
+    return get_connection(DEFAULT_DB_PATH, check_same_thread=check_same_thread)
 
 
 def _ensure_campaign_and_player(conn, campaign_id: str, player_id: str) -> None:
@@ -1268,16 +1276,18 @@ def _decrement_beats(conn, campaign_id: str, camp: dict) -> tuple[int, str | Non
     beats = int(ws.get("beats_remaining", 4)) - 1
     scene_note = None
     forced = False
+    changes: dict[str, Any] = {}
     if beats <= 0:
         beats = 4
-        ws["scene_id"] = f"scene-{uuid.uuid4().hex[:8]}"
-        ws["force_scene_transition"] = True
+        changes["scene_id"] = f"scene-{uuid.uuid4().hex[:8]}"
+        changes["force_scene_transition"] = True
         forced = True
         scene_note = "Scene transitioned due to beat budget exhaustion."
     else:
-        ws["force_scene_transition"] = False
-    ws["beats_remaining"] = beats
-    conn.execute("UPDATE campaigns SET world_state_json = ? WHERE id = ?", (json.dumps(ws), campaign_id))
+        changes["force_scene_transition"] = False
+    changes["beats_remaining"] = beats
+    ws.update(changes)
+    set_world_state_keys(conn, campaign_id, changes)
     return beats, scene_note, forced
 
 def _pad_suggestions_for_ui(actions: list) -> list:
@@ -1290,26 +1300,61 @@ def _pad_suggestions_for_ui(actions: list) -> list:
     return padded[:SUGGESTED_ACTIONS_TARGET]
 
 
+def _prepare_turn_state(conn, campaign_id: str, player_id: str, body: TurnRequest) -> GameState:
+    """Validate campaign/player (404) and build the turn's initial GameState with user input."""
+    _ensure_campaign_and_player(conn, campaign_id, player_id)
+    return _initial_turn_state(conn, campaign_id, player_id, body)
+
+
+def _initial_turn_state(conn, campaign_id: str, player_id: str, body: TurnRequest) -> GameState:
+    """Initial GameState for a turn with the request's user input applied."""
+    state = build_initial_gamestate(conn, campaign_id, player_id)
+    if body.intent is not None:
+        state.user_input = body.intent.user_utterance or json.dumps(body.intent.model_dump(mode="json"))
+    else:
+        state.user_input = body.user_input
+    return state
+
+
+async def _acquire_turn_slot(campaign_id: str) -> TurnLease:
+    """Wait for the campaign's turn slot; scheduler rejections become 429/503 + Retry-After."""
+    try:
+        return await get_turn_scheduler().acquire(campaign_id)
+    except TurnRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message, headers=e.headers) from None
+
+
 @router.post("/campaigns/{campaign_id}/turn", response_model=TurnResponse)
-def post_turn(
+async def post_turn(
     campaign_id: str,
     player_id: str = Query(..., description="Player character ID"),
     body: TurnRequest | None = None,
 ):
-    """Run one turn. Returns narrated_text, suggested_actions (padded), player_sheet, inventory, quest_log. state optional."""
+    """Run one turn. Returns narrated_text, suggested_actions (padded), player_sheet, inventory, quest_log. state optional.
+
+    DB setup and response assembly run in the threadpool; the graph itself is awaited
+    (``arun_turn``) so the LLM round-trip does not hold a worker thread. With
+    STORYTELLER_ASYNC_TURNS=0 the sync ``run_turn`` runs in the threadpool instead.
+
+    Turns on the same campaign are queued behind each other (see turn_scheduler);
+    429/503 with Retry-After when the queue is full.
+    """
     if body is None:
         body = TurnRequest(user_input="")
-    conn = _get_conn()
     start_ts = time.perf_counter()
+    lease = await _acquire_turn_slot(campaign_id)
     try:
-        _ensure_campaign_and_player(conn, campaign_id, player_id)
-        state = build_initial_gamestate(conn, campaign_id, player_id)
-        if body.intent is not None:
-            state.user_input = body.intent.user_utterance or json.dumps(body.intent.model_dump(mode="json"))
-        else:
-            state.user_input = body.user_input
+        conn = _get_conn(check_same_thread=False)
+    except BaseException:
+        lease.release()
+        raise
+    try:
+        state = await run_in_threadpool(_prepare_turn_state, conn, campaign_id, player_id, body)
         try:
-            result = run_turn(conn, state)
+            if ASYNC_TURN_PIPELINE:
+                result = await arun_turn(conn, state)
+            else:
+                result = await run_in_threadpool(run_turn, conn, state)
         except Exception as e:
             log_error_with_context(
                 error=e,
@@ -1321,170 +1366,7 @@ def post_turn(
             )
             # Re-raise to be caught by global exception handler
             raise
-        # V2.8: Pre-generate Director suggestions for the next turn (background)
-        camp = load_campaign(conn, campaign_id) or {}
-        _ws_raw = camp.get("world_state_json")
-        if isinstance(_ws_raw, str):
-            try:
-                _ws_raw = json.loads(_ws_raw) if _ws_raw else {}
-            except json.JSONDecodeError:
-                _ws_raw = {}
-        _ws_raw = _ws_raw if isinstance(_ws_raw, dict) else {}
-        # V3.0: Extract actual quest_log from world_state (populated by QuestTracker)
-        quest_log = _ws_raw.get("quest_log") or {}
-        player_sheet = result.player.model_dump(mode="json") if result.player else {}
-        inventory = (result.player.inventory or []) if result.player else []
-        # V2.15: Suggestions come from Director's generate_suggestions() only.
-        raw_actions = result.suggested_actions or []
-        suggested_actions = _pad_suggestions_for_ui(raw_actions)
-
-        world_time_minutes = None
-        if result.campaign and isinstance(result.campaign, dict):
-            world_time_minutes = result.campaign.get("world_time_minutes")
-        if world_time_minutes is None and camp:
-            world_time_minutes = camp.get("world_time_minutes")
-        canonical_year_label = canonical_year_label_from_campaign(campaign=result.campaign, world_state=_ws_raw)
-
-        debug_out = None
-        if body.debug:
-            world_state = _ws_raw if isinstance(_ws_raw, dict) else {}
-            active_factions = world_state.get("active_factions")
-            if active_factions is None and result.campaign and isinstance(result.campaign.get("world_state_json"), dict):
-                active_factions = result.campaign["world_state_json"].get("active_factions")
-            debug_out = {
-                "router_intent": getattr(result, "intent", None),
-                "router_route": getattr(result, "route", None),
-                "router_action_class": getattr(result, "action_class", None),
-                "router_output": result.router_output.model_dump(mode="json") if getattr(result, "router_output", None) else None,
-                "mechanic_output": result.mechanic_result.model_dump(mode="json") if result.mechanic_result else None,
-                "director_instructions": getattr(result, "director_instructions", None),
-                "present_npcs": getattr(result, "present_npcs", None),
-                "world_sim_events": getattr(result, "world_sim_events", None) or [],
-                "new_rumors": getattr(result, "new_rumors", None) or [],
-                "active_factions": active_factions,
-            }
-
-        state_out = None
-        if body.include_state:
-            state_out = result.model_dump(mode="json")
-
-        party_status: list[PartyStatusItem] | None = None
-        alignment_out: dict | None = None
-        faction_reputation_out: dict | None = None
-        camp = result.campaign if isinstance(result.campaign, dict) else {}
-        if camp:
-            party_ids = camp.get("party") or []
-            if party_ids:
-                party_status = []
-                for cid in party_ids:
-                    comp = get_companion_by_id(cid)
-                    name = comp.get("name", cid) if comp else cid
-                    affinity = (camp.get("party_affinity") or {}).get(cid, 0)
-                    loyalty = (camp.get("loyalty_progress") or {}).get(cid, 0)
-                    mood_tag = affinity_to_mood_tag(affinity)
-                    party_status.append(
-                        PartyStatusItem(id=cid, name=name, affinity=affinity, loyalty_progress=loyalty, mood_tag=mood_tag)
-                    )
-                # V2.20: Overlay PartyState data (influence, trust, respect, fear)
-                ws = camp.get("world_state_json")
-                if isinstance(ws, str):
-                    import json as _json
-                    try:
-                        ws = _json.loads(ws)
-                    except Exception:
-                        ws = {}
-                ps_raw = (ws or {}).get("party_state") if isinstance(ws, dict) else None
-                if ps_raw and isinstance(ps_raw, dict):
-                    cs_map = ps_raw.get("companion_states") or {}
-                    for item in party_status:
-                        cs = cs_map.get(item.id)
-                        if cs and isinstance(cs, dict):
-                            item.influence = cs.get("influence", 0)
-                            item.trust = cs.get("trust", 0)
-                            item.respect = cs.get("respect", 0)
-                            item.fear = cs.get("fear", 0)
-            aln = camp.get("alignment")
-            if isinstance(aln, dict):
-                alignment_out = {"light_dark": aln.get("light_dark", 0), "paragon_renegade": aln.get("paragon_renegade", 0)}
-            fr = camp.get("faction_reputation")
-            if isinstance(fr, dict) and fr:
-                faction_reputation_out = dict(fr)
-        news_feed_out = None
-        if camp:
-            nf = camp.get("news_feed")
-            if isinstance(nf, list) and nf:
-                news_feed_out = [item if isinstance(item, dict) else getattr(item, "model_dump", lambda **kw: item)(mode="json") for item in nf[:NEWS_FEED_MAX]]
-
-        context_stats_out = None
-        if DEV_CONTEXT_STATS and result.context_stats:
-            context_stats_out = result.context_stats
-        warnings_out = getattr(result, "warnings", None) or []
-
-        camp_live = load_campaign(conn, campaign_id) or {}
-        beats_remaining, scene_transition_note, force_scene_transition = _decrement_beats(conn, campaign_id, camp_live)
-        ws_live = _world_state_dict(camp_live)
-        mode = str(ws_live.get("mode") or "SIM").upper()
-        ledger_facts = get_facts(conn, campaign_id)
-        objectives = _active_objectives(conn, campaign_id)
-        if not objectives:
-            _seed_default_objective(conn, campaign_id)
-            objectives = _active_objectives(conn, campaign_id)
-        if scene_transition_note:
-            warnings_out.append(scene_transition_note)
-        turn_contract = build_turn_contract(
-            mode=mode if mode in {"SIM", "PASSAGE", "HYBRID"} else "SIM",
-            campaign_id=campaign_id,
-            turn_id=f"{campaign_id}_t{state.turn_number + 1}",
-            display_text=result.final_text or "",
-            scene_goal=((getattr(result, "scene_frame", None) or {}).get("player_objective") if isinstance(getattr(result, "scene_frame", None), dict) else "Advance the current objective"),
-            obstacle=((getattr(result, "scene_frame", None) or {}).get("immediate_situation") if isinstance(getattr(result, "scene_frame", None), dict) else "Escalating opposition"),
-            stakes="Mission momentum, faction trust, and party safety.",
-            mechanic_result=result.mechanic_result,
-            suggested_actions=suggested_actions,
-            meta=TurnMeta(
-                scene_id=ws_live.get("scene_id"),
-                beats_remaining=beats_remaining,
-                active_objectives=objectives,
-                alignment=alignment_out or None,
-                reputations=faction_reputation_out or None,
-                passage_id=ws_live.get("current_passage_id"),
-                prompt_versions=prompt_registry_snapshot(),
-            ),
-            ledger_facts=ledger_facts,
-            has_companions=bool((camp or {}).get("party")),
-            force_scene_transition=force_scene_transition,
-        )
-        if turn_contract.state_delta.facts_upsert:
-            upsert_facts(conn, campaign_id, turn_contract.turn_id, turn_contract.state_delta.facts_upsert)
-        if turn_contract.debug and turn_contract.debug.validation_errors:
-            record_event(conn, campaign_id, turn_contract.turn_id, {
-                "event_type": "turn_contract_validation_failure",
-                "errors": turn_contract.debug.validation_errors,
-                "repair_count": turn_contract.debug.repair_count,
-            })
-        conn.commit()
-
-        logger.info("turn_complete node=post_turn campaign_id=%s turn_id=%s latency_ms=%s validation_errors=%s repair_count=%s", campaign_id, turn_contract.turn_id, int((time.perf_counter()-start_ts)*1000), len((turn_contract.debug.validation_errors if turn_contract.debug else [])), (turn_contract.debug.repair_count if turn_contract.debug else 0))
-
-        return TurnResponse(
-            narrated_text=result.final_text or "",
-            suggested_actions=suggested_actions,
-            player_sheet=player_sheet,
-            inventory=inventory,
-            quest_log=quest_log or {},
-            world_time_minutes=world_time_minutes,
-            canonical_year_label=canonical_year_label,
-            state=state_out,
-            debug=debug_out,
-            party_status=party_status,
-            alignment=alignment_out,
-            faction_reputation=faction_reputation_out,
-            news_feed=news_feed_out,
-            context_stats=context_stats_out,
-            warnings=warnings_out,
-            dialogue_turn=getattr(result, "dialogue_turn", None),
-            turn_contract=turn_contract,
-        )
+        return await run_in_threadpool(_build_turn_response, conn, campaign_id, state, result, body, start_ts)
     except HTTPException:
         # Re-raise HTTP exceptions (e.g., 404 from _ensure_campaign_and_player)
         raise
@@ -1501,6 +1383,177 @@ def post_turn(
         raise
     finally:
         conn.close()
+        lease.release()
+
+
+def _build_turn_response(conn, campaign_id: str, state: GameState, result: GameState, body: TurnRequest, start_ts: float) -> TurnResponse:
+    """Post-turn bookkeeping (beats, objectives, turn contract, ledger) and the TurnResponse."""
+    # V2.8: Pre-generate Director suggestions for the next turn (background)
+    camp = load_campaign(conn, campaign_id) or {}
+    _ws_raw = camp.get("world_state_json")
+    if isinstance(_ws_raw, str):
+        try:
+            _ws_raw = json.loads(_ws_raw) if _ws_raw else {}
+        except json.JSONDecodeError:
+            _ws_raw = {}
+    _ws_raw = _ws_raw if isinstance(_ws_raw, dict) else {}
+    # V3.0: Extract actual quest_log from world_state (populated by QuestTracker)
+    quest_log = _ws_raw.get("quest_log") or {}
+    player_sheet = result.player.model_dump(mode="json") if result.player else {}
+    inventory = (result.player.inventory or []) if result.player else []
+    # V2.15: Suggestions come from Director's generate_suggestions() only.
+    raw_actions = result.suggested_actions or []
+    suggested_actions = _pad_suggestions_for_ui(raw_actions)
+
+    world_time_minutes = None
+    if result.campaign and isinstance(result.campaign, dict):
+        world_time_minutes = result.campaign.get("world_time_minutes")
+    if world_time_minutes is None and camp:
+        world_time_minutes = camp.get("world_time_minutes")
+    canonical_year_label = canonical_year_label_from_campaign(campaign=result.campaign, world_state=_ws_raw)
+
+    debug_out = None
+    if body.debug:
+        world_state = _ws_raw if isinstance(_ws_raw, dict) else {}
+        active_factions = world_state.get("active_factions")
+        if active_factions is None and result.campaign and isinstance(result.campaign.get("world_state_json"), dict):
+            active_factions = result.campaign["world_state_json"].get("active_factions")
+        debug_out = {
+            "router_intent": getattr(result, "intent", None),
+            "router_route": getattr(result, "route", None),
+            "router_action_class": getattr(result, "action_class", None),
+            "router_output": result.router_output.model_dump(mode="json") if getattr(result, "router_output", None) else None,
+            "mechanic_output": result.mechanic_result.model_dump(mode="json") if result.mechanic_result else None,
+            "director_instructions": getattr(result, "director_instructions", None),
+            "present_npcs": getattr(result, "present_npcs", None),
+            "world_sim_events": getattr(result, "world_sim_events", None) or [],
+            "new_rumors": getattr(result, "new_rumors", None) or [],
+            "active_factions": active_factions,
+        }
+
+    state_out = None
+    if body.include_state:
+        state_out = result.model_dump(mode="json")
+
+    party_status: list[PartyStatusItem] | None = None
+    alignment_out: dict | None = None
+    faction_reputation_out: dict | None = None
+    camp = result.campaign if isinstance(result.campaign, dict) else {}
+    if camp:
+        party_ids = camp.get("party") or []
+        if party_ids:
+            party_status = []
+            for cid in party_ids:
+                comp = get_companion_by_id(cid)
+                name = comp.get("name", cid) if comp else cid
+                affinity = (camp.get("party_affinity") or {}).get(cid, 0)
+                loyalty = (camp.get("loyalty_progress") or {}).get(cid, 0)
+                mood_tag = affinity_to_mood_tag(affinity)
+                party_status.append(
+                    PartyStatusItem(id=cid, name=name, affinity=affinity, loyalty_progress=loyalty, mood_tag=mood_tag)
+                )
+            # V2.20: Overlay PartyState data (influence, trust, respect, fear)
+            ws = camp.get("world_state_json")
+            if isinstance(ws, str):
+                import json as _json
+                try:
+                    ws = _json.loads(ws)
+                except Exception:
+                    ws = {}
+            ps_raw = (ws or {}).get("party_state") if isinstance(ws, dict) else None
+            if ps_raw and isinstance(ps_raw, dict):
+                cs_map = ps_raw.get("companion_states") or {}
+                for item in party_status:
+                    cs = cs_map.get(item.id)
+                    if cs and isinstance(cs, dict):
+                        item.influence = cs.get("influence", 0)
+                        item.trust = cs.get("trust", 0)
+                        item.respect = cs.get("respect", 0)
+                        item.fear = cs.get("fear", 0)
+        aln = camp.get("alignment")
+        if isinstance(aln, dict):
+            alignment_out = {"light_dark": aln.get("light_dark", 0), "paragon_renegade": aln.get("paragon_renegade", 0)}
+        fr = camp.get("faction_reputation")
+        if isinstance(fr, dict) and fr:
+            faction_reputation_out = dict(fr)
+    news_feed_out = None
+    if camp:
+        nf = camp.get("news_feed")
+        if isinstance(nf, list) and nf:
+            news_feed_out = [item if isinstance(item, dict) else getattr(item, "model_dump", lambda **kw: item)(mode="json") for item in nf[:NEWS_FEED_MAX]]
+
+    context_stats_out = None
+    if DEV_CONTEXT_STATS and result.context_stats:
+        context_stats_out = result.context_stats
+    warnings_out = getattr(result, "warnings", None) or []
+
+    camp_live = load_campaign(conn, campaign_id) or {}
+    beats_remaining, scene_transition_note, force_scene_transition = _decrement_beats(conn, campaign_id, camp_live)
+    ws_live = _world_state_dict(camp_live)
+    mode = str(ws_live.get("mode") or "SIM").upper()
+    ledger_facts = get_facts(conn, campaign_id)
+    objectives = _active_objectives(conn, campaign_id)
+    if not objectives:
+        _seed_default_objective(conn, campaign_id)
+        objectives = _active_objectives(conn, campaign_id)
+    if scene_transition_note:
+        warnings_out.append(scene_transition_note)
+    turn_contract = build_turn_contract(
+        mode=mode if mode in {"SIM", "PASSAGE", "HYBRID"} else "SIM",
+        campaign_id=campaign_id,
+        turn_id=f"{campaign_id}_t{state.turn_number + 1}",
+        display_text=result.final_text or "",
+        scene_goal=((getattr(result, "scene_frame", None) or {}).get("player_objective") if isinstance(getattr(result, "scene_frame", None), dict) else "Advance the current objective"),
+        obstacle=((getattr(result, "scene_frame", None) or {}).get("immediate_situation") if isinstance(getattr(result, "scene_frame", None), dict) else "Escalating opposition"),
+        stakes="Mission momentum, faction trust, and party safety.",
+        mechanic_result=result.mechanic_result,
+        suggested_actions=suggested_actions,
+        meta=TurnMeta(
+            scene_id=ws_live.get("scene_id"),
+            beats_remaining=beats_remaining,
+            active_objectives=objectives,
+            alignment=alignment_out or None,
+            reputations=faction_reputation_out or None,
+            passage_id=ws_live.get("current_passage_id"),
+            prompt_versions=prompt_registry_snapshot(),
+            retrieval_cache=getattr(result, "retrieval_cache", None),
+        ),
+        ledger_facts=ledger_facts,
+        has_companions=bool((camp or {}).get("party")),
+        force_scene_transition=force_scene_transition,
+    )
+    if turn_contract.state_delta.facts_upsert:
+        upsert_facts(conn, campaign_id, turn_contract.turn_id, turn_contract.state_delta.facts_upsert)
+    if turn_contract.debug and turn_contract.debug.validation_errors:
+        record_event(conn, campaign_id, turn_contract.turn_id, {
+            "event_type": "turn_contract_validation_failure",
+            "errors": turn_contract.debug.validation_errors,
+            "repair_count": turn_contract.debug.repair_count,
+        })
+    conn.commit()
+    apply_world_state_update(conn, campaign_id, ws_live)
+
+    logger.info("turn_complete node=post_turn campaign_id=%s turn_id=%s latency_ms=%s validation_errors=%s repair_count=%s", campaign_id, turn_contract.turn_id, int((time.perf_counter()-start_ts)*1000), len((turn_contract.debug.validation_errors if turn_contract.debug else [])), (turn_contract.debug.repair_count if turn_contract.debug else 0))
+
+    return TurnResponse(
+        narrated_text=result.final_text or "",
+        suggested_actions=suggested_actions,
+        player_sheet=player_sheet,
+        inventory=inventory,
+        quest_log=quest_log or {},
+        world_time_minutes=world_time_minutes,
+        canonical_year_label=canonical_year_label,
+        state=state_out,
+        debug=debug_out,
+        party_status=party_status,
+        alignment=alignment_out,
+        faction_reputation=faction_reputation_out,
+        news_feed=news_feed_out,
+        context_stats=context_stats_out,
+        warnings=warnings_out,
+        dialogue_turn=getattr(result, "dialogue_turn", None),
+        turn_contract=turn_contract,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -1527,8 +1580,11 @@ def _run_pre_narrator_pipeline(conn, state: GameState) -> dict:
     from backend.app.core.nodes.scene_frame import scene_frame_node
     from backend.app.core.nodes.director import make_director_node
 
+    from backend.app.rag.query_embeddings import RUNTIME_STATE_KEY, TurnQueryEmbeddings
+
     s = state_to_dict(state)
     s["__runtime_conn"] = conn
+    s[RUNTIME_STATE_KEY] = TurnQueryEmbeddings()
 
     # Router
     s = router_node(s)
@@ -1578,18 +1634,256 @@ def _run_post_narrator_pipeline(conn, state_dict: dict, final_text: str, lore_ci
     return state_dict
 
 
+def _stream_kg_context(conn, pre_state: dict, gs: GameState) -> str:
+    """KG + episodic-memory context for the streamed Narrator (same logic as narrator_node)."""
+    from backend.app.rag.context_bundles import bundle_for_state
+    from backend.app.rag.kg_retriever import KGRetriever
+
+    shared_char_ctx = pre_state.get("shared_kg_character_context", "")
+    shared_event_ctx = pre_state.get("shared_kg_relevant_events", "")
+    shared_mem_block = pre_state.get("shared_episodic_memories", "")
+    kg_retriever = KGRetriever()
+
+    if shared_char_ctx or shared_event_ctx:
+        campaign_dict = getattr(gs, "campaign", None) or {}
+        era = (campaign_dict.get("time_period") or campaign_dict.get("era") or "rebellion").strip() or "rebellion"
+        bundle = bundle_for_state(gs)
+        if bundle is not None and bundle.kg_location is not None:
+            loc_ctx = bundle.kg_location
+        else:
+            loc_ctx = kg_retriever.get_location_context(gs.current_location or "", era)
+        kg_parts = [p for p in [shared_char_ctx, loc_ctx, shared_event_ctx] if p]
+        kg_context = "## Knowledge Graph Context\n" + "\n\n".join(kg_parts) if kg_parts else ""
+    else:
+        kg_context = kg_retriever.get_context_for_narrator(gs)
+
+    if shared_mem_block:
+        kg_context = (kg_context + "\n\n" + shared_mem_block) if kg_context else shared_mem_block
+    else:
+        try:
+            from backend.app.core.episodic_memory import EpisodicMemory
+            epi = EpisodicMemory(conn, gs.campaign_id or "")
+            query_text = (gs.user_input or "") + " " + (gs.current_location or "")
+            npc_names = [n.get("name", "") for n in (gs.present_npcs or []) if n.get("name")]
+            memories = epi.recall(
+                query_text=query_text,
+                current_turn=int(gs.turn_number or 0),
+                location_id=gs.current_location,
+                npcs=npc_names,
+                max_results=4,
+            )
+            mem_block = epi.format_for_prompt(memories, max_chars=500)
+            if mem_block:
+                kg_context = (kg_context + "\n\n" + mem_block) if kg_context else mem_block
+        except Exception:
+            pass
+    return kg_context
+
+
+def _stream_narrator(pre_state: dict):
+    """NarratorAgent for the SSE path, wired to the turn's batched query embeddings."""
+    from backend.app.config import CONTEXT_BUNDLE_LORE_SLOTS
+    from backend.app.core.agents import NarratorAgent
+    from backend.app.core.agents.base import AgentLLM
+    from backend.app.rag.context_bundles import bundle_for_state, merge_precomputed, style_slots
+    from backend.app.rag.lore_retriever import retrieve_lore
+    from backend.app.rag.retrieval_bundles import NARRATOR_DOC_TYPES, NARRATOR_SECTION_KINDS
+    from backend.app.rag.style_retriever import retrieve_style_layered
+    from backend.app.rag.query_embeddings import get_turn_embeddings, lookup_vector
+
+    turn_embeddings = get_turn_embeddings(pre_state)
+    bundle = bundle_for_state(pre_state)
+
+    def lore_retriever_fn(query, top_k=6, era=None, related_npcs=None):
+        def live(k):
+            return retrieve_lore(query, top_k=k, era=era, doc_types=NARRATOR_DOC_TYPES, section_kinds=NARRATOR_SECTION_KINDS, related_npcs=related_npcs, query_vector=lookup_vector(turn_embeddings, query))
+        if bundle is None:
+            return live(top_k)
+        return merge_precomputed(bundle.lore_for(), live, top_k, CONTEXT_BUNDLE_LORE_SLOTS)
+
+    def style_retriever_fn(query, top_k=3, era_id=None, genre=None, archetype=None):
+        def live(k):
+            return retrieve_style_layered(query, top_k=k, era_id=era_id, genre=genre, archetype=archetype, query_vector=lookup_vector(turn_embeddings, query))
+        if bundle is None:
+            return live(top_k)
+        return merge_precomputed(bundle.style_chunks(), live, top_k, style_slots(genre, archetype))
+
+    try:
+        narrator_llm = AgentLLM("narrator")
+    except Exception:
+        narrator_llm = None
+
+    return NarratorAgent(
+        llm=narrator_llm,
+        lore_retriever=lore_retriever_fn,
+        voice_retriever=None,
+        style_retriever=style_retriever_fn,
+    )
+
+
+def _finish_meta_stream_turn(conn, pre_state: dict) -> dict:
+    """META shortcut for the SSE path: meta + commit, returns the ``done`` payload."""
+    from backend.app.core.nodes import dict_to_state
+    from backend.app.core.nodes.router import meta_node
+    from backend.app.core.nodes.commit import make_commit_node
+
+    pre_state = meta_node(pre_state)
+    commit_fn = make_commit_node()
+    result_dict = commit_fn(pre_state)
+    result_dict.pop("__runtime_conn", None)
+    result_dict.pop("__runtime_query_embeddings", None)
+    result_gs = dict_to_state(result_dict)
+    raw_actions = result_gs.suggested_actions or []
+    suggested_actions = _pad_suggestions_for_ui(raw_actions)
+    return {
+        "type": "done",
+        "narrated_text": result_gs.final_text or "",
+        "suggested_actions": [a.model_dump(mode="json") if hasattr(a, "model_dump") else a for a in suggested_actions],
+    }
+
+
+def _finish_stream_turn(
+    conn, campaign_id: str, state: GameState, pre_state: dict, accumulated: str, start_ts: float,
+    cache_counters: dict | None = None,
+) -> dict:
+    """Post-process streamed prose, run validation + commit, and build the ``done`` payload.
+
+    cache_counters: this turn's retrieval cache counters (``retrieval_cache.track_turn``).
+    """
+    from backend.app.core.nodes import dict_to_state
+    from backend.app.rag.retrieval_cache import summarize
+    from backend.app.core.agents.narrator import (
+        _strip_structural_artifacts,
+        _strip_embedded_suggestions,
+        _truncate_overlong_prose,
+        _enforce_pov_consistency,
+    )
+    from backend.app.core.nodes.narrator import _is_high_stakes_combat
+
+    # V2.15: Post-process streamed prose (no suggestion extraction needed)
+    final_text = _strip_structural_artifacts(accumulated)
+    final_text = _strip_embedded_suggestions(final_text)
+    final_text = _enforce_pov_consistency(final_text)
+    final_text = _truncate_overlong_prose(final_text)
+
+    # Append companion banter if available
+    campaign_data = dict(pre_state.get("campaign") or {})
+    banter_queue = list(campaign_data.get("banter_queue") or [])
+    if banter_queue and not _is_high_stakes_combat(pre_state):
+        first = banter_queue[0]
+        line = first.get("text", first) if isinstance(first, dict) else first
+        if line:
+            clean_line = str(line).strip().strip('"').strip("'").strip()
+            if clean_line:
+                final_text = f"{final_text}\n\n---\n\n*{clean_line}*"
+        campaign_data = {**campaign_data, "banter_queue": banter_queue[1:]}
+        pre_state["campaign"] = campaign_data
+
+    # Run post-narrator pipeline (NarrativeValidator + Commit)
+    result_dict = _run_post_narrator_pipeline(conn, pre_state, final_text, [])
+    result_dict.pop("__runtime_conn", None)
+    result_dict.pop("__runtime_query_embeddings", None)
+    result_gs = dict_to_state(result_dict)
+
+    # V2.15: Suggestions come from Director's generate_suggestions() only.
+    raw_actions = result_gs.suggested_actions or []
+    suggested_actions = _pad_suggestions_for_ui(raw_actions)
+
+    camp = load_campaign(conn, campaign_id) or {}
+    _ws_sse_raw = camp.get("world_state_json")
+    if isinstance(_ws_sse_raw, str):
+        try:
+            _ws_sse_raw = json.loads(_ws_sse_raw) if _ws_sse_raw else {}
+        except json.JSONDecodeError:
+            _ws_sse_raw = {}
+    _ws_sse_raw = _ws_sse_raw if isinstance(_ws_sse_raw, dict) else {}
+    # V3.0: Extract actual quest_log from world_state
+    quest_log = _ws_sse_raw.get("quest_log") or {}
+
+    player_sheet = result_gs.player.model_dump(mode="json") if result_gs.player else {}
+    inventory = (result_gs.player.inventory or []) if result_gs.player else []
+
+    world_time_minutes = None
+    if result_gs.campaign and isinstance(result_gs.campaign, dict):
+        world_time_minutes = result_gs.campaign.get("world_time_minutes")
+    if world_time_minutes is None and camp:
+        world_time_minutes = camp.get("world_time_minutes")
+    canonical_year_label = canonical_year_label_from_campaign(campaign=result_gs.campaign, world_state=_ws_sse_raw)
+
+    warnings_out = getattr(result_gs, "warnings", None) or []
+
+    beats_remaining, scene_transition_note, force_scene_transition = _decrement_beats(conn, campaign_id, camp)
+    ws_live = _world_state_dict(camp)
+    objectives = _active_objectives(conn, campaign_id)
+    if not objectives:
+        _seed_default_objective(conn, campaign_id)
+        objectives = _active_objectives(conn, campaign_id)
+    if scene_transition_note:
+        warnings_out.append(scene_transition_note)
+
+    turn_contract = build_turn_contract(
+        mode=str(ws_live.get("mode") or "SIM").upper(),
+        campaign_id=campaign_id,
+        turn_id=f"{campaign_id}_t{state.turn_number + 1}",
+        display_text=final_text,
+        scene_goal=((getattr(result_gs, "scene_frame", None) or {}).get("player_objective") if isinstance(getattr(result_gs, "scene_frame", None), dict) else "Advance the current objective"),
+        obstacle=((getattr(result_gs, "scene_frame", None) or {}).get("immediate_situation") if isinstance(getattr(result_gs, "scene_frame", None), dict) else "Escalating opposition"),
+        stakes="Mission momentum, faction trust, and party safety.",
+        mechanic_result=result_gs.mechanic_result,
+        suggested_actions=suggested_actions,
+        meta=TurnMeta(
+            scene_id=ws_live.get("scene_id"),
+            beats_remaining=beats_remaining,
+            active_objectives=objectives,
+            passage_id=ws_live.get("current_passage_id"),
+            prompt_versions=prompt_registry_snapshot(),
+            retrieval_cache=summarize(cache_counters) if cache_counters is not None else None,
+        ),
+        ledger_facts=get_facts(conn, campaign_id),
+        has_companions=bool((camp or {}).get("party")),
+        force_scene_transition=force_scene_transition,
+    )
+    if turn_contract.debug and turn_contract.debug.validation_errors:
+        record_event(conn, campaign_id, turn_contract.turn_id, {
+            "event_type": "turn_contract_validation_failure",
+            "errors": turn_contract.debug.validation_errors,
+            "repair_count": turn_contract.debug.repair_count,
+        })
+    conn.commit()
+    apply_world_state_update(conn, campaign_id, ws_live)
+
+    logger.info("turn_complete node=turn_stream campaign_id=%s turn_id=%s latency_ms=%s validation_errors=%s repair_count=%s", campaign_id, turn_contract.turn_id, int((time.perf_counter()-start_ts)*1000), len((turn_contract.debug.validation_errors if turn_contract.debug else [])), (turn_contract.debug.repair_count if turn_contract.debug else 0))
+    return {
+        "type": "done",
+        "narrated_text": final_text,
+        "suggested_actions": [
+            a.model_dump(mode="json") if hasattr(a, "model_dump") else a
+            for a in suggested_actions
+        ],
+        "player_sheet": player_sheet,
+        "inventory": inventory,
+        "quest_log": quest_log or {},
+        "world_time_minutes": world_time_minutes,
+        "canonical_year_label": canonical_year_label,
+        "warnings": warnings_out,
+        "dialogue_turn": getattr(result_gs, "dialogue_turn", None),
+        "turn_contract": turn_contract.model_dump(mode="json"),
+    }
+
+
 @router.post("/campaigns/{campaign_id}/turn_stream")
-def post_turn_stream(
+async def post_turn_stream(
     campaign_id: str,
     player_id: str = Query(..., description="Player character ID"),
     body: TurnRequest | None = None,
 ):
     """Stream narration via Server-Sent Events.
 
-    Runs the full pipeline synchronously up to (but not including) Narrator,
-    then streams Narrator tokens as SSE ``token`` events. After streaming
-    completes, runs post-processing + commit and returns final metadata
-    (suggested_actions, player_sheet, etc.) as the last SSE ``done`` event.
+    Runs the full pipeline up to (but not including) Narrator in the threadpool,
+    then streams Narrator tokens as SSE ``token`` events straight from the async
+    LLM client. After streaming completes, runs post-processing + commit and
+    returns final metadata (suggested_actions, player_sheet, etc.) as the last
+    SSE ``done`` event.
 
     SSE event format:
       - ``data: {"type": "token", "text": "..."}``  — individual token
@@ -1599,240 +1893,83 @@ def post_turn_stream(
     if body is None:
         body = TurnRequest(user_input="")
 
-    conn = _get_conn()
     start_ts = time.perf_counter()
+    # The slot and connection are held until the stream finishes. They are released
+    # in event_stream's finally and again by the response's background task, which
+    # also runs when the client disconnects before the body is iterated (both idempotent).
+    lease = await _acquire_turn_slot(campaign_id)
+    conn = None
 
     # Validate campaign/player before starting the stream
     try:
-        _ensure_campaign_and_player(conn, campaign_id, player_id)
-    except HTTPException:
-        conn.close()
+        conn = _get_conn(check_same_thread=False)
+        await run_in_threadpool(_ensure_campaign_and_player, conn, campaign_id, player_id)
+    except BaseException:
+        if conn is not None:
+            conn.close()
+        lease.release()
         raise
 
-    def event_stream():
+    async def event_stream():
+        narrator_llm = None
         try:
             from backend.app.core.nodes import dict_to_state
-            from backend.app.core.agents.narrator import (
-                _strip_structural_artifacts,
-                _strip_embedded_suggestions,
-                _truncate_overlong_prose,
-                _enforce_pov_consistency,
-            )
-            from backend.app.core.agents import NarratorAgent
-            from backend.app.core.agents.base import AgentLLM
-            from backend.app.core.nodes.narrator import _is_high_stakes_combat
-            from backend.app.rag.kg_retriever import KGRetriever
-            from backend.app.core.warnings import add_warning
+            from backend.app.rag.context_bundles import track_turn_versions
+            from backend.app.rag.retrieval_cache import track_turn
 
-            state = build_initial_gamestate(conn, campaign_id, player_id)
-            if body.intent is not None:
-                state.user_input = body.intent.user_utterance or json.dumps(body.intent.model_dump(mode="json"))
-            else:
-                state.user_input = body.user_input
+            state = await run_in_threadpool(_initial_turn_state, conn, campaign_id, player_id, body)
+            # Set in this task's context; every run_in_threadpool below runs in a copy of it.
+            cache_counters = track_turn()
+            track_turn_versions()
 
             # Run pre-narrator pipeline (Router → ... → Director)
-            pre_state = _run_pre_narrator_pipeline(conn, state)
+            pre_state = await run_in_threadpool(_run_pre_narrator_pipeline, conn, state)
 
             # Handle META shortcut (no streaming needed)
             if pre_state.get("intent") == "META":
-                from backend.app.core.nodes.router import meta_node
-                from backend.app.core.nodes.commit import make_commit_node
-                pre_state = meta_node(pre_state)
-                commit_fn = make_commit_node()
-                result_dict = commit_fn(pre_state)
-                result_dict.pop("__runtime_conn", None)
-                result_gs = dict_to_state(result_dict)
-                raw_actions = result_gs.suggested_actions or []
-                suggested_actions = _pad_suggestions_for_ui(raw_actions)
-                yield f"data: {json.dumps({'type': 'done', 'narrated_text': result_gs.final_text or '', 'suggested_actions': [a.model_dump(mode='json') if hasattr(a, 'model_dump') else a for a in suggested_actions]})}\n\n"
+                payload = await run_in_threadpool(_finish_meta_stream_turn, conn, pre_state)
+                yield f"data: {json.dumps(payload)}\n\n"
                 return
 
             # Stream Narrator
             gs = dict_to_state(pre_state)
-
-            # Build KG context (same logic as narrator_node)
-            shared_char_ctx = pre_state.get("shared_kg_character_context", "")
-            shared_event_ctx = pre_state.get("shared_kg_relevant_events", "")
-            shared_mem_block = pre_state.get("shared_episodic_memories", "")
-            kg_retriever = KGRetriever()
-
-            if shared_char_ctx or shared_event_ctx:
-                campaign_dict = getattr(gs, "campaign", None) or {}
-                era = (campaign_dict.get("time_period") or campaign_dict.get("era") or "rebellion").strip() or "rebellion"
-                loc_ctx = kg_retriever.get_location_context(gs.current_location or "", era)
-                kg_parts = [p for p in [shared_char_ctx, loc_ctx, shared_event_ctx] if p]
-                kg_context = "## Knowledge Graph Context\n" + "\n\n".join(kg_parts) if kg_parts else ""
-            else:
-                kg_context = kg_retriever.get_context_for_narrator(gs)
-
-            if shared_mem_block:
-                kg_context = (kg_context + "\n\n" + shared_mem_block) if kg_context else shared_mem_block
+            kg_context = await run_in_threadpool(_stream_kg_context, conn, pre_state, gs)
+            narrator = _stream_narrator(pre_state)
+            narrator_llm = narrator._llm
+            if ASYNC_TURN_PIPELINE:
+                tokens = narrator.agenerate_stream(gs, kg_context=kg_context)
             else:
-                try:
-                    from backend.app.core.episodic_memory import EpisodicMemory
-                    epi = EpisodicMemory(conn, gs.campaign_id or "")
-                    query_text = (gs.user_input or "") + " " + (gs.current_location or "")
-                    npc_names = [n.get("name", "") for n in (gs.present_npcs or []) if n.get("name")]
-                    memories = epi.recall(
-                        query_text=query_text,
-                        current_turn=int(gs.turn_number or 0),
-                        location_id=gs.current_location,
-                        npcs=npc_names,
-                        max_results=4,
-                    )
-                    mem_block = epi.format_for_prompt(memories, max_chars=500)
-                    if mem_block:
-                        kg_context = (kg_context + "\n\n" + mem_block) if kg_context else mem_block
-                except Exception:
-                    pass
-
-            # Create NarratorAgent for streaming
-            from backend.app.rag.lore_retriever import retrieve_lore
-            from backend.app.rag.retrieval_bundles import NARRATOR_DOC_TYPES, NARRATOR_SECTION_KINDS
-            from backend.app.rag.style_retriever import retrieve_style_layered
-
-            def lore_retriever_fn(query, top_k=6, era=None, related_npcs=None):
-                return retrieve_lore(query, top_k=top_k, era=era, doc_types=NARRATOR_DOC_TYPES, section_kinds=NARRATOR_SECTION_KINDS, related_npcs=related_npcs)
-
-            voice_retriever_fn = None
-
-            def style_retriever_fn(query, top_k=3, era_id=None, genre=None, archetype=None):
-                return retrieve_style_layered(query, top_k=top_k, era_id=era_id, genre=genre, archetype=archetype)
+                tokens = iterate_in_threadpool(narrator.generate_stream(gs, kg_context=kg_context))
 
-            try:
-                narrator_llm = AgentLLM("narrator")
-            except Exception:
-                narrator_llm = None
-
-            narrator = NarratorAgent(
-                llm=narrator_llm,
-                lore_retriever=lore_retriever_fn,
-                voice_retriever=voice_retriever_fn,
-                style_retriever=style_retriever_fn,
-            )
-
-            # Stream tokens
             accumulated = ""
-            for token in narrator.generate_stream(gs, kg_context=kg_context):
+            async for token in tokens:
                 accumulated += token
                 yield f"data: {json.dumps({'type': 'token', 'text': token})}\n\n"
 
-            # Post-process accumulated text
-            # V2.15: Post-process streamed prose (no suggestion extraction needed)
-            final_text = _strip_structural_artifacts(accumulated)
-            final_text = _strip_embedded_suggestions(final_text)
-            final_text = _enforce_pov_consistency(final_text)
-            final_text = _truncate_overlong_prose(final_text)
-
-            # Append companion banter if available
-            campaign_data = dict(pre_state.get("campaign") or {})
-            banter_queue = list(campaign_data.get("banter_queue") or [])
-            if banter_queue and not _is_high_stakes_combat(pre_state):
-                first = banter_queue[0]
-                line = first.get("text", first) if isinstance(first, dict) else first
-                if line:
-                    clean_line = str(line).strip().strip('"').strip("'").strip()
-                    if clean_line:
-                        final_text = f"{final_text}\n\n---\n\n*{clean_line}*"
-                campaign_data = {**campaign_data, "banter_queue": banter_queue[1:]}
-                pre_state["campaign"] = campaign_data
-
-            # Run post-narrator pipeline (NarrativeValidator + Commit)
-            result_dict = _run_post_narrator_pipeline(conn, pre_state, final_text, [])
-            result_dict.pop("__runtime_conn", None)
-            result_gs = dict_to_state(result_dict)
-
-            # V2.15: Suggestions come from Director's generate_suggestions() only.
-            raw_actions = result_gs.suggested_actions or []
-            suggested_actions = _pad_suggestions_for_ui(raw_actions)
-
-            camp = load_campaign(conn, campaign_id) or {}
-            _ws_sse_raw = camp.get("world_state_json")
-            if isinstance(_ws_sse_raw, str):
-                try:
-                    _ws_sse_raw = json.loads(_ws_sse_raw) if _ws_sse_raw else {}
-                except json.JSONDecodeError:
-                    _ws_sse_raw = {}
-            _ws_sse_raw = _ws_sse_raw if isinstance(_ws_sse_raw, dict) else {}
-            # V3.0: Extract actual quest_log from world_state
-            quest_log = _ws_sse_raw.get("quest_log") or {}
-
-            player_sheet = result_gs.player.model_dump(mode="json") if result_gs.player else {}
-            inventory = (result_gs.player.inventory or []) if result_gs.player else []
-
-            world_time_minutes = None
-            if result_gs.campaign and isinstance(result_gs.campaign, dict):
-                world_time_minutes = result_gs.campaign.get("world_time_minutes")
-            if world_time_minutes is None and camp:
-                world_time_minutes = camp.get("world_time_minutes")
-            canonical_year_label = canonical_year_label_from_campaign(campaign=result_gs.campaign, world_state=_ws_sse_raw)
-
-            warnings_out = getattr(result_gs, "warnings", None) or []
-
-            beats_remaining, scene_transition_note, force_scene_transition = _decrement_beats(conn, campaign_id, camp)
-            ws_live = _world_state_dict(camp)
-            objectives = _active_objectives(conn, campaign_id)
-            if not objectives:
-                _seed_default_objective(conn, campaign_id)
-                objectives = _active_objectives(conn, campaign_id)
-            if scene_transition_note:
-                warnings_out.append(scene_transition_note)
-
-            turn_contract = build_turn_contract(
-                mode=str(ws_live.get("mode") or "SIM").upper(),
-                campaign_id=campaign_id,
-                turn_id=f"{campaign_id}_t{state.turn_number + 1}",
-                display_text=final_text,
-                scene_goal=((getattr(result_gs, "scene_frame", None) or {}).get("player_objective") if isinstance(getattr(result_gs, "scene_frame", None), dict) else "Advance the current objective"),
-                obstacle=((getattr(result_gs, "scene_frame", None) or {}).get("immediate_situation") if isinstance(getattr(result_gs, "scene_frame", None), dict) else "Escalating opposition"),
-                stakes="Mission momentum, faction trust, and party safety.",
-                mechanic_result=result_gs.mechanic_result,
-                suggested_actions=suggested_actions,
-                meta=TurnMeta(
-                    scene_id=ws_live.get("scene_id"),
-                    beats_remaining=beats_remaining,
-                    active_objectives=objectives,
-                    passage_id=ws_live.get("current_passage_id"),
-                    prompt_versions=prompt_registry_snapshot(),
-                ),
-                ledger_facts=get_facts(conn, campaign_id),
-                has_companions=bool((camp or {}).get("party")),
-                force_scene_transition=force_scene_transition,
+            done_payload = await run_in_threadpool(
+                _finish_stream_turn, conn, campaign_id, state, pre_state, accumulated, start_ts, cache_counters,
             )
-            if turn_contract.debug and turn_contract.debug.validation_errors:
-                record_event(conn, campaign_id, turn_contract.turn_id, {
-                    "event_type": "turn_contract_validation_failure",
-                    "errors": turn_contract.debug.validation_errors,
-                    "repair_count": turn_contract.debug.repair_count,
-                })
-            conn.commit()
-
-            done_payload = {
-                "type": "done",
-                "narrated_text": final_text,
-                "suggested_actions": [
-                    a.model_dump(mode="json") if hasattr(a, "model_dump") else a
-                    for a in suggested_actions
-                ],
-                "player_sheet": player_sheet,
-                "inventory": inventory,
-                "quest_log": quest_log or {},
-                "world_time_minutes": world_time_minutes,
-                "canonical_year_label": canonical_year_label,
-                "warnings": warnings_out,
-                "dialogue_turn": getattr(result_gs, "dialogue_turn", None),
-                "turn_contract": turn_contract.model_dump(mode="json"),
-            }
-            logger.info("turn_complete node=turn_stream campaign_id=%s turn_id=%s latency_ms=%s validation_errors=%s repair_count=%s", campaign_id, turn_contract.turn_id, int((time.perf_counter()-start_ts)*1000), len((turn_contract.debug.validation_errors if turn_contract.debug else [])), (turn_contract.debug.repair_count if turn_contract.debug else 0))
             yield f"data: {json.dumps(done_payload)}\n\n"
 
         except Exception as e:
             logger.exception("SSE turn_stream failed node=turn_stream campaign_id=%s latency_ms=%s", campaign_id, int((time.perf_counter()-start_ts)*1000))
             yield f"data: {json.dumps({'type': 'error', 'message': f'Stream failed; retrying via non-stream endpoint is recommended. Details: {str(e)[:160]}'})}\n\n"
         finally:
-            conn.close()
+            if narrator_llm is not None:
+                # Per-stream AgentLLM: close its lazily created httpx.AsyncClient.
+                try:
+                    await narrator_llm.aclose()
+                except Exception:
+                    logger.debug("narrator LLM aclose failed", exc_info=True)
+            release_stream()
+
+    def release_stream() -> None:
+        conn.close()
+        lease.release()
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", background=BackgroundTask(release_stream),
+    )
 
 
 
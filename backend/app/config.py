@@ -10,6 +10,32 @@ import logging
 import os
 from pathlib import Path
 
+from backend.app.constants import (
+    CONTEXT_BUNDLE_LORE_SLOTS as _CONTEXT_BUNDLE_LORE_SLOTS_DEFAULT,
+    CONTEXT_BUNDLE_STYLE_SLOTS as _CONTEXT_BUNDLE_STYLE_SLOTS_DEFAULT,
+    DB_BUSY_TIMEOUT_MS as _DB_BUSY_TIMEOUT_DEFAULT,
+    DB_CACHE_SIZE_KB as _DB_CACHE_SIZE_DEFAULT,
+    DB_MMAP_SIZE_MB as _DB_MMAP_SIZE_DEFAULT,
+    DB_POOL_SIZE as _DB_POOL_SIZE_DEFAULT,
+    EMBEDDING_SERVER_BATCH_WINDOW_MS as _EMBEDDING_SERVER_BATCH_WINDOW_MS_DEFAULT,
+    EMBEDDING_SERVER_MAX_BATCH as _EMBEDDING_SERVER_MAX_BATCH_DEFAULT,
+    EMBEDDING_SERVER_RETRY_SECONDS as _EMBEDDING_SERVER_RETRY_SECONDS_DEFAULT,
+    EMBEDDING_SERVER_TIMEOUT_SECONDS as _EMBEDDING_SERVER_TIMEOUT_SECONDS_DEFAULT,
+    GAMESTATE_CACHE_MAX_CAMPAIGNS as _GAMESTATE_CACHE_DEFAULT,
+    KG_EXTRACTION_CONCURRENCY as _KG_EXTRACTION_CONCURRENCY_DEFAULT,
+    LORE_RRF_K as _LORE_RRF_K_DEFAULT,
+    LORE_SEARCH_MODE as _LORE_SEARCH_MODE_DEFAULT,
+    NARRATOR_LORE_TOP_K as _NARRATOR_LORE_TOP_K_DEFAULT,
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES as _QUERY_EMBEDDING_CACHE_DEFAULT,
+    RETRIEVAL_CACHE_MAX_ENTRIES as _RETRIEVAL_CACHE_DEFAULT,
+    RETRIEVAL_LANE_DEADLINE_SECONDS as _RETRIEVAL_LANE_DEADLINE_DEFAULT,
+    TURN_MAX_CONCURRENT as _TURN_MAX_CONCURRENT_DEFAULT,
+    TURN_QUEUE_MAX as _TURN_QUEUE_MAX_DEFAULT,
+    TURN_QUEUE_PER_CAMPAIGN as _TURN_QUEUE_PER_CAMPAIGN_DEFAULT,
+    TURN_QUEUE_TIMEOUT_SECONDS as _TURN_QUEUE_TIMEOUT_DEFAULT,
+    VECTOR_SEARCH_NPROBES as _VECTOR_SEARCH_NPROBES_DEFAULT,
+    VECTOR_SEARCH_REFINE_FACTOR as _VECTOR_SEARCH_REFINE_FACTOR_DEFAULT,
+)
 from shared.config import (
     EMBEDDING_DIMENSION,
     EMBEDDING_MODEL,
@@ -266,3 +292,104 @@ NARRATOR_MAX_INPUT_TOKENS = get_role_max_input_tokens("narrator")
 
 # Ingestion tagger (local LLM) flag: optional, off by default.
 INGESTION_TAGGER_ENABLED = os.environ.get("INGESTION_TAGGER_ENABLED", "").strip().lower() in ("1", "true", "yes")
+
+# Parallel retrieval fan-out (lore/voice/style lanes run concurrently per turn).
+# Disable with ENABLE_PARALLEL_RETRIEVAL=0 to run lanes inline (debugging).
+ENABLE_PARALLEL_RETRIEVAL = _env_flag("ENABLE_PARALLEL_RETRIEVAL", default=True)
+
+
+def get_retrieval_lane_deadline() -> float:
+    """Per-lane retrieval deadline in seconds (env STORYTELLER_RETRIEVAL_DEADLINE_SECONDS overrides)."""
+    env_val = os.environ.get("STORYTELLER_RETRIEVAL_DEADLINE_SECONDS", "").strip()
+    if env_val:
+        try:
+            return max(0.0, float(env_val))
+        except ValueError:
+            pass
+    return _RETRIEVAL_LANE_DEADLINE_DEFAULT
+
+# Query embedding cache: in-process LRU (0 disables) + optional on-disk SQLite tier.
+_qec_size = os.environ.get("STORYTELLER_QUERY_EMBEDDING_CACHE_SIZE", "").strip()
+QUERY_EMBEDDING_CACHE_SIZE = int(_qec_size) if _qec_size.isdigit() else _QUERY_EMBEDDING_CACHE_DEFAULT
+QUERY_EMBEDDING_CACHE_PATH = os.environ.get("STORYTELLER_QUERY_EMBEDDING_CACHE_PATH", "").strip()
+
+# Shared embedding server (`storyteller embed-server`): unix:/path/to.sock or host:port.
+# Empty = every process loads its own encoder.
+EMBEDDING_SERVER_ADDRESS = os.environ.get("STORYTELLER_EMBEDDING_SERVER", "").strip()
+
+# Episodic memory embeddings: "float32" (packed float32 BLOB) or "int8" (quantized BLOB + scale, 4x smaller).
+EPISODIC_EMBEDDING_FORMAT = os.environ.get("STORYTELLER_EPISODIC_EMBEDDING_FORMAT", "float32").strip().lower()
+if EPISODIC_EMBEDDING_FORMAT not in ("float32", "int8"):
+    EPISODIC_EMBEDDING_FORMAT = "float32"
+
+# Async turn pipeline: /turn and /turn_stream await the graph (ainvoke) and async LLM
+# clients instead of holding a threadpool thread per turn. Disable with STORYTELLER_ASYNC_TURNS=0.
+ASYNC_TURN_PIPELINE = _env_flag("STORYTELLER_ASYNC_TURNS", default=True)
+
+
+def _env_number(name: str, default, cast=int):
+    """Non-negative number from env var name; default when unset or invalid."""
+    raw = os.environ.get(name, "").strip()
+    if raw:
+        try:
+            return max(cast(0), cast(raw))
+        except ValueError:
+            pass
+    return default
+
+
+# Per-campaign turn scheduler (backend/app/api/turn_scheduler.py).
+TURN_MAX_CONCURRENT = max(1, _env_number("STORYTELLER_TURN_MAX_CONCURRENT", _TURN_MAX_CONCURRENT_DEFAULT))
+TURN_QUEUE_PER_CAMPAIGN = _env_number("STORYTELLER_TURN_QUEUE_PER_CAMPAIGN", _TURN_QUEUE_PER_CAMPAIGN_DEFAULT)
+TURN_QUEUE_MAX = _env_number("STORYTELLER_TURN_QUEUE_MAX", _TURN_QUEUE_MAX_DEFAULT)
+TURN_QUEUE_TIMEOUT_SECONDS = _env_number("STORYTELLER_TURN_QUEUE_TIMEOUT_SECONDS", _TURN_QUEUE_TIMEOUT_DEFAULT, float)
+
+# SQLite connection pool + pragmas (backend/app/db/connection.py).
+DB_POOL_SIZE = _env_number("STORYTELLER_DB_POOL_SIZE", _DB_POOL_SIZE_DEFAULT)
+DB_CACHE_SIZE_KB = _env_number("STORYTELLER_DB_CACHE_SIZE_KB", _DB_CACHE_SIZE_DEFAULT)
+DB_MMAP_SIZE_MB = _env_number("STORYTELLER_DB_MMAP_SIZE_MB", _DB_MMAP_SIZE_DEFAULT)
+DB_BUSY_TIMEOUT_MS = _env_number("STORYTELLER_DB_BUSY_TIMEOUT_MS", _DB_BUSY_TIMEOUT_DEFAULT)
+
+# Hot GameState snapshot cache (core/state_loader.py); 0 disables.
+GAMESTATE_CACHE_SIZE = _env_number("STORYTELLER_GAMESTATE_CACHE_SIZE", _GAMESTATE_CACHE_DEFAULT)
+
+# Concurrent extraction batches for `storyteller extract-knowledge` (kg/scheduler.py).
+KG_EXTRACTION_CONCURRENCY = max(
+    1, _env_number("STORYTELLER_KG_EXTRACTION_CONCURRENCY", _KG_EXTRACTION_CONCURRENCY_DEFAULT)
+)
+
+# ANN query tuning for LanceDB searches (rag/vector_store.py); only used once the
+# table has a vector index (`storyteller index`).
+VECTOR_SEARCH_NPROBES = _env_number("STORYTELLER_VECTOR_NPROBES", _VECTOR_SEARCH_NPROBES_DEFAULT)
+VECTOR_SEARCH_REFINE_FACTOR = _env_number("STORYTELLER_VECTOR_REFINE_FACTOR", _VECTOR_SEARCH_REFINE_FACTOR_DEFAULT)
+
+# Lore search: "hybrid" fuses BM25 (full-text index from `storyteller index`) with dense
+# rankings; "vector" is dense only. Hybrid degrades to dense on tables without the index.
+LORE_SEARCH_MODE = os.environ.get("STORYTELLER_LORE_SEARCH_MODE", _LORE_SEARCH_MODE_DEFAULT).strip().lower()
+if LORE_SEARCH_MODE not in ("hybrid", "vector"):
+    LORE_SEARCH_MODE = _LORE_SEARCH_MODE_DEFAULT
+LORE_RRF_K = max(1, _env_number("STORYTELLER_LORE_RRF_K", _LORE_RRF_K_DEFAULT))
+NARRATOR_LORE_TOP_K = max(1, _env_number("STORYTELLER_NARRATOR_LORE_TOP_K", _NARRATOR_LORE_TOP_K_DEFAULT))
+
+# Shared embedding server batching and client fallback (rag/embedding_server.py, rag/_cache.py).
+EMBEDDING_SERVER_BATCH_WINDOW_MS = _env_number(
+    "STORYTELLER_EMBEDDING_SERVER_BATCH_WINDOW_MS", _EMBEDDING_SERVER_BATCH_WINDOW_MS_DEFAULT, float
+)
+EMBEDDING_SERVER_MAX_BATCH = max(1, _env_number("STORYTELLER_EMBEDDING_SERVER_MAX_BATCH", _EMBEDDING_SERVER_MAX_BATCH_DEFAULT))
+EMBEDDING_SERVER_TIMEOUT_SECONDS = _env_number(
+    "STORYTELLER_EMBEDDING_SERVER_TIMEOUT_SECONDS", _EMBEDDING_SERVER_TIMEOUT_SECONDS_DEFAULT, float
+)
+EMBEDDING_SERVER_RETRY_SECONDS = _env_number(
+    "STORYTELLER_EMBEDDING_SERVER_RETRY_SECONDS", _EMBEDDING_SERVER_RETRY_SECONDS_DEFAULT, float
+)
+
+# Retrieval result cache: in-process LRU of lore/style/KG results (0 disables).
+RETRIEVAL_CACHE_SIZE = max(0, _env_number("STORYTELLER_RETRIEVAL_CACHE_SIZE", _RETRIEVAL_CACHE_DEFAULT))
+
+# Precomputed per-(era, location) context bundles from `storyteller precompute-context`.
+# Used as the first tier for narrator lore/style, KG location and anchor NPC context;
+# live retrieval fills the remaining slots. Stale lanes (table or KG changed) are ignored.
+ENABLE_CONTEXT_BUNDLES = _env_flag("ENABLE_CONTEXT_BUNDLES", default=True)
+CONTEXT_BUNDLES_DIR = Path(os.environ.get("STORYTELLER_CONTEXT_BUNDLES_DIR", str(DATA_ROOT / "context_bundles")))
+CONTEXT_BUNDLE_LORE_SLOTS = max(0, _env_number("STORYTELLER_CONTEXT_BUNDLE_LORE_SLOTS", _CONTEXT_BUNDLE_LORE_SLOTS_DEFAULT))
+CONTEXT_BUNDLE_STYLE_SLOTS = max(0, _env_number("STORYTELLER_CONTEXT_BUNDLE_STYLE_SLOTS", _CONTEXT_BUNDLE_STYLE_SLOTS_DEFAULT))
@@ -130,6 +130,60 @@ KG_MAX_RELATIONSHIPS_PER_CHAR = 8       # Max relationship edges per character i
 KG_MAX_EVENTS = 3                       # Max recent events per character/location
 KG_DIRECTOR_MAX_TOKENS = 600            # Token budget for Director's KG context section
 KG_NARRATOR_MAX_TOKENS = 800            # Token budget for Narrator's KG context section
+KG_GRAPH_CACHE_MAX_ERAS = 8             # In-memory KG graphs kept (one per database + era)
+KG_EXTRACTION_CONCURRENCY = 4           # Concurrent LLM batches in extract-knowledge (match OLLAMA_NUM_PARALLEL)
+
+# ── Retrieval fan-out ─────────────────────────────────────────────────
+# Lore/voice/style lanes run concurrently; a lane that misses its deadline is dropped.
+RETRIEVAL_LANE_DEADLINE_SECONDS = 8.0   # Per-lane deadline measured from fan-out start
+RETRIEVAL_LANE_MAX_WORKERS = 16         # Shared lane pool size (3 lanes per concurrent turn)
+
+# ── Vector search (ANN index, see ingestion/lance_index.py) ──────────
+VECTOR_SEARCH_NPROBES = 20              # IVF partitions probed per query (recall vs latency)
+VECTOR_SEARCH_REFINE_FACTOR = 5         # Re-rank top_k x this with exact distances (0 = off)
+
+# ── Lore search mode (rag/lore_retriever.py) ─────────────────────────
+LORE_SEARCH_MODE = "hybrid"             # "hybrid" (BM25 + dense, RRF) or "vector" (dense only)
+LORE_RRF_K = 60                         # Reciprocal-rank-fusion constant: 1 / (k + rank)
+NARRATOR_LORE_TOP_K = 4                 # Narrator lore chunks per turn (was 6 with dense-only search)
+
+# ── Query embedding cache ─────────────────────────────────────────────
+QUERY_EMBEDDING_CACHE_MAX_ENTRIES = 2048  # LRU size for (model, normalized query) -> vector
+
+# ── Retrieval result cache (rag/retrieval_cache.py) ──────────────────
+RETRIEVAL_CACHE_MAX_ENTRIES = 512       # LRU size for (lane, query, filters, table version) -> results
+
+# ── Precomputed location context bundles (rag/context_bundles.py) ───
+CONTEXT_BUNDLE_LORE_TOP_K = 8           # Lore chunks stored per (era, location) by precompute-context
+CONTEXT_BUNDLE_STYLE_TOP_K = 3          # Style chunks stored per (era, location)
+CONTEXT_BUNDLE_LORE_SLOTS = 2           # Narrator lore slots served from the bundle; live search fills the rest
+CONTEXT_BUNDLE_STYLE_SLOTS = 2          # Narrator style slots served from the bundle
+
+# ── Shared embedding server (rag/embedding_server.py) ───────────────
+EMBEDDING_SERVER_BATCH_WINDOW_MS = 5    # Coalesce requests arriving within this window
+EMBEDDING_SERVER_MAX_BATCH = 64         # Texts per encoder call (a larger single request still goes whole)
+EMBEDDING_SERVER_TIMEOUT_SECONDS = 10.0 # Client socket timeout before falling back in-process
+EMBEDDING_SERVER_RETRY_SECONDS = 30.0   # After a failure, encode in-process this long before retrying
+
+# ── Episodic memory recall ────────────────────────────────────────────
+EPISODIC_INDEX_MAX_CAMPAIGNS = 16       # Per-campaign recall matrices kept in memory (LRU)
+EPISODIC_RECALL_MIN_SCORE = 0.5         # Memories scoring below this are never recalled
+
+# ── GameState snapshot cache ──────────────────────────────────────────
+GAMESTATE_CACHE_MAX_CAMPAIGNS = 64      # Hot per-campaign GameState snapshots kept in memory (LRU)
+
+# ── Turn scheduler (API) ──────────────────────────────────────────────
+# Turns are serialized per campaign; different campaigns run in parallel up to the limit.
+TURN_MAX_CONCURRENT = 4                 # Turns running at once across all campaigns
+TURN_QUEUE_PER_CAMPAIGN = 3             # Waiting turns per campaign before 429
+TURN_QUEUE_MAX = 64                     # Waiting turns across all campaigns before 503
+TURN_QUEUE_TIMEOUT_SECONDS = 120.0      # Max time a turn waits for its slot before 503
+
+# ── SQLite connection pool ────────────────────────────────────────────
+DB_POOL_SIZE = 8                        # Shared idle connections kept per database (0 disables pooling)
+DB_CACHE_SIZE_KB = 16384                # Page cache per connection (PRAGMA cache_size = -KB)
+DB_MMAP_SIZE_MB = 128                   # Memory-mapped I/O window per connection (0 disables)
+DB_BUSY_TIMEOUT_MS = 5000               # Wait this long on a locked database before SQLITE_BUSY
 
 # ── Banter system ─────────────────────────────────────────────────────
 # Controls companion banter injection frequency. Moved from banter_manager.py.
@@ -3,12 +3,15 @@
 AgentLLM(role) returns a client with .complete(system_prompt, user_prompt, json_mode=False, raw_json_mode=False).
 If json_mode=True: enforce JSON-only response and validate parse; retry once on invalid.
 If raw_json_mode=True: skip internal JSON validation/retry and return raw output.
+Async twins (acomplete / agenerate / acomplete_stream) use the providers' async
+HTTP clients so an awaiting turn does not hold a worker thread.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Any, Iterator, Protocol
+from typing import Any, AsyncIterator, Iterator, Protocol
 
 from backend.app.config import MODEL_CONFIG
 from backend.app.core.json_repair import ensure_json  # noqa: F401 — re-exported
@@ -60,6 +63,12 @@ class AgentLLM:
         self._client = create_provider(provider, model, base_url, api_key)
         return self._client
 
+    async def aclose(self) -> None:
+        """Close the provider's HTTP clients (the async client is created lazily per provider)."""
+        client, self._client = self._client, None
+        if client is not None and hasattr(client, "aclose"):
+            await client.aclose()
+
     def _call_provider(self, client: Any, user_prompt: str, system_prompt: str, json_mode: bool = False) -> str:
         """Call the provider using its native interface.
 
@@ -83,6 +92,25 @@ class AgentLLM:
         else:
             raise TypeError(f"Provider {type(client).__name__} has no streaming method")
 
+    async def _acall_provider(self, client: Any, user_prompt: str, system_prompt: str, json_mode: bool = False) -> str:
+        """Async _call_provider: native async method when the provider has one, else a worker thread."""
+        if hasattr(client, "_acall_llm"):
+            return await client._acall_llm(user_prompt, system_prompt, json_mode=json_mode)
+        if hasattr(client, "acomplete"):
+            return await client.acomplete(user_prompt, system_prompt, json_mode=json_mode)
+        return await asyncio.to_thread(self._call_provider, client, user_prompt, system_prompt, json_mode)
+
+    async def _astream_provider(self, client: Any, user_prompt: str, system_prompt: str) -> AsyncIterator[str]:
+        """Async _stream_provider (providers without async streaming are rejected)."""
+        if hasattr(client, "_acall_llm_stream"):
+            stream = client._acall_llm_stream(user_prompt, system_prompt)
+        elif hasattr(client, "acomplete_stream"):
+            stream = client.acomplete_stream(user_prompt, system_prompt)
+        else:
+            raise TypeError(f"Provider {type(client).__name__} has no async streaming method")
+        async for token in stream:
+            yield token
+
     def _try_fallback_client(self) -> Any | None:
         """Create a fallback client if configured. Returns None if not available."""
         fallback_provider = self._config.get("fallback_provider")
@@ -140,35 +168,71 @@ class AgentLLM:
             return LLMResult(raw)
 
         # Validate JSON; retry once with correction prompt
-        parsed = ensure_json(raw)
-        if parsed:
-            try:
-                json.loads(parsed)
-                return LLMResult(parsed)
-            except json.JSONDecodeError:
-                pass
+        parsed = _valid_json(raw)
+        if parsed is not None:
+            return LLMResult(parsed)
         logger.warning("AgentLLM %s: invalid JSON, retrying once.", self._role)
-        warnings: list[str] = ["LLM JSON parse failed: repaired output used."]
-        correction = (
-            "Your previous response was not valid JSON. Output ONLY a single valid JSON object, no markdown or extra text."
-        )
         try:
-            raw2 = self._call_provider(client, user_prompt + "\n\n" + correction, system_prompt, json_mode=True)
+            raw2 = self._call_provider(client, user_prompt + "\n\n" + _JSON_CORRECTION, system_prompt, json_mode=True)
         except Exception as e:
             logger.exception("AgentLLM %s: LLM call failed on JSON repair", self._role)
             raise
-        out = ensure_json(raw2)
-        if out:
-            try:
-                json.loads(out)
-                return LLMResult(out, warnings=warnings, repaired=True)
-            except json.JSONDecodeError:
-                pass
+        return self._repaired_or_raise(raw2)
+
+    def _repaired_or_raise(self, raw2: str) -> LLMResult:
+        out = _valid_json(raw2)
+        if out is not None:
+            return LLMResult(out, warnings=["LLM JSON parse failed: repaired output used."], repaired=True)
         raise ValueError(
             f"Invalid JSON from LLM role={self._role} after retry. "
             f"Raw (truncated): {raw2[:200]}"
         )
 
+    async def acomplete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_mode: bool = False,
+        raw_json_mode: bool = False,
+    ) -> LLMResult:
+        """Async :meth:`complete`: same fallback-provider and JSON-retry behaviour."""
+        try:
+            client = self._get_client()
+        except Exception:
+            logger.exception("AgentLLM %s: failed to initialize provider", self._role)
+            raise
+
+        try:
+            raw = await self._acall_provider(client, user_prompt, system_prompt, json_mode=json_mode)
+        except Exception:
+            fallback = self._try_fallback_client()
+            if not fallback:
+                logger.exception("AgentLLM %s: LLM call failed", self._role)
+                raise
+            logger.warning("AgentLLM %s: primary failed, trying fallback provider", self._role)
+            try:
+                raw = await self._acall_provider(fallback, user_prompt, system_prompt, json_mode=json_mode)
+            except Exception:
+                logger.exception("AgentLLM %s: fallback provider also failed", self._role)
+                raise
+
+        if not json_mode or raw_json_mode:
+            return LLMResult(raw)
+        parsed = _valid_json(raw)
+        if parsed is not None:
+            return LLMResult(parsed)
+        logger.warning("AgentLLM %s: invalid JSON, retrying once.", self._role)
+        try:
+            raw2 = await self._acall_provider(client, user_prompt + "\n\n" + _JSON_CORRECTION, system_prompt, json_mode=True)
+        except Exception:
+            logger.exception("AgentLLM %s: LLM call failed on JSON repair", self._role)
+            raise
+        return self._repaired_or_raise(raw2)
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> str:
+        """Async alias for .acomplete(system_prompt, user_prompt, json_mode=False)."""
+        return await self.acomplete(system_prompt, user_prompt, json_mode=False)
+
     def generate(self, system_prompt: str, user_prompt: str) -> str:
         """Alias for .complete(system_prompt, user_prompt, json_mode=False)."""
         return self.complete(system_prompt, user_prompt, json_mode=False)
@@ -191,6 +255,38 @@ class AgentLLM:
             logger.exception("AgentLLM %s: streaming LLM call failed", self._role)
             raise
 
+    async def acomplete_stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        """Async :meth:`complete_stream` over the provider's async HTTP client."""
+        try:
+            client = self._get_client()
+        except Exception:
+            logger.exception("AgentLLM %s: failed to initialize provider for streaming", self._role)
+            raise
+
+        try:
+            async for token in self._astream_provider(client, user_prompt, system_prompt):
+                yield token
+        except Exception:
+            logger.exception("AgentLLM %s: streaming LLM call failed", self._role)
+            raise
+
+
+_JSON_CORRECTION = (
+    "Your previous response was not valid JSON. Output ONLY a single valid JSON object, no markdown or extra text."
+)
+
+
+def _valid_json(raw: str) -> str | None:
+    """Repaired JSON text if raw contains a parseable JSON value, else None."""
+    parsed = ensure_json(raw)
+    if not parsed:
+        return None
+    try:
+        json.loads(parsed)
+    except json.JSONDecodeError:
+        return None
+    return parsed
+
 
 # Backward compat
 def now_iso() -> str:
@@ -1,9 +1,10 @@
 """Narrator agent: generates narrative from state, mechanic result, director instructions, lore (grounded)."""
 from __future__ import annotations
 
+import asyncio
 import re
 import logging
-from typing import Callable, Iterator
+from typing import AsyncIterator, Callable, Iterator
 
 from backend.app.models.state import GameState
 from backend.app.models.narration import NarrationOutput, NarrationCitation
@@ -11,12 +12,16 @@ from backend.app.models.dialogue_turn import NPCUtterance
 from backend.app.core.agents.base import AgentLLM, ensure_json
 from backend.app.config import (
     DEV_CONTEXT_STATS,
+    ENABLE_PARALLEL_RETRIEVAL,
+    NARRATOR_LORE_TOP_K,
+    get_retrieval_lane_deadline,
     get_role_max_input_tokens,
     get_role_reserved_output_tokens,
 )
 from backend.app.core.context_budget import BudgetReport, build_context
 from backend.app.core.error_handling import log_error_with_context
 from backend.app.core.ledger import format_ledger_for_prompt
+from backend.app.core.retrieval_fanout import RetrievalLane, run_lanes
 from backend.app.core.agent_utils import (
     call_retriever,
     collect_related_npc_ids,
@@ -1143,6 +1148,32 @@ def _parse_llm_narration(raw: str, fallback_chunks: list[LoreChunk]) -> Narratio
     return NarrationOutput(text=text, citations=citations)
 
 
+def _rephrase_output(state: GameState) -> NarrationOutput | None:
+    """Rephrase prompt when the Mechanic flagged the action invalid (never invent outcomes)."""
+    if state.mechanic_result and getattr(state.mechanic_result, "invalid_action", False):
+        msg = getattr(state.mechanic_result, "rephrase_message", None) or "That action is unclear—try rephrasing."
+        return NarrationOutput(text=msg, citations=[])
+    return None
+
+
+def _finish_llm_narration(raw: str, lore_chunks: list) -> NarrationOutput:
+    """Parse and clean raw LLM narration."""
+    output = _parse_llm_narration(raw, lore_chunks)
+    cleaned_text = _strip_structural_artifacts(output.text)
+
+    # V2.15: Narrator writes prose only. Strip any suggestions the LLM
+    # may still inject despite the simplified prompt (safety net).
+    cleaned_text = _strip_embedded_suggestions(cleaned_text)
+
+    cleaned_text = _enforce_pov_consistency(cleaned_text)
+    cleaned_text = _truncate_overlong_prose(cleaned_text)
+    return NarrationOutput(
+        text=cleaned_text,
+        citations=output.citations,
+        embedded_suggestions=None,
+    )
+
+
 class NarratorAgent:
     """Incorporates mechanic_result (show don't tell), director_instructions, lore (grounded), voice snippets."""
 
@@ -1158,16 +1189,18 @@ class NarratorAgent:
         self._voice_retriever = voice_retriever
         self._style_retriever = style_retriever
 
-    def generate(self, state: GameState, kg_context: str = "") -> NarrationOutput:
-        """Produce narrative (grounded in mechanic events + lore); return NarrationOutput with optional citations."""
-        warnings_list = getattr(state, "warnings", None)
-        # If Mechanic returned invalid_action, do not invent outcomes—ask for rephrase only
-        if state.mechanic_result and getattr(state.mechanic_result, "invalid_action", False):
-            msg = getattr(state.mechanic_result, "rephrase_message", None) or "That action is unclear—try rephrasing."
-            return NarrationOutput(text=msg, citations=[])
-
-        # Retrieve lore
-        lore_chunks: list[LoreChunk] = []
+    def _retrieve_context(
+        self,
+        state: GameState,
+        warnings_list: list[str] | None,
+    ) -> tuple[list[LoreChunk], dict[str, list], list[dict]]:
+        """Fan out lore, voice and style retrieval concurrently; return (lore, voice_by_char, style).
+
+        Each lane gets the per-lane deadline from config; a lane that misses it (or raises)
+        contributes its empty default so narration proceeds with whatever arrived in time.
+        Lanes report into their own warnings list (a late lane may still be running after
+        the turn returns); run_lanes merges those of finished lanes into warnings_list.
+        """
         campaign = state.campaign or {}
         era = (campaign.get("time_period") or campaign.get("era") or "REBELLION")
         if isinstance(era, str):
@@ -1175,50 +1208,123 @@ class NarratorAgent:
         else:
             era = "REBELLION"
 
+        lanes: list[RetrievalLane] = []
+
         if self._lore_retriever is not None:
             query = _build_lore_query(state)
             related_ids = collect_related_npc_ids(state)
-            lore_chunks = call_retriever(
-                self._lore_retriever,
-                query,
-                top_k=6,
-                era=era,
-                related_npcs=related_ids if related_ids else None,
-                warnings=warnings_list,
-            )
-            if related_ids and not lore_chunks:
-                lore_chunks = call_retriever(
+
+            # One call: hybrid lore search treats related_npcs as a ranking preference, and
+            # vector-mode retrieve_lore retries without the filter when it matches nothing.
+            lore_warnings: list[str] = []
+
+            def _lore_lane() -> list[LoreChunk]:
+                chunks = call_retriever(
                     self._lore_retriever,
                     query,
-                    top_k=6,
+                    top_k=NARRATOR_LORE_TOP_K,
                     era=era,
-                    warnings=warnings_list,
+                    related_npcs=related_ids if related_ids else None,
+                    warnings=lore_warnings,
                 )
+                return chunks or []
 
-        # Retrieve voice snippets for present NPCs and party
-        voice_snippets_by_char: dict[str, list] = {}
+            lanes.append(RetrievalLane("lore", _lore_lane, default=[], warnings=lore_warnings))
+
+        # Voice snippets for present NPCs and party
         if self._voice_retriever is not None:
             char_ids = _collect_character_ids(state)
             if char_ids:
-                raw = call_retriever(self._voice_retriever, char_ids, era, k=6, warnings=warnings_list)
-                for cid, snips in raw.items():
-                    voice_snippets_by_char[cid] = [
-                        {"character_id": s.character_id, "era": s.era, "text": s.text, "chunk_id": s.chunk_id}
-                        if hasattr(s, "text") else s
-                        for s in snips
-                    ]
-
-        # Retrieve style chunks for narrative shaping
-        style_chunks: list[dict] = []
+                voice_warnings: list[str] = []
+
+                def _voice_lane() -> dict[str, list]:
+                    raw = call_retriever(self._voice_retriever, char_ids, era, k=6, warnings=voice_warnings)
+                    by_char: dict[str, list] = {}
+                    for cid, snips in (raw or {}).items():
+                        by_char[cid] = [
+                            {"character_id": s.character_id, "era": s.era, "text": s.text, "chunk_id": s.chunk_id}
+                            if hasattr(s, "text") else s
+                            for s in snips
+                        ]
+                    return by_char
+
+                lanes.append(RetrievalLane("voice", _voice_lane, default={}, warnings=voice_warnings))
+
+        # Style chunks for narrative shaping
         if self._style_retriever is not None:
             from backend.app.core.director_validation import build_style_query
             style_query = build_style_query(state)
-            campaign = getattr(state, "campaign", None) or {}
             _era_id = campaign.get("time_period") or campaign.get("era") or None
             _genre = campaign.get("genre") or None
             _archetype = campaign.get("archetype") or None
-            style_chunks = call_retriever(self._style_retriever, style_query, 3, era_id=_era_id, genre=_genre, archetype=_archetype, warnings=warnings_list)
+            style_warnings: list[str] = []
+
+            def _style_lane() -> list[dict]:
+                return call_retriever(
+                    self._style_retriever, style_query, 3,
+                    era_id=_era_id, genre=_genre, archetype=_archetype, warnings=style_warnings,
+                ) or []
+
+            lanes.append(RetrievalLane("style", _style_lane, default=[], warnings=style_warnings))
+
+        fanout = run_lanes(
+            lanes,
+            deadline_s=get_retrieval_lane_deadline(),
+            warnings=warnings_list,
+            parallel=ENABLE_PARALLEL_RETRIEVAL,
+        )
+        if fanout.elapsed_ms:
+            logger.debug("Narrator retrieval lanes (ms): %s", {k: round(v, 1) for k, v in fanout.elapsed_ms.items()})
+        return fanout.get("lore", []), fanout.get("voice", {}), fanout.get("style", [])
+
+    def generate(self, state: GameState, kg_context: str = "") -> NarrationOutput:
+        """Produce narrative (grounded in mechanic events + lore); return NarrationOutput with optional citations."""
+        # If Mechanic returned invalid_action, do not invent outcomes—ask for rephrase only
+        rephrase = _rephrase_output(state)
+        if rephrase is not None:
+            return rephrase
+        retrieved = self._retrieve_context(state, getattr(state, "warnings", None))
+        lore_chunks, system, user = self._prepare_prompt(state, retrieved, kg_context)
+
+        if self._llm is not None:
+            try:
+                raw = self._llm.generate(system_prompt=system, user_prompt=user)
+                return _finish_llm_narration(raw, lore_chunks)
+            except Exception as e:
+                self._report_llm_failure(state, e, "NarratorAgent.generate")
+        return self._fallback_output(state, lore_chunks)
 
+    async def agenerate(self, state: GameState, kg_context: str = "") -> NarrationOutput:
+        """Async :meth:`generate`: retrieval runs in a worker thread, the LLM call is awaited.
+
+        Uses the LLM's ``agenerate`` when available (AgentLLM), otherwise runs the
+        sync ``generate`` call in a worker thread.
+        """
+        rephrase = _rephrase_output(state)
+        if rephrase is not None:
+            return rephrase
+        retrieved = await asyncio.to_thread(self._retrieve_context, state, getattr(state, "warnings", None))
+        lore_chunks, system, user = self._prepare_prompt(state, retrieved, kg_context)
+
+        if self._llm is not None:
+            try:
+                if hasattr(self._llm, "agenerate"):
+                    raw = await self._llm.agenerate(system_prompt=system, user_prompt=user)
+                else:
+                    raw = await asyncio.to_thread(self._llm.generate, system_prompt=system, user_prompt=user)
+                return _finish_llm_narration(raw, lore_chunks)
+            except Exception as e:
+                self._report_llm_failure(state, e, "NarratorAgent.agenerate")
+        return self._fallback_output(state, lore_chunks)
+
+    def _prepare_prompt(
+        self,
+        state: GameState,
+        retrieved: tuple[list, dict, list],
+        kg_context: str,
+    ) -> tuple[list, str, str]:
+        """Build the narration prompt from retrieved context; returns (lore_chunks, system, user)."""
+        lore_chunks, voice_snippets_by_char, style_chunks = retrieved
         system, user, budget_report = _build_prompt(
             state,
             lore_chunks,
@@ -1235,40 +1341,23 @@ class NarratorAgent:
         # Store context_stats in state for later retrieval (if DEV_CONTEXT_STATS enabled)
         if DEV_CONTEXT_STATS:
             state.context_stats = budget_report.to_context_stats()
+        return lore_chunks, system, user
+
+    @staticmethod
+    def _report_llm_failure(state: GameState, error: Exception, agent_name: str) -> None:
+        log_error_with_context(
+            error=error,
+            node_name="narrator",
+            campaign_id=state.campaign_id,
+            turn_number=state.turn_number,
+            agent_name=agent_name,
+            extra_context={"location": state.current_location},
+        )
+        logger.warning("NarratorAgent LLM generation failed, using fallback")
+        add_warning(state, "LLM error: Narrator used fallback output.")
 
-        has_lore = bool(lore_chunks)
-        has_voice = bool(voice_snippets_by_char and any(voice_snippets_by_char.values()))
-
-        if self._llm is not None:
-            try:
-                raw = self._llm.generate(system_prompt=system, user_prompt=user)
-                output = _parse_llm_narration(raw, lore_chunks)
-                cleaned_text = _strip_structural_artifacts(output.text)
-
-                # V2.15: Narrator writes prose only. Strip any suggestions the LLM
-                # may still inject despite the simplified prompt (safety net).
-                cleaned_text = _strip_embedded_suggestions(cleaned_text)
-
-                cleaned_text = _enforce_pov_consistency(cleaned_text)
-                cleaned_text = _truncate_overlong_prose(cleaned_text)
-                output = NarrationOutput(
-                    text=cleaned_text,
-                    citations=output.citations,
-                    embedded_suggestions=None,
-                )
-                return output
-            except Exception as e:
-                log_error_with_context(
-                    error=e,
-                    node_name="narrator",
-                    campaign_id=state.campaign_id,
-                    turn_number=state.turn_number,
-                    agent_name="NarratorAgent.generate",
-                    extra_context={"location": state.current_location},
-                )
-                logger.warning("NarratorAgent LLM generation failed, using fallback")
-                add_warning(state, "LLM error: Narrator used fallback output.")
-        # No LLM or LLM failed: deterministic fallback
+    def _fallback_output(self, state: GameState, lore_chunks: list) -> NarrationOutput:
+        """No LLM or LLM failed: deterministic fallback."""
         # Build a readable narrative fallback (not raw pipeline data)
         mechanic_summary = _summarize_mechanic_events(state)
         loc = _humanize_location(state.current_location) or "your surroundings"
@@ -1365,58 +1454,7 @@ class NarratorAgent:
             yield msg
             return
 
-        # Retrieve lore
-        lore_chunks: list[LoreChunk] = []
-        campaign = state.campaign or {}
-        era = (campaign.get("time_period") or campaign.get("era") or "REBELLION")
-        if isinstance(era, str):
-            era = era.strip() or "REBELLION"
-        else:
-            era = "REBELLION"
-
-        if self._lore_retriever is not None:
-            query = _build_lore_query(state)
-            related_ids = collect_related_npc_ids(state)
-            lore_chunks = call_retriever(
-                self._lore_retriever,
-                query,
-                top_k=6,
-                era=era,
-                related_npcs=related_ids if related_ids else None,
-                warnings=warnings_list,
-            )
-            if related_ids and not lore_chunks:
-                lore_chunks = call_retriever(
-                    self._lore_retriever,
-                    query,
-                    top_k=6,
-                    era=era,
-                    warnings=warnings_list,
-                )
-
-        # Retrieve voice snippets
-        voice_snippets_by_char: dict[str, list] = {}
-        if self._voice_retriever is not None:
-            char_ids = _collect_character_ids(state)
-            if char_ids:
-                raw = call_retriever(self._voice_retriever, char_ids, era, k=6, warnings=warnings_list)
-                for cid, snips in raw.items():
-                    voice_snippets_by_char[cid] = [
-                        {"character_id": s.character_id, "era": s.era, "text": s.text, "chunk_id": s.chunk_id}
-                        if hasattr(s, "text") else s
-                        for s in snips
-                    ]
-
-        # Retrieve style chunks
-        style_chunks: list[dict] = []
-        if self._style_retriever is not None:
-            from backend.app.core.director_validation import build_style_query
-            style_query = build_style_query(state)
-            campaign = getattr(state, "campaign", None) or {}
-            _era_id = campaign.get("time_period") or campaign.get("era") or None
-            _genre = campaign.get("genre") or None
-            _archetype = campaign.get("archetype") or None
-            style_chunks = call_retriever(self._style_retriever, style_query, 3, era_id=_era_id, genre=_genre, archetype=_archetype, warnings=warnings_list)
+        lore_chunks, voice_snippets_by_char, style_chunks = self._retrieve_context(state, warnings_list)
 
         system, user = _build_prompt(
             state,
@@ -1447,47 +1485,54 @@ class NarratorAgent:
         output = self.generate(state, kg_context=kg_context)
         yield output.text
 
+    async def agenerate_stream(self, state: GameState, kg_context: str = "") -> AsyncIterator[str]:
+        """Async :meth:`generate_stream`: tokens come from the LLM's async stream.
+
+        Retrieval runs in a worker thread. Without an async-streaming LLM, or when
+        the stream fails, yields the full text from :meth:`agenerate` instead.
+        """
+        rephrase = _rephrase_output(state)
+        if rephrase is not None:
+            yield rephrase.text
+            return
+
+        lore_chunks, voice_snippets_by_char, style_chunks = await asyncio.to_thread(
+            self._retrieve_context, state, getattr(state, "warnings", None)
+        )
+        system, user = _build_prompt(
+            state,
+            lore_chunks,
+            voice_snippets_by_char,
+            include_budget=False,
+            kg_context=kg_context,
+            style_chunks=style_chunks,
+        )
+
+        if self._llm is not None and hasattr(self._llm, "acomplete_stream"):
+            try:
+                async for token in self._llm.acomplete_stream(system_prompt=system, user_prompt=user):
+                    yield token
+                return
+            except Exception as e:
+                log_error_with_context(
+                    error=e,
+                    node_name="narrator",
+                    campaign_id=state.campaign_id,
+                    turn_number=state.turn_number,
+                    agent_name="NarratorAgent.agenerate_stream",
+                    extra_context={"location": state.current_location},
+                )
+                logger.warning("NarratorAgent streaming failed, using fallback")
+                add_warning(state, "LLM error: Narrator streaming used fallback output.")
+
+        # Fallback (or an LLM without async streaming): full text from agenerate()
+        output = await self.agenerate(state, kg_context=kg_context)
+        yield output.text
+
     def generate_with_correction(self, state: GameState, correction: str, kg_context: str = "") -> NarrationOutput:
         """Re-generate narrative with a correction prompt appended. Used for narrator feedback loop (max 1 retry)."""
         warnings_list = getattr(state, "warnings", None)
-        lore_chunks: list[LoreChunk] = []
-        campaign = state.campaign or {}
-        era = (campaign.get("time_period") or campaign.get("era") or "REBELLION")
-        if isinstance(era, str):
-            era = era.strip() or "REBELLION"
-        else:
-            era = "REBELLION"
-
-        if self._lore_retriever is not None:
-            query = _build_lore_query(state)
-            related_ids = collect_related_npc_ids(state)
-            lore_chunks = call_retriever(
-                self._lore_retriever, query, top_k=6, era=era,
-                related_npcs=related_ids if related_ids else None,
-                warnings=warnings_list,
-            )
-
-        voice_snippets_by_char: dict[str, list] = {}
-        if self._voice_retriever is not None:
-            char_ids = _collect_character_ids(state)
-            if char_ids:
-                raw = call_retriever(self._voice_retriever, char_ids, era, k=6, warnings=warnings_list)
-                for cid, snips in raw.items():
-                    voice_snippets_by_char[cid] = [
-                        {"character_id": s.character_id, "era": s.era, "text": s.text, "chunk_id": s.chunk_id}
-                        if hasattr(s, "text") else s
-                        for s in snips
-                    ]
-
-        style_chunks: list[dict] = []
-        if self._style_retriever is not None:
-            from backend.app.core.director_validation import build_style_query
-            style_query = build_style_query(state)
-            campaign = getattr(state, "campaign", None) or {}
-            _era_id = campaign.get("time_period") or campaign.get("era") or None
-            _genre = campaign.get("genre") or None
-            _archetype = campaign.get("archetype") or None
-            style_chunks = call_retriever(self._style_retriever, style_query, 3, era_id=_era_id, genre=_genre, archetype=_archetype, warnings=warnings_list)
+        lore_chunks, voice_snippets_by_char, style_chunks = self._retrieve_context(state, warnings_list)
 
         system, user, budget_report = _build_prompt(
             state, lore_chunks, voice_snippets_by_char,
@@ -1,16 +1,30 @@
 """NPC introduction throttling: prevent overwhelming the player with too many named NPCs."""
 from __future__ import annotations
 
-import json
 import sqlite3
+from collections.abc import Iterable
 from typing import Any
 
 from backend.app.constants import get_scale_profile
+from backend.app.core.world_state_store import (
+    load_world_state as store_load_world_state,
+    load_world_state_keys,
+    set_world_state_keys,
+)
 
 # Early game: first 60 in-world minutes; cap new NPC introductions at 3
 EARLY_GAME_WINDOW_MINUTES = 60
 EARLY_GAME_NPC_CAP = 3
 
+# world_state keys read by can_introduce_new_npc (the rest of the document is not parsed)
+_THROTTLE_KEYS = (
+    "introduced_npcs",
+    "introduction_log",
+    "last_location_id",
+    "npc_introduction_triggers",
+    "campaign_scale",
+)
+
 
 def get_effective_location(state: dict[str, Any]) -> str | None:
     """Use MOVE event destination if present, else current_location."""
@@ -41,30 +55,15 @@ def _get_world_time_minutes(state: dict[str, Any]) -> int:
     return base + dt
 
 
-def load_world_state(conn: sqlite3.Connection, campaign_id: str) -> dict[str, Any]:
-    """Load world_state_json from campaigns."""
-    cur = conn.execute(
-        "SELECT world_state_json FROM campaigns WHERE id = ?",
-        (campaign_id,),
-    )
-    row = cur.fetchone()
-    if row is None:
-        return {}
-    raw = row[0]
-    if not raw:
-        return {}
-    try:
-        return json.loads(raw) if isinstance(raw, str) else (raw or {})
-    except (TypeError, json.JSONDecodeError):
-        return {}
-
-
-def _save_world_state(conn: sqlite3.Connection, campaign_id: str, world_state: dict[str, Any]) -> None:
-    """Persist world_state_json to campaigns."""
-    conn.execute(
-        "UPDATE campaigns SET world_state_json = ? WHERE id = ?",
-        (json.dumps(world_state), campaign_id),
-    )
+def load_world_state(
+    conn: sqlite3.Connection,
+    campaign_id: str,
+    keys: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Load world_state_json from campaigns ({} if missing). keys: read only those top-level keys."""
+    if keys is not None:
+        return load_world_state_keys(conn, campaign_id, keys) or {}
+    return store_load_world_state(conn, campaign_id) or {}
 
 
 def can_introduce_new_npc(
@@ -79,7 +78,7 @@ def can_introduce_new_npc(
     (c) not in early game, OR
     (d) in early game but under cap (3).
     """
-    world_state = load_world_state(conn, campaign_id)
+    world_state = load_world_state(conn, campaign_id, _THROTTLE_KEYS)
     introduced_npcs = world_state.get("introduced_npcs")
     if not isinstance(introduced_npcs, list):
         introduced_npcs = []
@@ -122,7 +121,7 @@ def record_npc_introduction(
     trigger: str = "spawn",
 ) -> None:
     """Add npc_id to introduced_npcs and append to introduction_log."""
-    world_state = load_world_state(conn, campaign_id)
+    world_state = load_world_state(conn, campaign_id, ("introduced_npcs", "introduction_log"))
     introduced = list(world_state.get("introduced_npcs") or [])
     if npc_id not in introduced:
         introduced.append(npc_id)
@@ -133,9 +132,7 @@ def record_npc_introduction(
         "introduced_at_minutes": world_time,
         "trigger": trigger,
     })
-    world_state["introduced_npcs"] = introduced
-    world_state["introduction_log"] = log
-    _save_world_state(conn, campaign_id, world_state)
+    set_world_state_keys(conn, campaign_id, {"introduced_npcs": introduced, "introduction_log": log})
 
 
 def update_last_location(
@@ -144,15 +141,17 @@ def update_last_location(
     effective_location: str | None,
 ) -> None:
     """Update last_location_id for next-turn comparison. Clear npc_introduction_triggers (single-use)."""
-    world_state = load_world_state(conn, campaign_id)
-    world_state["last_location_id"] = effective_location
-    world_state.pop("npc_introduction_triggers", None)  # Single-use; WorldSim sets fresh each tick
-    _save_world_state(conn, campaign_id, world_state)
+    set_world_state_keys(
+        conn,
+        campaign_id,
+        {"last_location_id": effective_location},
+        remove=("npc_introduction_triggers",),  # Single-use; WorldSim sets fresh each tick
+    )
 
 
 def get_introduced_npc_names(conn: sqlite3.Connection, campaign_id: str) -> list[str]:
     """Return names of already-introduced NPCs for CastingAgent context."""
-    world_state = load_world_state(conn, campaign_id)
+    world_state = load_world_state(conn, campaign_id, ("introduced_npcs",))
     ids = world_state.get("introduced_npcs") or []
     if not ids:
         return []
@@ -197,7 +196,7 @@ def apply_npc_introduction_from_event(
     Apply NPC introduction update to world_state_json (called from CommitNode).
     This is the event-driven version of record_npc_introduction().
     """
-    world_state = load_world_state(conn, campaign_id)
+    world_state = load_world_state(conn, campaign_id, ("introduced_npcs", "introduction_log"))
     introduced = list(world_state.get("introduced_npcs") or [])
     if npc_id not in introduced:
         introduced.append(npc_id)
@@ -207,9 +206,7 @@ def apply_npc_introduction_from_event(
         "introduced_at_minutes": world_time_minutes,
         "trigger": trigger,
     })
-    world_state["introduced_npcs"] = introduced
-    world_state["introduction_log"] = log
-    _save_world_state(conn, campaign_id, world_state)
+    set_world_state_keys(conn, campaign_id, {"introduced_npcs": introduced, "introduction_log": log})
 
 
 def apply_last_location_update_from_event(
@@ -221,7 +218,9 @@ def apply_last_location_update_from_event(
     Apply last location update to world_state_json (called from CommitNode).
     This is the event-driven version of update_last_location().
     """
-    world_state = load_world_state(conn, campaign_id)
-    world_state["last_location_id"] = effective_location
-    world_state.pop("npc_introduction_triggers", None)  # Single-use; WorldSim sets fresh each tick
-    _save_world_state(conn, campaign_id, world_state)
\ No newline at end of file
+    set_world_state_keys(
+        conn,
+        campaign_id,
+        {"last_location_id": effective_location},
+        remove=("npc_introduction_triggers",),  # Single-use; WorldSim sets fresh each tick
+    )
@@ -3,6 +3,13 @@
 V3.0: Hybrid retrieval — vector similarity (when embeddings available) blended
 with keyword-overlap + recency weighting. Graceful fallback to keyword-only
 if sentence-transformers is not installed.
+
+Recall scores a campaign's whole history at once: each campaign keeps an
+in-memory ``_MemoryIndex`` (contiguous float32 embedding matrix plus keyword,
+NPC and location postings) that is loaded once, extended on ``store()`` and
+re-validated against the table on every recall. Embeddings are stored as packed
+float32 BLOBs (or int8 + scale, see STORYTELLER_EPISODIC_EMBEDDING_FORMAT);
+pre-0022 ``embedding_json`` rows are still readable.
 """
 from __future__ import annotations
 
@@ -11,10 +18,26 @@ import logging
 import math
 import re
 import sqlite3
-from typing import Any
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Sequence
+
+from backend.app.config import EPISODIC_EMBEDDING_FORMAT
+from backend.app.constants import EPISODIC_INDEX_MAX_CAMPAIGNS, EPISODIC_RECALL_MIN_SCORE
+from backend.app.db.connection import database_key
+from shared.cache import get_cache_value
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with lancedb / sentence-transformers
+    np = None
 
 logger = logging.getLogger(__name__)
 
+_INDEX_CACHE_KEY = "episodic_memory_index_cache"
+_INDEX_REGISTRY_LOCK = threading.Lock()
+
 # Words too common to be useful keywords
 _STOP_WORDS = frozenset({
     "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
@@ -42,7 +65,7 @@ def _check_embeddings() -> bool:
     if _EMBEDDINGS_AVAILABLE is not None:
         return _EMBEDDINGS_AVAILABLE
     try:
-        from ingestion.embedding import encode  # noqa: F401
+        from backend.app.rag._cache import encode_cached  # noqa: F401
         _EMBEDDINGS_AVAILABLE = True
     except (ImportError, Exception):
         _EMBEDDINGS_AVAILABLE = False
@@ -50,14 +73,27 @@ def _check_embeddings() -> bool:
     return _EMBEDDINGS_AVAILABLE
 
 
-def _embed_text(text: str) -> list[float] | None:
-    """Embed text to a vector. Returns None if embeddings unavailable."""
+def _embed_text(text: str, query: bool = False) -> list[float] | None:
+    """Embed text to a vector. Returns None if embeddings unavailable.
+
+    Uses the same encoder as retrieval (rag._cache.get_encoder, or the shared
+    embedding server), so a worker holds one model rather than two. Only recall
+    queries (``query=True``) go through the query-embedding cache; memory texts
+    being stored are one-off and would just evict real query vectors.
+    """
     if not _check_embeddings():
         return None
     try:
-        from ingestion.embedding import encode
-        vectors = encode(text)
-        return vectors[0] if vectors else None
+        from backend.app.rag._cache import encode_cached, get_encoder
+        from shared.config import EMBEDDING_MODEL
+        if query:
+            vectors = encode_cached([text], EMBEDDING_MODEL)
+            return vectors[0] if vectors else None
+        vectors = get_encoder(EMBEDDING_MODEL).encode([text], show_progress_bar=False)
+        if vectors is None or not len(vectors):
+            return None
+        vec = vectors[0]
+        return vec.tolist() if hasattr(vec, "tolist") else list(vec)
     except Exception as e:
         logger.debug("Episodic memory: embedding failed (non-fatal): %s", e)
         return None
@@ -139,6 +175,224 @@ def _is_pivotal(
     return False
 
 
+# ── Vectorized recall index ──────────────────────────────────────────
+
+def pack_embedding(vec: Sequence[float], fmt: str = "float32") -> tuple[bytes, float | None]:
+    """Pack an embedding for the ``embedding_blob`` column.
+
+    Returns (blob, scale). ``float32`` stores raw float32 bytes and scale None;
+    ``int8`` stores one signed byte per dimension with value = byte * scale.
+    """
+    if fmt == "int8":
+        peak = max((abs(float(x)) for x in vec), default=0.0)
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = array("b", [max(-127, min(127, round(float(x) / scale))) for x in vec])
+        return quantized.tobytes(), scale
+    return array("f", [float(x) for x in vec]).tobytes(), None
+
+
+def unpack_embedding(blob: bytes | None, scale: float | None = None) -> array | None:
+    """Inverse of pack_embedding: float32 array, or None when missing or malformed."""
+    if not blob:
+        return None
+    try:
+        if scale is None:
+            return array("f", bytes(blob))
+        return array("f", [v * scale for v in array("b", bytes(blob))])
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode_embedding(blob: bytes | None, scale: float | None, legacy_json: str | None) -> Sequence[float] | None:
+    """Embedding for a stored row: binary column first, pre-migration JSON text second."""
+    vec = unpack_embedding(blob, scale)
+    if vec is not None or not legacy_json:
+        return vec
+    try:
+        parsed = json.loads(legacy_json)
+    except (TypeError, ValueError):
+        return None
+    return parsed if isinstance(parsed, list) and parsed else None
+
+
+def convert_embedding_json_rows(conn: sqlite3.Connection, fmt: str | None = None, batch_size: int = 500) -> int:
+    """Move legacy ``embedding_json`` vectors into ``embedding_blob``; returns rows converted.
+
+    Converted rows have ``embedding_json`` cleared. Unparseable JSON is left untouched.
+    Caller commits.
+    """
+    fmt = fmt or EPISODIC_EMBEDDING_FORMAT
+    converted = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """SELECT id, embedding_json FROM episodic_memories
+               WHERE id > ? AND embedding_json IS NOT NULL AND embedding_blob IS NULL
+               ORDER BY id LIMIT ?""",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            return converted
+        updates = []
+        for row_id, emb_json in rows:
+            last_id = row_id
+            vec = _decode_embedding(None, None, emb_json)
+            if vec:
+                blob, scale = pack_embedding(vec, fmt)
+                updates.append((blob, scale, row_id))
+        conn.executemany(
+            "UPDATE episodic_memories SET embedding_blob = ?, embedding_scale = ?, embedding_json = NULL WHERE id = ?",
+            updates,
+        )
+        converted += len(updates)
+
+
+def _parse_npcs(npcs_json: str | None) -> set[str]:
+    try:
+        return set(n.lower() for n in json.loads(npcs_json or "[]"))
+    except Exception:
+        return set()
+
+
+class _MemoryIndex:
+    """Recall index for one campaign: row metadata, postings and a float32 embedding matrix.
+
+    Embeddings are L2-normalized on insert so a single matrix-vector product yields
+    cosine similarity for every memory. Keyword/NPC/location overlaps come from
+    postings lists (term -> row indices), so scoring cost in Python is proportional
+    to the query terms, not to the campaign's history.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.rows: list[tuple] = []
+        self.max_id = 0
+        self.emb_storage: str | None = "blob"
+        self.pending: dict[int, tuple[int, str]] = {}  # id -> (turn, keywords) stored but not yet re-read
+        self._turns = np.zeros(64, dtype=np.float64)
+        self._pivotal = np.zeros(64, dtype=np.float64)
+        self._emb: Any = None
+        self._keywords: dict[str, list[int]] = {}
+        self._npcs: dict[str, list[int]] = {}
+        self._locations: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _grow(self, needed: int) -> None:
+        cap = len(self._turns)
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in ("_turns", "_pivotal"):
+            old = getattr(self, name)
+            grown = np.zeros(new_cap, dtype=old.dtype)
+            grown[:cap] = old
+            setattr(self, name, grown)
+        if self._emb is not None:
+            grown = np.zeros((new_cap, self._emb.shape[1]), dtype=np.float32)
+            grown[:cap] = self._emb
+            self._emb = grown
+
+    def append(self, row_id: int, row: tuple, embedding: Sequence[float] | None) -> None:
+        """Add one memory row: (turn, loc, npcs_json, events_json, stress, arc, beat, keywords, pivotal, summary)."""
+        turn_num, loc, npcs_json, _events, _stress, _arc, _beat, kw_str, pivotal, _summary = row
+        i = len(self.rows)
+        self._grow(i + 1)
+        self._turns[i] = turn_num
+        self._pivotal[i] = 1.0 if pivotal else 0.0
+        if embedding:
+            vec = np.asarray(embedding, dtype=np.float32)
+            if self._emb is None:
+                self._emb = np.zeros((len(self._turns), vec.shape[0]), dtype=np.float32)
+            if vec.shape[0] == self._emb.shape[1]:
+                norm = float(np.linalg.norm(vec))
+                if norm > 0:
+                    self._emb[i] = vec / norm
+        for kw in set(kw_str.split()) if kw_str else ():
+            self._keywords.setdefault(kw, []).append(i)
+        for npc in _parse_npcs(npcs_json):
+            self._npcs.setdefault(npc, []).append(i)
+        if loc:
+            self._locations.setdefault(loc.lower(), []).append(i)
+        self.rows.append(row)
+        self.max_id = max(self.max_id, row_id)
+
+    def top(
+        self,
+        current_turn: int,
+        query_keywords: set[str],
+        location_id: str | None,
+        npc_set: set[str],
+        query_embedding: list[float] | None,
+        max_results: int,
+    ) -> list[tuple[float, int]]:
+        """Score every memory and return the best (score, row index) pairs, best first."""
+        n = len(self.rows)
+        if n == 0 or max_results <= 0:
+            return []
+        score = np.zeros(n, dtype=np.float64)
+
+        if query_embedding and self._emb is not None:
+            q = np.asarray(query_embedding, dtype=np.float32)
+            q_norm = float(np.linalg.norm(q))
+            if q.shape[0] == self._emb.shape[1] and q_norm > 0:
+                sims = self._emb[:n] @ (q / q_norm)
+                score += np.maximum(sims, 0.0) * 5.0
+
+        def _bump(postings: dict[str, list[int]], term: str, amount: float) -> None:
+            idx = postings.get(term)
+            if idx:
+                score[idx] += amount
+
+        for kw in query_keywords:
+            _bump(self._keywords, kw, 1.0)
+        score += self._pivotal[:n] * 3.0
+        if location_id:
+            _bump(self._locations, location_id.lower(), 2.0)
+        for npc in npc_set:
+            _bump(self._npcs, npc, 1.0)
+
+        turns = self._turns[:n]
+        score *= 1.0 / (1.0 + np.abs(current_turn - turns) * 0.05)
+
+        candidates = np.flatnonzero(score >= EPISODIC_RECALL_MIN_SCORE)
+        if candidates.size == 0:
+            return []
+        if candidates.size > max_results:
+            part = np.argpartition(-score[candidates], max_results - 1)[:max_results]
+            candidates = candidates[part]
+        # Best score first; ties go to the more recent turn.
+        order = np.lexsort((-turns[candidates], -score[candidates]))
+        return [(float(score[i]), int(i)) for i in candidates[order]]
+
+
+def _memory_dict(record: tuple, score: float) -> dict[str, Any]:
+    """Shape a memory record as returned by ``EpisodicMemory.recall``."""
+    turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal, summary = record
+    try:
+        events = json.loads(events_json or "[]")
+    except Exception:
+        events = []
+    return {
+        "turn_number": turn_num,
+        "location_id": loc,
+        "npcs_present": list(_parse_npcs(npcs_json)),
+        "key_events": events,
+        "stress_level": stress,
+        "arc_stage": arc,
+        "hero_beat": beat,
+        "keywords": list(set(kw_str.split()) if kw_str else set()),
+        "is_pivotal": bool(pivotal),
+        "relevance_score": round(score, 2),
+        "narrative_summary": summary or "",
+    }
+
+
+def _index_registry() -> OrderedDict:
+    return get_cache_value(_INDEX_CACHE_KEY, OrderedDict)
+
+
 class EpisodicMemory:
     """Store and recall episodic memories for a campaign.
 
@@ -151,13 +405,21 @@ class EpisodicMemory:
         self._campaign_id = campaign_id
 
     def _has_embedding_column(self) -> bool:
-        """Check if the embedding_json column exists (migration may not have run)."""
+        """Check if embeddings can be stored (migration 0021 may not have run)."""
+        return self._embedding_storage() is not None
+
+    def _embedding_storage(self) -> str | None:
+        """How embeddings are stored: "blob" (0022+), "json" (0021 only) or None (no column)."""
         try:
             cursor = self._conn.execute("PRAGMA table_info(episodic_memories)")
             columns = {row[1] for row in cursor.fetchall()}
-            return "embedding_json" in columns
         except Exception:
-            return False
+            return None
+        if "embedding_blob" in columns:
+            return "blob"
+        if "embedding_json" in columns:
+            return "json"
+        return None
 
     def store(
         self,
@@ -189,13 +451,39 @@ class EpisodicMemory:
         pivotal = _is_pivotal(key_events, arc_stage, prev_arc_stage, stress_level)
 
         # V3.0: Compute embedding and summary
-        has_emb_col = self._has_embedding_column()
-        embedding = _embed_text(combined_text) if has_emb_col else None
-        summary = _summarize_narrative(narrative_text) if has_emb_col else ""
+        emb_storage = self._embedding_storage()
+        embedding = _embed_text(combined_text) if emb_storage else None
+        summary = _summarize_narrative(narrative_text) if emb_storage else ""
 
         try:
-            if has_emb_col:
-                self._conn.execute(
+            if emb_storage == "blob":
+                blob, scale = pack_embedding(embedding, EPISODIC_EMBEDDING_FORMAT) if embedding else (None, None)
+                cursor = self._conn.execute(
+                    """INSERT INTO episodic_memories
+                       (campaign_id, turn_number, location_id, npcs_present_json,
+                        key_events_json, stress_level, arc_stage, hero_beat,
+                        keywords, is_pivotal, embedding_blob, embedding_scale, narrative_summary)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        self._campaign_id,
+                        turn_number,
+                        location_id,
+                        json.dumps(npcs_present),
+                        json.dumps(key_events[:10]),  # Cap stored events
+                        stress_level,
+                        arc_stage,
+                        hero_beat,
+                        keywords_str,
+                        1 if pivotal else 0,
+                        blob,
+                        scale,
+                        summary,
+                    ),
+                )
+                # Index what recall will read back (quantization included).
+                embedding = unpack_embedding(blob, scale)
+            elif emb_storage:
+                cursor = self._conn.execute(
                     """INSERT INTO episodic_memories
                        (campaign_id, turn_number, location_id, npcs_present_json,
                         key_events_json, stress_level, arc_stage, hero_beat,
@@ -217,7 +505,7 @@ class EpisodicMemory:
                     ),
                 )
             else:
-                self._conn.execute(
+                cursor = self._conn.execute(
                     """INSERT INTO episodic_memories
                        (campaign_id, turn_number, location_id, npcs_present_json,
                         key_events_json, stress_level, arc_stage, hero_beat,
@@ -238,6 +526,13 @@ class EpisodicMemory:
                 )
         except Exception as e:
             logger.warning("Failed to store episodic memory (non-fatal): %s", e)
+            return
+
+        record = (
+            turn_number, location_id, json.dumps(npcs_present), json.dumps(key_events[:10]),
+            stress_level, arc_stage, hero_beat, keywords_str, 1 if pivotal else 0, summary,
+        )
+        self._index_stored(cursor.lastrowid, record, embedding, emb_storage)
 
     def recall(
         self,
@@ -246,6 +541,7 @@ class EpisodicMemory:
         location_id: str | None = None,
         npcs: list[str] | None = None,
         max_results: int = 5,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """Recall relevant episodic memories using hybrid scoring.
 
@@ -257,116 +553,223 @@ class EpisodicMemory:
         - NPC overlap: +1 per shared NPC
         - Recency decay: score * (1 / (1 + distance * 0.05))
 
+        Every memory in the campaign is scored (one matrix-vector product over the
+        cached embedding matrix); without numpy only the latest 100 turns are scanned.
         Falls back to keyword-only scoring if embeddings unavailable.
+        query_embedding: precomputed vector for query_text (e.g. from the turn's
+        batched query embeddings); computed here when omitted.
         """
-        has_emb_col = self._has_embedding_column()
+        emb_storage = self._embedding_storage()
+        query_keywords = set(_extract_keywords(query_text))
+        npc_set = set(n.lower() for n in (npcs or []))
+
+        if np is None:
+            rows = self._fetch_rows(emb_storage, latest=100)
+            if rows is None or not rows:
+                return []
+            index = None
+        else:
+            index = self._get_index(emb_storage)
+            if index is None or not len(index):
+                return []
+
+        # V3.0: Compute query embedding for vector similarity
+        if not emb_storage:
+            query_embedding = None
+        elif query_embedding is None and query_text:
+            query_embedding = _embed_text(query_text, query=True)
+
+        if index is None:
+            return self._scan_rows(
+                [self._split_row(r, emb_storage) for r in rows],
+                query_keywords, current_turn, location_id, npc_set, query_embedding, max_results,
+            )
+
+        with index.lock:
+            ranked = index.top(current_turn, query_keywords, location_id, npc_set, query_embedding, max_results)
+            return [_memory_dict(index.rows[i], score) for score, i in ranked]
+
+    # ── Row access / index maintenance ───────────────────────────────
+
+    def _fetch_rows(self, emb_storage: str | None, after_id: int = 0, latest: int | None = None) -> list | None:
+        """Fetch memory rows for this campaign (ascending id, or newest ``latest`` turns)."""
         select_cols = (
-            "turn_number, location_id, npcs_present_json, "
+            "id, turn_number, location_id, npcs_present_json, "
             "key_events_json, stress_level, arc_stage, "
             "hero_beat, keywords, is_pivotal"
         )
-        if has_emb_col:
+        if emb_storage == "blob":
+            select_cols += ", embedding_blob, embedding_scale, embedding_json, narrative_summary"
+        elif emb_storage:
             select_cols += ", embedding_json, narrative_summary"
-
         try:
-            rows = self._conn.execute(
+            if latest is not None:
+                return self._conn.execute(
+                    f"""SELECT {select_cols}
+                       FROM episodic_memories
+                       WHERE campaign_id = ?
+                       ORDER BY turn_number DESC
+                       LIMIT ?""",
+                    (self._campaign_id, latest),
+                ).fetchall()
+            return self._conn.execute(
                 f"""SELECT {select_cols}
                    FROM episodic_memories
-                   WHERE campaign_id = ?
-                   ORDER BY turn_number DESC
-                   LIMIT 100""",
-                (self._campaign_id,),
+                   WHERE campaign_id = ? AND id > ?
+                   ORDER BY id""",
+                (self._campaign_id, after_id),
             ).fetchall()
         except Exception as e:
             logger.warning("Failed to recall episodic memories (non-fatal): %s", e)
-            return []
+            return None
+
+    @staticmethod
+    def _split_row(row: Any, emb_storage: str | None) -> tuple[int, tuple, Sequence[float] | None]:
+        """Split a fetched row into (id, memory record, embedding)."""
+        blob = scale = emb_json = None
+        if emb_storage == "blob":
+            row_id, turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal, blob, scale, emb_json, summary = row
+        elif emb_storage:
+            row_id, turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal, emb_json, summary = row
+        else:
+            row_id, turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal = row
+            summary = ""
+        record = (turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal, summary or "")
+        return row_id, record, _decode_embedding(blob, scale, emb_json)
+
+    def _build_index(self, emb_storage: str | None) -> _MemoryIndex | None:
+        rows = self._fetch_rows(emb_storage)
+        if rows is None:
+            return None
+        index = _MemoryIndex()
+        index.emb_storage = emb_storage
+        for row in rows:
+            index.append(*self._split_row(row, emb_storage))
+        return index
 
-        if not rows:
-            return []
+    def _sync_index(self, index: _MemoryIndex, emb_storage: str | None) -> bool:
+        """Bring a cached index up to date with the table. False means it must be rebuilt.
 
-        query_keywords = set(_extract_keywords(query_text))
-        npc_set = set(n.lower() for n in (npcs or []))
+        Rows appended by ``store()`` are confirmed once (they may have been rolled
+        back); rows written elsewhere since the last sync are appended incrementally.
+        Deletions or anything else unexpected force a rebuild.
+        """
+        if index.emb_storage != emb_storage:
+            return False
+        try:
+            if index.pending:
+                ids = list(index.pending)
+                placeholders = ", ".join("?" for _ in ids)
+                found = {
+                    r[0]: (r[1], r[2])
+                    for r in self._conn.execute(
+                        f"SELECT id, turn_number, keywords FROM episodic_memories WHERE id IN ({placeholders})",
+                        ids,
+                    ).fetchall()
+                }
+                if any(found.get(i) != index.pending[i] for i in ids):
+                    return False
+                index.pending.clear()
+            count, max_id = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM episodic_memories WHERE campaign_id = ?",
+                (self._campaign_id,),
+            ).fetchone()
+        except Exception as e:
+            logger.debug("Episodic index check failed, rebuilding: %s", e)
+            return False
+        if count == len(index) and max_id == index.max_id:
+            return True
+        if count < len(index) or max_id < index.max_id:
+            return False
+        rows = self._fetch_rows(emb_storage, after_id=index.max_id)
+        if rows is None or len(index) + len(rows) != count:
+            return False
+        for row in rows:
+            index.append(*self._split_row(row, emb_storage))
+        return True
 
-        # V3.0: Compute query embedding for vector similarity
-        query_embedding: list[float] | None = None
-        if has_emb_col and query_text:
-            query_embedding = _embed_text(query_text)
+    def _get_index(self, emb_storage: str | None) -> _MemoryIndex | None:
+        """Return an up-to-date recall index for this campaign.
 
+        File-backed databases share one cached index per (database, campaign) across
+        connections; in-memory databases get a fresh index per call.
+        """
+        db_key = database_key(self._conn)
+        if db_key is None:
+            return self._build_index(emb_storage)
+        key = (db_key, self._campaign_id)
+        with _INDEX_REGISTRY_LOCK:
+            registry = _index_registry()
+            index = registry.get(key)
+            if index is not None:
+                registry.move_to_end(key)
+        if index is not None:
+            with index.lock:
+                if self._sync_index(index, emb_storage):
+                    return index
+        index = self._build_index(emb_storage)
+        if index is None:
+            return None
+        with _INDEX_REGISTRY_LOCK:
+            registry = _index_registry()
+            registry[key] = index
+            registry.move_to_end(key)
+            while len(registry) > EPISODIC_INDEX_MAX_CAMPAIGNS:
+                registry.popitem(last=False)
+        return index
+
+    def _index_stored(self, row_id: int | None, record: tuple, embedding: Sequence[float] | None, emb_storage: str | None) -> None:
+        """Append a just-inserted row to the cached index, if one is loaded for this campaign."""
+        if np is None or not row_id:
+            return
+        db_key = database_key(self._conn)
+        if db_key is None:
+            return
+        with _INDEX_REGISTRY_LOCK:
+            index = _index_registry().get((db_key, self._campaign_id))
+        if index is None:
+            return
+        with index.lock:
+            if index.emb_storage != emb_storage or row_id <= index.max_id:
+                return
+            index.append(row_id, record, embedding)
+            index.pending[row_id] = (record[0], record[7])
+
+    @staticmethod
+    def _scan_rows(
+        rows: list[tuple[int, tuple, Sequence[float] | None]],
+        query_keywords: set[str],
+        current_turn: int,
+        location_id: str | None,
+        npc_set: set[str],
+        query_embedding: list[float] | None,
+        max_results: int,
+    ) -> list[dict[str, Any]]:
+        """Pure-Python scoring loop, used when numpy is not installed."""
         scored: list[tuple[float, dict]] = []
-        for row in rows:
-            if has_emb_col:
-                turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal, emb_json, summary = row
-            else:
-                turn_num, loc, npcs_json, events_json, stress, arc, beat, kw_str, pivotal = row
-                emb_json = None
-                summary = ""
-
+        for _row_id, record, mem_embedding in rows:
+            turn_num, loc, npcs_json, _events, _stress, _arc, _beat, kw_str, pivotal, _summary = record
             mem_keywords = set(kw_str.split()) if kw_str else set()
-            mem_npcs = set()
-            try:
-                mem_npcs = set(n.lower() for n in json.loads(npcs_json or "[]"))
-            except Exception:
-                pass
+            mem_npcs = _parse_npcs(npcs_json)
 
-            # Score calculation
             score = 0.0
-
-            # V3.0: Vector similarity (primary signal when available)
-            if query_embedding and emb_json:
-                try:
-                    mem_embedding = json.loads(emb_json)
-                    sim = _cosine_similarity(query_embedding, mem_embedding)
-                    score += max(0.0, sim) * 5.0  # Scale to make it dominant signal
-                except Exception:
-                    pass
-
-            # Keyword overlap (secondary signal)
+            if query_embedding and mem_embedding:
+                score += max(0.0, _cosine_similarity(query_embedding, mem_embedding)) * 5.0
             if query_keywords:
-                overlap = len(query_keywords & mem_keywords)
-                score += overlap
-
-            # Pivotal bonus
+                score += len(query_keywords & mem_keywords)
             if pivotal:
                 score += 3.0
-
-            # Location match
             if location_id and loc and location_id.lower() == loc.lower():
                 score += 2.0
-
-            # NPC overlap
             if npc_set:
-                npc_overlap = len(npc_set & mem_npcs)
-                score += npc_overlap
+                score += len(npc_set & mem_npcs)
 
-            # Recency decay
             distance = abs(current_turn - turn_num)
-            recency_factor = 1.0 / (1.0 + distance * 0.05)
-            score *= recency_factor
-
-            # Minimum relevance threshold
-            if score < 0.5:
+            score *= 1.0 / (1.0 + distance * 0.05)
+            if score < EPISODIC_RECALL_MIN_SCORE:
                 continue
+            scored.append((score, _memory_dict(record, score)))
 
-            try:
-                events = json.loads(events_json or "[]")
-            except Exception:
-                events = []
-
-            scored.append((score, {
-                "turn_number": turn_num,
-                "location_id": loc,
-                "npcs_present": list(mem_npcs),
-                "key_events": events,
-                "stress_level": stress,
-                "arc_stage": arc,
-                "hero_beat": beat,
-                "keywords": list(mem_keywords),
-                "is_pivotal": bool(pivotal),
-                "relevance_score": round(score, 2),
-                "narrative_summary": summary or "",
-            }))
-
-        # Sort by score descending, return top results
         scored.sort(key=lambda x: x[0], reverse=True)
         return [item[1] for item in scored[:max_results]]
 
@@ -6,6 +6,7 @@ import os
 import sqlite3
 from typing import Any
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 from backend.app.models.state import GameState
 from backend.app.core.nodes import dict_to_state, state_to_dict
@@ -27,6 +28,14 @@ from backend.app.core.nodes.commit import make_commit_node
 _COMPILED_GRAPH: Any = None
 
 
+def _node(fn: Any) -> Any:
+    """Node callable for add_node; pairs it with its ``async_impl`` (if any) for ainvoke."""
+    async_impl = getattr(fn, "async_impl", None)
+    if async_impl is None:
+        return fn
+    return RunnableLambda(fn, afunc=async_impl)
+
+
 def build_graph() -> StateGraph:
     """Build the LangGraph pipeline (connection-agnostic).
 
@@ -49,7 +58,7 @@ def build_graph() -> StateGraph:
     graph.add_node("arc_planner", arc_planner_node)
     graph.add_node("scene_frame", scene_frame_node)
     graph.add_node("director", make_director_node())
-    graph.add_node("narrator", make_narrator_node())
+    graph.add_node("narrator", _node(make_narrator_node()))
     graph.add_node("narrative_validator", narrative_validator_node)
     graph.add_node("suggestion_refiner", make_suggestion_refiner_node())
     graph.add_node("commit", make_commit_node())
@@ -102,18 +111,28 @@ def run_turn(conn: sqlite3.Connection, state: GameState) -> GameState:
     need it (encounter, world_sim, commit) can read it at invocation time without the graph
     capturing a stale connection in closures. This key is a non-serializable runtime handle and
     MUST NOT be persisted or checkpointed. It is stripped from the result before converting back
-    to GameState.
+    to GameState. ``__runtime_query_embeddings`` (the turn's batched query vectors) follows the
+    same rules. ``retrieval_cache`` on the result holds this turn's retrieval cache hits/misses.
     """
     import logging
     import time
 
+    from backend.app.rag.context_bundles import track_turn_versions
+    from backend.app.rag.query_embeddings import RUNTIME_STATE_KEY, TurnQueryEmbeddings
+    from backend.app.rag.retrieval_cache import summarize, track_turn
+
     _logger = logging.getLogger(__name__)
     initial = state_to_dict(state)
     initial["__runtime_conn"] = conn
+    initial[RUNTIME_STATE_KEY] = TurnQueryEmbeddings()
+    cache_counters = track_turn()
+    track_turn_versions()
     t0 = time.monotonic()
     result = _get_compiled_graph().invoke(initial)
     elapsed = time.monotonic() - t0
     result.pop("__runtime_conn", None)
+    result.pop(RUNTIME_STATE_KEY, None)
+    result["retrieval_cache"] = summarize(cache_counters)
     _logger.info(
         "Turn completed in %.2fs (campaign=%s, turn=%d, intent=%s)",
         elapsed,
@@ -122,3 +141,40 @@ def run_turn(conn: sqlite3.Connection, state: GameState) -> GameState:
         state.intent or "unknown",
     )
     return dict_to_state(result)
+
+
+async def arun_turn(conn: sqlite3.Connection, state: GameState) -> GameState:
+    """Async :func:`run_turn` via ``ainvoke`` (same runtime keys and result).
+
+    Nodes with an async implementation (Narrator) await their LLM call on the event
+    loop; sync nodes run in LangGraph's executor threads. ``conn`` is therefore
+    used from more than one thread (never concurrently) and must be opened with
+    ``check_same_thread=False``.
+    """
+    import logging
+    import time
+
+    from backend.app.rag.context_bundles import track_turn_versions
+    from backend.app.rag.query_embeddings import RUNTIME_STATE_KEY, TurnQueryEmbeddings
+    from backend.app.rag.retrieval_cache import summarize, track_turn
+
+    _logger = logging.getLogger(__name__)
+    initial = state_to_dict(state)
+    initial["__runtime_conn"] = conn
+    initial[RUNTIME_STATE_KEY] = TurnQueryEmbeddings()
+    cache_counters = track_turn()
+    track_turn_versions()
+    t0 = time.monotonic()
+    result = await _get_compiled_graph().ainvoke(initial)
+    elapsed = time.monotonic() - t0
+    result.pop("__runtime_conn", None)
+    result.pop(RUNTIME_STATE_KEY, None)
+    result["retrieval_cache"] = summarize(cache_counters)
+    _logger.info(
+        "Turn completed in %.2fs (campaign=%s, turn=%d, intent=%s, mode=async)",
+        elapsed,
+        state.campaign_id or "unknown",
+        state.turn_number or 0,
+        state.intent or "unknown",
+    )
+    return dict_to_state(result)
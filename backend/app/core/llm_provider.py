@@ -10,7 +10,7 @@ from __future__ import annotations
 import json as _json
 import logging
 import os
-from typing import Any, Dict, Iterator, Optional, Protocol, runtime_checkable
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Protocol, runtime_checkable
 
 import httpx
 
@@ -35,90 +35,163 @@ class LLMProviderProtocol(Protocol):
         """Stream tokens. Yields individual token strings."""
         ...
 
+# Providers may also offer ``acomplete`` / ``acomplete_stream`` (async twins of the
+# methods above). AgentLLM uses them when present and otherwise runs the sync call
+# in a worker thread.
 
-class AnthropicClient:
-    """Client for Anthropic's Messages API (Claude models).
 
-    Requires ANTHROPIC_API_KEY environment variable or api_key parameter.
+class _HTTPProvider:
+    """Shared sync/async HTTP plumbing for cloud providers.
+
+    Subclasses build the request (``_request``), extract text from a JSON body
+    (``_parse_body``) and from one SSE line (``_parse_stream_line``). The async
+    methods use a lazily created ``httpx.AsyncClient`` so an awaiting turn does
+    not hold a worker thread for the round-trip.
     """
 
-    def __init__(
-        self,
-        model: str = "claude-sonnet-4-5-20250929",
-        api_key: str | None = None,
-        base_url: str | None = None,
-        max_tokens: int = 4096,
-        timeout: float | None = None,
-    ):
-        self.model = model
-        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
-        self.base_url = (base_url or "https://api.anthropic.com").rstrip("/")
-        self.max_tokens = max_tokens
+    _label = "LLM"
+
+    def __init__(self, timeout: float | None = None) -> None:
         self._timeout = timeout or _DEFAULT_TIMEOUT
         self.client = httpx.Client(timeout=self._timeout)
+        self._async_client: httpx.AsyncClient | None = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self._timeout)
+        return self._async_client
 
     def close(self) -> None:
         self.client.close()
 
+    async def aclose(self) -> None:
+        self.client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def __enter__(self):
         return self
 
     def __exit__(self, *exc_info):
         self.close()
 
-    def complete(self, prompt: str, system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
-        """Call Anthropic Messages API."""
-        if not self.api_key:
-            raise LLMProviderError("ANTHROPIC_API_KEY not set")
+    # -- subclass hooks --------------------------------------------------
 
-        messages = [{"role": "user", "content": prompt}]
-        payload: Dict[str, Any] = {
-            "model": self.model,
-            "max_tokens": self.max_tokens,
-            "messages": messages,
-        }
-        if system_prompt:
-            payload["system"] = system_prompt
+    def _request(
+        self, prompt: str, system_prompt: Optional[str], json_mode: bool, stream: bool,
+    ) -> tuple[str, Dict[str, Any], Dict[str, str]]:
+        raise NotImplementedError
 
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": "2023-06-01",
-            "content-type": "application/json",
-        }
+    def _parse_body(self, body: Dict[str, Any]) -> str:
+        raise NotImplementedError
 
-        try:
-            response = self.client.post(
-                f"{self.base_url}/v1/messages",
-                json=payload,
-                headers=headers,
+    def _parse_stream_line(self, line: str) -> tuple[str, bool]:
+        raise NotImplementedError
+
+    # -- error mapping ---------------------------------------------------
+
+    def _request_error(self, exc: httpx.HTTPError) -> LLMProviderError:
+        if isinstance(exc, httpx.TimeoutException):
+            return LLMProviderError(f"{self._label} request timed out")
+        if isinstance(exc, httpx.ConnectError):
+            return LLMProviderError(f"Cannot connect to {self._label} API at {self.base_url}")
+        if isinstance(exc, httpx.HTTPStatusError):
+            return LLMProviderError(
+                f"{self._label} HTTP error {exc.response.status_code}: {exc.response.text[:500]}"
             )
-            response.raise_for_status()
-        except httpx.TimeoutException as exc:
-            raise LLMProviderError(f"Anthropic request timed out") from exc
-        except httpx.ConnectError as exc:
-            raise LLMProviderError(f"Cannot connect to Anthropic API at {self.base_url}") from exc
-        except httpx.HTTPStatusError as exc:
-            raise LLMProviderError(
-                f"Anthropic HTTP error {exc.response.status_code}: {exc.response.text[:500]}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            raise LLMProviderError(f"Anthropic network error: {exc}") from exc
+        return LLMProviderError(f"{self._label} network error: {exc}")
+
+    def _stream_error(self, exc: httpx.HTTPError) -> LLMProviderError:
+        if isinstance(exc, httpx.TimeoutException):
+            return LLMProviderError(f"{self._label} stream timed out")
+        return LLMProviderError(f"{self._label} stream error: {exc}")
 
+    def _body_text(self, response: httpx.Response) -> str:
         try:
             body = response.json()
         except _json.JSONDecodeError as exc:
-            raise LLMProviderError("Anthropic returned non-JSON response") from exc
+            raise LLMProviderError(f"{self._label} returned non-JSON response") from exc
+        return self._parse_body(body)
 
-        # Extract text from content blocks
-        content = body.get("content", [])
-        text_parts = []
-        for block in content:
-            if isinstance(block, dict) and block.get("type") == "text":
-                text_parts.append(block.get("text", ""))
-        return "".join(text_parts)
+    # -- sync ------------------------------------------------------------
+
+    def complete(self, prompt: str, system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
+        url, payload, headers = self._request(prompt, system_prompt, json_mode, stream=False)
+        try:
+            response = self.client.post(url, json=payload, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise self._request_error(exc) from exc
+        return self._body_text(response)
 
     def complete_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
-        """Stream tokens from Anthropic SSE API."""
+        url, payload, headers = self._request(prompt, system_prompt, False, stream=True)
+        try:
+            with self.client.stream("POST", url, json=payload, headers=headers, timeout=self._timeout) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    text, stop = self._parse_stream_line(line)
+                    if text:
+                        yield text
+                    if stop:
+                        break
+        except httpx.HTTPError as exc:
+            raise self._stream_error(exc) from exc
+
+    # -- async -----------------------------------------------------------
+
+    async def acomplete(self, prompt: str, system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
+        url, payload, headers = self._request(prompt, system_prompt, json_mode, stream=False)
+        try:
+            response = await self.async_client.post(url, json=payload, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise self._request_error(exc) from exc
+        return self._body_text(response)
+
+    async def acomplete_stream(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        url, payload, headers = self._request(prompt, system_prompt, False, stream=True)
+        try:
+            async with self.async_client.stream(
+                "POST", url, json=payload, headers=headers, timeout=self._timeout,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    text, stop = self._parse_stream_line(line)
+                    if text:
+                        yield text
+                    if stop:
+                        break
+        except httpx.HTTPError as exc:
+            raise self._stream_error(exc) from exc
+
+
+class AnthropicClient(_HTTPProvider):
+    """Client for Anthropic's Messages API (Claude models).
+
+    Requires ANTHROPIC_API_KEY environment variable or api_key parameter.
+    """
+
+    _label = "Anthropic"
+
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-5-20250929",
+        api_key: str | None = None,
+        base_url: str | None = None,
+        max_tokens: int = 4096,
+        timeout: float | None = None,
+    ):
+        super().__init__(timeout)
+        self.model = model
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        self.base_url = (base_url or "https://api.anthropic.com").rstrip("/")
+        self.max_tokens = max_tokens
+
+    def _request(self, prompt, system_prompt, json_mode, stream):
+        """Build a Messages API request."""
         if not self.api_key:
             raise LLMProviderError("ANTHROPIC_API_KEY not set")
 
@@ -127,8 +200,9 @@ class AnthropicClient:
             "model": self.model,
             "max_tokens": self.max_tokens,
             "messages": messages,
-            "stream": True,
         }
+        if stream:
+            payload["stream"] = True
         if system_prompt:
             payload["system"] = system_prompt
 
@@ -137,47 +211,45 @@ class AnthropicClient:
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
+        return f"{self.base_url}/v1/messages", payload, headers
 
-        try:
-            with self.client.stream(
-                "POST",
-                f"{self.base_url}/v1/messages",
-                json=payload,
-                headers=headers,
-                timeout=self._timeout,
-            ) as response:
-                response.raise_for_status()
-                for line in response.iter_lines():
-                    if not line or not line.startswith("data: "):
-                        continue
-                    data_str = line[6:]  # Strip "data: " prefix
-                    if data_str.strip() == "[DONE]":
-                        break
-                    try:
-                        data = _json.loads(data_str)
-                    except _json.JSONDecodeError:
-                        continue
-                    if data.get("type") == "content_block_delta":
-                        delta = data.get("delta", {})
-                        if delta.get("type") == "text_delta":
-                            text = delta.get("text", "")
-                            if text:
-                                yield text
-                    elif data.get("type") == "message_stop":
-                        break
-        except httpx.TimeoutException as exc:
-            raise LLMProviderError("Anthropic stream timed out") from exc
-        except httpx.HTTPError as exc:
-            raise LLMProviderError(f"Anthropic stream error: {exc}") from exc
-
+    def _parse_body(self, body):
+        # Extract text from content blocks
+        content = body.get("content", [])
+        text_parts = []
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "text":
+                text_parts.append(block.get("text", ""))
+        return "".join(text_parts)
 
-class OpenAICompatClient:
+    def _parse_stream_line(self, line):
+        if not line or not line.startswith("data: "):
+            return "", False
+        data_str = line[6:]  # Strip "data: " prefix
+        if data_str.strip() == "[DONE]":
+            return "", True
+        try:
+            data = _json.loads(data_str)
+        except _json.JSONDecodeError:
+            return "", False
+        if data.get("type") == "content_block_delta":
+            delta = data.get("delta", {})
+            if delta.get("type") == "text_delta":
+                return delta.get("text", ""), False
+        elif data.get("type") == "message_stop":
+            return "", True
+        return "", False
+
+
+class OpenAICompatClient(_HTTPProvider):
     """Client for OpenAI-compatible APIs (OpenAI, local servers, etc.).
 
     Requires OPENAI_API_KEY environment variable or api_key parameter.
     Works with any OpenAI-compatible endpoint (OpenRouter, Together, vLLM, etc.).
     """
 
+    _label = "OpenAI-compatible"
+
     def __init__(
         self,
         model: str = "gpt-4o",
@@ -186,24 +258,14 @@ class OpenAICompatClient:
         max_tokens: int = 4096,
         timeout: float | None = None,
     ):
+        super().__init__(timeout)
         self.model = model
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
         self.base_url = (base_url or "https://api.openai.com").rstrip("/")
         self.max_tokens = max_tokens
-        self._timeout = timeout or _DEFAULT_TIMEOUT
-        self.client = httpx.Client(timeout=self._timeout)
-
-    def close(self) -> None:
-        self.client.close()
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *exc_info):
-        self.close()
-
-    def complete(self, prompt: str, system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
-        """Call OpenAI-compatible chat completions API."""
+    def _request(self, prompt, system_prompt, json_mode, stream):
+        """Build a chat completions request."""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -214,88 +276,37 @@ class OpenAICompatClient:
             "messages": messages,
             "max_tokens": self.max_tokens,
         }
-        if json_mode:
+        if stream:
+            payload["stream"] = True
+        elif json_mode:
             payload["response_format"] = {"type": "json_object"}
 
         headers: Dict[str, str] = {"content-type": "application/json"}
         if self.api_key:
             headers["authorization"] = f"Bearer {self.api_key}"
+        return f"{self.base_url}/v1/chat/completions", payload, headers
 
-        try:
-            response = self.client.post(
-                f"{self.base_url}/v1/chat/completions",
-                json=payload,
-                headers=headers,
-            )
-            response.raise_for_status()
-        except httpx.TimeoutException as exc:
-            raise LLMProviderError("OpenAI-compatible request timed out") from exc
-        except httpx.ConnectError as exc:
-            raise LLMProviderError(f"Cannot connect to OpenAI-compatible API at {self.base_url}") from exc
-        except httpx.HTTPStatusError as exc:
-            raise LLMProviderError(
-                f"OpenAI-compatible HTTP error {exc.response.status_code}: {exc.response.text[:500]}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            raise LLMProviderError(f"OpenAI-compatible network error: {exc}") from exc
-
-        try:
-            body = response.json()
-        except _json.JSONDecodeError as exc:
-            raise LLMProviderError("OpenAI-compatible returned non-JSON response") from exc
-
+    def _parse_body(self, body):
         choices = body.get("choices", [])
         if not choices:
             return ""
         return choices[0].get("message", {}).get("content", "")
 
-    def complete_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
-        """Stream tokens from OpenAI-compatible SSE API."""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload: Dict[str, Any] = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "stream": True,
-        }
-
-        headers: Dict[str, str] = {"content-type": "application/json"}
-        if self.api_key:
-            headers["authorization"] = f"Bearer {self.api_key}"
-
+    def _parse_stream_line(self, line):
+        if not line or not line.startswith("data: "):
+            return "", False
+        data_str = line[6:]
+        if data_str.strip() == "[DONE]":
+            return "", True
         try:
-            with self.client.stream(
-                "POST",
-                f"{self.base_url}/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=self._timeout,
-            ) as response:
-                response.raise_for_status()
-                for line in response.iter_lines():
-                    if not line or not line.startswith("data: "):
-                        continue
-                    data_str = line[6:]
-                    if data_str.strip() == "[DONE]":
-                        break
-                    try:
-                        data = _json.loads(data_str)
-                    except _json.JSONDecodeError:
-                        continue
-                    choices = data.get("choices", [])
-                    if choices:
-                        delta = choices[0].get("delta", {})
-                        content = delta.get("content", "")
-                        if content:
-                            yield content
-        except httpx.TimeoutException as exc:
-            raise LLMProviderError("OpenAI-compatible stream timed out") from exc
-        except httpx.HTTPError as exc:
-            raise LLMProviderError(f"OpenAI-compatible stream error: {exc}") from exc
+            data = _json.loads(data_str)
+        except _json.JSONDecodeError:
+            return "", False
+        choices = data.get("choices", [])
+        if choices:
+            delta = choices[0].get("delta", {})
+            return delta.get("content", "") or "", False
+        return "", False
 
 
 def create_provider(
@@ -1,18 +1,16 @@
 """Commit node factory (DB writes)."""
 from __future__ import annotations
 
-import json
 import logging
 import sqlite3
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
 from backend.app.core.error_handling import log_error_with_context
 from backend.app.core.event_store import append_events, reserve_next_turn_number
 from backend.app.core.projections import apply_projection
-from backend.app.core.state_loader import build_initial_gamestate, load_turn_history
+from backend.app.core.state_loader import build_initial_gamestate
 from backend.app.core.transcript_store import write_rendered_turn
+from backend.app.core.world_state_store import load_world_state, save_world_state
 from backend.app.core.ledger import update_ledger, update_era_summaries
 from backend.app.constants import MEMORY_COMPRESSION_CHUNK_SIZE
 from backend.app.core.story_position import advance_story_position
@@ -30,6 +28,8 @@ from backend.app.models.dialogue_turn import (
 from backend.app.models.events import Event
 from backend.app.models.event_utils import ensure_event
 
+logger = logging.getLogger(__name__)
+
 
 def make_commit_node():
     """Commit node: all DB writes happen here. Reads conn from state['__runtime_conn']."""
@@ -326,10 +326,8 @@ def make_commit_node():
             except Exception as _story_pos_err:
                 logger.warning("Story-position advance failed (non-fatal): %s", _story_pos_err)
 
-            conn.execute(
-                "UPDATE campaigns SET world_state_json = ? WHERE id = ?",
-                (json.dumps(world_state), campaign_id),
-            )
+            # Write only the keys this turn changed (diffed against the stored document).
+            save_world_state(conn, campaign_id, world_state, previous=load_world_state(conn, campaign_id) or {})
             append_events(conn, campaign_id, next_turn_number, events, commit=False)
             apply_projection(conn, campaign_id, events, commit=False)
             for e in throttle_events:
@@ -419,9 +417,9 @@ def make_commit_node():
             )
             raise
 
+        # Consolidated reload; also primes the hot snapshot the next turn starts from.
         refreshed = build_initial_gamestate(conn, campaign_id, player_id)
         refreshed_dict = refreshed.model_dump(mode="json")
-        refreshed_dict["history"] = load_turn_history(conn, campaign_id, limit=10)
         refreshed_dict["final_text"] = final_text
         refreshed_dict["suggested_actions"] = suggested_actions
         refreshed_dict["embedded_suggestions"] = state.get("embedded_suggestions")
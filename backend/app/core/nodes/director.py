@@ -8,54 +8,88 @@ from backend.app.core.agents import DirectorAgent
 from backend.app.core.agents.base import AgentLLM
 from backend.app.core.nodes import dict_to_state
 from backend.app.core.personality_profile import build_scene_personality_context
+from backend.app.rag.context_bundles import bundle_for_state
 from backend.app.rag.kg_retriever import KGRetriever
 from backend.app.rag.lore_retriever import retrieve_lore
+from backend.app.rag.query_embeddings import TurnQueryEmbeddings, get_turn_embeddings, lookup_vector
 from backend.app.rag.style_retriever import retrieve_style_layered
 from backend.app.rag.retrieval_bundles import DIRECTOR_DOC_TYPE, DIRECTOR_SECTION_KIND
 
 logger = logging.getLogger(__name__)
 
 
+def _prefetch_turn_queries(
+    query_embeddings: TurnQueryEmbeddings | None,
+    gs: Any,
+    extra_texts: list[str] | None = None,
+) -> None:
+    """Encode the Director's and Narrator's retrieval queries for this turn in one batch.
+
+    Skipped when there is no batch for the turn or no vector DB to query (nothing
+    would consume the vectors). Failures are non-fatal: retrievers encode on demand.
+    """
+    if query_embeddings is None:
+        return
+    try:
+        from backend.app.config import resolve_vectordb_path
+        if not resolve_vectordb_path().exists():
+            return
+        from backend.app.core.agents.narrator import _build_lore_query
+        from backend.app.core.director_validation import build_style_query
+        texts = [build_style_query(gs), _build_lore_query(gs)]
+        texts.extend(t for t in (extra_texts or []) if t and t.strip())
+        query_embeddings.prefetch(texts)
+    except Exception as e:
+        logger.debug("Turn query prefetch failed (non-fatal): %s", e)
+
+
 def make_director_node():
     """Build the Director node."""
-    retrieval_guardrails: dict[str, Any] = {}
-
-    def style_retriever(q, k, era_id=None, genre=None, archetype=None):
-        return retrieve_style_layered(q, top_k=k, era_id=era_id, genre=genre, archetype=archetype)
-
-    def lore_retriever(query: str, top_k: int = 4, era: str | None = None, related_npcs: list[str] | None = None):
-        chapter_max = retrieval_guardrails.get("max_chapter_index")
-        source_titles = retrieval_guardrails.get("allowed_sources")
-        return retrieve_lore(
-            query,
-            top_k=top_k,
-            era=era,
-            doc_type=DIRECTOR_DOC_TYPE,
-            section_kind=DIRECTOR_SECTION_KIND,
-            related_npcs=related_npcs,
-            source_titles=source_titles if isinstance(source_titles, list) and source_titles else None,
-            chapter_index_max=int(chapter_max) if chapter_max is not None else None,
-        )
-
     try:
-        director = DirectorAgent(
-            llm=AgentLLM("director"),
-            style_retriever=style_retriever,
-            lore_retriever=lore_retriever,
-        )
+        director_llm = AgentLLM("director")
     except Exception as e:
         logger.warning(
             "Failed to initialize DirectorAgent with LLM, using fallback: %s",
             e,
             exc_info=True,
         )
-        director = DirectorAgent(style_retriever=style_retriever, lore_retriever=lore_retriever)
+        director_llm = None
+
+    def _build_director(
+        retrieval_guardrails: dict[str, Any],
+        query_embeddings: TurnQueryEmbeddings | None,
+    ) -> DirectorAgent:
+        """DirectorAgent whose retrievers are bound to this turn's guardrails and query vectors.
+
+        Built per invocation so concurrent turns never share retrieval state.
+        """
+        def style_retriever(q, k, era_id=None, genre=None, archetype=None):
+            return retrieve_style_layered(
+                q, top_k=k, era_id=era_id, genre=genre, archetype=archetype,
+                query_vector=lookup_vector(query_embeddings, q),
+            )
+
+        def lore_retriever(query: str, top_k: int = 4, era: str | None = None, related_npcs: list[str] | None = None):
+            chapter_max = retrieval_guardrails.get("max_chapter_index")
+            source_titles = retrieval_guardrails.get("allowed_sources")
+            return retrieve_lore(
+                query,
+                top_k=top_k,
+                era=era,
+                doc_type=DIRECTOR_DOC_TYPE,
+                section_kind=DIRECTOR_SECTION_KIND,
+                related_npcs=related_npcs,
+                source_titles=source_titles if isinstance(source_titles, list) and source_titles else None,
+                chapter_index_max=int(chapter_max) if chapter_max is not None else None,
+                query_vector=lookup_vector(query_embeddings, query),
+            )
+
+        return DirectorAgent(llm=director_llm, style_retriever=style_retriever, lore_retriever=lore_retriever)
 
     kg_retriever = KGRetriever()
 
     def director_node(state: dict[str, Any]) -> dict[str, Any]:
         gs = dict_to_state(state)
-        nonlocal retrieval_guardrails
 
         campaign = getattr(gs, "campaign", None) or {}
         campaign_ws = campaign.get("world_state_json") if isinstance(campaign, dict) else None
@@ -65,6 +99,11 @@ def make_director_node():
         guardrails = story_position.get("retrieval_guardrails") if isinstance(story_position, dict) else None
         retrieval_guardrails = guardrails if isinstance(guardrails, dict) else {}
 
+        # Batch-encode every query this turn's RAG lanes will issue (Director + Narrator + episodic)
+        query_embeddings = get_turn_embeddings(state)
+        episodic_query_text = (gs.user_input or "") + " " + (gs.current_location or "")
+        _prefetch_turn_queries(query_embeddings, gs, [episodic_query_text])
+
         # --- V2.8: Shared RAG retrieval (compute once, pass to Narrator via state) ---
         era = (campaign.get("time_period") or campaign.get("era") or "rebellion").strip() or "rebellion"
 
@@ -74,7 +113,11 @@ def make_director_node():
         char_ids = _collect_character_ids_from_state(gs)
         faction_ids = _collect_faction_ids_from_state(gs)
 
-        shared_char_ctx = kg_retriever.get_character_context(char_ids, era)
+        # Anchor NPC lines come from the precomputed location bundle when one is built
+        bundle = bundle_for_state(gs)
+        shared_char_ctx = kg_retriever.get_character_context(
+            char_ids, era, precomputed=bundle.npc_relationships if bundle is not None else None,
+        )
         shared_event_ctx = kg_retriever.get_relevant_events(char_ids, gs.current_location, era)
         director_faction_ctx = kg_retriever.get_faction_dynamics(faction_ids, era)
 
@@ -89,7 +132,7 @@ def make_director_node():
             if conn:
                 from backend.app.core.episodic_memory import EpisodicMemory
                 epi = EpisodicMemory(conn, gs.campaign_id or "")
-                query_text = (gs.user_input or "") + " " + (gs.current_location or "")
+                query_text = episodic_query_text
                 npc_names = [n.get("name", "") for n in (gs.present_npcs or []) if n.get("name")]
                 memories = epi.recall(
                     query_text=query_text,
@@ -97,6 +140,11 @@ def make_director_node():
                     location_id=gs.current_location,
                     npcs=npc_names,
                     max_results=4,  # retrieve max(3,4)=4 for Narrator; Director uses first 3
+                    query_embedding=(
+                        query_embeddings.get(query_text)
+                        if query_embeddings is not None and query_text in query_embeddings
+                        else None
+                    ),
                 )
                 shared_mem_block = epi.format_for_prompt(memories, max_chars=500)
                 # Director uses a shorter version
@@ -173,6 +221,7 @@ def make_director_node():
             logger.debug("Personality profile build failed (non-fatal): %s", _pers_err)
 
         arc_guidance = state.get("arc_guidance") or {}
+        director = _build_director(retrieval_guardrails, query_embeddings)
         instructions, _plan_suggestions = director.plan(gs, kg_context=kg_context, arc_guidance=arc_guidance)
 
         logger.debug("Director node: passing shared RAG data to Narrator via state")
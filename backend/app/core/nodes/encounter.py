@@ -82,7 +82,7 @@ def make_encounter_node():
                     )
                     casting = CastingAgent(llm=None)
                 introduced_names = get_introduced_npc_names(conn, campaign_id)
-                ws = throttle_load_world_state(conn, campaign_id)
+                ws = throttle_load_world_state(conn, campaign_id, ("npc_introduction_triggers",))
                 triggers = ws.get("npc_introduction_triggers") or []
                 payload = casting.spawn(
                     spawn_request["campaign_id"],
@@ -129,7 +129,7 @@ def make_encounter_node():
             # V3.0: Check generated NPCs from campaign world generation
             present = []
             try:
-                ws = throttle_load_world_state(conn, campaign_id)
+                ws = throttle_load_world_state(conn, campaign_id, ("generated_npcs",))
                 gen_npcs = ws.get("generated_npcs") or []
                 for gnpc in gen_npcs:
                     if isinstance(gnpc, dict) and gnpc.get("default_location_id") == effective_loc:
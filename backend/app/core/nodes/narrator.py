@@ -1,6 +1,7 @@
 """Narrator node factory."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -9,8 +10,10 @@ from backend.app.core.agents.base import AgentLLM
 from backend.app.core.agents.narrator import _extract_npc_utterance
 from backend.app.core.nodes import dict_to_state
 from backend.app.rag.character_voice_retriever import get_voice_snippets
+from backend.app.rag.context_bundles import LocationBundle, bundle_for_state, merge_precomputed, style_slots
 from backend.app.rag.kg_retriever import KGRetriever
 from backend.app.rag.lore_retriever import retrieve_lore
+from backend.app.rag.query_embeddings import TurnQueryEmbeddings, get_turn_embeddings, lookup_vector
 from backend.app.rag.retrieval_bundles import NARRATOR_DOC_TYPES, NARRATOR_SECTION_KINDS
 from backend.app.rag.style_retriever import retrieve_style_layered
 
@@ -44,28 +47,11 @@ def _inject_companion_interjection(prose: str, speaker: str, line: str) -> str:
 
 
 def make_narrator_node():
-    """Build the Narrator node."""
-    retrieval_guardrails: dict[str, Any] = {}
-
-    def lore_retriever(query: str, top_k: int = 6, era: str | None = None, related_npcs: list[str] | None = None):
-        chapter_max = retrieval_guardrails.get("max_chapter_index")
-        source_titles = retrieval_guardrails.get("allowed_sources")
-        return retrieve_lore(
-            query,
-            top_k=top_k,
-            era=era,
-            doc_types=NARRATOR_DOC_TYPES,
-            section_kinds=NARRATOR_SECTION_KINDS,
-            related_npcs=related_npcs,
-            source_titles=source_titles if isinstance(source_titles, list) and source_titles else None,
-            chapter_index_max=int(chapter_max) if chapter_max is not None else None,
-        )
-
-    voice_retriever = None
-
-    def style_retriever_fn(query: str, top_k: int = 3, era_id=None, genre=None, archetype=None):
-        return retrieve_style_layered(query, top_k=top_k, era_id=era_id, genre=genre, archetype=archetype)
+    """Build the Narrator node.
 
+    The returned sync node carries an ``async_impl`` coroutine variant (same
+    behaviour, LLM call awaited) which build_graph registers for ``ainvoke``.
+    """
     try:
         narrator_llm = AgentLLM("narrator")
     except Exception as e:
@@ -76,26 +62,77 @@ def make_narrator_node():
         )
         narrator_llm = None
 
-    narrator = NarratorAgent(
-        llm=narrator_llm,
-        lore_retriever=lore_retriever,
-        voice_retriever=voice_retriever,
-        style_retriever=style_retriever_fn,
-    )
     kg_retriever = KGRetriever()
 
-    def narrator_node(state: dict[str, Any]) -> dict[str, Any]:
+    def _build_narrator(
+        retrieval_guardrails: dict[str, Any],
+        query_embeddings: TurnQueryEmbeddings | None,
+        bundle: LocationBundle | None = None,
+    ) -> NarratorAgent:
+        """NarratorAgent whose retrievers are bound to this turn's guardrails and query vectors.
+
+        Built per invocation so concurrent turns never share retrieval state. With a
+        precomputed location bundle, bundled lore/style fill the first slots and live
+        retrieval only the rest.
+        """
+        from backend.app.config import CONTEXT_BUNDLE_LORE_SLOTS
+
+        def lore_retriever(query: str, top_k: int = 6, era: str | None = None, related_npcs: list[str] | None = None):
+            chapter_max = retrieval_guardrails.get("max_chapter_index")
+            source_titles = retrieval_guardrails.get("allowed_sources")
+            source_titles = source_titles if isinstance(source_titles, list) and source_titles else None
+            chapter_index_max = int(chapter_max) if chapter_max is not None else None
+
+            def live(k: int):
+                return retrieve_lore(
+                    query,
+                    top_k=k,
+                    era=era,
+                    doc_types=NARRATOR_DOC_TYPES,
+                    section_kinds=NARRATOR_SECTION_KINDS,
+                    related_npcs=related_npcs,
+                    source_titles=source_titles,
+                    chapter_index_max=chapter_index_max,
+                    query_vector=lookup_vector(query_embeddings, query),
+                )
+
+            if bundle is None:
+                return live(top_k)
+            return merge_precomputed(
+                bundle.lore_for(source_titles, chapter_index_max), live, top_k, CONTEXT_BUNDLE_LORE_SLOTS,
+            )
+
+        def style_retriever_fn(query: str, top_k: int = 3, era_id=None, genre=None, archetype=None):
+            def live(k: int):
+                return retrieve_style_layered(
+                    query, top_k=k, era_id=era_id, genre=genre, archetype=archetype,
+                    query_vector=lookup_vector(query_embeddings, query),
+                )
+
+            if bundle is None:
+                return live(top_k)
+            return merge_precomputed(bundle.style_chunks(), live, top_k, style_slots(genre, archetype))
+
+        return NarratorAgent(
+            llm=narrator_llm,
+            lore_retriever=lore_retriever,
+            voice_retriever=None,
+            style_retriever=style_retriever_fn,
+        )
+
+    def _prepare(state: dict[str, Any]) -> tuple[Any, NarratorAgent, str]:
+        """Assemble (GameState, per-turn NarratorAgent, kg_context) for this turn."""
         import logging as _logging
         _narrator_logger = _logging.getLogger(__name__)
         gs = dict_to_state(state)
-        nonlocal retrieval_guardrails
         campaign_dict_for_guardrails = getattr(gs, "campaign", None) or {}
         ws_for_guardrails = campaign_dict_for_guardrails.get("world_state_json") if isinstance(campaign_dict_for_guardrails, dict) else {}
         if not isinstance(ws_for_guardrails, dict):
             ws_for_guardrails = {}
         story_position = ws_for_guardrails.get("story_position") if isinstance(ws_for_guardrails, dict) else None
         guardrails = story_position.get("retrieval_guardrails") if isinstance(story_position, dict) else None
-        retrieval_guardrails = guardrails if isinstance(guardrails, dict) else {}
+        bundle = bundle_for_state(gs)
+        narrator = _build_narrator(guardrails if isinstance(guardrails, dict) else {}, get_turn_embeddings(state), bundle)
 
         # --- V2.8: Use shared RAG data from Director if available ---
         shared_char_ctx = state.get("shared_kg_character_context", "")
@@ -109,7 +146,10 @@ def make_narrator_node():
             # add Narrator-only location_context
             campaign_dict = getattr(gs, "campaign", None) or {}
             era = (campaign_dict.get("time_period") or campaign_dict.get("era") or "rebellion").strip() or "rebellion"
-            loc_ctx = kg_retriever.get_location_context(gs.current_location or "", era)
+            if bundle is not None and bundle.kg_location is not None:
+                loc_ctx = bundle.kg_location
+            else:
+                loc_ctx = kg_retriever.get_location_context(gs.current_location or "", era)
             kg_parts = [p for p in [shared_char_ctx, loc_ctx, shared_event_ctx] if p]
             kg_context = "## Knowledge Graph Context\n" + "\n\n".join(kg_parts) if kg_parts else ""
             _narrator_logger.debug("Narrator using shared KG data from Director")
@@ -175,7 +215,12 @@ def make_narrator_node():
                         kg_context = (kg_context + "\n\n" + mem_block) if kg_context else mem_block
             except Exception as _epi_err:
                 _narrator_logger.warning("Episodic memory recall failed for Narrator (non-fatal): %s", _epi_err)
-        output = narrator.generate(gs, kg_context=kg_context)
+        return gs, narrator, kg_context
+
+    def _finish(state: dict[str, Any], gs: Any, narrator: NarratorAgent, output: Any, kg_context: str) -> dict[str, Any]:
+        """Consistency retry, banter weave and NPC-line extraction on the generated narration."""
+        import logging as _logging
+        _narrator_logger = _logging.getLogger(__name__)
         final_text = output.text
 
         # Phase 7: Narrator feedback loop — retry once on mechanic consistency failure
@@ -238,4 +283,15 @@ def make_narrator_node():
             "warnings": gs.warnings,
         }
 
+    def narrator_node(state: dict[str, Any]) -> dict[str, Any]:
+        gs, narrator, kg_context = _prepare(state)
+        output = narrator.generate(gs, kg_context=kg_context)
+        return _finish(state, gs, narrator, output, kg_context)
+
+    async def anarrator_node(state: dict[str, Any]) -> dict[str, Any]:
+        gs, narrator, kg_context = await asyncio.to_thread(_prepare, state)
+        output = await narrator.agenerate(gs, kg_context=kg_context)
+        return await asyncio.to_thread(_finish, state, gs, narrator, output, kg_context)
+
+    narrator_node.async_impl = anarrator_node
     return narrator_node
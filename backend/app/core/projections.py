@@ -5,6 +5,7 @@ import json
 import sqlite3
 from typing import Any
 
+from backend.app.core.world_state_store import load_world_state_keys, set_world_state_keys
 from backend.app.models.events import Event
 
 
@@ -15,28 +16,6 @@ def _coerce_int(value: Any, default: int = 0) -> int:
         return default
 
 
-def _load_world_state(conn: sqlite3.Connection, campaign_id: str) -> dict[str, Any] | None:
-    cur = conn.execute(
-        "SELECT world_state_json FROM campaigns WHERE id = ?",
-        (campaign_id,),
-    )
-    row = cur.fetchone()
-    if row is None:
-        return None
-    try:
-        state = json.loads(row[0]) if row[0] else {}
-    except (TypeError, json.JSONDecodeError):
-        state = {}
-    return state if isinstance(state, dict) else {}
-
-
-def _save_world_state(conn: sqlite3.Connection, campaign_id: str, state: dict[str, Any]) -> None:
-    conn.execute(
-        "UPDATE campaigns SET world_state_json = ? WHERE id = ?",
-        (json.dumps(state), campaign_id),
-    )
-
-
 def _load_character_psych_profile(
     conn: sqlite3.Connection,
     campaign_id: str,
@@ -143,10 +122,7 @@ def apply_projection(
             key = payload.get("key")
             value = payload.get("value")
             if key is not None:
-                state = _load_world_state(conn, campaign_id)
-                if state is not None:
-                    state[key] = value
-                    _save_world_state(conn, campaign_id, state)
+                set_world_state_keys(conn, campaign_id, {key: value})
 
         elif event_type == "WORLD_TIME_ADVANCE":
             mode = str(payload.get("mode") or "").lower()
@@ -180,10 +156,7 @@ def apply_projection(
                         (json.dumps(psych), character_id, campaign_id),
                     )
                     # Optional mirror for compatibility with existing world_state_json readers.
-                    state = _load_world_state(conn, campaign_id)
-                    if state is not None:
-                        state["psych_profile"] = psych
-                        _save_world_state(conn, campaign_id, state)
+                    set_world_state_keys(conn, campaign_id, {"psych_profile": psych})
 
         elif event_type == "NPC_DEPART":
             character_id = payload.get("character_id")
@@ -194,7 +167,7 @@ def apply_projection(
                 )
 
         elif event_type in ("FACTION_MOVE", "NPC_ACTION", "PLOT_TICK", "RUMOR_SPREAD"):
-            state = _load_world_state(conn, campaign_id)
+            state = load_world_state_keys(conn, campaign_id, ["world_sim_events"])
             if state is not None:
                 log = list(state.get("world_sim_events") or [])
                 log.append({
@@ -204,8 +177,7 @@ def apply_projection(
                 })
                 if len(log) > 50:
                     log = log[-50:]
-                state["world_sim_events"] = log
-                _save_world_state(conn, campaign_id, state)
+                set_world_state_keys(conn, campaign_id, {"world_sim_events": log})
 
         elif event_type in ("ITEM_GET", "ITEM_LOSE"):
             owner_id = payload.get("owner_id")
@@ -273,11 +245,7 @@ def apply_projection(
                 except sqlite3.IntegrityError:
                     pass
                 # Update world_state_json flags so pipeline nodes can detect starship ownership
-                state = _load_world_state(conn, campaign_id)
-                if state is not None:
-                    state["has_starship"] = True
-                    state["active_starship"] = ship_type
-                    _save_world_state(conn, campaign_id, state)
+                set_world_state_keys(conn, campaign_id, {"has_starship": True, "active_starship": ship_type})
 
     if commit:
         conn.commit()
@@ -0,0 +1,151 @@
+"""Parallel retrieval fan-out: run independent RAG lanes concurrently with a deadline.
+
+Lore, voice and style retrieval do not depend on each other, so running them one
+after another adds their latencies together on every turn. ``run_lanes`` submits
+each lane to a bounded process-wide thread pool (RETRIEVAL_LANE_MAX_WORKERS), waits
+up to a per-lane deadline, and returns whatever arrived in time. Lanes that time out
+or raise fall back to their default value and emit a degradation warning; they never
+fail the turn.
+
+A lane that misses its deadline keeps running in the background, so lanes write
+warnings to their own ``RetrievalLane.warnings`` list, never the turn's. Only the
+lists of lanes that finished are merged into the caller's warnings.
+
+Threads (not processes) are sufficient: encoder inference and LanceDB search both
+release the GIL for the bulk of their work.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from backend.app.constants import RETRIEVAL_LANE_MAX_WORKERS
+from backend.app.core.warnings import add_warning
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _lane_executor() -> ThreadPoolExecutor:
+    """Process-wide lane pool (created on first parallel fan-out)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RETRIEVAL_LANE_MAX_WORKERS, thread_name_prefix="rag-lane")
+        return _executor
+
+
+@dataclass
+class RetrievalLane:
+    """A single retrieval lane: a zero-arg callable plus its fallback value.
+
+    ``fn`` should report warnings into ``warnings`` (not a shared list); run_lanes
+    merges them into the caller's list only if the lane finishes.
+    """
+    name: str
+    fn: Callable[[], Any]
+    default: Any = None
+    deadline_s: float | None = None
+    warnings: list[str] = field(default_factory=list)
+
+
+@dataclass
+class FanoutResult:
+    """Results keyed by lane name, plus per-lane timing and failure bookkeeping."""
+    results: dict[str, Any] = field(default_factory=dict)
+    elapsed_ms: dict[str, float] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+def _timed_call(fn: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000.0
+
+
+def run_lanes(
+    lanes: list[RetrievalLane],
+    deadline_s: float | None = None,
+    warnings: list[str] | None = None,
+    parallel: bool = True,
+) -> FanoutResult:
+    """Run retrieval lanes concurrently and collect results that finish before their deadline.
+
+    Args:
+        lanes: Lanes to run. Lane names must be unique.
+        deadline_s: Default per-lane deadline in seconds, measured from fan-out start.
+            A lane's own ``deadline_s`` takes precedence. ``None`` waits indefinitely.
+        warnings: Mutable warnings list for degradation messages and the warnings of
+            lanes that finished.
+        parallel: When False (or with a single lane), lanes run inline in order and
+            deadlines are not enforced.
+
+    Returns:
+        FanoutResult with a value for every lane (the lane default on timeout/error).
+    """
+    out = FanoutResult()
+    if not lanes:
+        return out
+
+    if not parallel or len(lanes) == 1:
+        for lane in lanes:
+            try:
+                value, ms = _timed_call(lane.fn)
+                out.results[lane.name] = value
+                out.elapsed_ms[lane.name] = ms
+            except Exception as e:
+                _lane_failed(out, lane, e, warnings)
+            _merge_warnings(lane, warnings)
+        return out
+
+    start = time.monotonic()
+    executor = _lane_executor()
+    # Each lane runs in its own copy of the caller's context (per-turn cache counters).
+    futures = {
+        lane.name: executor.submit(contextvars.copy_context().run, _timed_call, lane.fn)
+        for lane in lanes
+    }
+    for lane in lanes:
+        future = futures[lane.name]
+        lane_deadline = lane.deadline_s if lane.deadline_s is not None else deadline_s
+        timeout = None if lane_deadline is None else max(0.0, start + lane_deadline - time.monotonic())
+        try:
+            value, ms = future.result(timeout=timeout)
+            out.results[lane.name] = value
+            out.elapsed_ms[lane.name] = ms
+        except FutureTimeoutError:
+            # Not started yet: drop it. Running: it finishes in the background, its
+            # result and warnings are discarded.
+            logger.warning("Retrieval lane '%s' missed its %.2fs deadline", lane.name, lane_deadline)
+            future.cancel()
+            out.results[lane.name] = lane.default
+            out.timed_out.append(lane.name)
+            add_warning(warnings, f"{lane.name.capitalize()} retrieval timed out: continuing without {lane.name} context.")
+            continue
+        except Exception as e:
+            _lane_failed(out, lane, e, warnings)
+        _merge_warnings(lane, warnings)
+    return out
+
+
+def _lane_failed(out: FanoutResult, lane: RetrievalLane, error: Exception, warnings: list[str] | None) -> None:
+    logger.warning("Retrieval lane '%s' failed: %s", lane.name, error)
+    out.results[lane.name] = lane.default
+    out.failed.append(lane.name)
+    add_warning(warnings, f"{lane.name.capitalize()} retrieval failed: continuing without {lane.name} context.")
+
+
+def _merge_warnings(lane: RetrievalLane, warnings: list[str] | None) -> None:
+    for message in list(lane.warnings):
+        add_warning(warnings, message)
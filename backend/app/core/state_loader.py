@@ -3,12 +3,18 @@ from __future__ import annotations
 
 import json
 import logging
+import pickle
 import sqlite3
+import threading
+from collections import OrderedDict
 from typing import Any
 
+from backend.app.config import GAMESTATE_CACHE_SIZE
+from backend.app.db.connection import database_key
 from backend.app.models.state import CharacterSheet, GameState
 from backend.app.core.event_store import get_current_turn_number, get_events
 from backend.app.core.transcript_store import get_rendered_turns
+from shared.cache import get_cache_value
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +56,11 @@ def load_campaign(conn: sqlite3.Connection, campaign_id: str) -> dict | None:
     row = cur.fetchone()
     if row is None:
         return None
-    d = _row_to_dict(row)
+    return _campaign_from_row(_row_to_dict(row))
+
+
+def _campaign_from_row(d: dict) -> dict:
+    """Parse world_state_json and flatten companion/alignment state onto the campaign dict."""
     ws: dict = {}
     if d.get("world_state_json"):
         try:
@@ -112,7 +122,11 @@ def load_player_by_id(
     row = cur.fetchone()
     if row is None:
         return None
-    d = _row_to_dict(row)
+    return _player_from_row(_row_to_dict(row))
+
+
+def _player_from_row(d: dict) -> dict:
+    """Parse the JSON columns of a load_player_by_id row."""
     if d.get("stats_json"):
         try:
             d["stats_json"] = json.loads(d["stats_json"]) if isinstance(d["stats_json"], str) else d["stats_json"]
@@ -142,20 +156,20 @@ def load_inventory(conn: sqlite3.Connection, owner_id: str) -> list[dict]:
         "SELECT id, owner_id, item_name, quantity, attributes_json FROM inventory WHERE owner_id = ?",
         (owner_id,),
     )
-    out = []
-    for row in cur.fetchall():
-        d = _row_to_dict(row)
-        if d.get("attributes_json"):
-            try:
-                d["attributes_json"] = (
-                    json.loads(d["attributes_json"])
-                    if isinstance(d["attributes_json"], str)
-                    else d["attributes_json"]
-                )
-            except (TypeError, json.JSONDecodeError):
-                d["attributes_json"] = {}
-        out.append(d)
-    return out
+    return [_inventory_from_row(_row_to_dict(row)) for row in cur.fetchall()]
+
+
+def _inventory_from_row(d: dict) -> dict:
+    if d.get("attributes_json"):
+        try:
+            d["attributes_json"] = (
+                json.loads(d["attributes_json"])
+                if isinstance(d["attributes_json"], str)
+                else d["attributes_json"]
+            )
+        except (TypeError, json.JSONDecodeError):
+            d["attributes_json"] = {}
+    return d
 
 
 def load_turn_history(
@@ -165,6 +179,11 @@ def load_turn_history(
     current = get_current_turn_number(conn, campaign_id)
     since_turn = max(0, current - limit)
     events = get_events(conn, campaign_id, since_turn=since_turn, include_hidden=False)
+    return _history_lines(events, limit)
+
+
+def _history_lines(events: list[dict], limit: int) -> list[str]:
+    """Format player-facing events as 'T3 MOVE to Tatooine' summaries (last `limit`)."""
     lines: list[str] = []
     for e in events:
         turn_number = e["turn_number"]
@@ -196,13 +215,41 @@ def load_turn_history(
     return lines[-limit:] if limit else lines
 
 
-def build_initial_gamestate(
-    conn: sqlite3.Connection, campaign_id: str, player_id: str
+def _recent_narrative(rendered: list[dict]) -> list[str]:
+    """Recent narrative text (rendered turns newest first) for narrative continuity, oldest first."""
+    recent_narrative: list[str] = []
+    for turn in reversed(rendered):  # oldest first
+        text = (turn.get("text") or "").strip()
+        if text:
+            tn = turn.get("turn_number", "?")
+            # Truncate to ~200 words to keep prompt budget manageable
+            words = text.split()
+            if len(words) > 200:
+                text = " ".join(words[:200]) + "..."
+            recent_narrative.append(f"[Turn {tn}] {text}")
+    return recent_narrative
+
+
+def _starship_from_ws(ws: dict) -> dict | None:
+    if ws.get("has_starship") and ws.get("active_starship"):
+        return {
+            "ship_type": ws["active_starship"],
+            "has_starship": True,
+        }
+    return None
+
+
+def _assemble_gamestate(
+    campaign_id: str,
+    player_id: str,
+    turn_number: int,
+    campaign: dict | None,
+    player_row: dict | None,
+    inventory: list[dict],
+    history: list[str],
+    rendered: list[dict],
 ) -> GameState:
-    """Build GameState from DB: turn_number, player CharacterSheet, current_location, campaign (world_time_minutes), history."""
-    turn_number = get_current_turn_number(conn, campaign_id)
-    campaign = load_campaign(conn, campaign_id)
-    player_row = load_player_by_id(conn, campaign_id, player_id)
+    """GameState from loaded (already parsed) rows."""
     ws = (campaign or {}).get("world_state_json") if isinstance(campaign, dict) else {}
     ws = ws if isinstance(ws, dict) else {}
     _era_sums = list(ws.get("era_summaries") or [])
@@ -214,13 +261,12 @@ def build_initial_gamestate(
             current_location=None,
             player=None,
             campaign=campaign,
-            history=load_turn_history(conn, campaign_id, limit=10),
+            history=history,
             era_summaries=_era_sums,
         )
-    inv = load_inventory(conn, player_id)
     inventory_summary = [
         {"item_name": r["item_name"], "quantity": r["quantity"], **r.get("attributes_json", {})}
-        for r in inv
+        for r in inventory
     ]
     player = CharacterSheet(
         character_id=player_row["id"],
@@ -236,31 +282,9 @@ def build_initial_gamestate(
         cyoa_answers=player_row.get("cyoa_answers") or None,
         gender=player_row.get("gender") or None,
     )
-    history = load_turn_history(conn, campaign_id, limit=10)
-
-    # Load recent narrative text (last 3 turns) for narrative continuity
-    recent_narrative: list[str] = []
-    try:
-        rendered = get_rendered_turns(conn, campaign_id, limit=3)
-        for turn in reversed(rendered):  # oldest first
-            text = (turn.get("text") or "").strip()
-            if text:
-                tn = turn.get("turn_number", "?")
-                # Truncate to ~200 words to keep prompt budget manageable
-                words = text.split()
-                if len(words) > 200:
-                    text = " ".join(words[:200]) + "..."
-                recent_narrative.append(f"[Turn {tn}] {text}")
-    except Exception:
-        logger.warning("Failed to load recent narrative (non-fatal)", exc_info=True)
 
     # V2.10: Load starship ownership from world_state_json
-    _player_starship: dict | None = None
-    if ws.get("has_starship") and ws.get("active_starship"):
-        _player_starship = {
-            "ship_type": ws["active_starship"],
-            "has_starship": True,
-        }
+    _player_starship = _starship_from_ws(ws)
 
     # V2.12: Load known NPCs from world_state_json
     _known_npcs = list(ws.get("known_npcs") or [])
@@ -275,7 +299,221 @@ def build_initial_gamestate(
         campaign=campaign,
         history=history,
         era_summaries=_era_sums,
-        recent_narrative=recent_narrative,
+        recent_narrative=_recent_narrative(rendered),
         player_starship=_player_starship,
         known_npcs=_known_npcs,
     )
+
+
+def _load_gamestate_queries(conn: sqlite3.Connection, campaign_id: str, player_id: str) -> GameState:
+    """Per-table load (one query per source); used when the consolidated load is unavailable."""
+    turn_number = get_current_turn_number(conn, campaign_id)
+    campaign = load_campaign(conn, campaign_id)
+    player_row = load_player_by_id(conn, campaign_id, player_id)
+    history = load_turn_history(conn, campaign_id, limit=_HISTORY_TURNS)
+    if player_row is None:
+        return _assemble_gamestate(campaign_id, player_id, turn_number, campaign, None, [], history, [])
+    rendered: list[dict] = []
+    try:
+        rendered = get_rendered_turns(conn, campaign_id, limit=_NARRATIVE_TURNS)
+    except Exception:
+        logger.warning("Failed to load recent narrative (non-fatal)", exc_info=True)
+    return _assemble_gamestate(
+        campaign_id, player_id, turn_number, campaign, player_row,
+        load_inventory(conn, player_id), history, rendered,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Consolidated load + hot snapshot cache
+# ---------------------------------------------------------------------------
+
+_HISTORY_TURNS = 10
+_NARRATIVE_TURNS = 3
+_SNAPSHOT_CACHE_KEY = "gamestate_snapshot_cache"
+
+# Everything build_initial_gamestate needs in one statement (one consistent read).
+# Child rows come back as JSON arrays; JSON text columns stay strings and are parsed
+# by the same helpers as the per-table loaders.
+_SNAPSHOT_SQL = """
+SELECT c.id, c.title, c.time_period, c.world_state_json,
+       COALESCE(c.world_time_minutes, 0) AS world_time_minutes,
+       COALESCE(c.state_version, 0) AS state_version,
+       t.turn_number,
+       (SELECT json_object(
+                 'id', id, 'name', name, 'role', role, 'location_id', location_id,
+                 'stats_json', stats_json, 'hp_current', hp_current,
+                 'relationship_score', relationship_score, 'credits', COALESCE(credits, 0),
+                 'psych_profile', COALESCE(psych_profile, '{}'), 'planet_id', planet_id,
+                 'background', background, 'cyoa_answers_json', cyoa_answers_json, 'gender', gender)
+          FROM characters WHERE campaign_id = c.id AND id = :player_id LIMIT 1) AS player_json,
+       (SELECT json_group_array(json_array(item_name, quantity, attributes_json))
+          FROM (SELECT item_name, quantity, attributes_json FROM inventory
+                WHERE owner_id = :player_id ORDER BY rowid)) AS inventory_json,
+       (SELECT json_group_array(json_array(turn_number, event_type, payload_json))
+          FROM (SELECT turn_number, event_type, payload_json FROM turn_events
+                WHERE campaign_id = c.id AND turn_number >= MAX(0, t.turn_number - :history)
+                  AND (is_hidden = 0 OR is_hidden IS NULL)
+                ORDER BY turn_number ASC, id ASC)) AS history_json,
+       (SELECT json_group_array(json_array(turn_number, text))
+          FROM (SELECT turn_number, text FROM rendered_turns
+                WHERE campaign_id = c.id ORDER BY turn_number DESC LIMIT :narrative)) AS narrative_json
+FROM campaigns c,
+     (SELECT COALESCE(MAX(turn_number), 0) AS turn_number
+        FROM turn_events WHERE campaign_id = :campaign_id) AS t
+WHERE c.id = :campaign_id
+"""
+
+
+def _load_gamestate_snapshot(
+    conn: sqlite3.Connection, campaign_id: str, player_id: str
+) -> tuple[GameState, int] | None:
+    """(GameState, state_version) from one consolidated query; None if the campaign row
+    is missing or the schema predates campaigns.state_version."""
+    try:
+        row = conn.execute(
+            _SNAPSHOT_SQL,
+            {"campaign_id": campaign_id, "player_id": player_id,
+             "history": _HISTORY_TURNS, "narrative": _NARRATIVE_TURNS},
+        ).fetchone()
+    except sqlite3.OperationalError as e:
+        logger.debug("Consolidated GameState load unavailable: %s", e)
+        return None
+    if row is None:
+        return None
+    d = _row_to_dict(row)
+    version = int(d.pop("state_version") or 0)
+    turn_number = int(d.pop("turn_number") or 0)
+    player_json = d.pop("player_json")
+    inventory_rows = json.loads(d.pop("inventory_json") or "[]")
+    event_rows = json.loads(d.pop("history_json") or "[]")
+    narrative_rows = json.loads(d.pop("narrative_json") or "[]")
+
+    campaign = _campaign_from_row(d)
+    player_row = _player_from_row(json.loads(player_json)) if player_json else None
+    inventory = [
+        _inventory_from_row({"item_name": name, "quantity": qty, "attributes_json": attrs})
+        for name, qty, attrs in inventory_rows
+    ]
+    events = [
+        {"turn_number": tn, "event_type": et, "payload": json.loads(payload) if payload else {}}
+        for tn, et, payload in event_rows
+    ]
+    rendered = [{"turn_number": tn, "text": text or ""} for tn, text in narrative_rows]
+    gs = _assemble_gamestate(
+        campaign_id, player_id, turn_number, campaign, player_row, inventory,
+        _history_lines(events, _HISTORY_TURNS), rendered,
+    )
+    return gs, version
+
+
+class _Snapshot:
+    """Cached GameState at one state_version, held pickled: every hit unpickles an
+    independent copy (graph nodes mutate nested dicts), which is several times
+    cheaper than a deep copy or re-parsing world_state_json."""
+
+    __slots__ = ("version", "player_id", "blob")
+
+    def __init__(self, version: int, player_id: str, state: GameState) -> None:
+        self.version = version
+        self.player_id = player_id
+        self.blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self) -> GameState:
+        return pickle.loads(self.blob)
+
+
+def _snapshot_registry() -> OrderedDict:
+    return get_cache_value(_SNAPSHOT_CACHE_KEY, OrderedDict)
+
+
+_snapshot_lock = threading.Lock()
+
+
+def _state_version(conn: sqlite3.Connection, campaign_id: str) -> int | None:
+    try:
+        row = conn.execute(
+            "SELECT COALESCE(state_version, 0) FROM campaigns WHERE id = ?", (campaign_id,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def build_initial_gamestate(
+    conn: sqlite3.Connection, campaign_id: str, player_id: str
+) -> GameState:
+    """Build GameState from DB: turn_number, player CharacterSheet, current_location, campaign (world_time_minutes), history.
+
+    Served from the hot snapshot cache when campaigns.state_version still matches the
+    cached (campaign_id, version); otherwise loaded with one consolidated query and cached.
+    """
+    db_key = database_key(conn) if GAMESTATE_CACHE_SIZE > 0 else None
+    if db_key is not None:
+        version = _state_version(conn, campaign_id)
+        with _snapshot_lock:
+            snap = _snapshot_registry().get((db_key, campaign_id))
+            if snap is not None and version is not None and snap.version == version and snap.player_id == player_id:
+                _snapshot_registry().move_to_end((db_key, campaign_id))
+            else:
+                snap = None
+        if snap is not None:
+            return snap.load()
+
+    loaded = _load_gamestate_snapshot(conn, campaign_id, player_id)
+    if loaded is None:
+        return _load_gamestate_queries(conn, campaign_id, player_id)
+    gs, version = loaded
+    if db_key is not None and not conn.in_transaction:
+        # Only committed state is cached: a rolled-back write could reuse the version number.
+        _remember(db_key, campaign_id, _Snapshot(version, player_id, gs))
+    return gs
+
+
+def _remember(db_key: str, campaign_id: str, snap: _Snapshot) -> None:
+    with _snapshot_lock:
+        registry = _snapshot_registry()
+        registry[(db_key, campaign_id)] = snap
+        registry.move_to_end((db_key, campaign_id))
+        while len(registry) > GAMESTATE_CACHE_SIZE:
+            registry.popitem(last=False)
+
+
+def apply_world_state_update(conn: sqlite3.Connection, campaign_id: str, world_state: dict) -> None:
+    """Patch the cached snapshot after a committed single-row world_state_json UPDATE.
+
+    Call after commit. The write bumped state_version by exactly one; if the database
+    is at cached version + 1 nothing else changed, so the snapshot is updated in place
+    instead of being reloaded on the next turn. Any other gap drops the entry.
+    """
+    db_key = database_key(conn)
+    if db_key is None or conn.in_transaction:
+        return
+    version = _state_version(conn, campaign_id)
+    with _snapshot_lock:
+        registry = _snapshot_registry()
+        snap = registry.get((db_key, campaign_id))
+        if snap is None:
+            return
+        if version is None or version != snap.version + 1:
+            registry.pop((db_key, campaign_id), None)
+            return
+        gs = snap.load()
+        campaign = dict(gs.campaign or {})
+        campaign["world_state_json"] = json.loads(json.dumps(world_state))
+        campaign = _campaign_from_row(campaign)
+        ws = campaign["world_state_json"]
+        update: dict[str, Any] = {"campaign": campaign, "era_summaries": list(ws.get("era_summaries") or [])}
+        if gs.player is not None:
+            update["known_npcs"] = list(ws.get("known_npcs") or [])
+            update["player_starship"] = _starship_from_ws(ws)
+        gs = gs.model_copy(update=update)
+        registry[(db_key, campaign_id)] = _Snapshot(version, snap.player_id, gs)
+
+
+def invalidate_gamestate_cache(campaign_id: str | None = None) -> None:
+    """Drop cached snapshots for campaign_id (all campaigns when None)."""
+    with _snapshot_lock:
+        registry = _snapshot_registry()
+        for key in [k for k in registry if campaign_id is None or k[1] == campaign_id]:
+            registry.pop(key, None)
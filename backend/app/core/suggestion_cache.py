@@ -15,6 +15,7 @@ import sqlite3
 from typing import Any
 
 from backend.app.config import DEFAULT_DB_PATH
+from backend.app.db.connection import get_connection
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +27,8 @@ class SuggestionCache:
         self.db_path = db_path or DEFAULT_DB_PATH
 
     def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Pooled connection; close() hands it back to the pool."""
+        return get_connection(self.db_path)
 
     def _ensure_table(self, conn: sqlite3.Connection) -> None:
         """Create the cache table if it doesn't exist."""
@@ -0,0 +1,189 @@
+"""World state store: keyed reads and partial writes of campaigns.world_state_json.
+
+world_state_json grows with the campaign (ledger, quest_log, npc_states, news_feed, ...),
+so reading or rewriting the whole document for a one-key change costs a full
+json.loads/json.dumps round trip in Python. These helpers let SQLite's JSON1 functions
+do the work instead:
+
+- load_world_state_keys: top-level keys via json_each; the rest is never parsed into Python.
+- set_world_state_keys: json_set/json_remove patches; untouched keys are never re-serialized.
+- save_world_state(previous=...): diff against the stored document, patch only changed keys,
+  and skip the UPDATE entirely when nothing changed.
+
+Anything JSON1 cannot patch (missing campaign, malformed or non-object stored JSON,
+keys that are not plain strings) falls back to a full read-modify-write, so callers
+never need to care.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# json_set takes 2 args per key; stay well under SQLITE_MAX_FUNCTION_ARG (default 127).
+_MAX_KEYS_PER_STATEMENT = 50
+
+# Patches only apply to documents stored as JSON objects (json.dumps output starts with "{");
+# a first-character check is far cheaper than asking JSON1 for json_type (a second full parse).
+_IS_OBJECT = "substr(world_state_json, 1, 1) = '{'"
+
+
+def _parse(raw: Any) -> dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        state = json.loads(raw) if isinstance(raw, str) else raw
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _path(key: Any) -> str | None:
+    """JSON1 path for a top-level key, or None if the key cannot be addressed safely."""
+    if not isinstance(key, str) or '"' in key or "\\" in key:
+        return None
+    return f'$."{key}"'
+
+
+def _json_value(type_: str | None, value: Any) -> Any:
+    """Convert a json_each (type, value) pair back to the Python value json.loads would give."""
+    if type_ in ("object", "array"):
+        return json.loads(value)
+    if type_ == "true":
+        return True
+    if type_ == "false":
+        return False
+    return value
+
+
+def load_world_state(conn: sqlite3.Connection, campaign_id: str) -> dict[str, Any] | None:
+    """Full world_state dict, or None if the campaign does not exist."""
+    row = conn.execute(
+        "SELECT world_state_json FROM campaigns WHERE id = ?",
+        (campaign_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return _parse(row[0])
+
+
+def load_world_state_keys(
+    conn: sqlite3.Connection, campaign_id: str, keys: Iterable[str]
+) -> dict[str, Any] | None:
+    """Only the requested top-level keys (absent keys are omitted); None if the campaign does not exist."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {} if conn.execute("SELECT 1 FROM campaigns WHERE id = ?", (campaign_id,)).fetchone() else None
+    placeholders = ",".join("?" * len(keys))
+    try:
+        rows = conn.execute(
+            f"""SELECT j.key, j.type, j.value
+                FROM campaigns c
+                LEFT JOIN json_each(c.world_state_json) j
+                  ON j.key IN ({placeholders})
+                WHERE c.id = ?""",
+            (*keys, campaign_id),
+        ).fetchall()
+    except sqlite3.OperationalError as e:
+        logger.debug("Keyed world_state read fell back to a full load: %s", e)
+        state = load_world_state(conn, campaign_id)
+        return None if state is None else {k: state[k] for k in keys if k in state}
+    if not rows:
+        return None
+    return {row[0]: _json_value(row[1], row[2]) for row in rows if row[0] is not None}
+
+
+def _write_full(conn: sqlite3.Connection, campaign_id: str, world_state: dict[str, Any]) -> None:
+    conn.execute(
+        "UPDATE campaigns SET world_state_json = ? WHERE id = ?",
+        (json.dumps(world_state), campaign_id),
+    )
+
+
+def _patch(
+    conn: sqlite3.Connection, campaign_id: str, updates: dict[str, Any], remove: list[str]
+) -> bool:
+    """Apply updates/removals with json_set/json_remove. False if the row was not patchable."""
+    statements: list[tuple[str, list[Any]]] = []
+    items = list(updates.items())
+    for i in range(0, len(items), _MAX_KEYS_PER_STATEMENT):
+        chunk = items[i:i + _MAX_KEYS_PER_STATEMENT]
+        params: list[Any] = []
+        for key, value in chunk:
+            params += [_path(key), json.dumps(value)]
+        statements.append((f"json_set(world_state_json, {', '.join(['?, json(?)'] * len(chunk))})", params))
+    for i in range(0, len(remove), _MAX_KEYS_PER_STATEMENT):
+        chunk = remove[i:i + _MAX_KEYS_PER_STATEMENT]
+        statements.append((f"json_remove(world_state_json, {', '.join(['?'] * len(chunk))})", [_path(k) for k in chunk]))
+    for expr, params in statements:
+        cur = conn.execute(
+            f"UPDATE campaigns SET world_state_json = {expr} WHERE id = ? AND {_IS_OBJECT}",
+            (*params, campaign_id),
+        )
+        if cur.rowcount == 0:
+            return False
+    return True
+
+
+def set_world_state_keys(
+    conn: sqlite3.Connection,
+    campaign_id: str,
+    updates: Mapping[str, Any],
+    remove: Iterable[str] = (),
+) -> None:
+    """Set and/or remove top-level keys without rewriting the rest of the document in Python.
+
+    Does not commit; a missing campaign is a no-op (like the UPDATE it replaces).
+    """
+    updates = dict(updates)
+    remove = [k for k in dict.fromkeys(remove) if k not in updates]
+    if not updates and not remove:
+        return
+    if all(_path(k) is not None for k in (*updates, *remove)):
+        try:
+            if _patch(conn, campaign_id, updates, remove):
+                return
+        except sqlite3.OperationalError as e:
+            # Malformed stored JSON or a value JSON1 rejects (e.g. NaN): rewrite in full below.
+            logger.debug("world_state patch fell back to a full write: %s", e)
+    state = load_world_state(conn, campaign_id)
+    if state is None:
+        return
+    state.update(updates)
+    for key in remove:
+        state.pop(key, None)
+    _write_full(conn, campaign_id, state)
+
+
+def _changed(old: Any, new: Any) -> bool:
+    # True == 1 in Python but not in JSON; compare types at the top level too.
+    return type(old) is not type(new) or old != new
+
+
+def save_world_state(
+    conn: sqlite3.Connection,
+    campaign_id: str,
+    world_state: dict[str, Any],
+    previous: dict[str, Any] | None = None,
+) -> int:
+    """Persist world_state. Does not commit.
+
+    With previous (the stored state world_state was derived from, e.g. from
+    load_world_state inside the same transaction) only keys that differ are written
+    and removed keys are deleted. Returns the number of keys written (0 = no UPDATE).
+    Without previous the whole document is replaced.
+    """
+    if previous is None:
+        _write_full(conn, campaign_id, world_state)
+        return len(world_state)
+    updates = {
+        k: v for k, v in world_state.items()
+        if k not in previous or _changed(previous[k], v)
+    }
+    removed = [k for k in previous if k not in world_state]
+    set_world_state_keys(conn, campaign_id, updates, removed)
+    return len(updates) + len(removed)
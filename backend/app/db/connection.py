@@ -3,41 +3,323 @@
 Provides configured connections with:
 - sqlite3.Row row factory (dict-like access)
 - Foreign keys enabled (PRAGMA foreign_keys = ON)
+- WAL journal, synchronous=NORMAL, sized page cache, mmap and busy_timeout
+
+File databases are served from a per-path :class:`ConnectionPool`. ``close()`` on a
+pooled connection rolls back any open transaction and hands it back to the pool
+instead of closing it, so existing ``try/finally: conn.close()`` callers reuse
+connections without changes. ``close()`` is idempotent, and using a connection after
+it has been returned raises ``sqlite3.ProgrammingError``. Released connections go to
+one idle list of at most STORYTELLER_DB_POOL_SIZE connections, reused last-in first-out
+(a thread that closes and reopens gets the same warm connection back); connections
+released while the list is full are closed. Disable pooling with STORYTELLER_DB_POOL_SIZE=0.
 """
+import logging
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
 from collections.abc import Generator
 from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Open pools kept per database path; the least recently used is closed beyond this.
+_MAX_POOLS = 8
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool."""
+
+    _pool: "ConnectionPool | None" = None
+    _owned = False
+    _closed = False
+    _released = False
+    _file_id: tuple[int, int] | None = None
+    database_file: str | None = None
+
+    def close(self) -> None:
+        if self._released:
+            return
+        if self._pool is not None and not self._owned and not self._closed:
+            self._pool._release(self)
+            return
+        self._discard()
+
+    def _check_checked_out(self) -> None:
+        if self._released:
+            raise sqlite3.ProgrammingError("Cannot operate on a connection returned to its pool.")
+
+    def cursor(self, *args, **kwargs):
+        self._check_checked_out()
+        return super().cursor(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        self._check_checked_out()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._check_checked_out()
+        return super().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs):
+        self._check_checked_out()
+        return super().executescript(*args, **kwargs)
+
+    def commit(self) -> None:
+        self._check_checked_out()
+        super().commit()
+
+    def rollback(self) -> None:
+        self._check_checked_out()
+        super().rollback()
+
+    def _discard(self) -> None:
+        self._pool = None
+        self._released = False
+        self._closed = True
+        super().close()
+
+
+def _file_id(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    from backend.app.config import DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE_MB
+
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.OperationalError as e:
+        # e.g. filesystems without shared-memory support; rollback journal still works
+        logger.debug("WAL journal unavailable: %s", e)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{int(DB_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE_MB) * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+class ConnectionPool:
+    """Reusable, pre-configured connections to one database file.
+
+    Connections are created with check_same_thread=False; the pool guarantees a
+    connection has a single owner between checkout and ``close()``.
+    """
+
+    def __init__(self, db_path: str, max_idle: int) -> None:
+        self.db_path = db_path
+        self.max_idle = max(0, int(max_idle))
+        self._lock = threading.Lock()
+        self._idle: list[PooledConnection] = []
+        self._local = threading.local()
+        self._stats = {"opened": 0, "reused": 0, "returned": 0, "discarded": 0}
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def connection(self) -> PooledConnection:
+        """Check out a connection; ``close()`` returns it."""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
+            if self._usable(conn):
+                self._count("reused")
+                conn._released = False
+                return conn
+
+    def thread_connection(self) -> PooledConnection:
+        """The calling thread's long-lived connection (read helpers that never close it)."""
+        conn = getattr(self._local, "owned", None)
+        if conn is not None and not conn._closed and self._usable(conn):
+            return conn
+        conn = self._open()
+        conn._owned = True
+        self._local.owned = conn
+        return conn
 
+    def _release(self, conn: PooledConnection) -> None:
+        with self._lock:
+            # Two close() calls must not put one connection in two places.
+            if conn._released:
+                return
+            conn._released = True
+        try:
+            if conn.in_transaction:
+                sqlite3.Connection.rollback(conn)
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._drop(conn)
+            return
+        self._count("returned")
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        self._drop(conn)
 
-def get_connection(db_path: str) -> sqlite3.Connection:
+    def _open(self) -> PooledConnection:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=PooledConnection)
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn)
+        conn._pool = self
+        conn._file_id = _file_id(self.db_path)
+        conn.database_file = next(
+            (row[2] or None for row in conn.execute("PRAGMA database_list").fetchall() if row[1] == "main"),
+            None,
+        )
+        self._count("opened")
+        return conn
+
+    def _usable(self, conn: PooledConnection) -> bool:
+        """False (and the connection is dropped) if the file was deleted or replaced."""
+        if conn._file_id is not None and conn._file_id == _file_id(self.db_path):
+            return True
+        self._drop(conn)
+        return False
+
+    def _drop(self, conn: PooledConnection) -> None:
+        self._count("discarded")
+        try:
+            conn._discard()
+        except sqlite3.Error:
+            pass
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def close_idle(self) -> None:
+        """Close idle connections (thread-owned ones are dropped with their thread)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._drop(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"path": self.db_path, "idle": len(self._idle), "max_idle": self.max_idle, **self._stats}
+
+
+_pools: "OrderedDict[str, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """The shared pool for db_path (created on first use)."""
+    from backend.app.config import DB_POOL_SIZE
+
+    key = os.path.abspath(str(db_path))
+    evicted: list[ConnectionPool] = []
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key, DB_POOL_SIZE)
+            while len(_pools) > _MAX_POOLS:
+                evicted.append(_pools.popitem(last=False)[1])
+        else:
+            _pools.move_to_end(key)
+    for old in evicted:
+        old.close_idle()
+    return pool
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Metrics for every open pool (for /health/detail)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [p.stats() for p in pools]
+
+
+def close_pools() -> None:
+    """Close idle pooled connections and forget all pools (shutdown/tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_idle()
+
+
+def _pooling_enabled(db_path: str) -> bool:
+    from backend.app.config import DB_POOL_SIZE
+
+    return DB_POOL_SIZE > 0 and str(db_path) not in ("", ":memory:") and not str(db_path).startswith("file:")
+
+
+def get_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
     """Return a configured SQLite connection.
 
     Args:
         db_path: Path to the SQLite database file. Parent directories
                  are created if they do not exist.
+        check_same_thread: Only honoured for unpooled connections; pooled
+                 connections may be handed between threads (async turn
+                 pipeline) but must never be used from two threads at once.
 
     Returns:
-        sqlite3.Connection with row_factory=sqlite3.Row and foreign
-        keys enabled.
+        sqlite3.Connection with row_factory=sqlite3.Row, foreign keys
+        enabled and the pool pragmas applied.
 
     Note:
         Compatible with Windows paths. The connection does not
-        auto-close; callers must close it or use as a context manager.
+        auto-close; callers must close it (which returns it to the pool).
     """
+    if _pooling_enabled(db_path):
+        return get_pool(db_path).connection()
+
     path = Path(db_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(path))
+    conn = sqlite3.connect(str(path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    _apply_pragmas(conn)
     return conn
 
 
+def thread_connection(db_path: str) -> sqlite3.Connection:
+    """Long-lived connection owned by the calling thread (do not share across threads).
+
+    For read helpers such as KGRetriever that keep no transaction open between calls.
+    One per calling thread, outside the STORYTELLER_DB_POOL_SIZE idle bound.
+    """
+    if _pooling_enabled(db_path):
+        return get_pool(db_path).thread_connection()
+    return get_connection(db_path)
+
+
+def database_key(conn: sqlite3.Connection) -> str | None:
+    """File path of the connection's main database; None for in-memory/temp databases.
+
+    Used to key process-wide caches of per-database data.
+    """
+    pooled = getattr(conn, "database_file", None)
+    if pooled:
+        # Pooled connections resolve this once when opened.
+        return pooled
+    try:
+        for row in conn.execute("PRAGMA database_list").fetchall():
+            if row[1] == "main":
+                return row[2] or None
+    except Exception:
+        return None
+    return None
+
+
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     """FastAPI dependency that yields a SQLite connection.
 
     Uses DEFAULT_DB_PATH from project config. The connection is
-    automatically closed when the request finishes.
+    returned to the pool when the request finishes.
     """
     from backend.app.config import DEFAULT_DB_PATH
 
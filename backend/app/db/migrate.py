@@ -1,6 +1,10 @@
 """Schema migration: applies numbered SQL files from migrations/ in order.
 
 Idempotent: each migration name recorded in schema_migrations; applied once.
+Statements run one at a time, so an ADD COLUMN left behind by an interrupted run
+is skipped on retry without skipping the rest of that migration's script.
+Migrations that also need to rewrite existing rows register a Python data step
+in _DATA_MIGRATIONS; it runs right after the SQL, before the name is recorded.
 
 Usage:
     python -m backend.app.db.migrate --db ./data/storyteller.db
@@ -9,6 +13,7 @@ import argparse
 import sqlite3
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Callable
 
 SCHEMA_MIGRATIONS_TABLE = """
 CREATE TABLE IF NOT EXISTS schema_migrations (
@@ -20,6 +25,17 @@ CREATE TABLE IF NOT EXISTS schema_migrations (
 MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
 
 
+def _convert_episodic_embeddings(conn: sqlite3.Connection) -> None:
+    """0022: repack embedding_json vectors into embedding_blob."""
+    from backend.app.core.episodic_memory import convert_embedding_json_rows
+    convert_embedding_json_rows(conn)
+
+
+_DATA_MIGRATIONS: dict[str, Callable[[sqlite3.Connection], None]] = {
+    "0022_episodic_memory_embedding_blob": _convert_episodic_embeddings,
+}
+
+
 def _migration_files() -> list[Path]:
     """Return sorted list of .sql files in migrations/ (0001_*.sql, 0002_*.sql, ...)."""
     if not MIGRATIONS_DIR.exists():
@@ -28,6 +44,31 @@ def _migration_files() -> list[Path]:
     return files
 
 
+def _split_statements(sql: str) -> list[str]:
+    """Split a migration script into complete statements (trigger bodies stay whole)."""
+    statements: list[str] = []
+    buf = ""
+    for line in sql.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statements.append(buf)
+            buf = ""
+    if buf.strip():
+        statements.append(buf)
+    return statements
+
+
+def _execute_migration(conn: sqlite3.Connection, sql: str) -> None:
+    """Run a migration script statement by statement, skipping columns that already exist."""
+    for statement in _split_statements(sql):
+        try:
+            conn.execute(statement)
+        except sqlite3.OperationalError as e:
+            if "duplicate column" in str(e).lower():
+                continue
+            raise
+
+
 def apply_schema(db_path: str) -> None:
     """Apply all pending migrations from migrations/ in order."""
     path = Path(db_path)
@@ -50,13 +91,10 @@ def apply_schema(db_path: str) -> None:
             if cursor.fetchone():
                 continue
             sql = fp.read_text(encoding="utf-8")
-            try:
-                conn.executescript(sql)
-            except sqlite3.OperationalError as e:
-                if "duplicate column" in str(e).lower():
-                    pass
-                else:
-                    raise
+            _execute_migration(conn, sql)
+            data_step = _DATA_MIGRATIONS.get(name)
+            if data_step is not None:
+                data_step(conn)
             now = datetime.now(timezone.utc).isoformat()
             cursor.execute(
                 "INSERT INTO schema_migrations (name, applied_at) VALUES (?, ?)",
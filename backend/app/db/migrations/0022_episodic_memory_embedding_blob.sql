@@ -0,0 +1,7 @@
+-- Store episodic memory embeddings as packed binary vectors instead of JSON text.
+-- embedding_blob holds float32 bytes, or int8 bytes when embedding_scale is set
+-- (component = byte * embedding_scale). Existing embedding_json rows are converted
+-- by the data step registered for this migration in migrate.py, which then clears
+-- embedding_json.
+ALTER TABLE episodic_memories ADD COLUMN embedding_blob BLOB;
+ALTER TABLE episodic_memories ADD COLUMN embedding_scale REAL;
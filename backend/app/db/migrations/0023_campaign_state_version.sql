@@ -0,0 +1,87 @@
+-- Change counter for everything build_initial_gamestate reads, so the hot GameState
+-- snapshot cache (core/state_loader.py) can validate with one indexed lookup.
+-- Every write to the campaign row's loaded columns, its characters, their inventory,
+-- its turn events or rendered turns bumps campaigns.state_version via the triggers below.
+
+ALTER TABLE campaigns ADD COLUMN state_version INTEGER NOT NULL DEFAULT 0;
+
+CREATE TRIGGER IF NOT EXISTS trg_campaigns_state_version
+AFTER UPDATE OF title, time_period, world_state_json, world_time_minutes ON campaigns
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_insert_state_version
+AFTER INSERT ON characters
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = NEW.campaign_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_update_state_version
+AFTER UPDATE ON characters
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id IN (OLD.campaign_id, NEW.campaign_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_characters_delete_state_version
+AFTER DELETE ON characters
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = OLD.campaign_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_inventory_insert_state_version
+AFTER INSERT ON inventory
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1
+  WHERE id = (SELECT campaign_id FROM characters WHERE id = NEW.owner_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_inventory_update_state_version
+AFTER UPDATE ON inventory
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1
+  WHERE id IN (SELECT campaign_id FROM characters WHERE id IN (OLD.owner_id, NEW.owner_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_inventory_delete_state_version
+AFTER DELETE ON inventory
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1
+  WHERE id = (SELECT campaign_id FROM characters WHERE id = OLD.owner_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_turn_events_insert_state_version
+AFTER INSERT ON turn_events
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = NEW.campaign_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_turn_events_update_state_version
+AFTER UPDATE ON turn_events
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id IN (OLD.campaign_id, NEW.campaign_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_turn_events_delete_state_version
+AFTER DELETE ON turn_events
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = OLD.campaign_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rendered_turns_insert_state_version
+AFTER INSERT ON rendered_turns
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = NEW.campaign_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rendered_turns_update_state_version
+AFTER UPDATE ON rendered_turns
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id IN (OLD.campaign_id, NEW.campaign_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rendered_turns_delete_state_version
+AFTER DELETE ON rendered_turns
+BEGIN
+  UPDATE campaigns SET state_version = state_version + 1 WHERE id = OLD.campaign_id;
+END;
@@ -0,0 +1,17 @@
+-- Per-batch checkpoints for `storyteller extract-knowledge` (backend/app/kg/scheduler.py).
+-- Chapters are extracted as several LLM batches running concurrently; a batch row is
+-- written in the same transaction as that batch's entities, triples and summary, so
+-- --resume skips exactly the batches whose results are already in the KG.
+-- batch_key is a hash of (book, chapter, chunk ids) and stays stable across runs.
+
+CREATE TABLE IF NOT EXISTS kg_extraction_batches (
+    batch_key TEXT PRIMARY KEY,
+    book_title TEXT NOT NULL,
+    chapter_title TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error_message TEXT,
+    completed_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_kg_extraction_batches_chapter
+    ON kg_extraction_batches(book_title, chapter_title);
@@ -8,6 +8,7 @@ from __future__ import annotations
 import logging
 import re
 import unicodedata
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -70,11 +71,102 @@ def slugify(name: str) -> str:
     return name.strip("_")
 
 
+# Fuzzy-match radius used by resolve_entity_id.
+_MAX_EDIT_DISTANCE = 2
+
+
+class EntityIndex(MutableMapping):
+    """name_lower -> entity_id cache with a fuzzy-lookup index.
+
+    Drop-in for the plain dict resolve_entity_id used to scan linearly. Candidates within
+    Levenshtein distance 2 come from a partition index: every name is split into three
+    segments, and any string within two edits of it contains at least one segment
+    unchanged, shifted by at most two positions. A query therefore probes a few dozen
+    (length, segment) keys instead of every name. A slug map replaces the second scan.
+    Ties resolve to the earliest-inserted name, exactly as the linear scan did.
+    """
+
+    def __init__(self, entries: Mapping[str, str] | None = None) -> None:
+        self._ids: dict[str, str] = {}
+        self._order: dict[str, int] = {}
+        self._segments: dict[tuple[int, int, str], list[str]] = {}
+        self._slugs: dict[str, str] = {}
+        if entries:
+            self.update(entries)
+
+    def __getitem__(self, name: str) -> str:
+        return self._ids[name]
+
+    def __setitem__(self, name: str, entity_id: str) -> None:
+        if name not in self._ids:
+            self._order[name] = len(self._order)
+            for seg_key in _segment_keys(name):
+                self._segments.setdefault(seg_key, []).append(name)
+            self._slugs.setdefault(slugify(name), name)
+        self._ids[name] = entity_id
+
+    def __delitem__(self, name: str) -> None:
+        del self._ids[name]
+        entries = self._ids
+        self._ids, self._order, self._segments, self._slugs = {}, {}, {}, {}
+        self.update(entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def fuzzy_match(self, name: str, max_distance: int = _MAX_EDIT_DISTANCE) -> str | None:
+        """Earliest-inserted cached name within max_distance edits of name (<= 2 supported)."""
+        best: str | None = None
+        best_order = len(self._order)
+        seen: set[str] = set()
+        n = len(name)
+        for length in range(max(0, n - max_distance), n + max_distance + 1):
+            for seg, (start, seg_len) in enumerate(_segments_for(length)):
+                lo = max(0, start - max_distance)
+                hi = min(n - seg_len, start + max_distance)
+                for pos in range(lo, hi + 1):
+                    for cand in self._segments.get((length, seg, name[pos:pos + seg_len]), ()):
+                        if cand in seen:
+                            continue
+                        seen.add(cand)
+                        order = self._order[cand]
+                        if order < best_order and _bounded_levenshtein(name, cand, max_distance) <= max_distance:
+                            best, best_order = cand, order
+        return best
+
+    def slug_match(self, slug: str) -> str | None:
+        """Earliest-inserted cached name whose slug equals slug."""
+        return self._slugs.get(slug)
+
+
+def _segments_for(length: int) -> list[tuple[int, int]]:
+    """(start, length) of the _MAX_EDIT_DISTANCE + 1 segments a string of this length is split into."""
+    parts = _MAX_EDIT_DISTANCE + 1
+    base, extra = divmod(length, parts)
+    out = []
+    start = 0
+    for i in range(parts):
+        seg_len = base + (1 if i >= parts - extra else 0)
+        out.append((start, seg_len))
+        start += seg_len
+    return out
+
+
+def _segment_keys(name: str) -> list[tuple[int, int, str]]:
+    return [
+        (len(name), i, name[start:start + seg_len])
+        for i, (start, seg_len) in enumerate(_segments_for(len(name)))
+    ]
+
+
 def resolve_entity_id(
     name: str,
     entity_type: str,
     alias_lookup: dict[str, str],
-    existing_entities: dict[str, str] | None = None,
+    existing_entities: dict[str, str] | EntityIndex | None = None,
 ) -> str:
     """Resolve an entity name to a canonical ID.
 
@@ -89,36 +181,61 @@ def resolve_entity_id(
         entity_type: Entity type (CHARACTER, LOCATION, etc.).
         alias_lookup: Pre-built lowercase alias -> canonical_id mapping.
         existing_entities: Cache of name_lower -> entity_id for already-seen entities.
+            Pass an EntityIndex when resolving many names against the same cache;
+            a plain dict is indexed on every call.
 
     Returns:
         Canonical entity ID string.
     """
     name_clean = name.strip()
     name_lower = name_clean.lower()
-    existing_entities = existing_entities or {}
 
     # 1. Alias lookup (works for any entity type but primarily for characters)
     if name_lower in alias_lookup:
         return alias_lookup[name_lower]
 
+    if not existing_entities:
+        return slugify(name_clean)
+
     # 2. Exact match in existing entity cache
     if name_lower in existing_entities:
         return existing_entities[name_lower]
 
+    index = existing_entities if isinstance(existing_entities, EntityIndex) else EntityIndex(existing_entities)
+
     # 3. Fuzzy match against existing entities (Levenshtein <= 2)
-    slug = slugify(name_clean)
-    for cached_name, cached_id in existing_entities.items():
-        if _levenshtein(name_lower, cached_name) <= 2:
-            return cached_id
+    match = index.fuzzy_match(name_lower)
+    if match is not None:
+        return index[match]
     # Also check slug against existing cache values
-    for cached_name, cached_id in existing_entities.items():
-        if slugify(cached_name) == slug:
-            return cached_id
+    slug = slugify(name_clean)
+    match = index.slug_match(slug)
+    if match is not None:
+        return index[match]
 
     # 4. Generate new slug
     return slug
 
 
+def resolve_entity_ids(
+    names: Iterable[tuple[str, str]],
+    alias_lookup: dict[str, str],
+    index: EntityIndex | None = None,
+) -> list[str]:
+    """Resolve a batch of (name, entity_type) pairs in order, recording each in index.
+
+    Equivalent to calling resolve_entity_id for each pair and storing
+    ``index[name.lower()] = entity_id`` after it, as extraction does.
+    """
+    index = index if index is not None else EntityIndex()
+    resolved = []
+    for name, entity_type in names:
+        entity_id = resolve_entity_id(name, entity_type, alias_lookup, index)
+        index[name.lower()] = entity_id
+        resolved.append(entity_id)
+    return resolved
+
+
 def merge_entity_properties(existing: dict, new: dict) -> dict:
     """Merge properties from a new extraction into existing entity properties.
 
@@ -140,6 +257,32 @@ def merge_entity_properties(existing: dict, new: dict) -> dict:
     return merged
 
 
+def _bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """Levenshtein distance if it is <= max_distance, else max_distance + 1.
+
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and the scan stops
+    as soon as a whole row exceeds the bound.
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    over = max_distance + 1
+    prev_row = [j if j <= max_distance else over for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1, start=1):
+        lo = max(1, i - max_distance)
+        hi = min(len(s2), i + max_distance)
+        curr_row = [over] * (len(s2) + 1)
+        curr_row[0] = i if i <= max_distance else over
+        for j in range(lo, hi + 1):
+            cost = 0 if c1 == s2[j - 1] else 1
+            curr_row[j] = min(curr_row[j - 1] + 1, prev_row[j] + 1, prev_row[j - 1] + cost, over)
+        if min(curr_row[max(0, lo - 1):hi + 1]) > max_distance:
+            return over
+        prev_row = curr_row
+    return prev_row[-1]
+
+
 def _levenshtein(s1: str, s2: str) -> int:
     """Compute Levenshtein distance between two strings."""
     if len(s1) < len(s2):
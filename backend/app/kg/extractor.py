@@ -12,7 +12,7 @@ from typing import Any
 
 from backend.app.core.agents.base import AgentLLM
 from backend.app.core.json_reliability import call_with_json_reliability
-from backend.app.kg.entity_resolution import resolve_entity_id, slugify
+from backend.app.kg.entity_resolution import EntityIndex, resolve_entity_id, resolve_entity_ids, slugify
 from backend.app.kg.predicates import VALID_PREDICATES, ENTITY_TYPES
 from backend.app.kg.store import KGStore
 
@@ -99,6 +99,10 @@ def _build_user_prompt(
 
 # ── Result dataclass ──────────────────────────────────────────────────
 
+# Warning on a result whose LLM call raised (nothing was extracted; worth retrying).
+LLM_FAILURE_WARNING = "LLM extraction failed"
+
+
 @dataclass
 class ExtractionResult:
     """Result of extracting knowledge from a batch of chunks."""
@@ -168,7 +172,7 @@ def extract_from_chunks(
         )
     except Exception:
         logger.exception("KG extraction failed for %s / %s", book_title, chapter_title)
-        return ExtractionResult(warnings=["LLM extraction failed"])
+        return ExtractionResult(warnings=[LLM_FAILURE_WARNING])
 
     # Parse and normalize the raw data
     result = _normalize_extraction(raw_data, era, alias_lookup, book_title)
@@ -200,8 +204,8 @@ def _normalize_extraction(
     triples: list[dict] = []
     warnings: list[str] = []
 
-    # Build an entity name -> resolved_id cache for this batch
-    entity_cache: dict[str, str] = {}
+    # Build an entity name -> resolved_id cache for this batch (indexed for fuzzy lookups)
+    entity_cache = EntityIndex()
 
     # Process entities
     for raw_ent in raw.get("entities", []):
@@ -298,12 +302,9 @@ def _normalize_extraction(
         })
 
         # Create PARTICIPATED_IN triples for each participant
-        for participant in participants:
-            p_name = str(participant).strip()
-            if not p_name:
-                continue
-            p_id = resolve_entity_id(p_name, "CHARACTER", alias_lookup, entity_cache)
-            entity_cache[p_name.lower()] = p_id
+        p_names = [p for p in (str(participant).strip() for participant in participants) if p]
+        p_ids = resolve_entity_ids(((p, "CHARACTER") for p in p_names), alias_lookup, entity_cache)
+        for p_id in p_ids:
             triples.append({
                 "subject_id": p_id,
                 "predicate": "PARTICIPATED_IN",
@@ -332,57 +333,67 @@ def store_extraction_result(
     chapter_index: int = 0,
     source_chunk_ids: list[str] | None = None,
 ) -> None:
-    """Persist extraction results to the KGStore."""
+    """Persist extraction results to the KGStore (bulk upserts, one transaction)."""
     chunk_id = source_chunk_ids[0] if source_chunk_ids else None
 
-    # Build set of known entity IDs from this extraction
-    known_ids = {ent["id"] for ent in result.entities}
-
-    for ent in result.entities:
-        store.upsert_entity(
-            entity_id=ent["id"],
-            entity_type=ent["entity_type"],
-            canonical_name=ent["canonical_name"],
-            era=ent["era"],
-            properties=ent.get("properties"),
-            source_book=ent.get("source_book", book_title),
-        )
+    entities = [
+        {
+            "id": ent["id"],
+            "entity_type": ent["entity_type"],
+            "canonical_name": ent["canonical_name"],
+            "era": ent["era"],
+            "properties": ent.get("properties"),
+            "source_book": ent.get("source_book", book_title),
+        }
+        for ent in result.entities
+    ]
 
     # Ensure all triple endpoints exist as entities before inserting triples
-    for triple in result.triples:
-        for endpoint_id in (triple["subject_id"], triple["object_id"]):
-            if endpoint_id not in known_ids and store.get_entity(endpoint_id) is None:
-                # Create a stub entity so the foreign key is satisfied
-                store.upsert_entity(
-                    entity_id=endpoint_id,
-                    entity_type="CHARACTER",  # default assumption
-                    canonical_name=endpoint_id.replace("_", " ").title(),
-                    era=era,
-                    source_book=book_title,
-                    confidence=0.5,  # low confidence for stub entities
-                )
-                known_ids.add(endpoint_id)
-
-    for triple in result.triples:
-        store.upsert_triple(
-            subject_id=triple["subject_id"],
-            predicate=triple["predicate"],
-            object_id=triple["object_id"],
-            era=triple["era"],
-            source_book=triple.get("source_book", book_title),
-            source_chunk_id=chunk_id,
-            properties={"context": triple.get("context", "")},
-        )
-
-    if result.chapter_summary:
-        store.add_summary(
-            summary_type="CHAPTER",
-            summary_text=result.chapter_summary,
-            era=era,
-            book_title=book_title,
-            chapter_title=chapter_title,
-            chapter_index=chapter_index,
+    known_ids = {ent["id"] for ent in result.entities}
+    endpoints = [
+        endpoint_id
+        for triple in result.triples
+        for endpoint_id in (triple["subject_id"], triple["object_id"])
+        if endpoint_id not in known_ids
+    ]
+    known_ids |= store.existing_entity_ids(endpoints)
+    for endpoint_id in endpoints:
+        if endpoint_id in known_ids:
+            continue
+        # Create a stub entity so the foreign key is satisfied
+        entities.append({
+            "id": endpoint_id,
+            "entity_type": "CHARACTER",  # default assumption
+            "canonical_name": endpoint_id.replace("_", " ").title(),
+            "era": era,
+            "source_book": book_title,
+            "confidence": 0.5,  # low confidence for stub entities
+        })
+        known_ids.add(endpoint_id)
+
+    with store.transaction():
+        store.upsert_entities(entities)
+        store.upsert_triples(
+            {
+                "subject_id": triple["subject_id"],
+                "predicate": triple["predicate"],
+                "object_id": triple["object_id"],
+                "era": triple["era"],
+                "source_book": triple.get("source_book", book_title),
+                "source_chunk_id": chunk_id,
+                "properties": {"context": triple.get("context", "")},
+            }
+            for triple in result.triples
         )
+        if result.chapter_summary:
+            store.add_summary(
+                summary_type="CHAPTER",
+                summary_text=result.chapter_summary,
+                era=era,
+                book_title=book_title,
+                chapter_title=chapter_title,
+                chapter_index=chapter_index,
+            )
 
 
 def _closest_predicate(candidate: str) -> str | None:
@@ -0,0 +1,273 @@
+"""Concurrent, resumable batch scheduler behind ``storyteller extract-knowledge``.
+
+Extraction is dominated by LLM latency (~50 s per batch on a local model), and the
+old loop ran one batch at a time. Here every (book, chapter, batch) is planned up
+front, ``concurrency`` worker threads run the LLM calls (each with its own AgentLLM),
+and the calling thread is the only KG writer:
+
+- results are written in plan order, so the KG ends up the same as a serial run;
+- each batch's entities, triples, summary and checkpoint go in one transaction, so
+  a crash never leaves a half-written batch behind;
+- batches are checkpointed individually (kg_extraction_batches), so ``--resume``
+  re-runs only batches that failed or never finished, not whole chapters.
+
+A chapter checkpoint is set to completed once all of its batches are stored, or to
+failed if any batch failed. The default concurrency comes from
+STORYTELLER_KG_EXTRACTION_CONCURRENCY (default 4); Ollama only serves that many
+requests at once when OLLAMA_NUM_PARALLEL is at least as high.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.app.config import KG_EXTRACTION_CONCURRENCY
+from backend.app.kg.extractor import (
+    LLM_FAILURE_WARNING,
+    ExtractionResult,
+    extract_from_chunks,
+    store_extraction_result,
+)
+from backend.app.kg.store import KGStore
+
+logger = logging.getLogger(__name__)
+
+_FAILED_ERROR = "extraction exception"
+
+
+@dataclass(frozen=True)
+class ExtractionBatch:
+    """One LLM call's worth of parent chunks from a single chapter."""
+
+    key: str
+    book_title: str
+    chapter_title: str
+    chapter_index: int
+    chunks: list[dict] = field(hash=False, compare=False)
+
+    @property
+    def chunk_ids(self) -> list[str]:
+        return [c.get("chunk_id", "") for c in self.chunks]
+
+
+@dataclass
+class ExtractionStats:
+    """Totals for one scheduler run (printed by the command)."""
+
+    books: int = 0
+    batches_total: int = 0
+    batches_stored: int = 0
+    batches_skipped: int = 0
+    batches_failed: int = 0
+    chapters_completed: int = 0
+    chapters_skipped: int = 0
+    chapters_failed: int = 0
+    entities: int = 0
+    triples: int = 0
+    summaries: int = 0
+
+
+def batch_key(book_title: str, chapter_title: str, chunks: list[dict]) -> str:
+    """Stable checkpoint key for a batch: its book, chapter and chunk IDs."""
+    ids = [
+        c.get("chunk_id") or hashlib.sha256(str(c.get("text", "")).encode("utf-8")).hexdigest()
+        for c in chunks
+    ]
+    payload = json.dumps([book_title, chapter_title, ids], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def plan_batches(
+    chunks_by_book: dict[str, dict[str, list[dict]]], batch_size: int
+) -> list[ExtractionBatch]:
+    """Split every chapter into batches, in the order the serial loop used."""
+    batch_size = max(1, int(batch_size))
+    batches: list[ExtractionBatch] = []
+    for book_title in sorted(chunks_by_book):
+        chapters = chunks_by_book[book_title]
+        for chapter_idx, chapter_title in enumerate(sorted(chapters)):
+            chunks = chapters[chapter_title]
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                batches.append(ExtractionBatch(
+                    key=batch_key(book_title, chapter_title, batch),
+                    book_title=book_title,
+                    chapter_title=chapter_title,
+                    chapter_index=chapter_idx,
+                    chunks=batch,
+                ))
+    return batches
+
+
+def run_extraction(
+    batches: list[ExtractionBatch],
+    kg_store: KGStore,
+    llm_factory: Callable[[], Any],
+    *,
+    era: str,
+    alias_lookup: dict[str, str],
+    known_characters: list[str] | None = None,
+    concurrency: int | None = None,
+    resume: bool = False,
+    on_batch: Callable[[ExtractionBatch], None] | None = None,
+    extract: Callable[..., ExtractionResult] = extract_from_chunks,
+) -> ExtractionStats:
+    """Extract and store every batch; returns totals.
+
+    llm_factory is called once per worker thread (AgentLLM is not shared across
+    threads). With resume, chapters already completed and batches already stored
+    are skipped. on_batch is called once per batch, skipped ones included, after it
+    is handled (progress bars).
+    """
+    concurrency = KG_EXTRACTION_CONCURRENCY if concurrency is None else max(1, int(concurrency))
+    stats = ExtractionStats(batches_total=len(batches))
+    stats.books = len({b.book_title for b in batches})
+
+    done_keys: set[str] = set()
+    skipped_chapters: set[tuple[str, str]] = set()
+    if resume:
+        for ck in dict.fromkeys((b.book_title, b.chapter_title) for b in batches):
+            if kg_store.get_checkpoint_status(ck[0], ck[1]) == "completed":
+                skipped_chapters.add(ck)
+        stats.chapters_skipped = len(skipped_chapters)
+        done_keys = kg_store.completed_batches(
+            b.key for b in batches if (b.book_title, b.chapter_title) not in skipped_chapters
+        )
+
+    pending: list[ExtractionBatch] = []
+    remaining: dict[tuple[str, str], int] = {}
+    for b in batches:
+        ck = (b.book_title, b.chapter_title)
+        if ck in skipped_chapters or b.key in done_keys:
+            stats.batches_skipped += 1
+            if on_batch is not None:
+                on_batch(b)
+            continue
+        pending.append(b)
+        remaining[ck] = remaining.get(ck, 0) + 1
+
+    # Chapters whose batches were all stored before an interrupted run finished them.
+    for ck in dict.fromkeys((b.book_title, b.chapter_title) for b in batches):
+        if ck not in skipped_chapters and ck not in remaining:
+            kg_store.set_checkpoint(ck[0], "completed", chapter_title=ck[1])
+            stats.chapters_completed += 1
+
+    failed_chapters: set[tuple[str, str]] = set()
+    started_chapters: set[tuple[str, str]] = set()
+    local = threading.local()
+
+    def _extract(batch: ExtractionBatch) -> ExtractionResult:
+        llm = getattr(local, "llm", None)
+        if llm is None:
+            llm = local.llm = llm_factory()
+        return extract(
+            batch.chunks, batch.book_title, batch.chapter_title, era,
+            llm, alias_lookup, known_characters,
+        )
+
+    def _start(batch: ExtractionBatch) -> None:
+        ck = (batch.book_title, batch.chapter_title)
+        if ck not in started_chapters:
+            started_chapters.add(ck)
+            kg_store.set_checkpoint(batch.book_title, "in_progress", chapter_title=batch.chapter_title)
+
+    def _write(batch: ExtractionBatch, result: ExtractionResult | None, error: BaseException | None) -> None:
+        ck = (batch.book_title, batch.chapter_title)
+        if error is None and LLM_FAILURE_WARNING in result.warnings:
+            error = RuntimeError(LLM_FAILURE_WARNING)
+        remaining[ck] -= 1
+        last = remaining[ck] == 0
+
+        if error is None:
+            try:
+                with kg_store.transaction():
+                    store_extraction_result(
+                        result, kg_store, batch.book_title, batch.chapter_title, era,
+                        chapter_index=batch.chapter_index,
+                        source_chunk_ids=batch.chunk_ids,
+                    )
+                    kg_store.set_batch_checkpoint(
+                        batch.key, batch.book_title, "completed", chapter_title=batch.chapter_title,
+                    )
+                    if last and ck not in failed_chapters:
+                        kg_store.set_checkpoint(batch.book_title, "completed", chapter_title=batch.chapter_title)
+            except Exception as e:
+                error = e
+            else:
+                stats.batches_stored += 1
+                stats.entities += len(result.entities)
+                stats.triples += len(result.triples)
+                if result.chapter_summary:
+                    stats.summaries += 1
+                for w in result.warnings:
+                    logger.warning("[%s/%s] %s", batch.book_title[:30], batch.chapter_title[:20], w)
+                if last and ck not in failed_chapters:
+                    stats.chapters_completed += 1
+
+        if error is not None:
+            logger.error(
+                "Extraction failed for %s / %s", batch.book_title, batch.chapter_title, exc_info=error,
+            )
+            stats.batches_failed += 1
+            failed_chapters.add(ck)
+            with kg_store.transaction():
+                kg_store.set_batch_checkpoint(
+                    batch.key, batch.book_title, "failed",
+                    chapter_title=batch.chapter_title, error=_FAILED_ERROR,
+                )
+                kg_store.set_checkpoint(
+                    batch.book_title, "failed", chapter_title=batch.chapter_title, error=_FAILED_ERROR,
+                )
+
+        if last and ck in failed_chapters:
+            stats.chapters_failed += 1
+            if error is None:
+                kg_store.set_checkpoint(
+                    batch.book_title, "failed", chapter_title=batch.chapter_title, error=_FAILED_ERROR,
+                )
+        if on_batch is not None:
+            on_batch(batch)
+
+    if concurrency <= 1 or len(pending) <= 1:
+        for batch in pending:
+            _start(batch)
+            try:
+                result, error = _extract(batch), None
+            except Exception as e:
+                result, error = None, e
+            _write(batch, result, error)
+        return stats
+
+    # Results are written in plan order; keep a bounded window of batches in flight so
+    # one slow batch holds back at most 2 x concurrency finished results.
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="kg-extract")
+    try:
+        in_flight: deque[tuple[ExtractionBatch, Future]] = deque()
+        it = iter(pending)
+
+        def _submit_next() -> None:
+            batch = next(it, None)
+            if batch is not None:
+                _start(batch)
+                in_flight.append((batch, pool.submit(_extract, batch)))
+
+        for _ in range(concurrency * 2):
+            _submit_next()
+        while in_flight:
+            batch, fut = in_flight.popleft()
+            _submit_next()
+            try:
+                result, error = fut.result(), None
+            except Exception as e:
+                result, error = None, e
+            _write(batch, result, error)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return stats
@@ -1,13 +1,16 @@
 """SQLite-backed knowledge graph store.
 
 Provides CRUD for entities, triples, summaries, and extraction checkpoints.
-All writes use upsert semantics for idempotent extraction runs.
+All writes use upsert semantics for idempotent extraction runs; upsert_entities and
+upsert_triples write whole batches with one executemany per table.
 """
 from __future__ import annotations
 
 import json
 import logging
 import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -16,6 +19,9 @@ from backend.app.kg.predicates import VALID_PREDICATES, ENTITY_TYPES
 logger = logging.getLogger(__name__)
 
 _MIGRATION_FILE = Path(__file__).resolve().parent.parent / "db" / "migrations" / "0005_knowledge_graph.sql"
+_BATCHES_MIGRATION_FILE = (
+    Path(__file__).resolve().parent.parent / "db" / "migrations" / "0024_kg_extraction_batches.sql"
+)
 
 
 class KGStore:
@@ -27,26 +33,54 @@ class KGStore:
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
+        # Nesting depth of transaction(); writes only commit at depth 0.
+        self._tx_depth = 0
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
-        """Apply the KG migration if tables don't exist."""
+        """Apply the KG migrations if tables don't exist."""
         cursor = self.conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='kg_entities'"
         )
-        if cursor.fetchone() is not None:
-            return
-        if _MIGRATION_FILE.exists():
-            sql = _MIGRATION_FILE.read_text(encoding="utf-8")
+        if cursor.fetchone() is None:
+            if _MIGRATION_FILE.exists():
+                sql = _MIGRATION_FILE.read_text(encoding="utf-8")
+            else:
+                logger.warning("KG migration file not found at %s, using inline schema", _MIGRATION_FILE)
+                sql = _INLINE_SCHEMA
+            self.conn.executescript(sql)
+        # Batch checkpoints came later; databases created by older runs lack the table.
+        if _BATCHES_MIGRATION_FILE.exists():
+            self.conn.executescript(_BATCHES_MIGRATION_FILE.read_text(encoding="utf-8"))
         else:
-            logger.warning("KG migration file not found at %s, using inline schema", _MIGRATION_FILE)
-            sql = _INLINE_SCHEMA
-        self.conn.executescript(sql)
+            self.conn.executescript(_INLINE_BATCHES_SCHEMA)
         self.conn.commit()
 
     def close(self) -> None:
         self.conn.close()
 
+    @contextmanager
+    def transaction(self) -> Iterator[KGStore]:
+        """Group writes into one commit; rolls everything back if the block raises.
+
+        Nested blocks join the outermost transaction.
+        """
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.rollback()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self.conn.commit()
+
+    def _commit(self) -> None:
+        if self._tx_depth == 0:
+            self.conn.commit()
+
     # ── Entities ──────────────────────────────────────────────────────
 
     def upsert_entity(
@@ -60,48 +94,91 @@ class KGStore:
         confidence: float = 1.0,
     ) -> None:
         """Insert or update an entity. Merges source_books list and properties."""
-        entity_type = entity_type.upper()
-        if entity_type not in ENTITY_TYPES:
-            logger.warning("Unknown entity_type %r for %r, storing anyway", entity_type, entity_id)
+        self.upsert_entities([{
+            "id": entity_id,
+            "entity_type": entity_type,
+            "canonical_name": canonical_name,
+            "era": era,
+            "properties": properties,
+            "source_book": source_book,
+            "confidence": confidence,
+        }])
+
+    def upsert_entities(self, entities: Iterable[dict]) -> int:
+        """Bulk upsert_entity: one read, one executemany and one commit for the batch.
+
+        Each dict has id, entity_type, canonical_name, era and optionally properties,
+        source_book and confidence. Rows are merged in memory in list order, exactly as
+        calling upsert_entity for each would; returns the number of distinct entities.
+        """
+        merged: dict[str, dict] = {}
+        for ent in entities:
+            entity_type = str(ent["entity_type"]).upper()
+            if entity_type not in ENTITY_TYPES:
+                logger.warning("Unknown entity_type %r for %r, storing anyway", entity_type, ent["id"])
+            source_book = ent.get("source_book")
+            row = merged.get(ent["id"])
+            if row is None:
+                merged[ent["id"]] = {
+                    "entity_type": entity_type,
+                    "canonical_name": ent["canonical_name"],
+                    "era": ent["era"],
+                    "properties": dict(ent.get("properties") or {}),
+                    "source_books": [source_book] if source_book else [],
+                    "confidence": ent.get("confidence", 1.0),
+                }
+                continue
+            if source_book and source_book not in row["source_books"]:
+                row["source_books"].append(source_book)
+            row["properties"] = _merge_properties(row["properties"], ent.get("properties") or {})
+            row["confidence"] = max(ent.get("confidence", 1.0), row["confidence"])
+        if not merged:
+            return 0
+
+        # Existing rows keep their type/name/era; the batch merges into them.
+        for existing in self._fetch_entities(list(merged)):
+            row = merged[existing["id"]]
+            books = json.loads(existing["source_books_json"] or "[]")
+            books.extend(b for b in row["source_books"] if b not in books)
+            row["source_books"] = books
+            row["properties"] = _merge_properties(
+                json.loads(existing["properties_json"] or "{}"), row["properties"]
+            )
+            row["confidence"] = max(row["confidence"], existing["confidence"])
 
-        properties = properties or {}
         now = datetime.now(timezone.utc).isoformat()
-
-        existing = self.get_entity(entity_id)
-        if existing is None:
-            source_books = [source_book] if source_book else []
-            self.conn.execute(
+        with self.transaction():
+            self.conn.executemany(
                 "INSERT INTO kg_entities (id, entity_type, canonical_name, era, properties_json, "
                 "source_books_json, confidence, created_at, updated_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    entity_id, entity_type, canonical_name, era,
-                    json.dumps(properties), json.dumps(source_books),
-                    confidence, now, now,
-                ),
-            )
-        else:
-            # Merge source_books
-            existing_books = json.loads(existing["source_books_json"] or "[]")
-            if source_book and source_book not in existing_books:
-                existing_books.append(source_book)
-
-            # Merge properties: union lists, keep most specific scalars
-            existing_props = json.loads(existing["properties_json"] or "{}")
-            merged_props = _merge_properties(existing_props, properties)
-
-            # Keep highest confidence
-            new_confidence = max(confidence, existing["confidence"])
-
-            self.conn.execute(
-                "UPDATE kg_entities SET properties_json=?, source_books_json=?, "
-                "confidence=?, updated_at=? WHERE id=?",
-                (
-                    json.dumps(merged_props), json.dumps(existing_books),
-                    new_confidence, now, entity_id,
-                ),
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET properties_json=excluded.properties_json, "
+                "source_books_json=excluded.source_books_json, confidence=excluded.confidence, "
+                "updated_at=excluded.updated_at",
+                [
+                    (
+                        entity_id, row["entity_type"], row["canonical_name"], row["era"],
+                        json.dumps(row["properties"]), json.dumps(row["source_books"]),
+                        row["confidence"], now, now,
+                    )
+                    for entity_id, row in merged.items()
+                ],
             )
-        self.conn.commit()
+        return len(merged)
+
+    def _fetch_entities(self, entity_ids: list[str]) -> list[sqlite3.Row]:
+        rows: list[sqlite3.Row] = []
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(entity_ids), 500):
+            part = entity_ids[start:start + 500]
+            rows.extend(self.conn.execute(
+                f"SELECT * FROM kg_entities WHERE id IN ({','.join('?' * len(part))})", part,
+            ).fetchall())
+        return rows
+
+    def existing_entity_ids(self, entity_ids: Iterable[str]) -> set[str]:
+        """The subset of entity_ids already stored."""
+        return {r["id"] for r in self._fetch_entities(list(dict.fromkeys(entity_ids)))}
 
     def get_entity(self, entity_id: str) -> dict | None:
         """Get a single entity by ID."""
@@ -145,38 +222,70 @@ class KGStore:
         properties: dict | None = None,
     ) -> None:
         """Insert or increment weight on duplicate triple."""
-        predicate = predicate.upper()
-        if predicate not in VALID_PREDICATES:
-            logger.warning("Unknown predicate %r, storing anyway", predicate)
+        self.upsert_triples([{
+            "subject_id": subject_id,
+            "predicate": predicate,
+            "object_id": object_id,
+            "era": era,
+            "source_book": source_book,
+            "source_chunk_id": source_chunk_id,
+            "confidence": confidence,
+            "properties": properties,
+        }])
+
+    def upsert_triples(self, triples: Iterable[dict]) -> int:
+        """Bulk upsert_triple: one executemany and one commit for the batch.
+
+        Each dict has subject_id, predicate, object_id, era and optionally source_book,
+        source_chunk_id, confidence and properties. Duplicates are folded in memory
+        first (weight counts occurrences, highest confidence wins, the last source
+        wins), then added onto any stored row. Returns the number of distinct triples.
+        """
+        merged: dict[tuple[str, str, str], dict] = {}
+        for t in triples:
+            predicate = str(t["predicate"]).upper()
+            if predicate not in VALID_PREDICATES:
+                logger.warning("Unknown predicate %r, storing anyway", predicate)
+            key = (t["subject_id"], predicate, t["object_id"])
+            confidence = t.get("confidence", 1.0)
+            row = merged.get(key)
+            if row is None:
+                merged[key] = {
+                    "era": t["era"],
+                    "properties": t.get("properties") or {},
+                    "confidence": confidence,
+                    "weight": 1.0,
+                    "source_book": t.get("source_book"),
+                    "source_chunk_id": t.get("source_chunk_id"),
+                }
+                continue
+            row["weight"] += 1.0
+            row["confidence"] = max(confidence, row["confidence"])
+            row["source_book"] = t.get("source_book")
+            row["source_chunk_id"] = t.get("source_chunk_id")
+        if not merged:
+            return 0
 
-        properties = properties or {}
         now = datetime.now(timezone.utc).isoformat()
-
-        existing = self.conn.execute(
-            "SELECT id, weight, confidence FROM kg_triples "
-            "WHERE subject_id=? AND predicate=? AND object_id=?",
-            (subject_id, predicate, object_id),
-        ).fetchone()
-
-        if existing is None:
-            self.conn.execute(
+        with self.transaction():
+            self.conn.executemany(
                 "INSERT INTO kg_triples (subject_id, predicate, object_id, era, source_book, "
                 "source_chunk_id, confidence, weight, properties_json, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    subject_id, predicate, object_id, era, source_book,
-                    source_chunk_id, confidence, 1.0, json.dumps(properties), now,
-                ),
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(subject_id, predicate, object_id) DO UPDATE SET "
+                "weight=kg_triples.weight + excluded.weight, "
+                "confidence=MAX(kg_triples.confidence, excluded.confidence), "
+                "source_book=excluded.source_book, source_chunk_id=excluded.source_chunk_id",
+                [
+                    (
+                        subject_id, predicate, object_id, row["era"], row["source_book"],
+                        row["source_chunk_id"], row["confidence"], row["weight"],
+                        json.dumps(row["properties"]), now,
+                    )
+                    for (subject_id, predicate, object_id), row in merged.items()
+                ],
             )
-        else:
-            new_weight = existing["weight"] + 1.0
-            new_confidence = max(confidence, existing["confidence"])
-            self.conn.execute(
-                "UPDATE kg_triples SET weight=?, confidence=?, source_book=?, "
-                "source_chunk_id=? WHERE id=?",
-                (new_weight, new_confidence, source_book, source_chunk_id, existing["id"]),
-            )
-        self.conn.commit()
+        return len(merged)
 
     def get_triples_for_entity(
         self,
@@ -226,6 +335,35 @@ class KGStore:
             results.extend(dict(r) for r in rows)
         return results
 
+    def get_triples_by_entity(self, era: str, entity_type: str) -> dict[str, list[dict]]:
+        """get_triples_for_entity(direction="both", era=era) for every entity of a type.
+
+        Two queries for the whole era instead of two per entity. Each list holds the
+        entity's outgoing triples (with object_name) then its incoming ones (with
+        subject_name), each by weight DESC.
+        """
+        entity_type = entity_type.upper()
+        by_entity: dict[str, list[dict]] = {}
+        outgoing = self.conn.execute(
+            "SELECT t.*, e.canonical_name AS object_name FROM kg_triples t "
+            "JOIN kg_entities a ON t.subject_id = a.id AND a.entity_type=? "
+            "JOIN kg_entities e ON t.object_id = e.id "
+            "WHERE t.era=? ORDER BY t.weight DESC, t.id",
+            (entity_type, era),
+        ).fetchall()
+        for r in outgoing:
+            by_entity.setdefault(r["subject_id"], []).append(dict(r))
+        incoming = self.conn.execute(
+            "SELECT t.*, e.canonical_name AS subject_name FROM kg_triples t "
+            "JOIN kg_entities a ON t.object_id = a.id AND a.entity_type=? "
+            "JOIN kg_entities e ON t.subject_id = e.id "
+            "WHERE t.era=? ORDER BY t.weight DESC, t.id",
+            (entity_type, era),
+        ).fetchall()
+        for r in incoming:
+            by_entity.setdefault(r["object_id"], []).append(dict(r))
+        return by_entity
+
     def get_triples_by_predicate(
         self, predicate: str, era: str | None = None
     ) -> list[dict]:
@@ -283,7 +421,7 @@ class KGStore:
                 datetime.now(timezone.utc).isoformat(),
             ),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_summaries(
         self,
@@ -314,6 +452,15 @@ class KGStore:
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def summarized_entity_ids(self, summary_type: str, era: str) -> set[str]:
+        """IDs of entities that already have a summary of this type in era."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT entity_id FROM kg_summaries "
+            "WHERE summary_type=? AND era=? AND entity_id IS NOT NULL",
+            (summary_type, era),
+        ).fetchall()
+        return {r[0] for r in rows}
+
     # ── Checkpoints ───────────────────────────────────────────────────
 
     def get_checkpoint_status(
@@ -359,7 +506,43 @@ class KGStore:
             "completed_at=excluded.completed_at",
             (book_title, chapter_title, chunk_id, phase, status, error, started, completed),
         )
-        self.conn.commit()
+        self._commit()
+
+    def completed_batches(self, batch_keys: Iterable[str]) -> set[str]:
+        """The subset of batch_keys whose extraction batch is already stored."""
+        keys = list(dict.fromkeys(batch_keys))
+        done: set[str] = set()
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = self.conn.execute(
+                "SELECT batch_key FROM kg_extraction_batches WHERE status='completed' "
+                f"AND batch_key IN ({','.join('?' * len(part))})",
+                part,
+            ).fetchall()
+            done.update(r[0] for r in rows)
+        return done
+
+    def set_batch_checkpoint(
+        self,
+        batch_key: str,
+        book_title: str,
+        status: str,
+        chapter_title: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record the outcome of one extraction batch (see kg/scheduler.py)."""
+        completed = datetime.now(timezone.utc).isoformat() if status in ("completed", "failed") else None
+        self.conn.execute(
+            "INSERT INTO kg_extraction_batches "
+            "(batch_key, book_title, chapter_title, status, error_message, completed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(batch_key) DO UPDATE SET "
+            "status=excluded.status, error_message=excluded.error_message, "
+            "completed_at=excluded.completed_at",
+            (batch_key, book_title, chapter_title, status, error, completed),
+        )
+        self._commit()
 
 
 def _merge_properties(existing: dict, new: dict) -> dict:
@@ -437,3 +620,16 @@ CREATE TABLE IF NOT EXISTS kg_extraction_checkpoints (
     UNIQUE(book_title, chapter_title, phase)
 );
 """
+
+_INLINE_BATCHES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kg_extraction_batches (
+    batch_key TEXT PRIMARY KEY,
+    book_title TEXT NOT NULL,
+    chapter_title TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error_message TEXT,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_kg_extraction_batches_chapter
+    ON kg_extraction_batches(book_title, chapter_title);
+"""
@@ -53,17 +53,18 @@ def synthesize_character_profiles(
     Returns number of profiles generated.
     """
     characters = store.get_entities_by_type("CHARACTER", era=era)
+    triples_by_entity = store.get_triples_by_entity(era, "CHARACTER")
+    summarized = store.summarized_entity_ids("CHARACTER_ARC", era)
     count = 0
 
     for char in characters:
         entity_id = char["id"]
-        triples = store.get_triples_for_entity(entity_id, direction="both", era=era)
+        triples = triples_by_entity.get(entity_id, [])
         if len(triples) < 2:
             continue
 
         # Check if summary already exists
-        existing = store.get_summaries(summary_type="CHARACTER_ARC", entity_id=entity_id, era=era)
-        if existing:
+        if entity_id in summarized:
             continue
 
         properties = json.loads(char.get("properties_json", "{}"))
@@ -128,15 +129,16 @@ def synthesize_location_dossiers(
     Returns number of dossiers generated.
     """
     locations = store.get_entities_by_type("LOCATION", era=era)
+    triples_by_entity = store.get_triples_by_entity(era, "LOCATION")
+    summarized = store.summarized_entity_ids("LOCATION_DOSSIER", era)
     count = 0
 
     for loc in locations:
         entity_id = loc["id"]
-        triples = store.get_triples_for_entity(entity_id, direction="both", era=era)
+        triples = triples_by_entity.get(entity_id, [])
 
         # Check if dossier already exists
-        existing = store.get_summaries(summary_type="LOCATION_DOSSIER", entity_id=entity_id, era=era)
-        if existing:
+        if entity_id in summarized:
             continue
 
         properties = json.loads(loc.get("properties_json", "{}"))
@@ -196,42 +198,50 @@ def detect_contradictions(store: KGStore, era: str) -> list[dict]:
     - Character with multiple conflicting faction memberships
     - Location with conflicting controlling factions
 
-    Returns list of {entity_id, field, values, source_books}.
+    Each check is one grouped query over the era's triples.
+
+    Returns list of {entity_id, entity_name, field, values, note}.
     """
     contradictions = []
 
-    # Check characters with multiple MEMBER_OF triples to different factions
-    characters = store.get_entities_by_type("CHARACTER", era=era)
-    for char in characters:
-        triples = store.get_triples_for_entity(char["id"], direction="outgoing", era=era)
-        member_of = [t for t in triples if t["predicate"] == "MEMBER_OF"]
-        if len(member_of) > 1:
-            factions = list({t.get("object_name", t["object_id"]) for t in member_of})
-            if len(factions) > 1:
-                contradictions.append({
-                    "entity_id": char["id"],
-                    "entity_name": char["canonical_name"],
-                    "field": "faction_membership",
-                    "values": factions,
-                    "note": "Character belongs to multiple factions (may be intentional for double agents)",
-                })
-
-    # Check locations with conflicting controlling_faction in properties
-    locations = store.get_entities_by_type("LOCATION", era=era)
-    for loc in locations:
-        triples = store.get_triples_for_entity(loc["id"], direction="both", era=era)
-        controls = [t for t in triples if t["predicate"] == "CONTROLS"]
-        if len(controls) > 1:
-            controllers = list({
-                t.get("subject_name", t["subject_id"]) for t in controls
-            })
-            if len(controllers) > 1:
-                contradictions.append({
-                    "entity_id": loc["id"],
-                    "entity_name": loc["canonical_name"],
-                    "field": "controlling_faction",
-                    "values": controllers,
-                    "note": "Location controlled by multiple factions (may be contested)",
-                })
+    # Characters with MEMBER_OF triples to more than one faction
+    rows = store.conn.execute(
+        "SELECT e.id, e.canonical_name, json_group_array(DISTINCT o.canonical_name) AS names "
+        "FROM kg_triples t "
+        "JOIN kg_entities e ON t.subject_id = e.id "
+        "JOIN kg_entities o ON t.object_id = o.id "
+        "WHERE t.predicate='MEMBER_OF' AND t.era=? AND e.entity_type='CHARACTER' AND e.era=? "
+        "GROUP BY e.id HAVING COUNT(DISTINCT o.canonical_name) > 1 "
+        "ORDER BY e.canonical_name",
+        (era, era),
+    ).fetchall()
+    for entity_id, name, names in rows:
+        contradictions.append({
+            "entity_id": entity_id,
+            "entity_name": name,
+            "field": "faction_membership",
+            "values": sorted(json.loads(names)),
+            "note": "Character belongs to multiple factions (may be intentional for double agents)",
+        })
+
+    # Locations CONTROLLED by more than one entity
+    rows = store.conn.execute(
+        "SELECT e.id, e.canonical_name, json_group_array(DISTINCT s.canonical_name) AS names "
+        "FROM kg_triples t "
+        "JOIN kg_entities e ON t.object_id = e.id "
+        "JOIN kg_entities s ON t.subject_id = s.id "
+        "WHERE t.predicate='CONTROLS' AND t.era=? AND e.entity_type='LOCATION' AND e.era=? "
+        "GROUP BY e.id HAVING COUNT(DISTINCT s.canonical_name) > 1 "
+        "ORDER BY e.canonical_name",
+        (era, era),
+    ).fetchall()
+    for entity_id, name, names in rows:
+        contradictions.append({
+            "entity_id": entity_id,
+            "entity_name": name,
+            "field": "controlling_faction",
+            "values": sorted(json.loads(names)),
+            "note": "Location controlled by multiple factions (may be contested)",
+        })
 
     return contradictions
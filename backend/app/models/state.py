@@ -187,6 +187,7 @@ class GameState(BaseModel):
     final_text: str | None = None
     lore_citations: list[dict] = Field(default_factory=list)  # NarrationCitation-like dicts for transcript
     context_stats: dict | None = None  # Dev-only: token budgeting stats from ContextBudget
+    retrieval_cache: dict | None = None  # Retrieval result cache hits/misses/saved_ms for this turn
     warnings: list[str] = Field(default_factory=list)  # Turn warnings (LLM/RAG fallbacks)
     # V2.5: Arc planner output (deterministic arc guidance for Director)
     arc_guidance: dict | None = None
@@ -218,6 +219,7 @@ class GameState(BaseModel):
                 "final_text": None,
                 "lore_citations": [],
                 "context_stats": None,
+                "retrieval_cache": None,
                 "warnings": [],
                 # WorldSim-related fields (transient, reset each turn)
                 "world_sim_ran": False,
@@ -84,6 +84,7 @@ class TurnMeta(BaseModel):
     alignment: dict[str, int] | None = None
     reputations: dict[str, int] | None = None
     prompt_versions: dict[str, str] = Field(default_factory=dict)
+    retrieval_cache: dict[str, Any] | None = None  # {hits, misses, hit_rate, saved_ms, lanes}
 
 
 class TurnDebug(BaseModel):
@@ -1,14 +1,27 @@
-"""Module-level caches for SentenceTransformer and LanceDB connections.
+"""Module-level caches for SentenceTransformer, query embeddings, LanceDB connections and flat tables.
 
-Single-user local app: simple dict singletons are sufficient.
-Thread-safety is not required (single-worker Ollama-only).
+Single-user local app: simple dict singletons are sufficient. Retrieval lanes may
+run concurrently (see backend.app.core.retrieval_fanout), so model loading is
+guarded by a lock to avoid constructing the same encoder twice.
+
+With STORYTELLER_EMBEDDING_SERVER set, get_encoder returns a RemoteEncoder that
+talks to the shared ``storyteller embed-server`` process instead of loading the
+model here; the local model is only loaded if the server is unreachable.
+Local models load on the EMBEDDING_BACKEND chosen in shared/embedding_backend.py
+(PyTorch, or the int8 ONNX export).
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from shared.cache import get_cache_value, clear_cache
 
@@ -18,6 +31,10 @@ logger = logging.getLogger(__name__)
 _ENCODER_CACHE_KEY = "rag_encoder_cache"
 _DB_CACHE_KEY = "rag_db_cache"
 _TABLE_CACHE_KEY = "rag_table_cache"
+_QUERY_EMBEDDING_CACHE_KEY = "rag_query_embedding_cache"
+_FLAT_TABLE_CACHE_KEY = "rag_flat_table_cache"
+
+_ENCODER_LOCK = threading.Lock()
 
 
 def _encoder_cache() -> dict[str, Any]:
@@ -25,11 +42,80 @@ def _encoder_cache() -> dict[str, Any]:
 
 
 def get_encoder(model_name: str) -> Any:
-    """Return a cached SentenceTransformer instance for the given model name."""
+    """Return the encoder for model_name: the shared embedding server client when
+    configured (falls back to in-process encoding), otherwise a local SentenceTransformer."""
+    from backend.app.config import EMBEDDING_SERVER_ADDRESS
+
+    if not EMBEDDING_SERVER_ADDRESS or _dummy_embeddings():
+        return get_local_encoder(model_name)
+    cache = _encoder_cache()
+    key = f"remote:{EMBEDDING_SERVER_ADDRESS}:{model_name}"
+    if key in cache:
+        return cache[key]
+    with _ENCODER_LOCK:
+        if key not in cache:
+            cache[key] = RemoteEncoder(EMBEDDING_SERVER_ADDRESS, model_name)
+        return cache[key]
+
+
+def get_local_encoder(model_name: str) -> Any:
+    """Return a cached in-process SentenceTransformer instance for the given model name."""
     cache = _encoder_cache()
     if model_name in cache:
         return cache[model_name]
-    if os.environ.get("STORYTELLER_DUMMY_EMBEDDINGS", "").strip().lower() in ("1", "true", "yes"):
+    with _ENCODER_LOCK:
+        if model_name in cache:
+            return cache[model_name]
+        return _load_encoder(model_name, cache)
+
+
+def _dummy_embeddings() -> bool:
+    return os.environ.get("STORYTELLER_DUMMY_EMBEDDINGS", "").strip().lower() in ("1", "true", "yes")
+
+
+class RemoteEncoder:
+    """SentenceTransformer-compatible ``encode`` backed by the shared embedding server.
+
+    Requests from all workers are batched server-side. When the server is down (or
+    errors) the call is served by the in-process encoder, loaded on first need, and
+    the server is retried after EMBEDDING_SERVER_RETRY_SECONDS.
+    """
+
+    def __init__(self, address: str, model_name: str, timeout: float | None = None) -> None:
+        from backend.app.config import EMBEDDING_SERVER_RETRY_SECONDS, EMBEDDING_SERVER_TIMEOUT_SECONDS
+        from backend.app.rag.embedding_server import EmbeddingServerClient
+
+        self.model_name = model_name
+        self.retry_seconds = EMBEDDING_SERVER_RETRY_SECONDS
+        self._client = EmbeddingServerClient(
+            address, timeout=EMBEDDING_SERVER_TIMEOUT_SECONDS if timeout is None else timeout,
+        )
+        self._down_until = 0.0
+        self.remote_calls = 0
+        self.local_calls = 0
+
+    def encode(self, texts: Any, show_progress_bar: bool = False, **kwargs: Any) -> Any:
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        # The server only does plain encode(); extra options go to the local model.
+        if not kwargs and time.monotonic() >= self._down_until:
+            try:
+                vectors = self._client.encode(batch, self.model_name)
+                self.remote_calls += 1
+                return vectors[0] if single else vectors
+            except Exception as e:
+                self._down_until = time.monotonic() + self.retry_seconds
+                logger.warning(
+                    "Embedding server %s unavailable (%s); encoding in-process for %ss",
+                    self._client.address, e, self.retry_seconds,
+                )
+        self.local_calls += 1
+        return get_local_encoder(self.model_name).encode(texts, show_progress_bar=show_progress_bar, **kwargs)
+
+
+def _load_encoder(model_name: str, cache: dict[str, Any]) -> Any:
+    """Construct the encoder for model_name and store it in cache (caller holds the lock)."""
+    if _dummy_embeddings():
         from backend.app.config import EMBEDDING_DIMENSION
         class _DummyEncoder:
             def encode(self, texts, show_progress_bar: bool = False):
@@ -39,8 +125,8 @@ def get_encoder(model_name: str) -> Any:
         logger.info("Using dummy encoder for model: %s", model_name)
         return enc
     try:
-        from sentence_transformers import SentenceTransformer
-        enc = SentenceTransformer(model_name)
+        from shared.embedding_backend import load_sentence_transformer
+        enc = load_sentence_transformer(model_name)
         cache[model_name] = enc
         logger.info("Cached SentenceTransformer for model: %s", model_name)
         return enc
@@ -50,6 +136,180 @@ def get_encoder(model_name: str) -> Any:
         ) from e
 
 
+# --- Query embedding cache (LRU + optional on-disk tier) ---
+
+def normalize_query_text(text: Any) -> str:
+    """Canonical form of a query for embedding-cache keys: trimmed, whitespace collapsed."""
+    return " ".join(str(text or "").split())
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of (model, normalized query text) -> vector, with optional SQLite disk tier.
+
+    Lore/style queries repeat heavily between turns at the same location, so repeat
+    queries skip encoder inference entirely. The disk tier (when a path is set)
+    survives restarts; vectors are stored as packed float32.
+    """
+
+    def __init__(self, max_entries: int = 2048, disk_path: str | Path | None = None) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        if disk_path:
+            self._open_disk(Path(disk_path))
+
+    def _open_disk(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+            conn.commit()
+            self._disk = conn
+            logger.info("Query embedding disk cache: %s", path)
+        except Exception as e:
+            logger.warning("Query embedding disk cache unavailable (%s): %s", path, e)
+            self._disk = None
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model_name: str, text: str) -> list[float] | None:
+        """Return the cached vector (memory, then disk) or None; updates hit/miss counters."""
+        key = (model_name, normalize_query_text(text))
+        with self._lock:
+            vec = self._entries.get(key)
+            if vec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vec
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT vector FROM query_embeddings WHERE model = ? AND text_hash = ?",
+                    (model_name, self._text_hash(key[1])),
+                ).fetchone()
+                if row is not None:
+                    vec = array("f", row[0]).tolist()
+                    self._store(key, vec)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vec
+            self.misses += 1
+            return None
+
+    def put(self, model_name: str, text: str, vector: Any) -> None:
+        vec = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+        key = (model_name, normalize_query_text(text))
+        with self._lock:
+            self._store(key, vec)
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO query_embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                        (model_name, self._text_hash(key[1]), array("f", vec).tobytes()),
+                    )
+                    self._disk.commit()
+                except Exception as e:
+                    logger.debug("Query embedding disk write failed: %s", e)
+
+    def _store(self, key: tuple[str, str], vec: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = vec
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "disk_enabled": self._disk is not None,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+
+def _make_query_embedding_cache() -> QueryEmbeddingCache:
+    from backend.app.config import QUERY_EMBEDDING_CACHE_PATH, QUERY_EMBEDDING_CACHE_SIZE
+    return QueryEmbeddingCache(max_entries=QUERY_EMBEDDING_CACHE_SIZE, disk_path=QUERY_EMBEDDING_CACHE_PATH or None)
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide query embedding cache (lore, style, voice, episodic paths)."""
+    return get_cache_value(_QUERY_EMBEDDING_CACHE_KEY, _make_query_embedding_cache)
+
+
+def encode_cached(
+    texts: list[str],
+    model_name: str,
+    encode_fn: Callable[[list[str]], Any] | None = None,
+) -> list[list[float]]:
+    """Encode query texts through the embedding cache; misses are encoded in one batch.
+
+    Args:
+        texts: Query texts (normalized for cache keys and for encoding).
+        model_name: Embedding model name (part of the cache key).
+        encode_fn: Batch encoder for misses; defaults to ``get_encoder(model_name).encode``.
+            Only invoked when at least one text misses, so warm queries never load a model.
+
+    Returns:
+        One vector (list of floats) per input text, in order.
+    """
+    if not texts:
+        return []
+    cache = get_query_embedding_cache()
+    normalized = [normalize_query_text(t) for t in texts]
+    found: dict[str, list[float]] = {}
+    missing: list[str] = []
+    for text in normalized:
+        if text in found or text in missing:
+            continue
+        vec = cache.get(model_name, text)
+        if vec is None:
+            missing.append(text)
+        else:
+            found[text] = vec
+    if missing:
+        if encode_fn is None:
+            encoder = get_encoder(model_name)
+            vectors = encoder.encode(missing, show_progress_bar=False)
+        else:
+            vectors = encode_fn(missing)
+        if hasattr(vectors, "tolist"):
+            vectors = vectors.tolist()
+        for text, vec in zip(missing, vectors):
+            vec = vec.tolist() if hasattr(vec, "tolist") else list(vec)
+            cache.put(model_name, text, vec)
+            found[text] = vec
+    return [found[t] for t in normalized]
+
+
 def _db_cache() -> dict[str, Any]:
     return get_cache_value(_DB_CACHE_KEY, dict)
 
@@ -84,9 +344,38 @@ def get_lancedb_table(db_path: str | Path, table_name: str) -> Any:
     return table
 
 
+def _flat_table_cache() -> dict[str, tuple[int, Any]]:
+    return get_cache_value(_FLAT_TABLE_CACHE_KEY, dict)
+
+
+def get_flat_table(path: str | Path) -> Any:
+    """Return a cached FlatTable (see rag.flat_store); reopened when the export is replaced."""
+    from backend.app.rag.flat_store import FlatTable
+
+    key = str(path)
+    stamp = (Path(path) / "meta.json").stat().st_mtime_ns
+    cache = _flat_table_cache()
+    entry = cache.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    table = FlatTable(path)
+    cache[key] = (stamp, table)
+    logger.info("Opened flat vector table: %s (%d rows)", key, table.num_rows)
+    return table
+
+
 def clear_caches() -> None:
     """Clear all caches (useful for testing)."""
-    for key in (_ENCODER_CACHE_KEY, _DB_CACHE_KEY, _TABLE_CACHE_KEY):
+    try:
+        get_cache_value(_QUERY_EMBEDDING_CACHE_KEY).close()
+    except KeyError:
+        pass
+    clear_cache(_QUERY_EMBEDDING_CACHE_KEY)
+    from backend.app.rag.context_bundles import _CONTEXT_BUNDLES_CACHE_KEY
+    from backend.app.rag.retrieval_cache import _RETRIEVAL_CACHE_KEY
+    clear_cache(_RETRIEVAL_CACHE_KEY)
+    clear_cache(_CONTEXT_BUNDLES_CACHE_KEY)
+    for key in (_ENCODER_CACHE_KEY, _DB_CACHE_KEY, _TABLE_CACHE_KEY, _FLAT_TABLE_CACHE_KEY):
         cache = get_cache_value(key, dict)
         cache.clear()
         clear_cache(key)
@@ -11,7 +11,7 @@ from backend.app.config import (
     EMBEDDING_MODEL,
     resolve_vectordb_path,
 )
-from backend.app.rag._cache import get_encoder
+from backend.app.rag._cache import encode_cached, get_encoder
 from backend.app.rag.vector_store import create_vector_store, LanceDBStore
 from backend.app.rag.utils import assert_vector_dim, esc, safe_filter_token
 from backend.app.core.warnings import add_warning
@@ -97,17 +97,19 @@ def get_voice_snippets(
         add_warning(warnings, "Voice retrieval failed: continuing without voice context.")
         return result
 
-    query_texts = [f"voice sample for {cid}" for cid in cid_set]
+    cids = list(cid_set)
+    query_texts = [f"voice sample for {cid}" for cid in cids]
     try:
-        vectors = encoder.encode(query_texts, show_progress_bar=False)
-        if hasattr(vectors, "tolist"):
-            vectors = vectors.tolist()
+        vectors = encode_cached(
+            query_texts, EMBEDDING_MODEL,
+            lambda texts: encoder.encode(texts, show_progress_bar=False),
+        )
     except Exception as ex:
         logger.debug("Voice query embedding failed: %s", ex)
         add_warning(warnings, "Voice retrieval failed: continuing without voice context.")
         return result
 
-    cid_to_vec = {cid: vec for cid, vec in zip(cid_set, vectors)}
+    cid_to_vec = {cid: vec for cid, vec in zip(cids, vectors)}
 
     for cid in cid_set:
         vec = cid_to_vec.get(cid)
@@ -0,0 +1,387 @@
+"""Precomputed per-(era, location) context bundles (``storyteller precompute-context``).
+
+Era packs fix the locations and anchor NPCs a campaign can visit (ContentIndices),
+yet the Director and Narrator rebuild the same location context every turn. The
+precompute stage writes one JSON file per era under CONTEXT_BUNDLES_DIR holding,
+per location:
+
+  lore               top Narrator lore chunks for the location (ids + text)
+  style              base + era style chunks for the location
+  kg_location        KG location block (type, region, controlling faction, dossier)
+  npc_relationships  KG relationship/arc line per anchor NPC stationed there
+
+At runtime ``bundle_for_state`` is the first-tier lookup. The Narrator serves its
+first CONTEXT_BUNDLE_LORE_SLOTS / CONTEXT_BUNDLE_STYLE_SLOTS results from the bundle
+and runs live retrieval only for the remaining slots (``merge_precomputed``); the KG
+location block and anchor NPC lines replace graph lookups.
+
+Lore, style and KG matching is exact on era, so a bundle is built with the pack's
+``era_id`` as stored and only serves campaigns whose era is that same string (file
+names are case-folded). A location the KG has no block for stores ``""``, which the
+runtime treats as "not precomputed" and looks up live.
+
+Bundled style holds the base + era lanes only. When a turn adds a genre or archetype
+overlay, ``style_slots`` caps the bundle at one style slot so live retrieval supplies
+the overlay.
+
+Every bundle file records the source versions it was built from (lore / style table
+version, KG fingerprint). A lane whose source has changed since is dropped, so a
+stale bundle degrades to live retrieval rather than serving outdated context. Inside
+a turn started with ``track_turn_versions`` the current versions are checked once
+and reused by every lookup of that turn.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from shared.cache import get_cache_value
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+
+_CONTEXT_BUNDLES_CACHE_KEY = "rag_context_bundle_files"
+
+# Source versions checked by the turn running in this context (None outside a tracked turn).
+_turn_versions: ContextVar[dict[tuple[str, str], dict[str, str]] | None] = ContextVar(
+    "context_bundle_turn_versions", default=None,
+)
+
+
+def _era_key(era: str | None) -> str:
+    """Case-folded era used for bundle file names and ``--era`` filters (not for matching)."""
+    return str(era or "").strip().upper()
+
+
+def bundle_path(era: str, root: str | Path | None = None) -> Path:
+    """Bundle file for era under root (default CONTEXT_BUNDLES_DIR)."""
+    if root is None:
+        from backend.app.config import CONTEXT_BUNDLES_DIR
+        root = CONTEXT_BUNDLES_DIR
+    return Path(root) / f"{_era_key(era).lower()}.json"
+
+
+def location_query(location: dict[str, Any]) -> str:
+    """Retrieval query for a location: name, planet, region, tags and opening description."""
+    parts = [str(location.get("name") or location.get("id") or "")]
+    for key in ("planet", "region"):
+        if location.get(key):
+            parts.append(str(location[key]))
+    parts.extend(str(t) for t in location.get("tags") or [])
+    description = " ".join(str(location.get("description") or "").split()[:40])
+    if description:
+        parts.append(description)
+    return " ".join(p for p in parts if p).strip() or "setting scene"
+
+
+def source_versions(db_path: str | Path | None = None, kg_db_path: str | None = None) -> dict[str, str]:
+    """Current version token of every source a bundle is built from."""
+    from backend.app.config import LORE_TABLE_NAME, STYLE_TABLE_NAME, resolve_vectordb_path
+    from backend.app.rag.kg_retriever import KGRetriever
+    from backend.app.rag.retrieval_cache import table_version
+
+    vectordb = resolve_vectordb_path(db_path)
+    return {
+        "lore": table_version(vectordb, LORE_TABLE_NAME),
+        "style": table_version(vectordb, STYLE_TABLE_NAME),
+        "kg": KGRetriever(kg_db_path).fingerprint(),
+    }
+
+
+def track_turn_versions() -> None:
+    """Check bundle source versions at most once for the turn running in the current context.
+
+    Worker threads share the memo when they run in a copy of this context, like
+    ``retrieval_cache.track_turn``.
+    """
+    _turn_versions.set({})
+
+
+def _current_versions(db_path: str | Path | None, kg_db_path: str | None) -> dict[str, str]:
+    """source_versions, memoized for the current turn when one is tracked."""
+    memo = _turn_versions.get()
+    if memo is None:
+        return source_versions(db_path, kg_db_path)
+    key = (str(db_path or ""), str(kg_db_path or ""))
+    current = memo.get(key)
+    if current is None:
+        current = memo[key] = source_versions(db_path, kg_db_path)
+    return current
+
+
+# ── Building ─────────────────────────────────────────────────────────
+
+
+def build_location_bundle(
+    era: str,
+    location: dict[str, Any],
+    anchor_ids: Sequence[str],
+    *,
+    kg_retriever: Any,
+    lore_top_k: int,
+    style_top_k: int,
+    db_path: str | Path | None = None,
+    warnings: list[str] | None = None,
+) -> dict[str, Any]:
+    """Retrieve the context one location needs, with the same filters the Narrator uses."""
+    from backend.app.rag.lore_retriever import retrieve_lore
+    from backend.app.rag.retrieval_bundles import NARRATOR_DOC_TYPES, NARRATOR_SECTION_KINDS
+    from backend.app.rag.style_retriever import retrieve_style_layered
+
+    query = location_query(location)
+    lore = retrieve_lore(
+        query,
+        top_k=lore_top_k,
+        era=era,
+        doc_types=NARRATOR_DOC_TYPES,
+        section_kinds=NARRATOR_SECTION_KINDS,
+        related_npcs=list(anchor_ids) or None,
+        db_path=db_path,
+        warnings=warnings,
+    )
+    style = retrieve_style_layered(query, era_id=era, top_k=style_top_k, db_path=db_path, warnings=warnings)
+    # Runtime looks locations up by id; the KG usually names them, so try both here.
+    kg_location = kg_retriever.get_location_context(str(location.get("id") or ""), era)
+    if not kg_location and location.get("name"):
+        kg_location = kg_retriever.get_location_context(str(location["name"]), era)
+    return {
+        "name": location.get("name") or "",
+        "query": query,
+        "lore": lore,
+        "style": style,
+        "kg_location": kg_location,
+        "npc_relationships": kg_retriever.character_lines(list(anchor_ids), era),
+    }
+
+
+def precompute_context_bundles(
+    eras: Iterable[str] | None = None,
+    *,
+    out_dir: str | Path | None = None,
+    db_path: str | Path | None = None,
+    lore_top_k: int | None = None,
+    style_top_k: int | None = None,
+    kg_retriever: Any = None,
+    packs: Iterable[Any] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Build and write one bundle file per era pack.
+
+    Returns ``{era: {"path", "locations", "lore_chunks", "style_chunks", "kg_locations", "warnings"}}``.
+    Template packs (era ids starting with ``_``) are skipped.
+    """
+    from backend.app.constants import CONTEXT_BUNDLE_LORE_TOP_K, CONTEXT_BUNDLE_STYLE_TOP_K
+    from backend.app.content.index import build_indices
+    from backend.app.rag.kg_retriever import KGRetriever
+
+    if packs is None:
+        from backend.app.content import CONTENT_REPOSITORY
+        packs = CONTENT_REPOSITORY.load_all_packs()
+    wanted = {_era_key(e) for e in eras} if eras else None
+    kg_retriever = kg_retriever or KGRetriever()
+    lore_top_k = lore_top_k or CONTEXT_BUNDLE_LORE_TOP_K
+    style_top_k = style_top_k or CONTEXT_BUNDLE_STYLE_TOP_K
+    versions = source_versions(db_path, kg_retriever.db_path)
+
+    report: dict[str, dict[str, Any]] = {}
+    for pack in packs:
+        era = str(pack.era_id or "").strip()
+        if not era or era.startswith("_") or (wanted is not None and _era_key(era) not in wanted):
+            continue
+        indices = build_indices(pack)
+        warnings: list[str] = []
+        locations = {
+            loc_id: build_location_bundle(
+                era,
+                loc,
+                indices.anchors_by_location.get(loc_id, []),
+                kg_retriever=kg_retriever,
+                lore_top_k=lore_top_k,
+                style_top_k=style_top_k,
+                db_path=db_path,
+                warnings=warnings,
+            )
+            for loc_id, loc in indices.locations_by_id.items()
+        }
+        path = bundle_path(era, out_dir)
+        _write_json_atomic(path, {
+            "format": BUNDLE_FORMAT,
+            "era": era,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "versions": versions,
+            "locations": locations,
+        })
+        report[era] = {
+            "path": str(path),
+            "locations": len(locations),
+            "lore_chunks": sum(len(b["lore"]) for b in locations.values()),
+            "style_chunks": sum(len(b["style"]) for b in locations.values()),
+            "kg_locations": sum(1 for b in locations.values() if b["kg_location"]),
+            "warnings": warnings,
+        }
+    return report
+
+
+def _write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ── Runtime lookup ───────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class LocationBundle:
+    """Fresh lanes of one location's bundle (stale lanes are empty; kg_location None when stale or not found)."""
+
+    era: str
+    location_id: str
+    lore: list[dict[str, Any]] = field(default_factory=list)
+    style: list[dict[str, Any]] = field(default_factory=list)
+    kg_location: str | None = None
+    npc_relationships: dict[str, str] = field(default_factory=dict)
+
+    def lore_for(self, source_titles: Sequence[str] | None = None, chapter_index_max: int | None = None) -> list[dict[str, Any]]:
+        """Copies of the lore chunks allowed by the story-position guardrails."""
+        if chapter_index_max is not None:
+            # Bundled chunks carry no chapter index; live search applies this guardrail.
+            return []
+        chunks = self.lore
+        if source_titles:
+            allowed = set(source_titles)
+            chunks = [c for c in chunks if c.get("source_title") in allowed]
+        return copy.deepcopy(chunks)
+
+    def style_chunks(self) -> list[dict[str, Any]]:
+        return copy.deepcopy(self.style)
+
+
+def _load_bundle_file(path: Path) -> dict[str, Any] | None:
+    """Parsed bundle file, re-read only when it changes on disk."""
+    try:
+        stamp = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    files: dict[str, tuple[int, dict[str, Any] | None]] = get_cache_value(_CONTEXT_BUNDLES_CACHE_KEY, dict)
+    cached = files.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning("Unreadable context bundle %s (%s); using live retrieval", path, e)
+        payload = None
+    if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT:
+        payload = None
+    files[str(path)] = (stamp, payload)
+    return payload
+
+
+def get_location_bundle(
+    era: str,
+    location_id: str | None,
+    *,
+    root: str | Path | None = None,
+    db_path: str | Path | None = None,
+    kg_db_path: str | None = None,
+) -> LocationBundle | None:
+    """Bundle for (era, location_id), or None when disabled, not built or unknown."""
+    from backend.app import config
+
+    if not location_id or not config.ENABLE_CONTEXT_BUNDLES:
+        return None
+    era = str(era or "").strip()
+    payload = _load_bundle_file(bundle_path(era, root))
+    if payload is None:
+        return None
+    if payload.get("era") != era:
+        # Built for a differently spelled era: its lanes would not match live lookups.
+        logger.debug("Context bundle era %r does not match campaign era %r", payload.get("era"), era)
+        return None
+    entry = (payload.get("locations") or {}).get(location_id)
+    if not isinstance(entry, dict):
+        return None
+    built = payload.get("versions") or {}
+    try:
+        current = _current_versions(db_path, kg_db_path)
+    except Exception as e:
+        logger.debug("Context bundle version check failed: %s", e)
+        return None
+    fresh = {lane: built.get(lane) == current.get(lane) for lane in ("lore", "style", "kg")}
+    if not all(fresh.values()):
+        logger.debug("Context bundle for %s/%s has stale lanes: %s", era, location_id, fresh)
+    return LocationBundle(
+        era=era,
+        location_id=location_id,
+        lore=list(entry.get("lore") or []) if fresh["lore"] else [],
+        style=list(entry.get("style") or []) if fresh["style"] else [],
+        kg_location=(str(entry.get("kg_location") or "") or None) if fresh["kg"] else None,
+        npc_relationships=dict(entry.get("npc_relationships") or {}) if fresh["kg"] else {},
+    )
+
+
+def bundle_for_state(state: Any) -> LocationBundle | None:
+    """Bundle for the campaign era and current location of a GameState or graph state dict."""
+    if isinstance(state, dict):
+        campaign, location = state.get("campaign") or {}, state.get("current_location")
+    else:
+        campaign, location = getattr(state, "campaign", None) or {}, getattr(state, "current_location", None)
+    era = (campaign.get("time_period") or campaign.get("era") or "rebellion").strip() or "rebellion"
+    try:
+        return get_location_bundle(era, location)
+    except Exception as e:
+        logger.debug("Context bundle lookup failed (non-fatal): %s", e)
+        return None
+
+
+def style_slots(genre: str | None = None, archetype: str | None = None) -> int:
+    """Style slots served from the bundle; at most one when a genre/archetype overlay applies."""
+    from backend.app.config import CONTEXT_BUNDLE_STYLE_SLOTS
+
+    if genre or archetype:
+        return min(CONTEXT_BUNDLE_STYLE_SLOTS, 1)
+    return CONTEXT_BUNDLE_STYLE_SLOTS
+
+
+def _item_key(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("chunk_id") or item.get("text") or "")
+    return str(item)
+
+
+def merge_precomputed(
+    precomputed: Sequence[Any],
+    live: Callable[[int], Sequence[Any] | None],
+    top_k: int,
+    slots: int,
+    key: Callable[[Any], str] = _item_key,
+) -> list[Any]:
+    """Up to ``slots`` bundle items first, then ``live(k)`` for the remaining k of top_k.
+
+    Live retrieval is skipped when the bundle fills every slot. Duplicates (same chunk
+    id, else text) are dropped, and remaining bundle items top up a short live result.
+    """
+    head = list(precomputed[: max(0, min(slots, top_k))])
+    remaining = top_k - len(head)
+    live_items = (live(remaining) or []) if remaining > 0 else []
+    out: list[Any] = []
+    seen: set[str] = set()
+    for item in chain(head, live_items, precomputed[len(head):]):
+        if len(out) >= top_k:
+            break
+        item_key = key(item)
+        if item_key in seen:
+            continue
+        seen.add(item_key)
+        out.append(item)
+    return out
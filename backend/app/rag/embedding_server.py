@@ -0,0 +1,384 @@
+"""Shared out-of-process embedding server (``storyteller embed-server``).
+
+Every uvicorn worker otherwise loads its own SentenceTransformer. With
+STORYTELLER_EMBEDDING_SERVER set, ``rag._cache.get_encoder`` returns a client
+that sends texts here instead; one process holds the model and batches requests
+from all workers (texts arriving within EMBEDDING_SERVER_BATCH_WINDOW_MS are
+encoded in one call). If the server is unreachable the client falls back to
+in-process encoding.
+
+Address: ``unix:/path/to.sock`` (or any value containing "/") for a Unix socket,
+``host:port`` for TCP. There is no auth, so TCP hosts must be loopback
+(``localhost``, ``127.x.x.x``, ``[::1]``); anything else is rejected.
+
+Wire protocol, one request per line over a persistent connection:
+  request   {"op": "encode", "model": str, "texts": [str, ...]}\\n
+            {"op": "health"}\\n
+  response  {"ok": true, "n": N, "dim": D}\\n followed by N*D little-endian float32
+            {"ok": true, "model": ..., ...stats}\\n              (health)
+            {"ok": false, "error": str}\\n
+"""
+from __future__ import annotations
+
+import ipaddress
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_MAX_LINE_BYTES = 64 * 1024 * 1024
+
+
+class EmbeddingServerError(RuntimeError):
+    """The server answered with an error (bad request, model mismatch, encode failure)."""
+
+
+def parse_address(address: str) -> tuple[int, Any]:
+    """Return (socket family, address) for ``unix:/path`` / ``/path`` or a loopback ``host:port``."""
+    address = address.strip()
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if "/" in address or "\\" in address:
+        return socket.AF_UNIX, address
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Embedding server address must be unix:/path or host:port, got {address!r}")
+    host = host.strip("[]") or "127.0.0.1"
+    if host.lower() == "localhost":
+        return socket.AF_INET, (host, int(port))
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        ip = None
+    if ip is None or not ip.is_loopback:
+        raise ValueError(
+            f"Embedding server has no auth and only accepts loopback TCP hosts, got {host!r}; "
+            "use a unix: socket path or 127.0.0.1"
+        )
+    return (socket.AF_INET6 if ip.version == 6 else socket.AF_INET), (host, int(port))
+
+
+# --- Client side ---------------------------------------------------------------
+
+def _send(wfile, payload: dict[str, Any]) -> None:
+    wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+    wfile.flush()
+
+
+def _read_header(rfile) -> dict[str, Any]:
+    line = rfile.readline(_MAX_LINE_BYTES)
+    if not line:
+        raise ConnectionError("Embedding server closed the connection")
+    header = json.loads(line)
+    if not header.get("ok"):
+        raise EmbeddingServerError(header.get("error") or "embedding server error")
+    return header
+
+
+class EmbeddingServerClient:
+    """Blocking client; one connection per thread, reconnected after errors."""
+
+    def __init__(self, address: str, timeout: float = 10.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        self._family, self._addr = parse_address(address)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(self._family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self._addr)
+            except OSError:
+                sock.close()
+                raise
+            conn = (sock, sock.makefile("rb"), sock.makefile("wb"))
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            for part in reversed(conn):
+                try:
+                    part.close()
+                except OSError:
+                    pass
+
+    def _call(self, payload: dict[str, Any], read_body: Callable[[Any, dict], Any]) -> Any:
+        try:
+            _, rfile, wfile = self._connection()
+            _send(wfile, payload)
+            header = _read_header(rfile)
+            return read_body(rfile, header)
+        except EmbeddingServerError:
+            raise
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def encode(self, texts: list[str], model_name: str):
+        """Vectors for texts as an (N, dim) float32 array, like SentenceTransformer.encode."""
+        import numpy as np
+
+        def _body(rfile, header):
+            n, dim = int(header["n"]), int(header["dim"])
+            size = n * dim * 4
+            buf = rfile.read(size)
+            if len(buf) != size:
+                raise ConnectionError("Embedding server sent a truncated response")
+            return np.frombuffer(buf, dtype="<f4").reshape(n, dim)
+
+        return self._call({"op": "encode", "model": model_name, "texts": list(texts)}, _body)
+
+    def health(self) -> dict[str, Any]:
+        return self._call({"op": "health"}, lambda _rfile, header: header)
+
+
+# --- Server side ---------------------------------------------------------------
+
+@dataclass
+class _Pending:
+    texts: list[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    vectors: Any = None
+    error: str | None = None
+
+
+class _Batcher:
+    """Coalesces concurrent encode requests into one encoder call per batch window."""
+
+    def __init__(self, encode_fn: Callable[[list[str]], Any], window_s: float, max_batch: int) -> None:
+        self._encode = encode_fn
+        self.window_s = max(0.0, window_s)
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue[_Pending | None] = queue.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list[str]) -> _Pending:
+        item = _Pending(texts)
+        if self._stopped:
+            item.error = "server shutting down"
+            return item
+        self._queue.put(item)
+        item.done.wait()
+        return item
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._queue.put(None)
+
+    def _run(self) -> None:
+        import numpy as np
+
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._drain()
+                return
+            batch = [first]
+            count = len(first.texts)
+            deadline = time.monotonic() + self.window_s
+            while count < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+                count += len(item.texts)
+
+            unique = list(dict.fromkeys(t for item in batch for t in item.texts))
+            try:
+                vectors = np.asarray(self._encode(unique), dtype="<f4") if unique else None
+                index = {t: i for i, t in enumerate(unique)}
+                for item in batch:
+                    if item.texts:
+                        item.vectors = vectors[[index[t] for t in item.texts]]
+                    else:
+                        item.vectors = np.zeros((0, 0), dtype="<f4")
+            except Exception as e:
+                logger.exception("Embedding batch of %d texts failed", len(unique))
+                for item in batch:
+                    item.error = f"encode failed: {e}"
+            self.requests += len(batch)
+            self.batches += 1
+            self.texts += len(unique)
+            for item in batch:
+                item.done.set()
+
+    def _drain(self) -> None:
+        """Fail requests queued behind the stop sentinel."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item.error = "server shutting down"
+                item.done.set()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_ThreadingServer"
+
+    def handle(self) -> None:
+        owner: EmbeddingServer = self.server.owner
+        with owner._conn_lock:
+            owner._connections.add(self.connection)
+        try:
+            self._serve(owner)
+        finally:
+            with owner._conn_lock:
+                owner._connections.discard(self.connection)
+
+    def _serve(self, owner: "EmbeddingServer") -> None:
+        while True:
+            line = self.rfile.readline(_MAX_LINE_BYTES)
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "health":
+                    _send(self.wfile, {"ok": True, **owner.stats()})
+                    continue
+                if op != "encode":
+                    raise EmbeddingServerError(f"unknown op {op!r}")
+                model = request.get("model")
+                if model and model != owner.model_name:
+                    raise EmbeddingServerError(f"server has model {owner.model_name!r}, not {model!r}")
+                texts = [str(t) for t in request.get("texts") or []]
+            except (ValueError, AttributeError, EmbeddingServerError) as e:
+                _send(self.wfile, {"ok": False, "error": str(e)})
+                continue
+            result = owner.batcher.submit(texts)
+            if result.error:
+                _send(self.wfile, {"ok": False, "error": result.error})
+                continue
+            vectors = result.vectors
+            dim = int(vectors.shape[1]) if len(vectors) else 0
+            self.wfile.write(json.dumps({"ok": True, "n": len(texts), "dim": dim}).encode("utf-8") + b"\n")
+            self.wfile.write(vectors.tobytes())
+            self.wfile.flush()
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.BaseServer):
+    daemon_threads = True
+    # Every worker thread may connect at once; the default backlog of 5 refuses
+    # Unix-socket connects with EAGAIN.
+    request_queue_size = 128
+    owner: "EmbeddingServer"
+
+
+class _UnixServer(_ThreadingServer, socketserver.UnixStreamServer):
+    pass
+
+
+class _TCPServer(_ThreadingServer, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+
+class EmbeddingServer:
+    """One encoder behind a Unix-socket / localhost TCP listener."""
+
+    def __init__(
+        self,
+        address: str,
+        model_name: str,
+        *,
+        encoder: Any = None,
+        batch_window_ms: float | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        from backend.app.config import EMBEDDING_SERVER_BATCH_WINDOW_MS, EMBEDDING_SERVER_MAX_BATCH
+
+        self.address = address
+        self.model_name = model_name
+        if encoder is None:
+            from backend.app.rag._cache import get_local_encoder
+            encoder = get_local_encoder(model_name)
+        self._encoder = encoder
+        window_ms = EMBEDDING_SERVER_BATCH_WINDOW_MS if batch_window_ms is None else batch_window_ms
+        self.batcher = _Batcher(
+            lambda texts: self._encoder.encode(texts, show_progress_bar=False),
+            window_s=window_ms / 1000.0,
+            max_batch=EMBEDDING_SERVER_MAX_BATCH if max_batch is None else max_batch,
+        )
+        family, addr = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(addr):
+                os.unlink(addr)  # stale socket from a previous run
+            self._server: _ThreadingServer = _UnixServer(addr, _Handler)
+        elif family == socket.AF_INET6:
+            self._server = _TCP6Server(addr, _Handler)
+        else:
+            self._server = _TCPServer(addr, _Handler)
+        self._server.owner = self
+        self._unix_path = addr if family == socket.AF_UNIX else None
+        self._thread: threading.Thread | None = None
+        self._connections: set[socket.socket] = set()
+        self._conn_lock = threading.Lock()
+
+    def stats(self) -> dict[str, Any]:
+        b = self.batcher
+        return {
+            "model": self.model_name,
+            "requests": b.requests,
+            "batches": b.batches,
+            "texts": b.texts,
+            "mean_batch": round(b.requests / b.batches, 2) if b.batches else 0.0,
+        }
+
+    def serve_forever(self) -> None:
+        logger.info("Embedding server for %s listening on %s", self.model_name, self.address)
+        self._server.serve_forever()
+
+    def start(self) -> "EmbeddingServer":
+        """Serve on a background thread (tests, or embedding in another process)."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="embedding-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stop a server started with :meth:`start` and release the socket."""
+        self._server.shutdown()
+        self.close()
+
+    def close(self) -> None:
+        self._server.server_close()
+        self.batcher.stop()
+        # Persistent client connections would otherwise keep their handler threads alive.
+        with self._conn_lock:
+            for conn in list(self._connections):
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        if self._unix_path and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
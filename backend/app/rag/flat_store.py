@@ -0,0 +1,457 @@
+"""Flat NumPy vector store: exact top-k over a memory-mapped float32 matrix.
+
+For small tables (style, character voice, test corpora), opening a LanceDB table
+and running a flat scan costs more than the scan itself. A flat table is a
+directory ``<db_path>/<table>.flat/`` beside the ``.lance`` table it was exported
+from:
+
+  vectors.npy     (N, dim) float32, opened with mmap_mode="r" so every worker
+                  shares the same page-cache pages
+  metadata.arrow  every other column, Arrow IPC file (memory-mapped)
+  meta.json       {"rows", "dim", "vector_column", "source_version", "exported_at"}
+
+Searches compute the query's squared L2 distance to each candidate, like
+LanceDB's default metric, so ``_distance`` (and the retrievers' ``1 - _distance``
+scores) are the same on both backends. Where clauses support the subset the
+retrievers build: ``=``/``!=``/``<``/``<=``/``>``/``>=`` against string or number
+literals, ``IN (...)``, ``LIKE``, ``IS [NOT] NULL``, ``array_has_any(col, [...])``,
+``array_has(col, '...')``, ``AND``/``OR``/``NOT`` and parentheses. Anything else
+raises ValueError.
+
+Create or refresh an export with ``storyteller index --export-flat --table <name>``
+and select it with STORYTELLER_VECTOR_STORE_BACKEND (see vector_store.create_vector_store).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+FLAT_SUFFIX = ".flat"
+_VECTORS_FILE = "vectors.npy"
+_METADATA_FILE = "metadata.arrow"
+_META_FILE = "meta.json"
+_MASK_CACHE_ENTRIES = 256
+# Rows gathered per matrix product when a filter selects a subset.
+_GATHER_BLOCK_ROWS = 32_768
+
+
+def flat_table_dir(db_path: str | Path, table_name: str) -> Path:
+    return Path(db_path) / f"{table_name}{FLAT_SUFFIX}"
+
+
+def flat_table_exists(db_path: str | Path, table_name: str) -> bool:
+    return (flat_table_dir(db_path, table_name) / _META_FILE).is_file()
+
+
+# --- Writing ---------------------------------------------------------------------
+
+def write_flat_table(
+    db_path: str | Path,
+    table_name: str,
+    table: Any,
+    source_version: int | None = None,
+) -> dict[str, Any]:
+    """Write an Arrow table (with a ``vector`` or ``vec`` column) as a flat table.
+
+    The new files are written to a temporary directory and swapped in, so readers
+    holding the old memory maps keep working until they reopen.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    vector_column = next((c for c in ("vector", "vec") if c in table.column_names), None)
+    if vector_column is None:
+        raise ValueError(f"Table {table_name!r} has no vector column")
+    column = table.column(vector_column).combine_chunks()
+    dim = column.type.list_size if pa.types.is_fixed_size_list(column.type) else None
+    if table.num_rows:
+        vectors = np.asarray(column.flatten().to_numpy(zero_copy_only=False), dtype="<f4")
+        dim = dim or len(vectors) // table.num_rows
+        vectors = vectors.reshape(table.num_rows, dim)
+    else:
+        dim = dim or 0
+        vectors = np.zeros((0, dim), dtype="<f4")
+
+    final_dir = flat_table_dir(db_path, table_name)
+    tmp_dir = final_dir.with_name(f"{final_dir.name}.tmp-{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    np.save(tmp_dir / _VECTORS_FILE, vectors)
+    metadata = table.drop_columns([vector_column]).combine_chunks()
+    with pa.OSFile(str(tmp_dir / _METADATA_FILE), "wb") as sink:
+        with ipc.new_file(sink, metadata.schema) as writer:
+            writer.write_table(metadata, max_chunksize=max(1, metadata.num_rows))
+    meta = {
+        "rows": int(table.num_rows),
+        "dim": int(dim),
+        "vector_column": vector_column,
+        "source_version": source_version,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    (tmp_dir / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    old_dir = final_dir.with_name(f"{final_dir.name}.old-{os.getpid()}")
+    if final_dir.exists():
+        final_dir.rename(old_dir)
+    tmp_dir.rename(final_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return meta
+
+
+def export_flat_table(db_path: str | Path, table_name: str) -> dict[str, Any]:
+    """Copy a LanceDB table into its flat export (replacing any previous export)."""
+    import lancedb
+
+    table = lancedb.connect(str(db_path)).open_table(table_name)
+    version = getattr(table, "version", None)
+    return write_flat_table(db_path, table_name, table.to_arrow(), source_version=version)
+
+
+def refresh_flat_export(db_path: str | Path, table_name: str) -> dict[str, Any] | None:
+    """Re-export table_name if it already has a flat export (called after ingestion)."""
+    if not flat_table_exists(db_path, table_name):
+        return None
+    try:
+        meta = export_flat_table(db_path, table_name)
+    except Exception as e:
+        logger.warning("Flat export of %s is stale; refresh failed (run `storyteller index --export-flat`): %s",
+                       table_name, e)
+        return None
+    logger.info("Refreshed flat export of %s (%d rows)", table_name, meta["rows"])
+    return meta
+
+
+# --- Where-clause compiler ----------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<str>'(?:[^']|'')*')"
+    r"|(?P<num>-?\d+(?:\.\d+)?)"
+    r"|(?P<op><>|!=|>=|<=|=|<|>)"
+    r"|(?P<punct>[()\[\],])"
+    r"|(?P<ident>[A-Za-z_][A-Za-z0-9_]*)"
+    r")"
+)
+_KEYWORDS = {"AND", "OR", "NOT", "IN", "LIKE", "IS", "NULL"}
+
+
+def _tokenize(where: str) -> list[tuple[str, Any]]:
+    tokens: list[tuple[str, Any]] = []
+    pos = 0
+    where = where.rstrip()
+    while pos < len(where):
+        m = _TOKEN_RE.match(where, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Unsupported where clause near {where[pos:pos + 20]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == "str":
+            tokens.append(("lit", text[1:-1].replace("''", "'")))
+        elif kind == "num":
+            tokens.append(("lit", float(text) if "." in text else int(text)))
+        elif kind == "ident" and text.upper() in _KEYWORDS:
+            tokens.append(("kw", text.upper()))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+class _WhereParser:
+    """Recursive-descent parser evaluating a where clause to a boolean row mask."""
+
+    def __init__(self, where: str, columns: "_Columns") -> None:
+        self.tokens = _tokenize(where)
+        self.pos = 0
+        self.columns = columns
+
+    def parse(self) -> Any:
+        mask = self._or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected token {self.tokens[self.pos][1]!r} in where clause")
+        return mask
+
+    def _peek(self) -> tuple[str, Any] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, kind: str, value: Any = None) -> Any:
+        tok = self._peek()
+        if tok is None or tok[0] != kind or (value is not None and tok[1] != value):
+            raise ValueError(f"Expected {value or kind} in where clause, got {tok[1] if tok else 'end'!r}")
+        self.pos += 1
+        return tok[1]
+
+    def _accept(self, kind: str, value: Any = None) -> bool:
+        tok = self._peek()
+        if tok is not None and tok[0] == kind and (value is None or tok[1] == value):
+            self.pos += 1
+            return True
+        return False
+
+    def _or(self) -> Any:
+        mask = self._and()
+        while self._accept("kw", "OR"):
+            mask = mask | self._and()
+        return mask
+
+    def _and(self) -> Any:
+        mask = self._not()
+        while self._accept("kw", "AND"):
+            mask = mask & self._not()
+        return mask
+
+    def _not(self) -> Any:
+        if self._accept("kw", "NOT"):
+            return ~self._not()
+        if self._accept("punct", "("):
+            mask = self._or()
+            self._take("punct", ")")
+            return mask
+        return self._predicate()
+
+    def _literals(self, close: str) -> list[Any]:
+        values = [self._take("lit")]
+        while self._accept("punct", ","):
+            values.append(self._take("lit"))
+        self._take("punct", close)
+        return values
+
+    def _predicate(self) -> Any:
+        import pyarrow.compute as pc
+
+        name = self._take("ident")
+        if name.lower() in ("array_has_any", "array_has") and self._accept("punct", "("):
+            column = self._take("ident")
+            self._take("punct", ",")
+            if name.lower() == "array_has":
+                values = [self._take("lit")]
+            else:
+                self._take("punct", "[")
+                values = self._literals("]")
+            self._take("punct", ")")
+            return self.columns.list_has_any(column, values)
+
+        col = self.columns.get(name)
+        negate = self._accept("kw", "NOT")
+        if self._accept("kw", "IN"):
+            self._take("punct", "(")
+            result = pc.is_in(col, value_set=_literal_array(self._literals(")"), col.type))
+        elif self._accept("kw", "LIKE"):
+            result = pc.match_like(col, self._take("lit"))
+        elif not negate and self._accept("kw", "IS"):
+            negate = self._accept("kw", "NOT")
+            self._take("kw", "NULL")
+            mask = col.is_null().to_numpy(zero_copy_only=False)
+            return ~mask if negate else mask
+        elif not negate:
+            op = self._take("op")
+            fn = {"=": pc.equal, "!=": pc.not_equal, "<>": pc.not_equal, "<": pc.less,
+                  "<=": pc.less_equal, ">": pc.greater, ">=": pc.greater_equal}[op]
+            result = fn(col, _literal_scalar(self._take("lit"), col.type))
+        else:
+            raise ValueError("NOT must be followed by IN or LIKE in where clause")
+        mask = _to_mask(result)
+        # SQL semantics: NULL never matches, with or without NOT.
+        return (~mask & ~col.is_null().to_numpy(zero_copy_only=False)) if negate else mask
+
+
+def _literal_scalar(value: Any, type_: Any) -> Any:
+    import pyarrow as pa
+
+    if isinstance(value, str) and (pa.types.is_string(type_) or pa.types.is_large_string(type_)):
+        return pa.scalar(value, type_)
+    return pa.scalar(value)
+
+
+def _literal_array(values: list[Any], type_: Any) -> Any:
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, type_)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"IN list {values!r} does not match column type {type_}") from e
+
+
+def _to_mask(result: Any) -> Any:
+    import pyarrow.compute as pc
+
+    return pc.fill_null(result, False).to_numpy(zero_copy_only=False)
+
+
+class _Columns:
+    """Metadata columns as contiguous arrays, combined on first use."""
+
+    def __init__(self, metadata: Any) -> None:
+        self._metadata = metadata
+        self._arrays: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        arr = self._arrays.get(name)
+        if arr is None:
+            if name not in self._metadata.column_names:
+                raise ValueError(f"No column {name!r} in flat table")
+            arr = self._metadata.column(name).combine_chunks()
+            with self._lock:
+                self._arrays[name] = arr
+        return arr
+
+    def list_has_any(self, name: str, values: list[Any]) -> Any:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        col = self.get(name)
+        if not (pa.types.is_list(col.type) or pa.types.is_large_list(col.type)):
+            raise ValueError(f"array_has_any needs a list column; {name!r} is {col.type}")
+        mask = np.zeros(len(col), dtype=bool)
+        hits = _to_mask(pc.is_in(pc.list_flatten(col), value_set=_literal_array(values, col.type.value_type)))
+        parents = pc.list_parent_indices(col).to_numpy(zero_copy_only=False)
+        mask[parents[hits]] = True
+        return mask
+
+
+# --- Reading ------------------------------------------------------------------------
+
+class FlatTable:
+    """An opened flat table: mmapped vectors, metadata, and cached filter masks.
+
+    Shared by every FlatVectorStore for the same table (see rag._cache.get_flat_table).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        self.path = Path(path)
+        self.meta = json.loads((self.path / _META_FILE).read_text(encoding="utf-8"))
+        self.vectors = np.load(self.path / _VECTORS_FILE, mmap_mode="r")
+        self.metadata = ipc.open_file(pa.memory_map(str(self.path / _METADATA_FILE), "r")).read_all()
+        if self.metadata.num_rows != self.vectors.shape[0]:
+            raise ValueError(
+                f"Flat table {self.path} is inconsistent: {self.vectors.shape[0]} vectors, "
+                f"{self.metadata.num_rows} metadata rows"
+            )
+        self.vector_column = self.meta.get("vector_column") or "vector"
+        self.schema = self.metadata.schema.append(
+            pa.field(self.vector_column, pa.list_(pa.float32(), int(self.vectors.shape[1])))
+        )
+        self._columns = _Columns(self.metadata)
+        self._norms: Any = None
+        self._masks: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def num_rows(self) -> int:
+        return int(self.vectors.shape[0])
+
+    def _squared_norms(self) -> Any:
+        if self._norms is None:
+            import numpy as np
+            norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+            with self._lock:
+                self._norms = norms
+        return self._norms
+
+    def mask(self, where: str) -> Any:
+        """Boolean row mask for a where clause (cached: retrievers repeat the same filters)."""
+        cached = self._masks.get(where)
+        if cached is not None:
+            return cached
+        mask = _WhereParser(where, self._columns).parse()
+        with self._lock:
+            self._masks[where] = mask
+            while len(self._masks) > _MASK_CACHE_ENTRIES:
+                self._masks.popitem(last=False)
+        return mask
+
+    def search(self, query_vector: Any, top_k: int, where_clauses: list[str] | None = None) -> list[dict[str, Any]]:
+        import numpy as np
+
+        if top_k <= 0 or self.num_rows == 0:
+            return []
+        q = np.asarray(query_vector, dtype="<f4").reshape(-1)
+        if q.shape[0] != self.vectors.shape[1]:
+            raise ValueError(f"Query vector has {q.shape[0]} dims; flat table has {self.vectors.shape[1]}")
+        norms = self._squared_norms()
+        clauses = [c for c in (where_clauses or []) if c and c.strip()]
+        if clauses:
+            mask = self.mask(clauses[0])
+            for clause in clauses[1:]:
+                mask = mask & self.mask(clause)
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+            dots = np.empty(candidates.size, dtype="<f4")
+            for start in range(0, candidates.size, _GATHER_BLOCK_ROWS):
+                block = candidates[start:start + _GATHER_BLOCK_ROWS]
+                dots[start:start + block.size] = self.vectors[block] @ q
+            distances = norms[candidates] - 2.0 * dots + float(q @ q)
+        else:
+            candidates = None
+            distances = norms - 2.0 * (self.vectors @ q) + float(q @ q)
+
+        k = min(top_k, distances.size)
+        order = np.argpartition(distances, k - 1)[:k] if k < distances.size else np.arange(distances.size)
+        order = order[np.argsort(distances[order], kind="stable")]
+        rows_idx = order if candidates is None else candidates[order]
+        rows = self.metadata.take(rows_idx).to_pylist()
+        for row, i, j in zip(rows, rows_idx, order):
+            row[self.vector_column] = self.vectors[i].tolist()
+            row["_distance"] = max(0.0, float(distances[j]))
+        return rows
+
+
+class FlatVectorStore:
+    """VectorStore over a flat table export (exact search; no ANN index needed)."""
+
+    def __init__(self, db_path: str | Path, table_name: str) -> None:
+        self._db_path = Path(db_path)
+        self._table_name = table_name
+        self._table: FlatTable | None = None
+
+    def _get_table(self) -> FlatTable:
+        if self._table is None:
+            from backend.app.rag._cache import get_flat_table
+            from backend.app.rag.utils import assert_vector_dim
+
+            table = get_flat_table(flat_table_dir(self._db_path, self._table_name))
+            assert_vector_dim(table, self._table_name)
+            self._table = table
+        return self._table
+
+    def table_exists(self, table_name: str | None = None) -> bool:
+        return flat_table_exists(self._db_path, table_name or self._table_name)
+
+    def get_schema_columns(self) -> set[str]:
+        return set(self._get_table().schema.names)
+
+    def search(
+        self,
+        query_vector: list[float],
+        top_k: int = 6,
+        where: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return self._get_table().search(query_vector, top_k, [where] if where else None)
+
+    def search_multi_where(
+        self,
+        query_vector: list[float],
+        top_k: int = 6,
+        where_clauses: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        return self._get_table().search(query_vector, top_k, where_clauses)
@@ -0,0 +1,189 @@
+"""Era-scoped in-memory knowledge graph behind KGRetriever.
+
+The KG tables are written by ``storyteller extract-knowledge`` and only read at runtime,
+yet prompt assembly used to issue ~4 queries per character (entity, outgoing, incoming,
+arc summary) for the Director and again for the Narrator on every turn. Instead, each
+(database, era) is loaded once into an entity table, weight-sorted adjacency lists and a
+summary map, so KG context is built from dictionary lookups.
+
+A cached graph is reused while the database's KG fingerprint is unchanged: extraction
+checkpoints plus the newest row of each KG table. Any extraction run (or direct write
+that adds rows) moves it, and the next lookup reloads that era.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.app.constants import KG_GRAPH_CACHE_MAX_ERAS
+from backend.app.db.connection import database_key
+from shared.cache import get_cache_value
+
+logger = logging.getLogger(__name__)
+
+_GRAPH_CACHE_KEY = "kg_graph_cache"
+
+# Predicates shown under "Faction Dynamics".
+FACTION_PREDICATES = ("OPPOSES", "ALLIED_WITH", "NEUTRAL_TO")
+
+_CHECKPOINTS_SQL = (
+    "(SELECT COUNT(*) || ':' || IFNULL(MAX(id), 0) || ':' || IFNULL(MAX(started_at), '')"
+    " || ':' || IFNULL(MAX(completed_at), '') FROM kg_extraction_checkpoints)"
+)
+_TABLES_SQL = (
+    "(SELECT MAX(rowid) FROM kg_entities), (SELECT MAX(rowid) FROM kg_triples), "
+    "(SELECT MAX(rowid) FROM kg_summaries)"
+)
+
+
+@dataclass(frozen=True)
+class KGEntity:
+    id: str
+    entity_type: str
+    canonical_name: str
+    properties: dict[str, Any]
+    confidence: float
+
+
+@dataclass(frozen=True)
+class KGEdge:
+    """One triple seen from one endpoint: other_* is the entity at the far end."""
+
+    subject_id: str
+    predicate: str
+    object_id: str
+    other_name: str
+    weight: float
+
+
+@dataclass
+class KGGraph:
+    """Read-only view of one era of the knowledge graph."""
+
+    era: str
+    fingerprint: tuple = ()
+    entities: dict[str, KGEntity] = field(default_factory=dict)
+    # LOWER(canonical_name) -> id, LOCATION entities only
+    location_names: dict[str, str] = field(default_factory=dict)
+    # Sorted by weight DESC (ties in insertion order), like the SQL they replace.
+    outgoing: dict[str, list[KGEdge]] = field(default_factory=dict)
+    incoming: dict[str, list[KGEdge]] = field(default_factory=dict)
+    # (subject_id, subject_name, predicate, object_id, object_name), weight DESC
+    faction_edges: list[tuple[str, str, str, str, str]] = field(default_factory=list)
+    # EVENT entities by confidence DESC
+    events: list[KGEntity] = field(default_factory=list)
+    # (summary_type, entity_id) -> first summary_text
+    summaries: dict[tuple[str, str], str] = field(default_factory=dict)
+
+
+def _props(raw: str | None) -> dict[str, Any]:
+    try:
+        props = json.loads(raw or "{}")
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    return props if isinstance(props, dict) else {}
+
+
+def kg_fingerprint(conn: sqlite3.Connection) -> tuple:
+    """Cheap change marker for the KG tables (indexed MAX lookups, small checkpoint table)."""
+    try:
+        return tuple(conn.execute(f"SELECT {_CHECKPOINTS_SQL}, {_TABLES_SQL}").fetchone())
+    except sqlite3.OperationalError:
+        # No checkpoint table (KG written without the extraction pipeline)
+        return tuple(conn.execute(f"SELECT NULL, {_TABLES_SQL}").fetchone())
+
+
+def load_kg_graph(conn: sqlite3.Connection, era: str, fingerprint: tuple = ()) -> KGGraph:
+    """Load one era of the KG tables into memory (three queries)."""
+    graph = KGGraph(era=era, fingerprint=fingerprint)
+
+    for row in conn.execute(
+        "SELECT id, entity_type, canonical_name, properties_json, confidence "
+        "FROM kg_entities WHERE era=? ORDER BY rowid",
+        (era,),
+    ):
+        entity = KGEntity(
+            id=row[0],
+            entity_type=row[1],
+            canonical_name=row[2],
+            properties=_props(row[3]),
+            confidence=float(row[4] if row[4] is not None else 1.0),
+        )
+        graph.entities[entity.id] = entity
+        if entity.entity_type == "LOCATION":
+            graph.location_names.setdefault(entity.canonical_name.lower(), entity.id)
+        elif entity.entity_type == "EVENT":
+            graph.events.append(entity)
+    graph.events.sort(key=lambda e: e.confidence, reverse=True)
+
+    # Endpoint names may come from entities of any era (the old JOINs did not filter them).
+    for subject_id, predicate, object_id, weight, subject_name, object_name in conn.execute(
+        "SELECT t.subject_id, t.predicate, t.object_id, t.weight, s.canonical_name, o.canonical_name "
+        "FROM kg_triples t "
+        "LEFT JOIN kg_entities s ON t.subject_id = s.id "
+        "LEFT JOIN kg_entities o ON t.object_id = o.id "
+        "WHERE t.era=? ORDER BY t.weight DESC, t.id",
+        (era,),
+    ):
+        if object_name is not None:
+            graph.outgoing.setdefault(subject_id, []).append(
+                KGEdge(subject_id, predicate, object_id, object_name, weight)
+            )
+        if subject_name is not None:
+            graph.incoming.setdefault(object_id, []).append(
+                KGEdge(subject_id, predicate, object_id, subject_name, weight)
+            )
+        if predicate in FACTION_PREDICATES and subject_name is not None and object_name is not None:
+            graph.faction_edges.append((subject_id, subject_name, predicate, object_id, object_name))
+
+    for summary_type, entity_id, text in conn.execute(
+        "SELECT summary_type, entity_id, summary_text FROM kg_summaries "
+        "WHERE era=? AND entity_id IS NOT NULL ORDER BY id",
+        (era,),
+    ):
+        graph.summaries.setdefault((summary_type, entity_id), text)
+    return graph
+
+
+def _registry() -> OrderedDict:
+    return get_cache_value(_GRAPH_CACHE_KEY, OrderedDict)
+
+
+_registry_lock = threading.Lock()
+
+
+def get_kg_graph(conn: sqlite3.Connection, era: str) -> KGGraph:
+    """The cached graph for (conn's database, era), reloaded when the KG fingerprint moves."""
+    fingerprint = kg_fingerprint(conn)
+    db_key = database_key(conn)
+    if db_key is None:
+        return load_kg_graph(conn, era, fingerprint)
+    key = (db_key, era)
+    with _registry_lock:
+        graph = _registry().get(key)
+        if graph is not None and graph.fingerprint == fingerprint:
+            _registry().move_to_end(key)
+            return graph
+    graph = load_kg_graph(conn, era, fingerprint)
+    logger.debug(
+        "KG graph loaded era=%s entities=%d edges=%d",
+        era, len(graph.entities), sum(len(v) for v in graph.outgoing.values()),
+    )
+    with _registry_lock:
+        registry = _registry()
+        registry[key] = graph
+        registry.move_to_end(key)
+        while len(registry) > KG_GRAPH_CACHE_MAX_ERAS:
+            registry.popitem(last=False)
+    return graph
+
+
+def invalidate_kg_graphs() -> None:
+    """Drop every cached graph (tests, or after writing KG tables in-process)."""
+    with _registry_lock:
+        _registry().clear()
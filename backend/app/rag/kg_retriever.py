@@ -1,12 +1,12 @@
 """Runtime Knowledge Graph retrieval for Director/Narrator context injection.
 
-Queries the SQLite KG tables for structured entity/relationship/event context
-and formats it as text blocks for prompt injection. Gracefully degrades to
-empty strings when KG tables are missing or empty.
+Reads structured entity/relationship/event context from an era-scoped in-memory
+copy of the SQLite KG tables (see kg_graph.py) and formats it as text blocks for
+prompt injection. Gracefully degrades to empty strings when KG tables are missing
+or empty.
 """
 from __future__ import annotations
 
-import json
 import logging
 import sqlite3
 from typing import TYPE_CHECKING
@@ -19,7 +19,11 @@ from backend.app.constants import (
     KG_NARRATOR_MAX_TOKENS,
 )
 from backend.app.core.context_budget import estimate_tokens
+from backend.app.db.connection import thread_connection
+from backend.app.kg.entity_resolution import slugify
 from backend.app.kg.predicates import PREDICATE_LABELS
+from backend.app.rag.kg_graph import KGGraph, get_kg_graph, kg_fingerprint
+from backend.app.rag.retrieval_cache import get_retrieval_cache
 
 if TYPE_CHECKING:
     from backend.app.models.state import GameState
@@ -32,151 +36,137 @@ class KGRetriever:
 
     def __init__(self, db_path: str | None = None):
         self.db_path = db_path or DEFAULT_DB_PATH
-        self._conn: sqlite3.Connection | None = None
 
     def _get_conn(self) -> sqlite3.Connection | None:
-        """Lazily connect to SQLite, returning None if KG tables don't exist."""
-        if self._conn is not None:
-            return self._conn
+        """The calling thread's pooled connection, or None if KG tables don't exist.
+
+        Retrievers are shared by graph nodes running on different threads, so the
+        connection is looked up per call (thread-owned, reused across calls) rather
+        than cached on the instance.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = thread_connection(self.db_path)
             # Check if KG tables exist
             cursor = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='kg_entities'"
             )
             if cursor.fetchone() is None:
-                conn.close()
                 return None
-            self._conn = conn
-            return self._conn
+            return conn
         except Exception:
             logger.debug("KG database not available at %s", self.db_path, exc_info=True)
             return None
 
+    def _graph(self, era: str) -> KGGraph | None:
+        """In-memory graph for era (loaded once, reused until the KG changes)."""
+        conn = self._get_conn()
+        if conn is None:
+            return None
+        try:
+            return get_kg_graph(conn, era)
+        except sqlite3.OperationalError:
+            logger.debug("KG graph load failed for era %s", era, exc_info=True)
+            return None
+
     def get_character_context(
         self,
         character_ids: list[str],
         era: str = "rebellion",
         max_relationships: int = KG_MAX_RELATIONSHIPS_PER_CHAR,
+        precomputed: dict[str, str] | None = None,
     ) -> str:
-        """Get formatted character relationship context for prompt injection."""
-        conn = self._get_conn()
-        if conn is None or not character_ids:
-            return ""
-
-        lines = []
-        for cid in character_ids[:6]:  # limit to 6 characters
-            try:
-                row = conn.execute(
-                    "SELECT * FROM kg_entities WHERE id=? AND era=?", (cid, era)
-                ).fetchone()
-                if row is None:
-                    continue
-
-                props = json.loads(row["properties_json"] or "{}")
-                name = row["canonical_name"]
-
-                # Build character header
-                species = props.get("species", "")
-                role = props.get("role", "")
-                faction = props.get("faction", "")
-                header_parts = [name]
-                if species:
-                    header_parts.append(species)
-                if role:
-                    header_parts.append(role)
-                if faction:
-                    header_parts.append(faction)
-                header = " (".join([header_parts[0]] + [", ".join(header_parts[1:])]) + ")" if len(header_parts) > 1 else name
-
-                # Get relationships
-                triples = conn.execute(
-                    "SELECT t.*, e.canonical_name AS other_name FROM kg_triples t "
-                    "JOIN kg_entities e ON t.object_id = e.id "
-                    "WHERE t.subject_id=? AND t.era=? ORDER BY t.weight DESC LIMIT ?",
-                    (cid, era, max_relationships),
-                ).fetchall()
-                incoming = conn.execute(
-                    "SELECT t.*, e.canonical_name AS other_name FROM kg_triples t "
-                    "JOIN kg_entities e ON t.subject_id = e.id "
-                    "WHERE t.object_id=? AND t.era=? ORDER BY t.weight DESC LIMIT ?",
-                    (cid, era, max_relationships),
-                ).fetchall()
-
-                rel_parts = []
-                for t in triples:
-                    label = PREDICATE_LABELS.get(t["predicate"], t["predicate"].lower())
-                    rel_parts.append(f"{label} {t['other_name']}")
-                for t in incoming:
-                    label = PREDICATE_LABELS.get(t["predicate"], t["predicate"].lower())
-                    rel_parts.append(f"{t['other_name']} {label} them")
-
-                # Get arc summary if available
-                arc = conn.execute(
-                    "SELECT summary_text FROM kg_summaries "
-                    "WHERE summary_type='CHARACTER_ARC' AND entity_id=? AND era=? LIMIT 1",
-                    (cid, era),
-                ).fetchone()
-
-                char_block = f"- {header}: {'; '.join(rel_parts[:max_relationships])}"
-                if arc:
-                    arc_text = arc["summary_text"][:200]
-                    char_block += f"\n  Arc: {arc_text}"
-                lines.append(char_block)
-
-            except sqlite3.OperationalError:
-                logger.debug("KG query failed for character %s", cid, exc_info=True)
-                continue
+        """Get formatted character relationship context for prompt injection.
 
+        precomputed: ready-made lines by character id (a location bundle's anchor NPC
+        summaries, see rag/context_bundles.py); only the remaining ids touch the graph.
+        """
+        if not character_ids:
+            return ""
+        wanted = character_ids[:6]  # limit to 6 characters
+        precomputed = precomputed or {}
+        missing = [cid for cid in wanted if cid not in precomputed]
+        computed = self.character_lines(missing, era, max_relationships) if missing else {}
+        lines = [precomputed.get(cid) or computed.get(cid) for cid in wanted]
+        lines = [line for line in lines if line]
         if not lines:
             return ""
         return "### Character Relationships\n" + "\n".join(lines)
 
+    def character_lines(
+        self,
+        character_ids: list[str],
+        era: str = "rebellion",
+        max_relationships: int = KG_MAX_RELATIONSHIPS_PER_CHAR,
+    ) -> dict[str, str]:
+        """One relationship/arc summary line per known character id."""
+        if not character_ids:
+            return {}
+        graph = self._graph(era)
+        if graph is None:
+            return {}
+
+        lines: dict[str, str] = {}
+        for cid in character_ids:
+            entity = graph.entities.get(cid)
+            if entity is None:
+                continue
+
+            props = entity.properties
+            name = entity.canonical_name
+
+            # Build character header
+            species = props.get("species", "")
+            role = props.get("role", "")
+            faction = props.get("faction", "")
+            header_parts = [name]
+            if species:
+                header_parts.append(species)
+            if role:
+                header_parts.append(role)
+            if faction:
+                header_parts.append(faction)
+            header = " (".join([header_parts[0]] + [", ".join(header_parts[1:])]) + ")" if len(header_parts) > 1 else name
+
+            # Get relationships (adjacency lists are already weight-sorted)
+            rel_parts = []
+            for t in graph.outgoing.get(cid, ())[:max_relationships]:
+                label = PREDICATE_LABELS.get(t.predicate, t.predicate.lower())
+                rel_parts.append(f"{label} {t.other_name}")
+            for t in graph.incoming.get(cid, ())[:max_relationships]:
+                label = PREDICATE_LABELS.get(t.predicate, t.predicate.lower())
+                rel_parts.append(f"{t.other_name} {label} them")
+
+            # Get arc summary if available
+            arc = graph.summaries.get(("CHARACTER_ARC", cid))
+
+            char_block = f"- {header}: {'; '.join(rel_parts[:max_relationships])}"
+            if arc:
+                char_block += f"\n  Arc: {arc[:200]}"
+            lines[cid] = char_block
+        return lines
+
     def get_faction_dynamics(
         self,
         faction_ids: list[str] | None = None,
         era: str = "rebellion",
     ) -> str:
         """Get faction relationships and dynamics."""
-        conn = self._get_conn()
-        if conn is None:
+        graph = self._graph(era)
+        if graph is None:
             return ""
 
-        try:
-            if faction_ids:
-                placeholders = ",".join("?" for _ in faction_ids)
-                rows = conn.execute(
-                    f"SELECT t.*, s.canonical_name AS subject_name, o.canonical_name AS object_name "
-                    f"FROM kg_triples t "
-                    f"JOIN kg_entities s ON t.subject_id = s.id "
-                    f"JOIN kg_entities o ON t.object_id = o.id "
-                    f"WHERE t.predicate IN ('OPPOSES','ALLIED_WITH','NEUTRAL_TO') "
-                    f"AND t.era=? AND (t.subject_id IN ({placeholders}) OR t.object_id IN ({placeholders})) "
-                    f"ORDER BY t.weight DESC LIMIT 10",
-                    (era, *faction_ids, *faction_ids),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT t.*, s.canonical_name AS subject_name, o.canonical_name AS object_name "
-                    "FROM kg_triples t "
-                    "JOIN kg_entities s ON t.subject_id = s.id "
-                    "JOIN kg_entities o ON t.object_id = o.id "
-                    "WHERE t.predicate IN ('OPPOSES','ALLIED_WITH','NEUTRAL_TO') AND t.era=? "
-                    "ORDER BY t.weight DESC LIMIT 10",
-                    (era,),
-                ).fetchall()
-
-            if not rows:
-                return ""
-
-            lines = []
-            for r in rows:
-                label = PREDICATE_LABELS.get(r["predicate"], r["predicate"].lower())
-                lines.append(f"- {r['subject_name']} {label} {r['object_name']}")
-            return "### Faction Dynamics\n" + "\n".join(lines)
-        except sqlite3.OperationalError:
+        wanted = set(faction_ids or ())
+        lines = []
+        for subject_id, subject_name, predicate, object_id, object_name in graph.faction_edges:
+            if wanted and subject_id not in wanted and object_id not in wanted:
+                continue
+            label = PREDICATE_LABELS.get(predicate, predicate.lower())
+            lines.append(f"- {subject_name} {label} {object_name}")
+            if len(lines) >= 10:
+                break
+        if not lines:
             return ""
+        return "### Faction Dynamics\n" + "\n".join(lines)
 
     def get_location_context(
         self,
@@ -184,51 +174,44 @@ class KGRetriever:
         era: str = "rebellion",
     ) -> str:
         """Get location knowledge: type, region, controlling faction, notable characters/events."""
-        conn = self._get_conn()
-        if conn is None or not location_name:
+        if not location_name:
+            return ""
+        graph = self._graph(era)
+        if graph is None:
             return ""
 
-        try:
-            # Try exact match, then slug match
-            from backend.app.kg.entity_resolution import slugify
-            slug = slugify(location_name)
-            row = conn.execute(
-                "SELECT * FROM kg_entities WHERE (id=? OR LOWER(canonical_name)=?) AND entity_type='LOCATION' AND era=?",
-                (slug, location_name.lower(), era),
-            ).fetchone()
-            if row is None:
-                return ""
-
-            props = json.loads(row["properties_json"] or "{}")
-            loc_type = props.get("location_type", "")
-            region = props.get("region", "")
-            controlling = props.get("controlling_faction", "")
-
-            header = f"### Location: {row['canonical_name']}"
-            details = []
-            if loc_type:
-                details.append(f"Type: {loc_type}")
-            if region:
-                details.append(f"Region: {region}")
-            if controlling:
-                details.append(f"Controlled by: {controlling}")
-
-            # Get dossier if available
-            dossier = conn.execute(
-                "SELECT summary_text FROM kg_summaries "
-                "WHERE summary_type='LOCATION_DOSSIER' AND entity_id=? AND era=? LIMIT 1",
-                (row["id"], era),
-            ).fetchone()
-
-            result = header
-            if details:
-                result += "\n" + ", ".join(details)
-            if dossier:
-                result += "\n" + dossier["summary_text"][:300]
-            return result
-        except sqlite3.OperationalError:
+        # Try exact id (slug) match, then name match
+        slug = slugify(location_name)
+        entity = graph.entities.get(slug)
+        if entity is None or entity.entity_type != "LOCATION":
+            entity = graph.entities.get(graph.location_names.get(location_name.lower(), ""))
+        if entity is None:
             return ""
 
+        props = entity.properties
+        loc_type = props.get("location_type", "")
+        region = props.get("region", "")
+        controlling = props.get("controlling_faction", "")
+
+        header = f"### Location: {entity.canonical_name}"
+        details = []
+        if loc_type:
+            details.append(f"Type: {loc_type}")
+        if region:
+            details.append(f"Region: {region}")
+        if controlling:
+            details.append(f"Controlled by: {controlling}")
+
+        # Get dossier if available
+        dossier = graph.summaries.get(("LOCATION_DOSSIER", entity.id))
+
+        result = header
+        if details:
+            result += "\n" + ", ".join(details)
+        if dossier:
+            result += "\n" + dossier[:300]
+        return result
+
     def get_relevant_events(
         self,
         character_ids: list[str] | None = None,
@@ -237,65 +220,87 @@ class KGRetriever:
         max_events: int = KG_MAX_EVENTS,
     ) -> str:
         """Get relevant events for current context."""
+        graph = self._graph(era)
+        if graph is None:
+            return ""
+
+        events = graph.events[:max_events * 3]  # top by confidence; filter below
+        if not events:
+            return ""
+
+        relevant = []
+        char_set = set(character_ids or [])
+        for ev in events:
+            props = ev.properties
+            participants = props.get("participants", [])
+            ev_location = props.get("location", "")
+
+            # Score relevance
+            score = 0
+            for p in participants:
+                if slugify(p) in char_set:
+                    score += 2
+            if location and location.lower() in ev_location.lower():
+                score += 1
+
+            if score > 0 or (not character_ids and not location):
+                relevant.append((score, ev))
+
+        relevant.sort(key=lambda x: x[0], reverse=True)
+        relevant = relevant[:max_events]
+
+        if not relevant:
+            return ""
+
+        lines = []
+        for _, ev in relevant:
+            outcome = ev.properties.get("outcome", "")
+            lines.append(f"- {ev.canonical_name}: {outcome[:100]}")
+        return "### Relevant Events\n" + "\n".join(lines)
+
+    def fingerprint(self) -> str:
+        """KG change marker as a string ("" when there is no KG); keys caches and bundles."""
         conn = self._get_conn()
         if conn is None:
             return ""
-
         try:
-            events = conn.execute(
-                "SELECT * FROM kg_entities WHERE entity_type='EVENT' AND era=? "
-                "ORDER BY confidence DESC LIMIT ?",
-                (era, max_events * 3),  # fetch extra, filter below
-            ).fetchall()
-            if not events:
-                return ""
-
-            relevant = []
-            char_set = set(character_ids or [])
-            for ev in events:
-                props = json.loads(ev["properties_json"] or "{}")
-                participants = props.get("participants", [])
-                ev_location = props.get("location", "")
-
-                # Score relevance
-                score = 0
-                for p in participants:
-                    from backend.app.kg.entity_resolution import slugify
-                    if slugify(p) in char_set:
-                        score += 2
-                if location and location.lower() in ev_location.lower():
-                    score += 1
-
-                if score > 0 or (not character_ids and not location):
-                    relevant.append((score, ev, props))
-
-            relevant.sort(key=lambda x: x[0], reverse=True)
-            relevant = relevant[:max_events]
-
-            if not relevant:
-                return ""
-
-            lines = []
-            for _, ev, props in relevant:
-                outcome = props.get("outcome", "")
-                lines.append(f"- {ev['canonical_name']}: {outcome[:100]}")
-            return "### Relevant Events\n" + "\n".join(lines)
-        except sqlite3.OperationalError:
+            return repr(kg_fingerprint(conn))
+        except sqlite3.Error:
             return ""
 
+    def _cached_context(self, lane: str, params: dict, compute) -> str:
+        """Run compute through the retrieval cache, keyed on params and the KG fingerprint."""
+        conn = self._get_conn()
+        if conn is None:
+            return ""
+        try:
+            version = repr(kg_fingerprint(conn))
+        except sqlite3.Error:
+            return compute()
+        return get_retrieval_cache().get_or_compute(lane, {"db": str(self.db_path), **params}, version, compute)
+
     def get_context_for_director(
         self,
         state: "GameState",
         max_tokens: int = KG_DIRECTOR_MAX_TOKENS,
     ) -> str:
-        """Build KG context block for Director."""
+        """Build KG context block for Director (cached until the KG changes)."""
         campaign = getattr(state, "campaign", None) or {}
         era = (campaign.get("time_period") or campaign.get("era") or "rebellion").strip() or "rebellion"
 
         # Collect character IDs from present NPCs and party
         char_ids = _collect_character_ids_from_state(state)
         faction_ids = _collect_faction_ids_from_state(state)
-
+        location = state.current_location
+        return self._cached_context(
+            "kg_director",
+            {"era": era, "characters": char_ids, "factions": faction_ids, "location": location, "max_tokens": max_tokens},
+            lambda: self._director_context(era, char_ids, faction_ids, location, max_tokens),
+        )
+
+    def _director_context(
+        self, era: str, char_ids: list[str], faction_ids: list[str], location: str | None, max_tokens: int,
+    ) -> str:
         parts = []
         char_ctx = self.get_character_context(char_ids, era)
         if char_ctx:
@@ -303,7 +308,7 @@ class KGRetriever:
         faction_ctx = self.get_faction_dynamics(faction_ids, era)
         if faction_ctx:
             parts.append(faction_ctx)
-        event_ctx = self.get_relevant_events(char_ids, state.current_location, era)
+        event_ctx = self.get_relevant_events(char_ids, location, era)
         if event_ctx:
             parts.append(event_ctx)
 
@@ -318,20 +323,27 @@ class KGRetriever:
         state: "GameState",
         max_tokens: int = KG_NARRATOR_MAX_TOKENS,
     ) -> str:
-        """Build KG context block for Narrator."""
+        """Build KG context block for Narrator (cached until the KG changes)."""
         campaign = getattr(state, "campaign", None) or {}
         era = (campaign.get("time_period") or campaign.get("era") or "rebellion").strip() or "rebellion"
 
         char_ids = _collect_character_ids_from_state(state)
-
+        location = state.current_location
+        return self._cached_context(
+            "kg_narrator",
+            {"era": era, "characters": char_ids, "location": location, "max_tokens": max_tokens},
+            lambda: self._narrator_context(era, char_ids, location, max_tokens),
+        )
+
+    def _narrator_context(self, era: str, char_ids: list[str], location: str | None, max_tokens: int) -> str:
         parts = []
         char_ctx = self.get_character_context(char_ids, era)
         if char_ctx:
             parts.append(char_ctx)
-        loc_ctx = self.get_location_context(state.current_location or "", era)
+        loc_ctx = self.get_location_context(location or "", era)
         if loc_ctx:
             parts.append(loc_ctx)
-        event_ctx = self.get_relevant_events(char_ids, state.current_location, era)
+        event_ctx = self.get_relevant_events(char_ids, location, era)
         if event_ctx:
             parts.append(event_ctx)
 
@@ -371,7 +383,6 @@ def _collect_faction_ids_from_state(state: "GameState") -> list[str]:
         if isinstance(f, dict):
             name = f.get("name", "")
             if name:
-                from backend.app.kg.entity_resolution import slugify
                 ids.append(slugify(name))
     return ids
 
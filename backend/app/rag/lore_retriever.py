@@ -1,4 +1,4 @@
-"""Lore retrieval from LanceDB. LoreRetriever.query(text, filters={planet,faction,time_period,doc_type,section_kind,characters,related_npcs}, k=6)."""
+"""Lore retrieval from LanceDB (hybrid BM25 + dense by default). LoreRetriever.query(text, filters={planet,faction,time_period,doc_type,section_kind,characters,related_npcs}, k=6)."""
 from __future__ import annotations
 
 import json
@@ -6,10 +6,17 @@ import logging
 from pathlib import Path
 from typing import Any, List
 
-from backend.app.config import LORE_TABLE_NAME, resolve_vectordb_path, EMBEDDING_MODEL
-from backend.app.rag._cache import get_encoder
+from backend.app.config import LORE_RRF_K, LORE_SEARCH_MODE, LORE_TABLE_NAME, resolve_vectordb_path, EMBEDDING_MODEL
+from backend.app.rag._cache import encode_cached, get_encoder, normalize_query_text
+from backend.app.rag.retrieval_cache import cached_retriever, table_version, vector_key
 from backend.app.rag.vector_store import create_vector_store, LanceDBStore
-from backend.app.rag.utils import assert_vector_dim, esc, safe_filter_token, safe_filter_tokens
+from backend.app.rag.utils import (
+    assert_vector_dim,
+    esc,
+    reciprocal_rank_fusion,
+    safe_filter_token,
+    safe_filter_tokens,
+)
 from backend.app.core.warnings import add_warning
 
 logger = logging.getLogger(__name__)
@@ -37,6 +44,95 @@ def _parse_list_json(val: Any) -> List[str]:
     return []
 
 
+def _list_filter(schema_cols: set[str], column: str, values: List[str] | None) -> str | None:
+    """Contains-any clause for a list column (characters / related_npcs).
+
+    Prefers the native list<string> column, which the label-list index serves; tables
+    not yet migrated (scripts/migrate_lance_list_columns.py) fall back to a substring
+    scan of the legacy ``<column>_json`` string column.
+    """
+    if not values:
+        return None
+    if column in schema_cols:
+        items = ", ".join(f"'{_esc(v)}'" for v in values)
+        return f"array_has_any({column}, [{items}])"
+    json_column = f"{column}_json"
+    if json_column in schema_cols:
+        parts = [f"{json_column} LIKE '%\"{_esc(v)}\"%'" for v in values]
+        return f"({' OR '.join(parts)})"
+    return None
+
+
+def _dense_search(store: Any, query_vector: list[float], top_k: int, where_clauses: list[str]) -> list[dict]:
+    if isinstance(store, LanceDBStore):
+        return store.search_multi_where(query_vector, top_k=top_k, where_clauses=where_clauses)
+    return list(store.search(query_vector, top_k=top_k, where=" AND ".join(where_clauses) if where_clauses else None))
+
+
+def _lexical_search(store: Any, query: str, top_k: int, where_clauses: list[str]) -> list[dict] | None:
+    """BM25 ranking, or None when the store has no full-text index (or the search fails)."""
+    if not query.strip() or not getattr(store, "has_text_index", lambda: False)():
+        return None
+    try:
+        return store.text_search(query, top_k=top_k, where_clauses=where_clauses)
+    except Exception as e:
+        logger.debug("Lore full-text search failed, using dense ranking only: %s", e)
+        return None
+
+
+def _row_key(row: dict) -> str:
+    return str(row.get("id") or row.get("chunk_id") or row.get("text") or "")
+
+
+def _hybrid_search(
+    store: Any,
+    query: str,
+    query_vector: list[float],
+    top_k: int,
+    where_clauses: list[str],
+    entity_clauses: list[str],
+) -> list[dict]:
+    """Dense + BM25 rankings fused with reciprocal-rank fusion (rows carry ``_rrf_score``).
+
+    Proper nouns (planets, ships, names) that embed poorly still match lexically, so a
+    smaller top_k keeps the right chunks. Character / NPC filters are soft here: the
+    filtered dense and lexical lanes rank tagged chunks first, and a lexical lane
+    without them fills in when few chunks are tagged. Without a full-text index the
+    unfiltered dense query only runs when the filtered lanes come back empty.
+    Degrades to plain dense results when there is only one ranking.
+    """
+    filtered = where_clauses + entity_clauses
+    rankings = [_dense_search(store, query_vector, top_k, filtered)]
+    lexical = _lexical_search(store, query, top_k, filtered)
+    if lexical is not None:
+        rankings.append(lexical)
+    if entity_clauses:
+        if lexical is not None:
+            rankings.append(_lexical_search(store, query, top_k, where_clauses) or [])
+        elif not rankings[0]:
+            rankings.append(_dense_search(store, query_vector, top_k, where_clauses))
+    rankings = [r for r in rankings if r]
+    if len(rankings) <= 1:
+        return rankings[0][:top_k] if rankings else []
+    fused = reciprocal_rank_fusion(rankings, key=_row_key, k=LORE_RRF_K)
+    return [{**row, "_rrf_score": score} for row, score in fused[:top_k]]
+
+
+def _lore_cache_key(arguments: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    db_path = resolve_vectordb_path(arguments["db_path"])
+    table_name = arguments["table_name"] or LORE_TABLE_NAME
+    params = {
+        **arguments,
+        "query": normalize_query_text(arguments["query"]),
+        "query_vector": vector_key(arguments["query_vector"]),
+        "db_path": str(db_path),
+        "table_name": table_name,
+        "mode": (arguments["mode"] or LORE_SEARCH_MODE).strip().lower(),
+    }
+    return params, table_version(db_path, table_name)
+
+
+@cached_retriever("lore", _lore_cache_key)
 def retrieve_lore(
     query: str,
     top_k: int = 6,
@@ -61,11 +157,18 @@ def retrieve_lore(
     db_path: str | Path | None = None,
     table_name: str | None = None,
     warnings: list[str] | None = None,
+    query_vector: list[float] | None = None,
+    mode: str | None = None,
 ) -> List[dict[str, Any]]:
     """
     Retrieve top-k lore chunks. Filters: era, source_type, time_period, planet, faction, doc_type, section_kind,
     doc_types (OR list), section_kinds (OR list), characters.
     Old DBs missing new columns are handled gracefully (filters skipped, no crash).
+    query_vector: precomputed embedding of query (e.g. from the turn's batched
+    TurnQueryEmbeddings); when omitted the query is encoded here.
+    mode: "hybrid" or "vector" (default LORE_SEARCH_MODE); see _hybrid_search. In
+    vector mode a related_npcs-filtered search with no results is retried without it.
+    Results are cached per query, filters and table version (rag/retrieval_cache.py).
     """
     db_path = resolve_vectordb_path(db_path)
     table_name = table_name or LORE_TABLE_NAME
@@ -85,8 +188,11 @@ def retrieve_lore(
         add_warning(warnings, "Lore retrieval failed: continuing without lore context.")
         return []
 
-    encoder = get_encoder(EMBEDDING_MODEL)
-    query_vector = encoder.encode([query], show_progress_bar=False)[0]
+    if query_vector is None:
+        query_vector = encode_cached(
+            [query], EMBEDDING_MODEL,
+            lambda texts: get_encoder(EMBEDDING_MODEL).encode(texts, show_progress_bar=False),
+        )[0]
     if hasattr(query_vector, "tolist"):
         query_vector = query_vector.tolist()
 
@@ -168,21 +274,16 @@ def retrieve_lore(
                     where_clauses.append(f"({' OR '.join(parts)})")
             elif section_kind:
                 where_clauses.append(f"section_kind = '{_esc(section_kind)}'")
-        if safe_char_filter:
-            if "characters_json" in schema_cols:
-                parts = [f"characters_json LIKE '%\"{_esc(c)}\"%'" for c in safe_char_filter]
-                where_clauses.append(f"({' OR '.join(parts)})")
-            elif "characters" in schema_cols:
-                parts = [f"list_contains(characters, '{_esc(c)}')" for c in safe_char_filter]
-                where_clauses.append(f"({' OR '.join(parts)})")
-        if safe_npc_filter:
-            if "related_npcs_json" in schema_cols:
-                parts = [f"related_npcs_json LIKE '%\"{_esc(n)}\"%'" for n in safe_npc_filter]
-                where_clauses.append(f"({' OR '.join(parts)})")
-            elif "related_npcs" in schema_cols:
-                parts = [f"list_contains(related_npcs, '{_esc(n)}')" for n in safe_npc_filter]
-                where_clauses.append(f"({' OR '.join(parts)})")
-        rows = store.search_multi_where(query_vector, top_k=top_k, where_clauses=where_clauses) if isinstance(store, LanceDBStore) else [r for r in store.search(query_vector, top_k=top_k, where=" AND ".join(where_clauses) if where_clauses else None)]
+        char_clause = _list_filter(schema_cols, "characters", safe_char_filter)
+        npc_clause = _list_filter(schema_cols, "related_npcs", safe_npc_filter)
+        entity_clauses = [c for c in (char_clause, npc_clause) if c]
+        if (mode or LORE_SEARCH_MODE).strip().lower() == "hybrid":
+            rows = _hybrid_search(store, query, query_vector, top_k, where_clauses, entity_clauses)
+        else:
+            rows = _dense_search(store, query_vector, top_k, where_clauses + entity_clauses)
+            if not rows and npc_clause:
+                # related_npcs is a preference: with no NPC-tagged match, retry without it.
+                rows = _dense_search(store, query_vector, top_k, where_clauses + ([char_clause] if char_clause else []))
     except Exception as e:
         logger.warning("Lore search failed: %s", e)
         add_warning(warnings, "Lore retrieval failed: continuing without lore context.")
@@ -196,13 +297,16 @@ def retrieve_lore(
         def _v(name: str, default: Any = ""):
             return row.get(name, default)
 
-        dist = _v("_distance", 0.0)
-        score = float(1.0 - (dist if dist is not None else 0.0))
+        if "_rrf_score" in row:
+            score = float(row["_rrf_score"])
+        else:
+            dist = _v("_distance", 0.0)
+            score = float(1.0 - (dist if dist is not None else 0.0))
         book_title = _v("book_title") or _v("source") or ""
         chapter_title = _v("chapter_title") or _v("chapter") or ""
         chunk_id = _v("chunk_id") or _v("id") or ""
-        chars = _parse_list_json(_v("characters_json", None) or _v("characters", None))
-        related = _parse_list_json(_v("related_npcs_json", None) or _v("related_npcs", None))
+        chars = _parse_list_json(_v("characters", None) or _v("characters_json", None))
+        related = _parse_list_json(_v("related_npcs", None) or _v("related_npcs_json", None))
         metadata = {
             "era": _v("era") or "",
             "time_period": _v("time_period") or "",
@@ -244,11 +348,14 @@ class LoreRetriever:
         filters: dict[str, Any] | None = None,
         k: int = 6,
         warnings: list[str] | None = None,
+        query_vector: list[float] | None = None,
+        mode: str | None = None,
     ) -> List[dict[str, Any]]:
         """Query lore. filters: {planet, faction, time_period, era, doc_type, section_kind,
         doc_types (list), section_kinds (list), characters, related_npcs,
         source_title, source_titles, chapter_index_min, chapter_index_max} (optional).
-        characters/related_npcs can be a string or list of strings for contains-match."""
+        characters/related_npcs can be a string or list of strings for contains-match.
+        mode: "hybrid" (BM25 + dense, default) or "vector"; see retrieve_lore."""
         filters = filters or {}
         chars = filters.get("characters")
         related = filters.get("related_npcs")
@@ -276,4 +383,6 @@ class LoreRetriever:
             db_path=self.db_path,
             table_name=self.table_name,
             warnings=warnings,
+            query_vector=query_vector,
+            mode=mode,
         )
@@ -0,0 +1,121 @@
+"""Per-turn query embedding batch shared by all RAG lanes.
+
+A single turn embeds several near-identical queries: the Director's style and lore
+queries, the Narrator's lore and style queries, voice-sample queries and the
+episodic-memory recall query. ``TurnQueryEmbeddings`` collects those texts up front,
+encodes them in one encoder batch, and hands the vectors to each retriever so the
+turn pays for a single forward pass instead of one per lane.
+
+The batch object travels through the graph as ``state["__runtime_query_embeddings"]``
+(same convention as ``__runtime_conn``: non-serializable, never persisted).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Iterable
+
+from backend.app.config import EMBEDDING_MODEL
+from backend.app.rag._cache import encode_cached, get_encoder
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_STATE_KEY = "__runtime_query_embeddings"
+
+
+def _to_list(vec: Any) -> list[float]:
+    return vec.tolist() if hasattr(vec, "tolist") else list(vec)
+
+
+def encode_queries(texts: list[str], model_name: str | None = None) -> list[list[float]]:
+    """Encode query texts in one encoder call; returns plain float lists in input order.
+
+    Goes through the shared query embedding cache, so only texts not seen in earlier
+    turns reach the encoder.
+    """
+    if not texts:
+        return []
+    model = model_name or EMBEDDING_MODEL
+    vectors = encode_cached(
+        list(texts), model,
+        lambda batch: get_encoder(model).encode(batch, show_progress_bar=False),
+    )
+    return [_to_list(v) for v in vectors]
+
+
+class TurnQueryEmbeddings:
+    """Turn-scoped text -> vector map filled by batched encoder calls.
+
+    ``prefetch`` encodes every not-yet-seen text in one batch. ``get`` returns the
+    cached vector, encoding on demand (single-item batch) for texts nobody prefetched.
+    Safe to share across retrieval lanes running on different threads.
+    """
+
+    def __init__(self, model_name: str | None = None) -> None:
+        self.model_name = model_name or EMBEDDING_MODEL
+        self._vectors: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.encoded = 0
+        self.hits = 0
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._vectors
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def prefetch(self, texts: Iterable[str]) -> None:
+        """Encode all unseen, non-empty texts in a single batch."""
+        with self._lock:
+            missing: list[str] = []
+            seen: set[str] = set()
+            for text in texts:
+                if not text or text in self._vectors or text in seen:
+                    continue
+                missing.append(text)
+                seen.add(text)
+            if not missing:
+                return
+            vectors = encode_queries(missing, self.model_name)
+            for text, vec in zip(missing, vectors):
+                self._vectors[text] = vec
+            self.batches += 1
+            self.encoded += len(missing)
+            logger.debug("Turn query embeddings: encoded %d text(s) in one batch", len(missing))
+
+    def get(self, text: str) -> list[float]:
+        """Return the vector for text, encoding it if it was not prefetched."""
+        vec = self._vectors.get(text)
+        if vec is not None:
+            self.hits += 1
+            return vec
+        self.prefetch([text])
+        return self._vectors[text]
+
+    def get_many(self, texts: list[str]) -> list[list[float]]:
+        """Return vectors for texts (in order), batching any that are missing."""
+        self.prefetch(texts)
+        return [self.get(t) for t in texts]
+
+    def stats(self) -> dict[str, int]:
+        return {"texts": len(self._vectors), "batches": self.batches, "encoded": self.encoded, "hits": self.hits}
+
+
+def get_turn_embeddings(state: dict[str, Any] | None) -> TurnQueryEmbeddings | None:
+    """Return the turn's embedding batch from a graph state dict (None when absent)."""
+    if not isinstance(state, dict):
+        return None
+    batch = state.get(RUNTIME_STATE_KEY)
+    return batch if isinstance(batch, TurnQueryEmbeddings) else None
+
+
+def lookup_vector(batch: TurnQueryEmbeddings | None, text: str) -> list[float] | None:
+    """Vector for text from batch, or None so the retriever encodes on its own."""
+    if batch is None or not text:
+        return None
+    try:
+        return batch.get(text)
+    except Exception as e:
+        logger.debug("Turn query embedding lookup failed (retriever will encode): %s", e)
+        return None
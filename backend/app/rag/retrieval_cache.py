@@ -0,0 +1,233 @@
+"""Retrieval result cache: recent lore / style / KG results, reused across turns.
+
+While the player stays at one location with the same NPCs, the Director and
+Narrator issue the same retrievals turn after turn. Results are cached per
+(lane, parameters, table version), where parameters are the normalized query,
+a hash of the precomputed query vector and every filter, in a size-bounded LRU
+(STORYTELLER_RETRIEVAL_CACHE_SIZE, 0 disables).
+
+Versions invalidate entries without explicit flushes:
+  lore / style  run id of the table's latest ingestion manifest
+                (ingestion.manifest.table_versions) plus the modification time of
+                the table's version directory, so out-of-band writes count too
+  kg            the KG fingerprint (rag.kg_graph.kg_fingerprint)
+
+Per-lane hits, misses and the time hits saved (the original computation time)
+are counted twice: process-wide for ``stats()``, and into the counters of the turn
+running in the current context (``track_turn``), which become the per-turn
+``retrieval_cache`` block of the turn metadata. Turns run concurrently, so the turn
+counters live in a ContextVar rather than being diffed from the global ones.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable
+
+from backend.app.core.warnings import add_warning
+from shared.cache import get_cache_value
+
+logger = logging.getLogger(__name__)
+
+_RETRIEVAL_CACHE_KEY = "rag_retrieval_result_cache"
+
+LaneCounters = dict[str, dict[str, float]]
+
+# Counters of the turn running in this context (None outside a tracked turn).
+_turn_counters: ContextVar[LaneCounters | None] = ContextVar("retrieval_cache_turn_counters", default=None)
+
+
+def track_turn() -> LaneCounters:
+    """Start counting cache hits/misses for the turn running in the current context.
+
+    Worker threads see the counters when they run in a copy of this context
+    (``run_in_threadpool``, ``asyncio.to_thread``, ``retrieval_fanout.run_lanes``).
+    Pass the returned counters to :func:`summarize` at the end of the turn.
+    """
+    counters: LaneCounters = {}
+    _turn_counters.set(counters)
+    return counters
+
+
+def summarize(counters: LaneCounters) -> dict[str, Any]:
+    """Hits, misses, hit rate and saved milliseconds, total and per lane."""
+    lanes = {
+        lane: {"hits": int(c["hits"]), "misses": int(c["misses"]), "saved_ms": round(c["saved_ms"], 2)}
+        for lane, c in counters.items()
+        if c["hits"] or c["misses"]
+    }
+    hits = sum(v["hits"] for v in lanes.values())
+    misses = sum(v["misses"] for v in lanes.values())
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        "saved_ms": round(sum(v["saved_ms"] for v in lanes.values()), 2),
+        "lanes": lanes,
+    }
+
+
+def vector_key(vector: Any) -> str | None:
+    """Short stable hash of a query vector (float32 bytes), or None."""
+    if vector is None:
+        return None
+    from array import array
+
+    values = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+    return hashlib.sha1(array("f", values).tobytes()).hexdigest()[:16]
+
+
+def table_version(db_path: str | Path, table_name: str) -> str:
+    """Version token for a vector table: latest manifest run id + on-disk version marker."""
+    from ingestion.manifest import table_versions
+
+    versions = table_versions()
+    run_id = versions.get(table_name) or versions.get("", "")
+    marker = 0
+    for candidate in (
+        Path(db_path) / f"{table_name}.lance" / "_versions",
+        Path(db_path) / f"{table_name}.flat" / "meta.json",
+    ):
+        try:
+            marker = max(marker, candidate.stat().st_mtime_ns)
+        except OSError:
+            continue
+    return f"{run_id}:{marker}"
+
+
+class RetrievalCache:
+    """Bounded LRU of retrieval results with per-lane hit/miss/saved-time counters."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: OrderedDict[tuple[str, str, str], tuple[Any, float]] = OrderedDict()
+        self._lanes: LaneCounters = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _params_hash(params: dict[str, Any]) -> str:
+        raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, lane: str, field: str, amount: float = 1) -> None:
+        """Add to the process-wide and current turn's counters (lock held)."""
+        turn = _turn_counters.get()
+        for lanes in (self._lanes, turn) if turn is not None else (self._lanes,):
+            counters = lanes.setdefault(lane, {"hits": 0, "misses": 0, "saved_ms": 0.0})
+            counters[field] += amount
+
+    def get_or_compute(
+        self,
+        lane: str,
+        params: dict[str, Any],
+        version: str,
+        compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached result for (lane, params, version), computing it on a miss.
+
+        ``cacheable(result)`` can veto storing a result (e.g. a degraded one that
+        produced warnings). Cached results are deep-copied on the way out so callers
+        may mutate what they get back.
+        """
+        if self.max_entries <= 0:
+            return compute()
+        key = (lane, self._params_hash(params), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._count(lane, "hits")
+                self._count(lane, "saved_ms", entry[1])
+                result = entry[0]
+            else:
+                self._count(lane, "misses")
+        if entry is not None:
+            return copy.deepcopy(result)
+
+        start = time.perf_counter()
+        result = compute()
+        cost_ms = (time.perf_counter() - start) * 1000.0
+        if cacheable is None or cacheable(result):
+            with self._lock:
+                self._entries[key] = (copy.deepcopy(result), cost_ms)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Process-wide counters since start (or the last clear)."""
+        with self._lock:
+            lanes = {lane: dict(c) for lane, c in self._lanes.items()}
+        return {"size": len(self._entries), "max_entries": self.max_entries, **summarize(lanes)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._lanes.clear()
+
+
+def _make_retrieval_cache() -> RetrievalCache:
+    from backend.app.config import RETRIEVAL_CACHE_SIZE
+    return RetrievalCache(max_entries=RETRIEVAL_CACHE_SIZE)
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Return the process-wide retrieval result cache."""
+    return get_cache_value(_RETRIEVAL_CACHE_KEY, _make_retrieval_cache)
+
+
+def cached_retriever(
+    lane: str,
+    key_fn: Callable[[dict[str, Any]], tuple[dict[str, Any], str]],
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a retriever so calls go through the process-wide retrieval cache.
+
+    ``key_fn(arguments)`` receives the bound call arguments (minus ``warnings``) and
+    returns ``(key params, table version)``. Warnings raised while computing are
+    forwarded to the caller's list, and results that produced warnings (degraded
+    or failed retrievals) are not stored, so they are never replayed silently.
+    The undecorated function stays available as ``.uncached``.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache = get_retrieval_cache()
+            if cache.max_entries <= 0:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            warnings = arguments.pop("warnings", None)
+            params, version = key_fn(arguments)
+            local_warnings: list[str] = []
+            result = cache.get_or_compute(
+                lane,
+                params,
+                version,
+                lambda: fn(**{**arguments, "warnings": local_warnings}),
+                cacheable=lambda _result: not local_warnings,
+            )
+            for message in local_warnings:
+                add_warning(warnings, message)
+            return result
+
+        wrapper.uncached = fn  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -11,6 +11,7 @@ import lancedb
 import pyarrow as pa
 
 from backend.app.config import EMBEDDING_DIMENSION, EMBEDDING_MODEL, STYLE_TABLE_NAME, resolve_vectordb_path
+from backend.app.rag.flat_store import refresh_flat_export
 from ingestion.manifest import input_file_hashes, write_run_manifest
 
 logger = logging.getLogger(__name__)
@@ -203,6 +204,8 @@ def ingest_style_dir(
         logger.info("Ingested %s: %d chunks", fp.name, len(rows))
 
     logger.info("Style ingestion complete: %d total chunks", total_chunks)
+    if total_chunks:
+        refresh_flat_export(db_path, table_name)
     write_run_manifest(
         run_type="style",
         input_files=input_hashes,
@@ -7,7 +7,8 @@ from pathlib import Path
 from typing import Any, List
 
 from backend.app.config import EMBEDDING_MODEL, STYLE_TABLE_NAME, resolve_vectordb_path
-from backend.app.rag._cache import get_encoder
+from backend.app.rag._cache import encode_cached, get_encoder, normalize_query_text
+from backend.app.rag.retrieval_cache import cached_retriever, table_version, vector_key
 from backend.app.rag.vector_store import create_vector_store, LanceDBStore
 from backend.app.rag.utils import assert_vector_dim, safe_filter_token
 from backend.app.core.warnings import add_warning
@@ -26,6 +27,7 @@ def retrieve_style(
     table_name: str | None = None,
     warnings: list[str] | None = None,
     style_tags: list[str] | None = None,
+    query_vector: list[float] | None = None,
 ) -> List[dict[str, Any]]:
     """
     Retrieve top-k style chunks by semantic similarity.
@@ -38,6 +40,7 @@ def retrieve_style(
         style_tags: Optional tag filter. When provided, results whose tags
             overlap with *style_tags* are boosted (sorted first), then
             remaining results follow sorted by score.
+        query_vector: Precomputed query embedding (skips encoding when given).
 
     Returns:
         List of dicts with: text, source_title, tags (list[str]), score (if available).
@@ -58,8 +61,11 @@ def retrieve_style(
         logger.warning("Could not open style table %s: %s", table_name, e)
         add_warning(warnings, "Style retrieval failed: continuing without style context.")
         return []
-    encoder = get_encoder(EMBEDDING_MODEL)
-    query_vector = encoder.encode([query], show_progress_bar=False)[0]
+    if query_vector is None:
+        query_vector = encode_cached(
+            [query], EMBEDDING_MODEL,
+            lambda texts: get_encoder(EMBEDDING_MODEL).encode(texts, show_progress_bar=False),
+        )[0]
     if hasattr(query_vector, "tolist"):
         query_vector = query_vector.tolist()
 
@@ -173,6 +179,20 @@ def _apply_tag_boost(out: List[dict[str, Any]], style_tags: list[str] | None) ->
     out.sort(key=lambda c: (-_tag_overlap(c), -(c.get("score") or 0.0)))
 
 
+def _style_cache_key(arguments: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    db_path = resolve_vectordb_path(arguments["db_path"])
+    table_name = arguments["table_name"] or STYLE_TABLE_NAME
+    params = {
+        **arguments,
+        "query": normalize_query_text(arguments["query"]),
+        "query_vector": vector_key(arguments["query_vector"]),
+        "db_path": str(db_path),
+        "table_name": table_name,
+    }
+    return params, table_version(db_path, table_name)
+
+
+@cached_retriever("style", _style_cache_key)
 def retrieve_style_layered(
     query: str,
     era_id: str | None = None,
@@ -183,6 +203,7 @@ def retrieve_style_layered(
     table_name: str | None = None,
     warnings: list[str] | None = None,
     style_tags: list[str] | None = None,
+    query_vector: list[float] | None = None,
 ) -> List[dict[str, Any]]:
     """Retrieve style chunks with 4-lane layered retrieval.
 
@@ -192,6 +213,7 @@ def retrieve_style_layered(
     Lane 3 (when archetype set): Narrative archetype (Hero's Journey, etc.).
 
     Star Wars is always the foundation. Genre and archetype modify but never replace it.
+    Results are cached per query, lanes and table version (rag/retrieval_cache.py).
 
     Args:
         query: Search text.
@@ -203,6 +225,7 @@ def retrieve_style_layered(
         table_name: Style table name override.
         warnings: Mutable list for degradation warnings.
         style_tags: Optional tag-boost list (applied after merge).
+        query_vector: Precomputed query embedding (skips encoding when given).
 
     Returns:
         List of style chunk dicts (text, source_title, tags, score).
@@ -220,7 +243,7 @@ def retrieve_style_layered(
     if not era_id and not genre and not archetype:
         return retrieve_style(
             query, top_k=top_k, db_path=db_path, table_name=table_name,
-            warnings=warnings, style_tags=style_tags,
+            warnings=warnings, style_tags=style_tags, query_vector=query_vector,
         )
 
     if not db_path.exists():
@@ -236,8 +259,11 @@ def retrieve_style_layered(
         logger.warning("Could not open style table %s: %s", table_name, e)
         add_warning(warnings, "Style retrieval failed: continuing without style context.")
         return []
-    encoder = get_encoder(EMBEDDING_MODEL)
-    query_vector = encoder.encode([query], show_progress_bar=False)[0]
+    if query_vector is None:
+        query_vector = encode_cached(
+            [query], EMBEDDING_MODEL,
+            lambda texts: get_encoder(EMBEDDING_MODEL).encode(texts, show_progress_bar=False),
+        )[0]
     if hasattr(query_vector, "tolist"):
         query_vector = query_vector.tolist()
 
@@ -284,7 +310,7 @@ def retrieve_style_layered(
     if not merged:
         return retrieve_style(
             query, top_k=top_k, db_path=db_path, table_name=table_name,
-            warnings=warnings, style_tags=style_tags,
+            warnings=warnings, style_tags=style_tags, query_vector=query_vector,
         )
 
     # Sort merged results by score descending, truncate to top_k
@@ -1,8 +1,8 @@
-"""Shared RAG utility functions (filter tokens, vector dim checks, SQL escaping)."""
+"""Shared RAG utility functions (filter tokens, vector dim checks, SQL escaping, rank fusion)."""
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Any, Callable
 
 from backend.app.config import EMBEDDING_DIMENSION, EMBEDDING_MODEL
 
@@ -49,3 +49,25 @@ def assert_vector_dim(table, table_name: str) -> None:
                         "Run scripts/rebuild_lancedb.py after changing embeddings."
                     )
             break
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[dict[str, Any]]],
+    key: Callable[[dict[str, Any]], str],
+    k: int = 60,
+) -> list[tuple[dict[str, Any], float]]:
+    """Fuse ranked result lists: score(d) = sum over lists of 1 / (k + rank(d)), rank from 1.
+
+    Rank-based, so dense distances and BM25 scores need no normalisation. Returns
+    (row, score) best first; a row found by several lists keeps its first-seen copy.
+    Ties keep the order in which rows were first seen.
+    """
+    scores: dict[str, float] = {}
+    rows: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            rid = key(row)
+            rows.setdefault(rid, row)
+            scores[rid] = scores.get(rid, 0.0) + 1.0 / (k + rank)
+    order = sorted(scores, key=lambda rid: -scores[rid])
+    return [(rows[rid], scores[rid]) for rid in order]
@@ -1,8 +1,9 @@
 """Abstract VectorStore interface for swappable vector DB backends.
 
 The VectorStore protocol decouples retrieval logic from the concrete vector DB
-implementation (currently LanceDB). To switch backends (e.g., Chroma, Qdrant,
-Pinecone), implement a new VectorStore subclass — no retriever changes needed.
+implementation: LanceDB, or the flat NumPy store (rag/flat_store.py) for small
+tables. To switch backends (e.g., Chroma, Qdrant, Pinecone), implement a new
+VectorStore subclass — no retriever changes needed.
 """
 from __future__ import annotations
 
@@ -43,13 +44,29 @@ class VectorStore(Protocol):
 
 
 class LanceDBStore:
-    """LanceDB-backed VectorStore implementation."""
+    """LanceDB-backed VectorStore implementation.
+
+    Searches use the table's vector index when one exists (built by ``storyteller
+    index``); nprobes and refine_factor tune recall against latency and are ignored
+    by flat scans.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        table_name: str,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+    ) -> None:
+        from backend.app.config import VECTOR_SEARCH_NPROBES, VECTOR_SEARCH_REFINE_FACTOR
 
-    def __init__(self, db_path: str | Path, table_name: str) -> None:
         self._db_path = Path(db_path)
         self._table_name = table_name
         self._table: Any | None = None
         self._schema_cols: set[str] | None = None
+        self.nprobes = VECTOR_SEARCH_NPROBES if nprobes is None else nprobes
+        self.refine_factor = VECTOR_SEARCH_REFINE_FACTOR if refine_factor is None else refine_factor
+        self._has_text_index: bool | None = None
 
     def _get_table(self) -> Any:
         if self._table is None:
@@ -72,14 +89,21 @@ class LanceDBStore:
             self._schema_cols = {f.name for f in table.schema}
         return self._schema_cols
 
+    def _vector_query(self, query_vector: list[float], top_k: int) -> Any:
+        q = self._get_table().search(query_vector).limit(top_k)
+        if self.nprobes and hasattr(q, "nprobes"):
+            q = q.nprobes(self.nprobes)
+        if self.refine_factor and hasattr(q, "refine_factor"):
+            q = q.refine_factor(self.refine_factor)
+        return q
+
     def search(
         self,
         query_vector: list[float],
         top_k: int = 6,
         where: str | None = None,
     ) -> list[dict[str, Any]]:
-        table = self._get_table()
-        q = table.search(query_vector).limit(top_k)
+        q = self._vector_query(query_vector, top_k)
         if where:
             q = q.where(where)
         tbl = q.to_arrow()
@@ -91,13 +115,37 @@ class LanceDBStore:
         top_k: int = 6,
         where_clauses: list[str] | None = None,
     ) -> list[dict[str, Any]]:
-        table = self._get_table()
-        q = table.search(query_vector).limit(top_k)
+        q = self._vector_query(query_vector, top_k)
         for clause in (where_clauses or []):
             q = q.where(clause)
         tbl = q.to_arrow()
         return _arrow_to_rows(tbl)
 
+    def has_text_index(self) -> bool:
+        """True when the table has a full-text (BM25) index on ``text`` (``storyteller index``)."""
+        if self._has_text_index is None:
+            try:
+                self._has_text_index = any(
+                    list(cfg.columns) == ["text"] and str(cfg.index_type).upper() in ("FTS", "INVERTED")
+                    for cfg in self._get_table().list_indices()
+                )
+            except Exception as e:
+                logger.debug("Could not list indexes on %s: %s", self._table_name, e)
+                self._has_text_index = False
+        return self._has_text_index
+
+    def text_search(
+        self,
+        query_text: str,
+        top_k: int = 6,
+        where_clauses: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """BM25 full-text search over ``text``; rows carry ``_score`` instead of ``_distance``."""
+        q = self._get_table().search(query_text, query_type="fts").limit(top_k)
+        for clause in (where_clauses or []):
+            q = q.where(clause)
+        return _arrow_to_rows(q.to_arrow())
+
 
 def _arrow_to_rows(tbl: Any) -> list[dict[str, Any]]:
     if tbl.num_rows == 0:
@@ -112,6 +160,30 @@ def _arrow_to_rows(tbl: Any) -> list[dict[str, Any]]:
     return rows
 
 
+_VECTOR_STORE_BACKENDS = ("lancedb", "lance", "flat")
+_warned_missing_flat: set[tuple[str, str]] = set()
+
+
+def backend_for_table(spec: str, table_name: str) -> str:
+    """Resolve a backend spec for one table.
+
+    The spec is a comma-separated list: a bare name sets the default and
+    ``table=backend`` overrides one table, e.g.
+    ``lancedb,style_chunks=flat,character_voice_chunks=flat``.
+    """
+    default = "lancedb"
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, sep, value = part.partition("=")
+        if not sep:
+            default = name
+        elif name.strip() == table_name.lower():
+            return value.strip()
+    return default
+
+
 def create_vector_store(
     db_path: str | Path,
     table_name: str,
@@ -121,11 +193,26 @@ def create_vector_store(
 
     Backends:
     - lancedb (default)
+    - flat: exact search over a memory-mapped NumPy export of the table
+      (``storyteller index --export-flat``); tables without an export use LanceDB.
 
-    Env override:
+    Env override (per table, see backend_for_table):
     - STORYTELLER_VECTOR_STORE_BACKEND
     """
-    resolved_backend = (backend or os.environ.get("STORYTELLER_VECTOR_STORE_BACKEND", "lancedb")).strip().lower()
-    if resolved_backend in ("lancedb", "lance"):
-        return LanceDBStore(db_path, table_name)
-    raise ValueError(f"Unsupported vector store backend: {resolved_backend}")
+    spec = backend or os.environ.get("STORYTELLER_VECTOR_STORE_BACKEND", "lancedb")
+    resolved_backend = backend_for_table(spec, table_name)
+    if resolved_backend not in _VECTOR_STORE_BACKENDS:
+        raise ValueError(f"Unsupported vector store backend: {resolved_backend}")
+    if resolved_backend == "flat":
+        from backend.app.rag.flat_store import FlatVectorStore, flat_table_exists
+
+        if flat_table_exists(db_path, table_name):
+            return FlatVectorStore(db_path, table_name)
+        key = (str(db_path), table_name)
+        if key not in _warned_missing_flat:
+            _warned_missing_flat.add(key)
+            logger.warning(
+                "No flat export of %s in %s; using LanceDB (run `storyteller index --export-flat --table %s`)",
+                table_name, db_path, table_name,
+            )
+    return LanceDBStore(db_path, table_name)
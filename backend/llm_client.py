@@ -1,10 +1,16 @@
-"""LLM client for Ollama-compatible endpoints (Ollama /api/generate)."""
+"""LLM client for Ollama-compatible endpoints (Ollama /api/generate).
+
+Sync methods (``_call_llm``, ``_call_llm_stream``) use a shared ``httpx.Client``;
+the async variants (``_acall_llm``, ``_acall_llm_stream``) use a lazily created
+``httpx.AsyncClient`` so async turn execution does not hold a worker thread for
+the LLM round-trip.
+"""
 
 import json as _json
 import os
 import httpx
 import logging
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,7 @@ class LLMClient:
         self.model = model
         self._timeout = timeout or _LLM_TIMEOUT
         self.client = httpx.Client(timeout=self._timeout)
+        self._async_client: httpx.AsyncClient | None = None
 
     # ------------------------------------------------------------------
     # Cleanup
@@ -34,6 +41,20 @@ class LLMClient:
         """Close the underlying HTTP client (optional, for clean shutdown)."""
         self.client.close()
 
+    async def aclose(self) -> None:
+        """Close both HTTP clients from async code."""
+        self.client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Lazily created async HTTP client (bound to the running event loop's first use)."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self._timeout)
+        return self._async_client
+
     def __enter__(self):
         return self
 
@@ -44,22 +65,45 @@ class LLMClient:
     # Model auto-detection
     # ------------------------------------------------------------------
 
+    def _pick_model(self, resp: httpx.Response) -> None:
+        if resp.status_code != 200:
+            raise ValueError("Could not fetch models")
+        models = resp.json().get("models", [])
+        if not models:
+            raise ValueError("No models available")
+        self.model = models[0]["name"]
+        logger.info("Auto-detected model: %s", self.model)
+
     def _ensure_model(self) -> None:
         if self.model:
             return
         try:
-            resp = self.client.get(f"{self.base_url}/api/tags")
-            if resp.status_code != 200:
-                raise ValueError("Could not fetch models")
-            models = resp.json().get("models", [])
-            if not models:
-                raise ValueError("No models available")
-            self.model = models[0]["name"]
-            logger.info("Auto-detected model: %s", self.model)
+            self._pick_model(self.client.get(f"{self.base_url}/api/tags"))
         except Exception as e:
             logger.error("Failed to auto-detect model: %s", e)
             raise ValueError("Model not specified and auto-detection failed") from e
 
+    async def _aensure_model(self) -> None:
+        if self.model:
+            return
+        try:
+            self._pick_model(await self.async_client.get(f"{self.base_url}/api/tags"))
+        except Exception as e:
+            logger.error("Failed to auto-detect model: %s", e)
+            raise ValueError("Model not specified and auto-detection failed") from e
+
+    def _payload(self, prompt: str, system_prompt: Optional[str], stream: bool, json_mode: bool = False) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+
     # ------------------------------------------------------------------
     # Core LLM call with error handling
     # ------------------------------------------------------------------
@@ -74,46 +118,49 @@ class LLMClient:
         calling agents can fall back to deterministic behaviour.
         """
         self._ensure_model()
-        payload: Dict[str, Any] = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-        }
-        if system_prompt:
-            payload["system"] = system_prompt
-        if json_mode:
-            payload["format"] = "json"
-
+        payload = self._payload(prompt, system_prompt, stream=False, json_mode=json_mode)
         try:
             response = self.client.post(f"{self.base_url}/api/generate", json=payload)
             response.raise_for_status()
-        except httpx.TimeoutException as exc:
+        except httpx.HTTPError as exc:
+            raise self._request_error(exc) from exc
+        return self._response_text(response)
+
+    async def _acall_llm(self, prompt: str, system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
+        """Async variant of :meth:`_call_llm` (same payload, errors and return value)."""
+        await self._aensure_model()
+        payload = self._payload(prompt, system_prompt, stream=False, json_mode=json_mode)
+        try:
+            response = await self.async_client.post(f"{self.base_url}/api/generate", json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise self._request_error(exc) from exc
+        return self._response_text(response)
+
+    def _request_error(self, exc: httpx.HTTPError) -> LLMClientError:
+        """Log an httpx failure and map it to LLMClientError."""
+        if isinstance(exc, httpx.TimeoutException):
             logger.error("LLM request timed out (model=%s): %s", self.model, exc)
-            raise LLMClientError(
-                f"LLM request timed out after {self.client.timeout.read}s"
-            ) from exc
-        except httpx.ConnectError as exc:
+            return LLMClientError(f"LLM request timed out after {self._timeout}s")
+        if isinstance(exc, httpx.ConnectError):
             logger.error(
                 "Cannot connect to Ollama at %s – is the server running? %s",
                 self.base_url, exc,
             )
-            raise LLMClientError(
-                f"Cannot connect to Ollama at {self.base_url} – is the server running?"
-            ) from exc
-        except httpx.HTTPStatusError as exc:
+            return LLMClientError(f"Cannot connect to Ollama at {self.base_url} – is the server running?")
+        if isinstance(exc, httpx.HTTPStatusError):
             logger.error(
                 "Ollama returned HTTP %d: %s",
                 exc.response.status_code,
                 exc.response.text[:500],
             )
-            raise LLMClientError(
-                f"Ollama HTTP error {exc.response.status_code}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            # Catch-all for any other httpx transport/protocol errors
-            logger.error("LLM network error: %s", exc)
-            raise LLMClientError(f"LLM network error: {exc}") from exc
+            return LLMClientError(f"Ollama HTTP error {exc.response.status_code}")
+        # Catch-all for any other httpx transport/protocol errors
+        logger.error("LLM network error: %s", exc)
+        return LLMClientError(f"LLM network error: {exc}")
 
+    @staticmethod
+    def _response_text(response: httpx.Response) -> str:
         try:
             body = response.json()
         except _json.JSONDecodeError as exc:
@@ -123,7 +170,6 @@ class LLMClient:
                 response.text[:500],
             )
             raise LLMClientError("Ollama returned non-JSON response") from exc
-
         return body.get("response", "")
 
     # ------------------------------------------------------------------
@@ -144,14 +190,7 @@ class LLMClient:
         Raises :class:`LLMClientError` on connection failures.
         """
         self._ensure_model()
-        payload: Dict[str, Any] = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": True,
-        }
-        if system_prompt:
-            payload["system"] = system_prompt
-
+        payload = self._payload(prompt, system_prompt, stream=True)
         try:
             with self.client.stream(
                 "POST",
@@ -161,38 +200,66 @@ class LLMClient:
             ) as response:
                 response.raise_for_status()
                 for line in response.iter_lines():
-                    if not line:
-                        continue
-                    try:
-                        data = _json.loads(line)
-                    except _json.JSONDecodeError:
-                        continue
-                    token = data.get("response", "")
+                    token, done = self._parse_stream_line(line)
+                    if token:
+                        yield token
+                    if done:
+                        break
+        except httpx.HTTPError as exc:
+            raise self._stream_error(exc) from exc
+
+    async def _acall_llm_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Async variant of :meth:`_call_llm_stream`; yields tokens as they arrive."""
+        await self._aensure_model()
+        payload = self._payload(prompt, system_prompt, stream=True)
+        try:
+            async with self.async_client.stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=_LLM_TIMEOUT,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    token, done = self._parse_stream_line(line)
                     if token:
                         yield token
-                    if data.get("done", False):
+                    if done:
                         break
-        except httpx.TimeoutException as exc:
+        except httpx.HTTPError as exc:
+            raise self._stream_error(exc) from exc
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> tuple[str, bool]:
+        """Parse one NDJSON line into (token, done). Blank/garbled lines yield ("", False)."""
+        if not line:
+            return "", False
+        try:
+            data = _json.loads(line)
+        except _json.JSONDecodeError:
+            return "", False
+        return data.get("response", ""), bool(data.get("done", False))
+
+    def _stream_error(self, exc: httpx.HTTPError) -> LLMClientError:
+        """Log a streaming httpx failure and map it to LLMClientError."""
+        if isinstance(exc, httpx.TimeoutException):
             logger.error("LLM stream timed out (model=%s): %s", self.model, exc)
-            raise LLMClientError(
-                f"LLM stream timed out after {_LLM_TIMEOUT}s"
-            ) from exc
-        except httpx.ConnectError as exc:
+            return LLMClientError(f"LLM stream timed out after {_LLM_TIMEOUT}s")
+        if isinstance(exc, httpx.ConnectError):
             logger.error(
                 "Cannot connect to Ollama at %s for streaming: %s",
                 self.base_url, exc,
             )
-            raise LLMClientError(
-                f"Cannot connect to Ollama at {self.base_url}"
-            ) from exc
-        except httpx.HTTPStatusError as exc:
+            return LLMClientError(f"Cannot connect to Ollama at {self.base_url}")
+        if isinstance(exc, httpx.HTTPStatusError):
             logger.error(
                 "Ollama stream returned HTTP %d",
                 exc.response.status_code,
             )
-            raise LLMClientError(
-                f"Ollama stream HTTP error {exc.response.status_code}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            logger.error("LLM stream network error: %s", exc)
-            raise LLMClientError(f"LLM stream network error: {exc}") from exc
+            return LLMClientError(f"Ollama stream HTTP error {exc.response.status_code}")
+        logger.error("LLM stream network error: %s", exc)
+        return LLMClientError(f"LLM stream network error: {exc}")
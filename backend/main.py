@@ -113,6 +113,30 @@ def _collect_environment_diagnostics() -> dict:
         "packs": era_pack_details,
     }
 
+    try:
+        from backend.app.rag._cache import get_query_embedding_cache
+        checks["query_embedding_cache"] = {"ok": True, **get_query_embedding_cache().stats()}
+    except Exception as _qec_err:
+        checks["query_embedding_cache"] = {"ok": True, "error": str(_qec_err)}
+
+    try:
+        from backend.app.rag.retrieval_cache import get_retrieval_cache
+        checks["retrieval_cache"] = {"ok": True, **get_retrieval_cache().stats()}
+    except Exception as _rc_err:
+        checks["retrieval_cache"] = {"ok": True, "error": str(_rc_err)}
+
+    try:
+        from backend.app.db.connection import pool_stats
+        checks["db_pool"] = {"ok": True, "pools": pool_stats()}
+    except Exception as _pool_err:
+        checks["db_pool"] = {"ok": True, "error": str(_pool_err)}
+
+    try:
+        from backend.app.api.turn_scheduler import get_turn_scheduler
+        checks["turn_scheduler"] = {"ok": True, **get_turn_scheduler().stats()}
+    except Exception as _ts_err:
+        checks["turn_scheduler"] = {"ok": True, "error": str(_ts_err)}
+
     checks["llm_roles"] = {
         "ok": True,
         "configured_roles": sorted(list(MODEL_CONFIG.keys())),
@@ -181,6 +205,8 @@ async def lifespan(app: FastAPI):
         DEFAULT_DB_PATH,
     )
     yield
+    from backend.app.db.connection import close_pools
+    close_pools()
 
 
 app = FastAPI(title="Storyteller AI API", version="2.0.0", lifespan=lifespan)
@@ -273,7 +299,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "path": request.url.path,
         },
     )
-    return JSONResponse(status_code=exc.status_code, content=error_response)
+    return JSONResponse(status_code=exc.status_code, content=error_response, headers=getattr(exc, "headers", None))
 
 
 @app.exception_handler(Exception)
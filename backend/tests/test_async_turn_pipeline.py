@@ -0,0 +1,102 @@
+"""Tests for the async turn pipeline (async LLM clients, async Narrator, async graph nodes)."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from backend.app.core.agents.base import AgentLLM
+from backend.app.core.agents.narrator import NarratorAgent
+from backend.app.models.state import GameState
+
+
+def _state() -> GameState:
+    return GameState.model_validate({
+        "campaign_id": "c1",
+        "player_id": "p1",
+        "turn_number": 2,
+        "user_input": "I look around",
+        "current_location": "loc-cantina",
+        "intent": "ACTION",
+        "campaign": {"time_period": "REBELLION"},
+        "mechanic_result": {"action_type": "INTERACT", "events": [], "narrative_facts": ["Looked around."]},
+    })
+
+
+class _AsyncProvider:
+    def __init__(self, replies: list[str]):
+        self.replies = list(replies)
+        self.prompts: list[str] = []
+
+    async def acomplete(self, user_prompt, system_prompt, json_mode=False):
+        self.prompts.append(user_prompt)
+        return self.replies.pop(0)
+
+    async def acomplete_stream(self, user_prompt, system_prompt):
+        for tok in ["The ", "cantina ", "hums."]:
+            yield tok
+
+
+def test_acomplete_retries_invalid_json_once():
+    provider = _AsyncProvider(["not json", '{"ok": true}'])
+    agent = AgentLLM("narrator")
+    agent._client = provider
+
+    out = asyncio.run(agent.acomplete("sys", "user", json_mode=True))
+    assert json.loads(out) == {"ok": True}
+    assert out.repaired is True
+    assert len(provider.prompts) == 2
+
+
+def test_acomplete_runs_sync_only_provider_in_thread():
+    class _SyncProvider:
+        def complete(self, user_prompt, system_prompt, json_mode=False):
+            return "plain"
+
+    agent = AgentLLM("narrator")
+    agent._client = _SyncProvider()
+    assert asyncio.run(agent.agenerate("sys", "user")) == "plain"
+
+
+def test_llm_client_async_stream_parses_ndjson():
+    from backend.llm_client import LLMClient
+
+    body = "\n".join(json.dumps(d) for d in [
+        {"response": "Hello", "done": False},
+        {"response": "", "done": False},
+        {"response": " world", "done": True},
+    ])
+    client = LLMClient(model="m")
+    client._async_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    )
+
+    async def _collect():
+        try:
+            return [t async for t in client._acall_llm_stream("prompt", "system")]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(_collect()) == ["Hello", " world"]
+
+
+def test_narrator_agenerate_stream_uses_async_llm():
+    llm = AgentLLM("narrator")
+    llm._client = _AsyncProvider([])
+    narrator = NarratorAgent(llm=llm)
+
+    async def _collect():
+        return [t async for t in narrator.agenerate_stream(_state(), kg_context="")]
+
+    assert asyncio.run(_collect()) == ["The ", "cantina ", "hums."]
+
+
+def test_narrator_node_exposes_async_impl():
+    from backend.app.core.graph import _node
+    from backend.app.core.nodes.narrator import make_narrator_node
+
+    node = make_narrator_node()
+    assert asyncio.iscoroutinefunction(node.async_impl)
+    runnable = _node(node)
+    assert runnable.afunc is node.async_impl
@@ -0,0 +1,207 @@
+"""Tests for precomputed per-location context bundles (rag/context_bundles.py)."""
+from __future__ import annotations
+
+import contextvars
+import json
+
+import pytest
+
+from backend.app.kg.store import KGStore
+from backend.app.rag import context_bundles
+from backend.app.rag.context_bundles import (
+    LocationBundle,
+    get_location_bundle,
+    merge_precomputed,
+    precompute_context_bundles,
+    style_slots,
+    track_turn_versions,
+)
+from backend.app.rag.kg_retriever import KGRetriever
+from backend.app.world.era_pack_models import EraPack
+from shared.cache import clear_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_bundle_cache():
+    clear_cache(context_bundles._CONTEXT_BUNDLES_CACHE_KEY)
+    yield
+    clear_cache(context_bundles._CONTEXT_BUNDLES_CACHE_KEY)
+
+
+@pytest.fixture
+def kg_db(tmp_path):
+    db_path = str(tmp_path / "kg.db")
+    store = KGStore(db_path)
+    store.upsert_entity("luke_skywalker", "CHARACTER", "Luke Skywalker", "TEST_ERA",
+                        properties={"species": "Human", "role": "Jedi Knight"})
+    store.upsert_entity("han_solo", "CHARACTER", "Han Solo", "TEST_ERA", properties={"role": "Smuggler"})
+    store.upsert_entity("tatooine", "LOCATION", "Tatooine", "TEST_ERA",
+                        properties={"location_type": "planet", "region": "Outer Rim"})
+    store.upsert_triple("luke_skywalker", "FRIEND_OF", "han_solo", "TEST_ERA")
+    store.add_summary("LOCATION_DOSSIER", "A harsh desert world.", "TEST_ERA", entity_id="tatooine")
+    store.close()
+    return db_path
+
+
+@pytest.fixture
+def pack():
+    return EraPack.model_validate({
+        "era_id": "TEST_ERA",
+        "locations": [
+            {"id": "loc-tatooine", "name": "Tatooine", "tags": ["desert"], "description": "Twin suns."},
+            {"id": "loc-hangar", "name": "Hangar"},
+        ],
+        "npcs": {"anchors": [
+            {"id": "luke_skywalker", "name": "Luke Skywalker", "default_location_id": "loc-tatooine"},
+        ]},
+    })
+
+
+def _build(tmp_path, pack, kg_db):
+    vectordb = tmp_path / "lancedb"
+    report = precompute_context_bundles(
+        out_dir=tmp_path / "bundles", db_path=vectordb, kg_retriever=KGRetriever(kg_db), packs=[pack],
+    )
+    return report, vectordb
+
+
+def test_precompute_writes_kg_location_and_anchor_lines(tmp_path, pack, kg_db):
+    report, _ = _build(tmp_path, pack, kg_db)
+    info = report["TEST_ERA"]
+    assert info["locations"] == 2
+    assert info["kg_locations"] == 1
+    payload = json.loads((tmp_path / "bundles" / "test_era.json").read_text(encoding="utf-8"))
+    tatooine = payload["locations"]["loc-tatooine"]
+    assert "A harsh desert world." in tatooine["kg_location"]
+    assert "Han Solo" in tatooine["npc_relationships"]["luke_skywalker"]
+    assert payload["locations"]["loc-hangar"]["npc_relationships"] == {}
+
+
+def test_template_packs_are_skipped(tmp_path, kg_db):
+    template = EraPack.model_validate({"era_id": "_TEMPLATE", "locations": [{"id": "loc-a", "name": "A"}]})
+    assert precompute_context_bundles(out_dir=tmp_path, kg_retriever=KGRetriever(kg_db), packs=[template]) == {}
+
+
+def test_runtime_lookup_serves_fresh_lanes(tmp_path, pack, kg_db):
+    _, vectordb = _build(tmp_path, pack, kg_db)
+    bundle = get_location_bundle(
+        "TEST_ERA", "loc-tatooine", root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db,
+    )
+    assert bundle is not None
+    assert "Tatooine" in bundle.kg_location
+    assert set(bundle.npc_relationships) == {"luke_skywalker"}
+    hangar = get_location_bundle("TEST_ERA", "loc-hangar", root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db)
+    assert hangar is not None and hangar.kg_location is None  # no KG block: live lookup runs
+    assert get_location_bundle("TEST_ERA", "loc-unknown", root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db) is None
+    assert get_location_bundle("OTHER_ERA", "loc-tatooine", root=tmp_path / "bundles", db_path=vectordb) is None
+
+
+def test_era_must_match_exactly(tmp_path, pack, kg_db):
+    # KG and lore matching is exact on era, so a bundle built for "TEST_ERA" must not
+    # serve (possibly empty) lanes to a campaign stored as "test_era".
+    _, vectordb = _build(tmp_path, pack, kg_db)
+    assert get_location_bundle(
+        "test_era", "loc-tatooine", root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db,
+    ) is None
+
+
+def test_stale_kg_lane_is_dropped(tmp_path, pack, kg_db):
+    _, vectordb = _build(tmp_path, pack, kg_db)
+    store = KGStore(kg_db)
+    store.upsert_entity("leia_organa", "CHARACTER", "Leia Organa", "TEST_ERA")
+    store.close()
+    bundle = get_location_bundle(
+        "TEST_ERA", "loc-tatooine", root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db,
+    )
+    assert bundle is not None
+    assert bundle.kg_location is None
+    assert bundle.npc_relationships == {}
+
+
+def test_source_versions_checked_once_per_turn(tmp_path, pack, kg_db, monkeypatch):
+    _, vectordb = _build(tmp_path, pack, kg_db)
+    calls = []
+    real = context_bundles.source_versions
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(context_bundles, "source_versions", counting)
+
+    def turn():
+        track_turn_versions()
+        for location_id in ("loc-tatooine", "loc-hangar", "loc-tatooine"):
+            assert get_location_bundle(
+                "TEST_ERA", location_id, root=tmp_path / "bundles", db_path=vectordb, kg_db_path=kg_db,
+            ) is not None
+
+    contextvars.copy_context().run(turn)
+    assert len(calls) == 1
+    contextvars.copy_context().run(turn)  # the next turn checks again
+    assert len(calls) == 2
+
+
+def test_style_overlay_limits_bundle_style_slots(monkeypatch):
+    monkeypatch.setattr("backend.app.config.CONTEXT_BUNDLE_STYLE_SLOTS", 2)
+    assert style_slots() == 2
+    assert style_slots(genre="noir_detective") == 1
+    assert style_slots(archetype="heros_journey") == 1
+    monkeypatch.setattr("backend.app.config.CONTEXT_BUNDLE_STYLE_SLOTS", 0)
+    assert style_slots(genre="noir_detective") == 0
+
+
+def test_disabled_returns_none(tmp_path, pack, kg_db, monkeypatch):
+    _, vectordb = _build(tmp_path, pack, kg_db)
+    monkeypatch.setattr("backend.app.config.ENABLE_CONTEXT_BUNDLES", False)
+    assert get_location_bundle("TEST_ERA", "loc-tatooine", root=tmp_path / "bundles", db_path=vectordb) is None
+
+
+def test_merge_fills_remaining_slots_from_live():
+    bundled = [{"chunk_id": "b1"}, {"chunk_id": "b2"}, {"chunk_id": "b3"}]
+    requested = []
+
+    def live(k):
+        requested.append(k)
+        return [{"chunk_id": "b1"}, {"chunk_id": "l1"}][:k]
+
+    merged = merge_precomputed(bundled, live, top_k=4, slots=2)
+    assert requested == [2]
+    assert [c["chunk_id"] for c in merged] == ["b1", "b2", "l1", "b3"]
+
+
+def test_merge_skips_live_when_bundle_fills_all_slots():
+    def live(k):
+        raise AssertionError("live retrieval should not run")
+
+    merged = merge_precomputed([{"chunk_id": "a"}, {"chunk_id": "b"}], live, top_k=2, slots=4)
+    assert [c["chunk_id"] for c in merged] == ["a", "b"]
+
+
+def test_merge_without_bundle_items_is_live_only():
+    assert merge_precomputed([], lambda k: [{"text": str(i)} for i in range(k)], top_k=3, slots=2) == [
+        {"text": "0"}, {"text": "1"}, {"text": "2"},
+    ]
+
+
+def test_lore_guardrails():
+    bundle = LocationBundle(
+        era="TEST_ERA",
+        location_id="loc-a",
+        lore=[{"chunk_id": "1", "source_title": "Book A"}, {"chunk_id": "2", "source_title": "Book B"}],
+    )
+    assert [c["chunk_id"] for c in bundle.lore_for(["Book B"])] == ["2"]
+    assert bundle.lore_for(chapter_index_max=3) == []
+    bundle.lore_for()[0]["chunk_id"] = "mutated"
+    assert bundle.lore[0]["chunk_id"] == "1"
+
+
+def test_character_context_uses_precomputed_lines(kg_db):
+    retriever = KGRetriever(kg_db)
+    live = retriever.get_character_context(["luke_skywalker", "han_solo"], era="TEST_ERA")
+    mixed = retriever.get_character_context(
+        ["luke_skywalker", "han_solo"], era="TEST_ERA", precomputed={"luke_skywalker": "- Luke (bundled)"},
+    )
+    assert "Luke (bundled)" in mixed
+    assert "Han Solo" in mixed
+    assert mixed.splitlines()[0] == live.splitlines()[0] == "### Character Relationships"
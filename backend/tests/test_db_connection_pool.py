@@ -0,0 +1,151 @@
+"""Tests for the pooled SQLite connection manager (WAL, pragmas, reuse, metrics)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from backend.app.db import connection as dbc
+from backend.app.db.connection import close_pools, get_connection, get_pool, thread_connection
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    close_pools()
+    yield
+    close_pools()
+
+
+def test_pooled_connection_has_wal_and_pragmas(tmp_path):
+    conn = get_connection(str(tmp_path / "game.db"))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+        assert isinstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+    finally:
+        conn.close()
+
+
+def test_close_returns_connection_for_reuse(tmp_path):
+    db = str(tmp_path / "game.db")
+    first = get_connection(db)
+    first.execute("CREATE TABLE t (x INTEGER)")
+    first.execute("INSERT INTO t VALUES (1)")  # left uncommitted
+    first.close()
+
+    second = get_connection(db)
+    try:
+        assert second is first
+        assert not second.in_transaction
+        assert second.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    finally:
+        second.close()
+    stats = get_pool(db).stats()
+    assert stats["opened"] == 1 and stats["reused"] == 1 and stats["returned"] == 2
+
+
+def test_connections_are_exclusive_while_checked_out(tmp_path):
+    db = str(tmp_path / "game.db")
+    a = get_connection(db)
+    b = get_connection(db)
+    assert a is not b
+    a.close()
+    b.close()  # most recently returned: handed out first
+
+    seen: list[object] = []
+
+    def _worker():
+        c = get_connection(db)
+        seen.append(c)
+        c.close()
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    t.join()
+    assert seen == [b]
+    assert get_pool(db).stats()["reused"] == 1
+
+
+def test_idle_connections_are_bounded_across_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.app.config.DB_POOL_SIZE", 2)
+    db = str(tmp_path / "game.db")
+    checked_out = threading.Barrier(4)
+
+    def _worker():
+        conn = get_connection(db)
+        checked_out.wait()  # all four threads hold a connection at once
+        conn.close()
+
+    threads = [threading.Thread(target=_worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = get_pool(db).stats()
+    assert stats["opened"] == 4
+    assert stats["idle"] == 2 and stats["discarded"] == 2
+
+
+def test_double_close_is_idempotent_and_blocks_reuse(tmp_path):
+    db = str(tmp_path / "game.db")
+    other = get_connection(db)
+    conn = get_connection(db)
+    other.close()
+    conn.close()
+    conn.close()   # no-op: must not land in the idle list twice
+    assert get_pool(db).stats()["idle"] == 2
+    assert get_pool(db).stats()["returned"] == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+    first, second = get_connection(db), get_connection(db)
+    try:
+        assert {id(first), id(second)} == {id(other), id(conn)}
+        assert second.execute("SELECT 1").fetchone()[0] == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_replaced_database_file_is_not_reused(tmp_path):
+    db = str(tmp_path / "game.db")
+    conn = get_connection(db)
+    conn.execute("CREATE TABLE old (x INTEGER)")
+    conn.commit()
+    conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db + suffix):
+            os.unlink(db + suffix)
+
+    fresh = get_connection(db)
+    try:
+        assert fresh is not conn
+        assert fresh.execute("SELECT name FROM sqlite_master WHERE name='old'").fetchone() is None
+    finally:
+        fresh.close()
+    assert get_pool(db).stats()["discarded"] == 1
+
+
+def test_thread_connection_is_per_thread_and_survives_calls(tmp_path):
+    db = str(tmp_path / "game.db")
+    assert thread_connection(db) is thread_connection(db)
+    other: list[object] = []
+    t = threading.Thread(target=lambda: other.append(thread_connection(db)))
+    t.start()
+    t.join()
+    assert other[0] is not thread_connection(db)
+
+
+def test_pool_disabled_returns_plain_connections(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.app.config.DB_POOL_SIZE", 0)
+    conn = get_connection(str(tmp_path / "game.db"))
+    try:
+        assert not isinstance(conn, dbc.PooledConnection)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
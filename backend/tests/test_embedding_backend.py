@@ -0,0 +1,76 @@
+"""Tests for encoder backend selection (torch vs int8 ONNX) and export verification math."""
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from shared import embedding_backend
+from shared.embedding_backend import (
+    cosine_agreement,
+    load_sentence_transformer,
+    onnx_model_dir,
+    quantized_file_name,
+)
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@pytest.fixture
+def onnx_root(tmp_path, monkeypatch):
+    monkeypatch.setattr("shared.config.EMBEDDING_ONNX_DIR", str(tmp_path))
+    monkeypatch.setattr("shared.config.EMBEDDING_ONNX_QUANTIZATION", "avx2")
+    return tmp_path
+
+
+def _load(backend):
+    st_class = MagicMock(return_value="encoder")
+    with patch.dict("sys.modules", {"sentence_transformers": MagicMock(SentenceTransformer=st_class)}):
+        return load_sentence_transformer(MODEL, backend=backend), st_class
+
+
+def test_torch_backend_loads_reference_model(onnx_root):
+    encoder, st_class = _load("torch")
+    assert encoder == "encoder"
+    st_class.assert_called_once_with(MODEL)
+
+
+def test_onnx_int8_loads_exported_model(onnx_root):
+    export_dir = onnx_model_dir(MODEL)
+    assert export_dir.parent == onnx_root and "/" not in export_dir.name
+    qfile = export_dir / quantized_file_name("avx2")
+    qfile.parent.mkdir(parents=True)
+    qfile.write_bytes(b"")
+
+    _, st_class = _load("onnx-int8")
+    st_class.assert_called_once_with(
+        str(export_dir), backend="onnx", model_kwargs={"file_name": "onnx/model_int8_avx2.onnx"},
+    )
+
+
+def test_onnx_int8_falls_back_to_torch(onnx_root, caplog):
+    with caplog.at_level(logging.WARNING, logger=embedding_backend.__name__):
+        _, st_class = _load("onnx-int8")
+    st_class.assert_called_once_with(MODEL)
+    assert "storyteller embed-export" in caplog.text
+
+    # Export present but the installed sentence-transformers cannot load ONNX.
+    qfile = onnx_model_dir(MODEL) / quantized_file_name("avx2")
+    qfile.parent.mkdir(parents=True)
+    qfile.write_bytes(b"")
+    st_class = MagicMock(side_effect=[TypeError("unexpected keyword 'backend'"), "encoder"])
+    with patch.dict("sys.modules", {"sentence_transformers": MagicMock(SentenceTransformer=st_class)}):
+        assert load_sentence_transformer(MODEL, backend="onnx-int8") == "encoder"
+    assert st_class.call_args_list[-1].args == (MODEL,)
+
+
+def test_cosine_agreement():
+    ref = np.array([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+    cand = np.array([[2.0, 0.0], [0.0, 1.0], [1.0, -1.0]])
+    result = cosine_agreement(ref, cand)
+    assert result["mean"] == pytest.approx(2 / 3, abs=1e-4)
+    assert result["min"] == pytest.approx(0.0, abs=1e-6)
+    with pytest.raises(ValueError):
+        cosine_agreement(ref, cand[:2])
@@ -0,0 +1,126 @@
+"""Tests for the shared embedding server and its in-process fallback client."""
+from __future__ import annotations
+
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backend.app.rag import _cache
+from backend.app.rag._cache import RemoteEncoder
+from backend.app.rag.embedding_server import (
+    EmbeddingServer,
+    EmbeddingServerClient,
+    EmbeddingServerError,
+    parse_address,
+)
+
+MODEL = "test-model"
+
+
+class _FakeEncoder:
+    """Vector = [len(text), first char code, 1.0]; records every batch it encodes."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def encode(self, texts, show_progress_bar=False):
+        if isinstance(texts, str):
+            return np.asarray(self.encode([texts])[0])
+        with self.lock:
+            self.batches.append(list(texts))
+        return np.asarray([[len(t), ord(t[0]) if t else 0, 1.0] for t in texts], dtype="float32")
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 bytes, so keep this out of the deep test tmp dir.
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        yield str(Path(tmp) / "embed.sock")
+
+
+@pytest.fixture
+def server(socket_path):
+    encoder = _FakeEncoder()
+    srv = EmbeddingServer(f"unix:{socket_path}", MODEL, encoder=encoder, batch_window_ms=50, max_batch=64).start()
+    yield srv, encoder
+    srv.shutdown()
+
+
+def test_parse_address():
+    assert parse_address("unix:/run/embed.sock")[1] == "/run/embed.sock"
+    assert parse_address("./data/embed.sock")[1] == "./data/embed.sock"
+    assert parse_address("127.0.0.1:7799")[1] == ("127.0.0.1", 7799)
+    assert parse_address(":7799")[1] == ("127.0.0.1", 7799)
+    assert parse_address("[::1]:7799") == (socket.AF_INET6, ("::1", 7799))
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+@pytest.mark.parametrize("address", ["0.0.0.0:7799", "192.168.1.20:7799", "[::]:7799", "embed-host:7799"])
+def test_parse_address_rejects_non_loopback_hosts(address):
+    with pytest.raises(ValueError, match="loopback"):
+        parse_address(address)
+
+
+def test_encode_round_trip_and_health(server, socket_path):
+    srv, encoder = server
+    client = EmbeddingServerClient(socket_path)
+    try:
+        vectors = client.encode(["Tatooine", "Hoth", "Tatooine"], MODEL)
+        assert vectors.dtype == np.float32 and vectors.shape == (3, 3)
+        assert vectors[:, 0].tolist() == [8.0, 4.0, 8.0]
+        assert encoder.batches == [["Tatooine", "Hoth"]]  # duplicates encoded once
+        # The connection is reused for the next request.
+        assert client.encode([], MODEL).shape[0] == 0
+        assert client.health()["model"] == MODEL
+        with pytest.raises(EmbeddingServerError, match="server has model"):
+            client.encode(["x"], "other-model")
+    finally:
+        client.close()
+
+
+def test_concurrent_requests_share_encoder_batches(server, socket_path):
+    srv, encoder = server
+    barrier = threading.Barrier(8)
+    results: dict[int, list[float]] = {}
+
+    def _worker(i: int) -> None:
+        client = EmbeddingServerClient(socket_path)
+        try:
+            barrier.wait()
+            results[i] = client.encode(["x" * (i + 1)], MODEL)[0].tolist()
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert {i: v[0] for i, v in results.items()} == {i: float(i + 1) for i in range(8)}
+    assert len(encoder.batches) < 8
+    stats = srv.stats()
+    assert stats["requests"] == 8 and stats["batches"] == len(encoder.batches)
+
+
+def test_remote_encoder_uses_server_then_falls_back(server, socket_path, monkeypatch):
+    srv, encoder = server
+    local = _FakeEncoder()
+    monkeypatch.setattr(_cache, "get_local_encoder", lambda _model: local)
+
+    remote = RemoteEncoder(f"unix:{socket_path}", MODEL, timeout=2.0)
+    assert remote.encode(["Endor"]).tolist() == [[5.0, 69.0, 1.0]]
+    assert remote.encode("Endor").tolist() == [5.0, 69.0, 1.0]
+    assert remote.remote_calls == 2 and not local.batches
+
+    srv.shutdown()
+    assert remote.encode(["Endor"]).tolist() == [[5.0, 69.0, 1.0]]
+    assert remote.local_calls == 1 and local.batches == [["Endor"]]
+    # While the server is marked down, calls go straight to the local model.
+    remote.encode(["Bespin"])
+    assert remote.local_calls == 2 and remote.remote_calls == 2
@@ -0,0 +1,219 @@
+"""Tests for episodic memory recall (vectorized index over the full campaign history)."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from backend.app.core import episodic_memory as em
+from backend.app.core.episodic_memory import EpisodicMemory
+from backend.app.db.migrate import apply_schema
+from shared.cache import clear_cache
+
+_VECTORS = {
+    "duel": [1.0, 0.0, 0.0, 0.0],
+    "trade": [0.0, 1.0, 0.0, 0.0],
+    "escape": [0.0, 0.0, 1.0, 0.0],
+}
+
+
+def _fake_embed(text: str, query: bool = False) -> list[float]:
+    for word, vec in _VECTORS.items():
+        if word in text:
+            return list(vec)
+    return [0.0, 0.0, 0.0, 1.0]
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(em, "_embed_text", _fake_embed)
+    clear_cache(em._INDEX_CACHE_KEY)
+    db = tmp_path / "epi.db"
+    apply_schema(str(db))
+    c = sqlite3.connect(str(db))
+    yield c
+    c.close()
+    clear_cache(em._INDEX_CACHE_KEY)
+
+
+def _store(mem: EpisodicMemory, turn: int, text: str, **kw) -> None:
+    mem.store(
+        turn_number=turn,
+        location_id=kw.pop("location_id", "loc-docks"),
+        npcs_present=kw.pop("npcs_present", []),
+        key_events=kw.pop("key_events", []),
+        narrative_text=text,
+        **kw,
+    )
+
+
+def test_recall_reaches_pivotal_memory_beyond_latest_100_turns(conn):
+    mem = EpisodicMemory(conn, "c1")
+    _store(mem, 1, "A lightsaber duel with Vader.", stress_level=9, location_id="loc-bespin")
+    for turn in range(2, 151):
+        _store(mem, turn, "Routine trade run.")
+    conn.commit()
+
+    results = mem.recall("duel", current_turn=151, location_id="loc-bespin", query_embedding=_VECTORS["duel"])
+    assert results[0]["turn_number"] == 1
+    assert results[0]["is_pivotal"] is True
+
+
+def test_vectorized_recall_matches_python_scan(conn):
+    mem = EpisodicMemory(conn, "c1")
+    texts = ["duel in the hangar", "trade with Jawas", "escape pod launch", "quiet night"]
+    for turn in range(1, 41):
+        _store(
+            mem, turn, texts[turn % 4],
+            location_id="loc-cantina" if turn % 3 == 0 else "loc-docks",
+            npcs_present=["Han"] if turn % 5 == 0 else ["Leia"],
+            stress_level=turn % 10,
+        )
+    conn.commit()
+
+    kwargs = dict(current_turn=41, location_id="loc-cantina", max_results=6)
+    fast = mem.recall("escape from the hangar", npcs=["han"], query_embedding=_VECTORS["escape"], **kwargs)
+    storage = mem._embedding_storage()
+    rows = [mem._split_row(r, storage) for r in mem._fetch_rows(storage)]
+    slow = mem._scan_rows(
+        rows, set(em._extract_keywords("escape from the hangar")), 41, "loc-cantina", {"han"},
+        _VECTORS["escape"], 6,
+    )
+    assert [(m["turn_number"], m["relevance_score"]) for m in fast] == [
+        (m["turn_number"], m["relevance_score"]) for m in slow
+    ]
+
+
+def test_store_extends_cached_index_without_rebuild(conn, monkeypatch):
+    mem = EpisodicMemory(conn, "c1")
+    _store(mem, 1, "trade deal")
+    conn.commit()
+    assert mem.recall("trade", current_turn=1)
+
+    builds: list[int] = []
+    original = EpisodicMemory._build_index
+
+    def _counting(self, has_emb_col):
+        builds.append(1)
+        return original(self, has_emb_col)
+
+    monkeypatch.setattr(EpisodicMemory, "_build_index", _counting)
+    _store(mem, 2, "duel at dawn", stress_level=9)
+    conn.commit()
+    # A fresh EpisodicMemory on another connection shares the cached index.
+    other = sqlite3.connect(conn.execute("PRAGMA database_list").fetchone()[2])
+    try:
+        results = EpisodicMemory(other, "c1").recall("duel", current_turn=2, query_embedding=_VECTORS["duel"])
+    finally:
+        other.close()
+    assert results[0]["turn_number"] == 2
+    assert builds == []
+
+
+def test_rolled_back_store_is_dropped_from_index(conn):
+    mem = EpisodicMemory(conn, "c1")
+    _store(mem, 1, "trade deal")
+    conn.commit()
+    mem.recall("trade", current_turn=1)
+
+    _store(mem, 2, "duel at dawn", stress_level=9)
+    conn.rollback()
+    # The phantom turn-2 row is pivotal and would otherwise score above the threshold.
+    results = mem.recall("trade deal", current_turn=2, query_embedding=_VECTORS["trade"])
+    assert [m["turn_number"] for m in results] == [1]
+
+
+def test_in_memory_database_recall(monkeypatch):
+    monkeypatch.setattr(em, "_embed_text", _fake_embed)
+    c = sqlite3.connect(":memory:")
+    c.execute(
+        "CREATE TABLE episodic_memories (id INTEGER PRIMARY KEY AUTOINCREMENT, campaign_id TEXT NOT NULL, "
+        "turn_number INTEGER NOT NULL, location_id TEXT, npcs_present_json TEXT NOT NULL DEFAULT '[]', "
+        "key_events_json TEXT NOT NULL DEFAULT '[]', stress_level INTEGER DEFAULT 0, arc_stage TEXT, "
+        "hero_beat TEXT, keywords TEXT NOT NULL DEFAULT '', is_pivotal INTEGER NOT NULL DEFAULT 0)"
+    )
+    mem = EpisodicMemory(c, "c1")
+    _store(mem, 1, "smuggler trade deal", npcs_present=["Han"])
+    results = mem.recall("trade deal", current_turn=2, npcs=["Han"])
+    assert results and results[0]["npcs_present"] == ["han"]
+    assert "narrative_summary" in results[0]
+
+
+def test_only_recall_queries_use_query_embedding_cache(monkeypatch):
+    from backend.app.rag import _cache
+
+    class _Encoder:
+        def encode(self, texts, show_progress_bar=False):
+            return [[1.0, 0.0, 0.0, 0.0] for _ in texts]
+
+    cached: list[list[str]] = []
+
+    def _encode_cached(texts, model_name):
+        cached.append(list(texts))
+        return [[0.0, 1.0, 0.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(em, "_EMBEDDINGS_AVAILABLE", True)
+    monkeypatch.setattr(_cache, "get_encoder", lambda model_name: _Encoder())
+    monkeypatch.setattr(_cache, "encode_cached", _encode_cached)
+
+    assert em._embed_text("stored memory text") == [1.0, 0.0, 0.0, 0.0]
+    assert cached == []
+    assert em._embed_text("recall query", query=True) == [0.0, 1.0, 0.0, 0.0]
+    assert cached == [["recall query"]]
+
+
+# ---------------------------------------------------------------------------
+# Binary embedding storage
+# ---------------------------------------------------------------------------
+
+
+def test_pack_embedding_round_trips_float32_and_int8():
+    vec = [0.5, -0.25, 0.125, 0.0]
+    blob, scale = em.pack_embedding(vec)
+    assert scale is None and len(blob) == 4 * len(vec)
+    assert list(em.unpack_embedding(blob, scale)) == vec
+
+    blob8, scale8 = em.pack_embedding(vec, "int8")
+    assert len(blob8) == len(vec)
+    restored = em.unpack_embedding(blob8, scale8)
+    assert all(abs(a - b) <= scale8 for a, b in zip(restored, vec))
+    assert em.unpack_embedding(b"\x00\x01\x02", None) is None
+
+
+def test_store_writes_blob_not_json(conn):
+    EpisodicMemory(conn, "c1").store(1, "loc-docks", [], [], narrative_text="trade deal")
+    blob, scale, emb_json = conn.execute(
+        "SELECT embedding_blob, embedding_scale, embedding_json FROM episodic_memories"
+    ).fetchone()
+    assert emb_json is None and scale is None
+    assert list(em.unpack_embedding(blob)) == _VECTORS["trade"]
+
+
+def test_migration_converts_legacy_json_embeddings(tmp_path, monkeypatch):
+    import json
+
+    from backend.app.db import migrate
+
+    db = str(tmp_path / "legacy.db")
+    all_files = migrate._migration_files()
+    monkeypatch.setattr(migrate, "_migration_files", lambda: [f for f in all_files if f.stem < "0022"])
+    migrate.apply_schema(db)
+    c = sqlite3.connect(db)
+    c.execute(
+        "INSERT INTO episodic_memories (campaign_id, turn_number, keywords, embedding_json) VALUES (?, ?, ?, ?)",
+        ("c1", 1, "duel", json.dumps(_VECTORS["duel"])),
+    )
+    c.commit()
+    c.close()
+
+    monkeypatch.setattr(migrate, "_migration_files", lambda: all_files)
+    migrate.apply_schema(db)
+    c = sqlite3.connect(db)
+    try:
+        blob, emb_json = c.execute("SELECT embedding_blob, embedding_json FROM episodic_memories").fetchone()
+        assert emb_json is None
+        assert list(em.unpack_embedding(blob)) == _VECTORS["duel"]
+        results = EpisodicMemory(c, "c1").recall("duel", current_turn=1, query_embedding=_VECTORS["duel"])
+        assert [m["turn_number"] for m in results] == [1]
+    finally:
+        c.close()
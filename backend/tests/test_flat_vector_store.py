@@ -0,0 +1,102 @@
+"""Tests for the flat NumPy vector store: parity with LanceDB and the where-clause subset."""
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from backend.app.config import EMBEDDING_DIMENSION
+from backend.app.rag._cache import clear_caches
+from backend.app.rag.flat_store import FlatVectorStore, export_flat_table, write_flat_table
+from backend.app.rag.vector_store import LanceDBStore, create_vector_store
+
+lancedb = pytest.importorskip("lancedb")
+
+N = 60
+
+
+def _table(rng) -> pa.Table:
+    vectors = rng.standard_normal((N, EMBEDDING_DIMENSION)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return pa.table({
+        "id": [f"c{i}" for i in range(N)],
+        "vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), EMBEDDING_DIMENSION),
+        "text": [f"chunk {i}" for i in range(N)],
+        "era": ["rebellion" if i % 2 else "old_republic" for i in range(N)],
+        "book_title": ["Han's Gambit" if i % 3 == 0 else "Book" for i in range(N)],
+        "chapter_index": pa.array([i % 10 for i in range(N)], pa.int32()),
+        "related_npcs_json": ['["leia_organa"]' if i % 5 == 0 else "[]" for i in range(N)],
+        "related_npcs": [["leia_organa", "han_solo"] if i % 5 == 0 else [] for i in range(N)],
+        "planet": [None if i % 4 == 0 else "hoth" for i in range(N)],
+    })
+
+
+@pytest.fixture
+def stores(tmp_path):
+    rng = np.random.default_rng(3)
+    db = tmp_path / "lancedb"
+    lancedb.connect(str(db)).create_table("lore_chunks", _table(rng))
+    meta = export_flat_table(db, "lore_chunks")
+    assert meta["rows"] == N and meta["dim"] == EMBEDDING_DIMENSION and meta["source_version"] is not None
+    clear_caches()
+    yield LanceDBStore(db, "lore_chunks"), FlatVectorStore(db, "lore_chunks"), rng
+    clear_caches()
+
+
+@pytest.mark.parametrize("clauses", [
+    [],
+    ["era = 'rebellion'"],
+    ["era = 'rebellion'", "chapter_index >= 3", "chapter_index <= 7"],
+    ["(book_title = 'Han''s Gambit' OR book_title = 'Book')", "era != 'rebellion'"],
+    ["era IN ('rebellion', 'legacy')"],
+    ["array_has_any(related_npcs, ['leia_organa', 'boba_fett'])"],
+    ["(related_npcs_json LIKE '%\"leia_organa\"%')"],
+    ["planet IS NULL"],
+    ["NOT era = 'rebellion' AND planet = 'hoth'"],
+])
+def test_flat_search_matches_lancedb(stores, clauses):
+    lance, flat, rng = stores
+    q = rng.standard_normal(EMBEDDING_DIMENSION).astype("float32").tolist()
+    expected = lance.search_multi_where(q, top_k=5, where_clauses=clauses)
+    got = flat.search_multi_where(q, top_k=5, where_clauses=clauses)
+    assert [r["id"] for r in got] == [r["id"] for r in expected]
+    for g, e in zip(got, expected):
+        assert g["_distance"] == pytest.approx(e["_distance"], abs=1e-4)
+        assert g["related_npcs"] == e["related_npcs"] and g["planet"] == e["planet"]
+    assert flat.search(q, top_k=5, where=" AND ".join(clauses) or None) == got
+
+
+def test_flat_store_schema_and_errors(stores):
+    _, flat, _ = stores
+    assert flat.table_exists() and not flat.table_exists("style_chunks")
+    assert {"id", "vector", "related_npcs", "chapter_index"} <= flat.get_schema_columns()
+    q = [0.0] * EMBEDDING_DIMENSION
+    with pytest.raises(ValueError):
+        flat.search(q, where="era ~ 'x'")
+    with pytest.raises(ValueError):
+        flat.search(q, where="missing_col = 'x'")
+    assert flat.search(q, top_k=5, where="era = 'nope'") == []
+
+
+def test_create_vector_store_per_table_backend(stores, tmp_path):
+    lance, _, _ = stores
+    db = lance._db_path
+    spec = "lancedb,lore_chunks=flat"
+    assert isinstance(create_vector_store(db, "lore_chunks", backend=spec), FlatVectorStore)
+    assert isinstance(create_vector_store(db, "style_chunks", backend=spec), LanceDBStore)
+    # Flat selected but never exported: LanceDB is used instead.
+    assert isinstance(create_vector_store(db, "style_chunks", backend="flat"), LanceDBStore)
+
+
+def test_flat_table_reopens_after_re_export(tmp_path):
+    db = tmp_path / "lancedb"
+    rng = np.random.default_rng(5)
+    table = _table(rng)
+    write_flat_table(db, "style_chunks", table.slice(0, 10))
+    store = FlatVectorStore(db, "style_chunks")
+    q = rng.standard_normal(EMBEDDING_DIMENSION).tolist()
+    assert len(store.search(q, top_k=50)) == 10
+
+    write_flat_table(db, "style_chunks", table)
+    assert len(FlatVectorStore(db, "style_chunks").search(q, top_k=50)) == 50
+    clear_caches()
@@ -4,10 +4,13 @@ from __future__ import annotations
 import pytest
 
 from backend.app.kg.entity_resolution import (
+    EntityIndex,
     build_alias_lookup,
     merge_entity_properties,
     resolve_entity_id,
+    resolve_entity_ids,
     slugify,
+    _bounded_levenshtein,
     _levenshtein,
 )
 
@@ -72,6 +75,62 @@ class TestResolveEntityId:
         assert resolve_entity_id("Vader", "CHARACTER", lookup, existing) == "darth_vader"
 
 
+class TestEntityIndex:
+    def test_bounded_levenshtein_matches_full_distance(self):
+        import itertools
+        words = ["", "a", "ab", "ba", "abc", "acb", "abcd", "xbcd", "luke", "luek", "lukes", "skywalker"]
+        for a, b in itertools.product(words, repeat=2):
+            assert _bounded_levenshtein(a, b, 2) == min(_levenshtein(a, b), 3), (a, b)
+
+    def test_matches_linear_scan(self):
+        import random
+
+        def linear(name, existing):
+            name_lower = name.strip().lower()
+            if name_lower in existing:
+                return existing[name_lower]
+            for cached, cid in existing.items():
+                if _levenshtein(name_lower, cached) <= 2:
+                    return cid
+            for cached, cid in existing.items():
+                if slugify(cached) == slugify(name):
+                    return cid
+            return slugify(name)
+
+        rng = random.Random(7)
+        alphabet = "abcd -"
+        for _ in range(200):
+            existing = {}
+            for _ in range(rng.randint(0, 30)):
+                existing["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))] = f"id{rng.randint(0, 4)}"
+            index = EntityIndex(existing)
+            for _ in range(20):
+                q = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+                assert resolve_entity_id(q, "CHARACTER", {}, index) == linear(q, existing), (q, existing)
+
+    def test_earliest_inserted_match_wins(self):
+        index = EntityIndex()
+        index["han solo"] = "han_solo"
+        index["han sola"] = "han_sola"
+        assert resolve_entity_id("Han Sol", "CHARACTER", {}, index) == "han_solo"
+        index["han solo"] = "han_solo_v2"  # reassigning keeps insertion order
+        assert resolve_entity_id("Han Sol", "CHARACTER", {}, index) == "han_solo_v2"
+
+    def test_slug_match(self):
+        index = EntityIndex({"at-at walker (imperial)": "at_at"})
+        assert resolve_entity_id("AT AT Walker Imperial", "VEHICLE", {}, index) == "at_at"
+
+    def test_bulk_resolution_records_names(self):
+        index = EntityIndex()
+        ids = resolve_entity_ids(
+            [("Luke Skywalker", "CHARACTER"), ("Luke Skywalkr", "CHARACTER"), ("Vader", "CHARACTER")],
+            {"vader": "darth_vader"},
+            index,
+        )
+        assert ids == ["luke_skywalker", "luke_skywalker", "darth_vader"]
+        assert index["luke skywalkr"] == "luke_skywalker" and len(index) == 3
+
+
 class TestMergeEntityProperties:
     def test_union_lists(self):
         result = merge_entity_properties(
@@ -159,6 +159,37 @@ class TestGracefulDegradation:
         assert retriever.get_character_context(["luke"], era="rebellion") == ""
 
 
+class TestGraphCache:
+    def test_graph_is_loaded_once_per_era(self, retriever, monkeypatch):
+        from backend.app.rag import kg_graph
+
+        kg_graph.invalidate_kg_graphs()
+        loads = []
+        real_load = kg_graph.load_kg_graph
+        monkeypatch.setattr(kg_graph, "load_kg_graph", lambda *a: loads.append(a[1]) or real_load(*a))
+        state = _make_mock_state(
+            present_npcs=[{"id": "luke_skywalker"}],
+            campaign={"time_period": "rebellion"},
+            current_location="Tatooine",
+        )
+        retriever.get_context_for_director(state)
+        retriever.get_context_for_narrator(state)
+        assert loads == ["rebellion"]
+
+    def test_extraction_checkpoint_or_new_rows_reload_graph(self, populated_store, retriever):
+        assert "Arc:" not in retriever.get_character_context(["han_solo"], era="rebellion")
+        store = KGStore(populated_store)
+        store.set_checkpoint("Book", "completed", chapter_title="Ch 1")
+        store.add_summary("CHARACTER_ARC", "Han learned to care.", "rebellion", entity_id="han_solo")
+        store.close()
+        assert "Han learned to care." in retriever.get_character_context(["han_solo"], era="rebellion")
+
+        store = KGStore(populated_store)
+        store.upsert_triple("han_solo", "ALLIED_WITH", "rebel_alliance", "rebellion")
+        store.close()
+        assert "Han Solo" in retriever.get_faction_dynamics(["rebel_alliance"], era="rebellion")
+
+
 # ── Helpers ───────────────────────────────────────────────────────────
 
 class _MockState:
@@ -0,0 +1,139 @@
+"""Tests for the concurrent, resumable KG extraction scheduler (fake extractor, no LLM)."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.app.kg.extractor import LLM_FAILURE_WARNING, ExtractionResult
+from backend.app.kg.scheduler import plan_batches, run_extraction
+from backend.app.kg.store import KGStore
+
+ERA = "rebellion"
+
+
+def _library() -> dict[str, dict[str, list[dict]]]:
+    return {
+        "Book B": {
+            "Ch 1": [{"chunk_id": f"b1-{i}", "text": f"text b1 {i}"} for i in range(5)],
+        },
+        "Book A": {
+            "Ch 2": [{"chunk_id": f"a2-{i}", "text": f"text a2 {i}"} for i in range(3)],
+            "Ch 1": [{"chunk_id": f"a1-{i}", "text": f"text a1 {i}"} for i in range(4)],
+        },
+    }
+
+
+class _FakeExtractor:
+    """One entity per chunk plus a chain of triples; records threads and LLMs used."""
+
+    def __init__(self, fail_ids: set[str] | None = None, llm_failure_ids: set[str] | None = None):
+        self.fail_ids = fail_ids or set()
+        self.llm_failure_ids = llm_failure_ids or set()
+        self.calls: list[str] = []
+        self.llms: set[int] = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, chunks, book_title, chapter_title, era, llm, alias_lookup, known_characters):
+        ids = [c["chunk_id"] for c in chunks]
+        with self.lock:
+            self.calls.append(ids[0])
+            self.llms.add(id(llm))
+        # Later batches finish first, so the writer has to restore plan order.
+        time.sleep(0.02 if ids[0].endswith("-0") else 0.0)
+        if self.fail_ids & set(ids):
+            raise RuntimeError("model crashed")
+        if self.llm_failure_ids & set(ids):
+            return ExtractionResult(warnings=[LLM_FAILURE_WARNING])
+        entities = [
+            {"id": f"ent_{cid}", "entity_type": "CHARACTER", "canonical_name": cid, "era": era}
+            for cid in ids
+        ]
+        triples = [
+            {"subject_id": f"ent_{a}", "predicate": "ALLIED_WITH", "object_id": f"ent_{b}", "era": era}
+            for a, b in zip(ids, ids[1:])
+        ]
+        return ExtractionResult(entities=entities, triples=triples, chapter_summary=f"{chapter_title} {ids[0]}")
+
+
+@pytest.fixture
+def store():
+    s = KGStore(":memory:")
+    yield s
+    s.close()
+
+
+def _run(store, extractor, concurrency=1, resume=False):
+    return run_extraction(
+        plan_batches(_library(), 2), store, object,
+        era=ERA, alias_lookup={}, concurrency=concurrency, resume=resume, extract=extractor,
+    )
+
+
+def _dump(store):
+    entities = store.conn.execute("SELECT id, properties_json FROM kg_entities ORDER BY rowid").fetchall()
+    triples = store.conn.execute("SELECT subject_id, object_id, weight FROM kg_triples ORDER BY id").fetchall()
+    summaries = store.conn.execute("SELECT summary_text, chapter_index FROM kg_summaries ORDER BY id").fetchall()
+    return [tuple(r) for r in entities], [tuple(r) for r in triples], [tuple(r) for r in summaries]
+
+
+def test_plan_keeps_serial_order_and_stable_keys():
+    batches = plan_batches(_library(), 2)
+    assert [(b.book_title, b.chapter_title, b.chunk_ids[0]) for b in batches] == [
+        ("Book A", "Ch 1", "a1-0"), ("Book A", "Ch 1", "a1-2"),
+        ("Book A", "Ch 2", "a2-0"), ("Book A", "Ch 2", "a2-2"),
+        ("Book B", "Ch 1", "b1-0"), ("Book B", "Ch 1", "b1-2"), ("Book B", "Ch 1", "b1-4"),
+    ]
+    assert [b.chapter_index for b in batches[:4]] == [0, 0, 1, 1]
+    assert [b.key for b in plan_batches(_library(), 2)] == [b.key for b in batches]
+    assert len({b.key for b in batches}) == len(batches)
+
+
+def test_concurrent_run_writes_same_graph_as_serial():
+    serial, parallel = KGStore(":memory:"), KGStore(":memory:")
+    try:
+        s1 = _run(serial, _FakeExtractor())
+        extractor = _FakeExtractor()
+        s2 = _run(parallel, extractor, concurrency=4)
+        assert _dump(serial) == _dump(parallel)
+        assert s1.batches_stored == s2.batches_stored == 7
+        assert s2.chapters_completed == 3 and s2.entities == 12 and s2.summaries == 7
+        # One AgentLLM per worker thread, never more than the pool size.
+        assert 1 <= len(extractor.llms) <= 4
+        assert parallel.get_checkpoint_status("Book B", "Ch 1") == "completed"
+    finally:
+        serial.close()
+        parallel.close()
+
+
+def test_resume_reruns_only_failed_batches(store):
+    first = _run(store, _FakeExtractor(fail_ids={"a2-2"}, llm_failure_ids={"b1-4"}), concurrency=3)
+    assert first.batches_failed == 2 and first.batches_stored == 5
+    assert first.chapters_completed == 1 and first.chapters_failed == 2
+    assert store.get_checkpoint_status("Book A", "Ch 2") == "failed"
+
+    retry = _FakeExtractor()
+    second = _run(store, retry, concurrency=3, resume=True)
+    assert sorted(retry.calls) == ["a2-2", "b1-4"]
+    assert second.chapters_skipped == 1 and second.batches_skipped == 5
+    assert second.chapters_completed == 2 and second.batches_failed == 0
+    assert store.get_checkpoint_status("Book A", "Ch 2") == "completed"
+    assert store.entity_count() == 12
+
+
+def test_failed_write_rolls_back_the_whole_batch(store, monkeypatch):
+    real_add = store.add_summary
+
+    def _flaky_add(summary_type, summary_text, era, **kw):
+        if summary_text.endswith("a1-2"):
+            raise RuntimeError("disk full")
+        return real_add(summary_type, summary_text, era, **kw)
+
+    monkeypatch.setattr(store, "add_summary", _flaky_add)
+    stats = _run(store, _FakeExtractor())
+    assert stats.batches_failed == 1
+    # The a1-2 batch stored nothing, not even the entities written before the summary.
+    assert store.get_entity("ent_a1-2") is None
+    assert store.get_entity("ent_a1-0") is not None
+    assert store.get_checkpoint_status("Book A", "Ch 1") == "failed"
@@ -123,6 +123,73 @@ class TestTripleCRUD:
         assert store.triple_count(era="rebellion") == 1
 
 
+_ENTITY_ROWS = [
+    {"id": "luke", "entity_type": "character", "canonical_name": "Luke", "era": "rebellion",
+     "properties": {"species": "Human", "titles": ["Farmboy"]}, "source_book": "A New Hope", "confidence": 0.6},
+    {"id": "tatooine", "entity_type": "LOCATION", "canonical_name": "Tatooine", "era": "rebellion"},
+    {"id": "luke", "entity_type": "CHARACTER", "canonical_name": "Luke S.", "era": "legacy",
+     "properties": {"titles": ["Jedi"], "role": "Pilot"}, "source_book": "Empire Strikes Back", "confidence": 0.9},
+    {"id": "luke", "entity_type": "CHARACTER", "canonical_name": "Luke", "era": "rebellion",
+     "properties": {"species": "Clone", "role": ""}, "source_book": "A New Hope", "confidence": 0.1},
+]
+
+_TRIPLE_ROWS = [
+    {"subject_id": "luke", "predicate": "visited", "object_id": "tatooine", "era": "rebellion",
+     "source_book": "A", "source_chunk_id": "c1", "confidence": 0.4, "properties": {"context": "first"}},
+    {"subject_id": "tatooine", "predicate": "CONTROLS", "object_id": "luke", "era": "rebellion"},
+    {"subject_id": "luke", "predicate": "VISITED", "object_id": "tatooine", "era": "rebellion",
+     "source_book": "B", "source_chunk_id": "c2", "confidence": 0.8, "properties": {"context": "second"}},
+]
+
+
+def _rows(store: KGStore, table: str, columns: str) -> list[tuple]:
+    return [tuple(r) for r in store.conn.execute(f"SELECT {columns} FROM {table} ORDER BY rowid")]
+
+
+class TestBulkUpserts:
+    def test_upsert_entities_matches_one_by_one(self, store: KGStore):
+        serial = KGStore(":memory:")
+        try:
+            for target in (store, serial):
+                target.upsert_entity("luke", "CHARACTER", "Luke", "rebellion",
+                                     properties={"homeworld": "Tatooine"}, source_book="Heir to the Empire")
+            for row in _ENTITY_ROWS:
+                serial.upsert_entity(
+                    row["id"], row["entity_type"], row["canonical_name"], row["era"],
+                    properties=row.get("properties"), source_book=row.get("source_book"),
+                    confidence=row.get("confidence", 1.0),
+                )
+            assert store.upsert_entities(_ENTITY_ROWS) == 2
+            columns = "id, entity_type, canonical_name, era, properties_json, source_books_json, confidence"
+            assert _rows(store, "kg_entities", columns) == _rows(serial, "kg_entities", columns)
+        finally:
+            serial.close()
+
+    def test_upsert_triples_folds_duplicates_onto_stored_rows(self, store: KGStore):
+        store.upsert_entities(_ENTITY_ROWS)
+        store.upsert_triple("luke", "VISITED", "tatooine", "rebellion", confidence=0.5)
+        assert store.upsert_triples(_TRIPLE_ROWS) == 2
+        visited = store.get_triples_by_predicate("VISITED")[0]
+        assert visited["weight"] == 3.0
+        assert visited["confidence"] == 0.8
+        assert (visited["source_book"], visited["source_chunk_id"]) == ("B", "c2")
+        assert visited["properties_json"] == "{}"  # properties are set on insert only
+        assert store.triple_count() == 2
+
+    def test_bulk_writes_join_an_enclosing_transaction(self, store: KGStore):
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.upsert_entities(_ENTITY_ROWS)
+                store.upsert_triples(_TRIPLE_ROWS)
+                raise RuntimeError("writer failed")
+        assert store.entity_count() == 0
+        assert store.triple_count() == 0
+
+    def test_empty_batches_are_noops(self, store: KGStore):
+        assert store.upsert_entities([]) == 0
+        assert store.upsert_triples([]) == 0
+
+
 class TestSummaries:
     def test_add_and_get(self, store: KGStore):
         store.add_summary(
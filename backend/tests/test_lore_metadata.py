@@ -219,6 +219,8 @@ class TestLoreMetadataIngestion(unittest.TestCase):
             self.assertIn("characters_json", d)
             parsed = json.loads(d["characters_json"][0])
             self.assertEqual(parsed, ["Luke"])
+            self.assertEqual(d["characters"][0], ["Luke"])
+            self.assertEqual(d["related_npcs"][0], [])
 
     def test_ingest_produces_default_metadata(self) -> None:
         """ingest.py produces chunks with default doc_type/section_kind when not set."""
@@ -108,3 +108,40 @@ def test_retrieve_lore_applies_setting_period_and_related_npc_filters(monkeypatc
     assert "related_npcs_json LIKE '%\"leia_organa\"%'" in applied
     assert out[0]["metadata"]["setting_id"] == "star_wars_legends"
     assert out[0]["metadata"]["period_id"] == "rebellion"
+
+
+def test_retrieve_lore_uses_native_list_columns_when_present(monkeypatch):
+    rows = [
+        {
+            "text": "alpha",
+            "era": "rebellion",
+            "related_npcs": ["leia_organa"],
+            "characters": ["Leia", "Han"],
+            "related_npcs_json": '["leia_organa"]',
+            "characters_json": '["Leia", "Han"]',
+            "book_title": "Book",
+            "chunk_id": "c1",
+            "_distance": 0.1,
+        }
+    ]
+    fake_store = _FakeStore(rows)
+
+    monkeypatch.setattr(lore_retriever, "create_vector_store", lambda *_: fake_store)
+    monkeypatch.setattr(lore_retriever, "get_encoder", lambda *_: _FakeEncoder())
+    monkeypatch.setattr(lore_retriever, "_assert_vector_dim", lambda *_: None)
+
+    out = lore_retriever.retrieve_lore(
+        "find leia",
+        top_k=3,
+        characters=["Leia", "Boba Fett"],
+        related_npcs=["leia_organa", "han_solo"],
+        db_path=".",
+        table_name="lore_chunks",
+    )
+
+    applied = "\n".join(fake_store.last_clauses)
+    assert "array_has_any(characters, ['Leia', 'Boba Fett'])" in applied
+    assert "array_has_any(related_npcs, ['leia_organa', 'han_solo'])" in applied
+    assert "LIKE" not in applied
+    assert out[0]["metadata"]["characters"] == ["Leia", "Han"]
+    assert out[0]["metadata"]["related_npcs"] == ["leia_organa"]
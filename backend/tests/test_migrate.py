@@ -27,3 +27,41 @@ class TestMigrate(unittest.TestCase):
         finally:
             if os.path.exists(path):
                 os.unlink(path)
+
+    def test_rerun_after_interrupted_add_column_migrations(self):
+        """Columns added before an interruption are skipped; the rest of the script still runs."""
+        import sqlite3
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            path = f.name
+        try:
+            apply_schema(path)
+            conn = sqlite3.connect(path)
+            # 0022 stopped after its first ALTER; 0023 stopped after its ALTER, before the triggers
+            conn.execute("ALTER TABLE episodic_memories DROP COLUMN embedding_scale")
+            for (trigger,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_state_version'"
+            ).fetchall():
+                conn.execute(f"DROP TRIGGER {trigger}")
+            conn.execute(
+                "DELETE FROM schema_migrations WHERE name IN "
+                "('0022_episodic_memory_embedding_blob', '0023_campaign_state_version')"
+            )
+            conn.commit()
+            conn.close()
+
+            apply_schema(path)
+            conn = sqlite3.connect(path)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(episodic_memories)")}
+            triggers = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_state_version'"
+            ).fetchone()[0]
+            conn.execute("INSERT INTO campaigns (id, title) VALUES ('c1', 'Test')")
+            conn.execute("UPDATE campaigns SET title = 'Renamed' WHERE id = 'c1'")
+            version = conn.execute("SELECT state_version FROM campaigns WHERE id = 'c1'").fetchone()[0]
+            conn.close()
+            self.assertIn("embedding_scale", columns)
+            self.assertEqual(triggers, 13)
+            self.assertEqual(version, 1)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
@@ -0,0 +1,96 @@
+"""Tests for per-turn batched query embeddings shared across RAG lanes."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.app.rag import query_embeddings as qe
+from backend.app.rag._cache import clear_caches
+from backend.app.rag.query_embeddings import (
+    RUNTIME_STATE_KEY,
+    TurnQueryEmbeddings,
+    get_turn_embeddings,
+    lookup_vector,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+class _CountingEncoder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts, show_progress_bar: bool = False):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_prefetch_encodes_all_unique_texts_in_one_batch():
+    enc = _CountingEncoder()
+    with patch.object(qe, "get_encoder", lambda *_: enc):
+        batch = TurnQueryEmbeddings()
+        batch.prefetch(["lore query", "style query", "lore query", ""])
+        assert enc.calls == [["lore query", "style query"]]
+        assert batch.get("lore query") == [10.0, 1.0]
+        assert batch.get("style query") == [11.0, 1.0]
+        assert len(enc.calls) == 1
+        assert batch.stats() == {"texts": 2, "batches": 1, "encoded": 2, "hits": 2}
+
+
+def test_get_encodes_missing_text_on_demand():
+    enc = _CountingEncoder()
+    with patch.object(qe, "get_encoder", lambda *_: enc):
+        batch = TurnQueryEmbeddings()
+        batch.prefetch(["a"])
+        assert batch.get("bb") == [2.0, 1.0]
+        assert enc.calls == [["a"], ["bb"]]
+        # Already-known texts are not re-encoded
+        batch.prefetch(["a", "bb"])
+        assert len(enc.calls) == 2
+
+
+def test_get_turn_embeddings_reads_runtime_key():
+    batch = TurnQueryEmbeddings()
+    assert get_turn_embeddings({RUNTIME_STATE_KEY: batch}) is batch
+    assert get_turn_embeddings({}) is None
+    assert get_turn_embeddings(None) is None
+
+
+def test_lookup_vector_returns_none_without_batch_or_on_failure():
+    assert lookup_vector(None, "q") is None
+
+    def _broken(*_):
+        raise RuntimeError("no encoder")
+
+    with patch.object(qe, "get_encoder", _broken):
+        assert lookup_vector(TurnQueryEmbeddings(), "q") is None
+
+
+def test_retrieve_lore_uses_precomputed_vector(monkeypatch, tmp_path):
+    """retrieve_lore must not touch the encoder when query_vector is supplied."""
+    from backend.app.rag import lore_retriever
+
+    searched: list[list[float]] = []
+
+    class _Store:
+        def get_schema_columns(self):
+            return {"text", "era"}
+
+        def search(self, vector, top_k=6, where=None):
+            searched.append(vector)
+            return [{"text": "Lore", "_distance": 0.1}]
+
+    def _no_encoder(*_):
+        raise AssertionError("encoder should not be loaded")
+
+    monkeypatch.setattr(lore_retriever, "create_vector_store", lambda *a, **k: _Store())
+    monkeypatch.setattr(lore_retriever, "get_encoder", _no_encoder)
+    rows = lore_retriever.retrieve_lore("q", db_path=tmp_path, query_vector=[0.5, 0.5])
+    assert searched == [[0.5, 0.5]]
+    assert rows[0]["text"] == "Lore"
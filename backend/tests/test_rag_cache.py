@@ -1,9 +1,17 @@
 """Tests for RAG caching: SentenceTransformer and LanceDB connection reuse."""
 import os
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from backend.app.rag._cache import get_encoder, clear_caches
+from backend.app.rag._cache import (
+    QueryEmbeddingCache,
+    clear_caches,
+    encode_cached,
+    get_encoder,
+    get_query_embedding_cache,
+)
 
 
 class TestEncoderCache(unittest.TestCase):
@@ -47,3 +55,55 @@ class TestEncoderCache(unittest.TestCase):
 
         self.assertIsNot(enc_a, enc_b)
         self.assertEqual(mock_st_class.call_count, 2)
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    """Verify the (model, normalized text) -> vector LRU and its disk tier."""
+
+    def setUp(self):
+        clear_caches()
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_repeat_query_skips_encoder(self):
+        calls = []
+
+        def encode_fn(texts):
+            calls.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+        first = encode_cached(["  cantina   Mos Eisley ", "docks"], "m", encode_fn)
+        second = encode_cached(["cantina Mos Eisley"], "m", encode_fn)
+        self.assertEqual(calls, [["cantina Mos Eisley", "docks"]])
+        self.assertEqual(first[0], second[0])
+        stats = get_query_embedding_cache().stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_model_name_is_part_of_key(self):
+        cache = QueryEmbeddingCache(max_entries=4)
+        cache.put("model-a", "q", [1.0])
+        self.assertIsNone(cache.get("model-b", "q"))
+        self.assertEqual(cache.get("model-a", "q"), [1.0])
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")
+        cache.put("m", "c", [3.0])
+        self.assertIsNone(cache.get("m", "b"))
+        self.assertEqual(cache.get("m", "a"), [1.0])
+        self.assertEqual(len(cache), 2)
+
+    def test_disk_tier_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "qcache.sqlite"
+            cache = QueryEmbeddingCache(max_entries=8, disk_path=path)
+            cache.put("m", "hyperspace lane", [0.25, -0.5])
+            cache.close()
+            reopened = QueryEmbeddingCache(max_entries=8, disk_path=path)
+            self.assertEqual(reopened.get("m", "hyperspace  lane"), [0.25, -0.5])
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+            reopened.close()
@@ -0,0 +1,135 @@
+"""Tests for the retrieval result cache (lore / style / KG results reused across turns)."""
+from __future__ import annotations
+
+import contextvars
+
+import pytest
+
+from backend.app.rag import retrieval_cache
+from backend.app.rag.retrieval_cache import (
+    RetrievalCache,
+    _RETRIEVAL_CACHE_KEY,
+    cached_retriever,
+    get_retrieval_cache,
+    summarize,
+    vector_key,
+)
+from shared.cache import clear_cache, set_cache_value
+
+
+@pytest.fixture
+def cache():
+    instance = RetrievalCache(max_entries=4)
+    set_cache_value(_RETRIEVAL_CACHE_KEY, instance)
+    yield instance
+    clear_cache(_RETRIEVAL_CACHE_KEY)
+
+
+def test_hit_returns_copy_and_counts_saved_time():
+    cache = RetrievalCache(max_entries=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"text": "Mos Eisley"}]
+
+    first = cache.get_or_compute("lore", {"q": "cantina"}, "v1", compute)
+    first[0]["text"] = "mutated"
+    second = cache.get_or_compute("lore", {"q": "cantina"}, "v1", compute)
+    assert len(calls) == 1
+    assert second == [{"text": "Mos Eisley"}]
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["lanes"]["lore"]["saved_ms"] >= 0.0
+
+
+def test_version_change_misses():
+    cache = RetrievalCache(max_entries=4)
+    cache.get_or_compute("lore", {"q": "x"}, "run-1", lambda: ["old"])
+    assert cache.get_or_compute("lore", {"q": "x"}, "run-2", lambda: ["new"]) == ["new"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_oldest():
+    cache = RetrievalCache(max_entries=2)
+    for q in ("a", "b", "c"):
+        cache.get_or_compute("lore", {"q": q}, "v", lambda q=q: q)
+    assert len(cache) == 2
+    assert cache.get_or_compute("lore", {"q": "a"}, "v", lambda: "recomputed") == "recomputed"
+
+
+def test_zero_size_disables_caching():
+    cache = RetrievalCache(max_entries=0)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute("lore", {"q": "x"}, "v", lambda: calls.append(1))
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_turn_counters_are_per_context():
+    cache = RetrievalCache(max_entries=4)
+    cache.get_or_compute("style", {"q": "x"}, "v", lambda: [])
+
+    def turn(lane_calls):
+        counters = retrieval_cache.track_turn()
+        for lane, params in lane_calls:
+            cache.get_or_compute(lane, params, "v", lambda: "ctx")
+        return summarize(counters)
+
+    # Two turns in their own contexts (as concurrent turns are) never see each other's counts.
+    first = contextvars.copy_context().run(turn, [("style", {"q": "x"}), ("kg_director", {"era": "REBELLION"})])
+    second = contextvars.copy_context().run(turn, [("lore", {"q": "y"})])
+    assert first["hits"] == 1 and first["misses"] == 1
+    assert set(first["lanes"]) == {"style", "kg_director"}
+    assert second["hits"] == 0 and second["misses"] == 1
+    assert set(second["lanes"]) == {"lore"}
+    assert cache.stats()["misses"] == 3
+
+
+def test_vector_key_stable():
+    assert vector_key(None) is None
+    assert vector_key([0.1, 0.2]) == vector_key((0.1, 0.2))
+    assert vector_key([0.1, 0.2]) != vector_key([0.2, 0.1])
+
+
+def test_decorator_caches_and_skips_results_with_warnings(cache):
+    calls = []
+
+    @cached_retriever("lore", lambda args: ({"query": args["query"]}, "v"))
+    def retrieve(query: str, warnings: list[str] | None = None) -> list[str]:
+        calls.append(query)
+        if query == "degraded" and warnings is not None:
+            warnings.append("lore table missing")
+        return [query]
+
+    assert retrieve("cantina") == ["cantina"]
+    assert retrieve("cantina") == ["cantina"]
+    assert calls == ["cantina"]
+
+    for _ in range(2):
+        warnings: list[str] = []
+        assert retrieve("degraded", warnings=warnings) == ["degraded"]
+        assert warnings == ["lore table missing"]
+    assert calls == ["cantina", "degraded", "degraded"]
+    assert retrieve.uncached("cantina") == ["cantina"]
+
+
+def test_lore_cache_invalidated_by_new_ingest_run(cache, monkeypatch, tmp_path):
+    versions = {"lore_chunks": "run-1"}
+    monkeypatch.setattr("ingestion.manifest.table_versions", lambda root=None: dict(versions))
+    v1 = retrieval_cache.table_version(tmp_path, "lore_chunks")
+    versions["lore_chunks"] = "run-2"
+    v2 = retrieval_cache.table_version(tmp_path, "lore_chunks")
+    assert v1 != v2
+    assert v2.startswith("run-2:")
+
+
+def test_get_retrieval_cache_uses_configured_size():
+    clear_cache(_RETRIEVAL_CACHE_KEY)
+    try:
+        from backend.app.config import RETRIEVAL_CACHE_SIZE
+        assert get_retrieval_cache().max_entries == RETRIEVAL_CACHE_SIZE
+    finally:
+        clear_cache(_RETRIEVAL_CACHE_KEY)
@@ -0,0 +1,164 @@
+"""Tests for parallel retrieval fan-out (lanes, deadlines, narrator wiring)."""
+from __future__ import annotations
+
+import threading
+import time
+
+from backend.app.core.retrieval_fanout import RetrievalLane, run_lanes
+
+
+def _sleepy(value, delay: float):
+    def _fn():
+        time.sleep(delay)
+        return value
+    return _fn
+
+
+def test_lanes_run_concurrently():
+    """Two 0.2s lanes finish in roughly 0.2s total, not 0.4s."""
+    lanes = [
+        RetrievalLane("lore", _sleepy(["l"], 0.2), default=[]),
+        RetrievalLane("style", _sleepy(["s"], 0.2), default=[]),
+    ]
+    start = time.perf_counter()
+    result = run_lanes(lanes, deadline_s=5.0)
+    elapsed = time.perf_counter() - start
+    assert result.get("lore") == ["l"]
+    assert result.get("style") == ["s"]
+    assert elapsed < 0.35
+    assert set(result.elapsed_ms) == {"lore", "style"}
+
+
+def test_lane_missing_deadline_returns_default_and_warns():
+    warnings: list[str] = []
+    lanes = [
+        RetrievalLane("lore", _sleepy(["l"], 0.01), default=[]),
+        RetrievalLane("voice", _sleepy({"a": [1]}, 1.0), default={}),
+    ]
+    result = run_lanes(lanes, deadline_s=0.2, warnings=warnings)
+    assert result.get("lore") == ["l"]
+    assert result.get("voice") == {}
+    assert result.timed_out == ["voice"]
+    assert any("Voice retrieval timed out" in w for w in warnings)
+
+
+def test_late_lane_warnings_are_not_merged():
+    warnings: list[str] = []
+    release = threading.Event()
+    done = threading.Event()
+    late = RetrievalLane("style", lambda: None, default=[])
+    fast = RetrievalLane("lore", lambda: None, default=[])
+
+    def _late():
+        release.wait(2.0)
+        late.warnings.append("style table missing")
+        done.set()
+        return ["s"]
+
+    def _fast():
+        fast.warnings.append("lore degraded")
+        return ["l"]
+
+    late.fn, fast.fn = _late, _fast
+    result = run_lanes([fast, late], deadline_s=0.05, warnings=warnings)
+    release.set()
+    assert done.wait(2.0)
+    assert result.get("lore") == ["l"] and result.get("style") == []
+    # The straggler's warning lands in its own list after the fan-out returned.
+    assert "lore degraded" in warnings
+    assert "style table missing" not in warnings
+
+
+def test_per_lane_deadline_overrides_default():
+    release = threading.Event()
+
+    def _blocked():
+        release.wait(2.0)
+        return ["s"]
+
+    lanes = [
+        RetrievalLane("lore", _sleepy(["l"], 0.2), default=[], deadline_s=2.0),
+        RetrievalLane("style", _blocked, default=[]),
+    ]
+    try:
+        result = run_lanes(lanes, deadline_s=0.05)
+    finally:
+        release.set()
+    assert result.get("lore") == ["l"]
+    assert result.get("style") == []
+    assert result.timed_out == ["style"]
+
+
+def test_failing_lane_does_not_break_others():
+    warnings: list[str] = []
+
+    def _boom():
+        raise RuntimeError("table missing")
+
+    lanes = [
+        RetrievalLane("lore", _boom, default=[]),
+        RetrievalLane("style", lambda: ["s"], default=[]),
+    ]
+    result = run_lanes(lanes, deadline_s=1.0, warnings=warnings)
+    assert result.get("lore") == []
+    assert result.get("style") == ["s"]
+    assert result.failed == ["lore"]
+    assert any("Lore retrieval failed" in w for w in warnings)
+
+
+def test_sequential_mode_runs_inline():
+    caller_threads: list[str] = []
+
+    def _fn():
+        caller_threads.append(threading.current_thread().name)
+        return 1
+
+    result = run_lanes([RetrievalLane("a", _fn), RetrievalLane("b", _fn)], parallel=False)
+    assert result.results == {"a": 1, "b": 1}
+    assert caller_threads == [threading.current_thread().name] * 2
+
+
+def test_narrator_fans_out_lore_voice_style():
+    """NarratorAgent.generate runs its retrievers concurrently; one NPC-scoped lore call, no retry."""
+    from backend.app.config import NARRATOR_LORE_TOP_K
+    from backend.app.core.agents.narrator import NarratorAgent
+    from backend.app.models.state import GameState, MechanicOutput
+
+    barrier = threading.Barrier(3, timeout=2.0)
+    lore_calls: list[dict] = []
+
+    def lore_retriever(query, top_k=6, era=None, related_npcs=None, **_kw):
+        lore_calls.append({"related_npcs": related_npcs, "top_k": top_k})
+        barrier.wait()
+        return [{"text": "Lore.", "source_title": "Book", "chunk_id": "c1"}]
+
+    def voice_retriever(cids, era, k=6, **_kw):
+        barrier.wait()
+        return {cid: [{"text": "Hm.", "character_id": cid, "era": era, "chunk_id": "v1"}] for cid in cids}
+
+    def style_retriever(q, top_k=3, **_kw):
+        barrier.wait()
+        return [{"text": "Terse prose.", "source_title": "style", "tags": [], "score": 1.0}]
+
+    narrator = NarratorAgent(
+        llm=None,
+        lore_retriever=lore_retriever,
+        voice_retriever=voice_retriever,
+        style_retriever=style_retriever,
+    )
+    state = GameState(
+        campaign_id="c1",
+        player_id="p1",
+        turn_number=1,
+        current_location="loc-cantina",
+        campaign={"time_period": "REBELLION"},
+        present_npcs=[{"id": "han_solo", "name": "Han", "role": "NPC"}],
+        mechanic_result=MechanicOutput(action_type="TALK", events=[], narrative_facts=[]),
+        user_input="Talk to Han.",
+    )
+    # The barrier only releases if all three lanes are in flight at the same time.
+    lore, voice, style = narrator._retrieve_context(state, [])
+    assert lore_calls == [{"related_npcs": ["han_solo"], "top_k": NARRATOR_LORE_TOP_K}]
+    assert lore and lore[0]["chunk_id"] == "c1"
+    assert voice["han_solo"][0]["text"] == "Hm."
+    assert style and style[0]["text"] == "Terse prose."
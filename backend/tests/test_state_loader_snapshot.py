@@ -0,0 +1,111 @@
+"""Tests for the consolidated GameState load and the hot snapshot cache."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend.app.core import state_loader
+from backend.app.core.event_store import append_events
+from backend.app.core.state_loader import (
+    apply_world_state_update,
+    build_initial_gamestate,
+    invalidate_gamestate_cache,
+)
+from backend.app.core.transcript_store import write_rendered_turn
+from backend.app.db.connection import close_pools, get_connection
+from backend.app.db.migrate import apply_schema
+from backend.app.models.events import Event
+
+
+@pytest.fixture
+def conn(tmp_path):
+    invalidate_gamestate_cache()
+    db = str(tmp_path / "state.db")
+    apply_schema(db)
+    c = get_connection(db)
+    ws = {"party": ["comp-1"], "known_npcs": ["Bartender"], "has_starship": True, "active_starship": "yt-1300",
+          "era_summaries": ["Long ago..."]}
+    c.execute(
+        "INSERT INTO campaigns (id, title, time_period, world_state_json, world_time_minutes) VALUES (?, ?, ?, ?, ?)",
+        ("c1", "Test", "REBELLION", json.dumps(ws), 90),
+    )
+    c.execute(
+        """INSERT INTO characters (id, campaign_id, name, role, location_id, stats_json, hp_current, credits, psych_profile)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        ("p1", "c1", "Hero", "Player", "loc-cantina", json.dumps({"Combat": 2}), 10, 50, json.dumps({"stress_level": 3})),
+    )
+    c.execute(
+        "INSERT INTO inventory (id, owner_id, item_name, quantity, attributes_json) VALUES (?, ?, ?, ?, ?)",
+        ("i1", "p1", "Blaster", 1, json.dumps({"damage": 4})),
+    )
+    for turn in range(1, 14):
+        append_events(c, "c1", turn, [
+            Event(event_type="TURN", payload={"user_input": f"t{turn}"}, is_hidden=True),
+            Event(event_type="MOVE", payload={"to_location": f"loc-{turn}"}),
+        ], commit=False)
+        write_rendered_turn(c, "c1", turn, f"Narration for turn {turn}.", [], [], commit=False)
+    c.commit()
+    yield c
+    c.close()
+    close_pools()
+    invalidate_gamestate_cache()
+
+
+def test_consolidated_load_matches_per_table_load(conn):
+    legacy = state_loader._load_gamestate_queries(conn, "c1", "p1")
+    gs, version = state_loader._load_gamestate_snapshot(conn, "c1", "p1")
+    assert gs.model_dump() == legacy.model_dump()
+    assert version > 0
+    assert gs.turn_number == 13
+    assert gs.history[-1] == "T13 MOVE to loc-13"
+    assert gs.recent_narrative[-1] == "[Turn 13] Narration for turn 13."
+    assert gs.player.inventory == [{"item_name": "Blaster", "quantity": 1, "damage": 4}]
+
+
+def test_snapshot_hit_skips_consolidated_load(conn, monkeypatch):
+    first = build_initial_gamestate(conn, "c1", "p1")
+    first.campaign["party"].append("mutated-by-a-node")
+
+    def _no_load(*_a):
+        raise AssertionError("expected a snapshot hit")
+
+    monkeypatch.setattr(state_loader, "_load_gamestate_snapshot", _no_load)
+    second = build_initial_gamestate(conn, "c1", "p1")
+    assert second.campaign["party"] == ["comp-1"]
+    assert second.turn_number == 13
+
+
+@pytest.mark.parametrize("write", [
+    "UPDATE characters SET hp_current = 3 WHERE id = 'p1'",
+    "UPDATE inventory SET quantity = 2 WHERE id = 'i1'",
+    "INSERT INTO turn_events (campaign_id, turn_number, event_type, payload_json, is_hidden) VALUES ('c1', 14, 'HEAL', '{}', 0)",
+    "UPDATE campaigns SET world_time_minutes = 120 WHERE id = 'c1'",
+])
+def test_any_tracked_write_invalidates_snapshot(conn, write):
+    build_initial_gamestate(conn, "c1", "p1")
+    conn.execute(write)
+    conn.commit()
+    fresh = build_initial_gamestate(conn, "c1", "p1")
+    assert fresh.model_dump() == state_loader._load_gamestate_queries(conn, "c1", "p1").model_dump()
+
+
+def test_world_state_update_patches_snapshot_in_place(conn, monkeypatch):
+    build_initial_gamestate(conn, "c1", "p1")
+    ws = {"party": ["comp-1", "comp-2"], "known_npcs": ["Bartender", "Droid"], "beats_remaining": 2}
+    conn.execute("UPDATE campaigns SET world_state_json = ? WHERE id = ?", (json.dumps(ws), "c1"))
+    conn.commit()
+    apply_world_state_update(conn, "c1", ws)
+
+    expected = state_loader._load_gamestate_queries(conn, "c1", "p1").model_dump()
+    monkeypatch.setattr(state_loader, "_load_gamestate_snapshot", lambda *_a: pytest.fail("expected a hit"))
+    patched = build_initial_gamestate(conn, "c1", "p1")
+    assert patched.model_dump() == expected
+    assert patched.player_starship is None and patched.known_npcs == ["Bartender", "Droid"]
+
+
+def test_uncommitted_load_is_not_cached(conn):
+    conn.execute("UPDATE characters SET hp_current = 1 WHERE id = 'p1'")
+    assert build_initial_gamestate(conn, "c1", "p1").player.hp_current == 1
+    conn.rollback()
+    assert build_initial_gamestate(conn, "c1", "p1").player.hp_current == 10
@@ -0,0 +1,127 @@
+"""Tests for the per-campaign turn scheduler (serialization, parallelism, backpressure)."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.app.api.turn_scheduler import TurnRejected, TurnScheduler
+
+
+def test_same_campaign_turns_run_in_order():
+    sched = TurnScheduler(max_concurrent=4, max_queue_per_campaign=5)
+    order: list[str] = []
+
+    async def turn(name: str, delay: float):
+        lease = await sched.acquire("c1")
+        try:
+            order.append(f"start {name}")
+            await asyncio.sleep(delay)
+            order.append(f"end {name}")
+        finally:
+            lease.release()
+
+    async def main():
+        await asyncio.gather(turn("a", 0.05), turn("b", 0.0), turn("c", 0.0))
+
+    asyncio.run(main())
+    assert order == ["start a", "end a", "start b", "end b", "start c", "end c"]
+    stats = sched.stats()
+    assert stats["completed"] == 3 and stats["queued_turns"] == 2
+    assert stats["running"] == 0 and stats["queued"] == 0
+
+
+def test_different_campaigns_run_in_parallel_up_to_limit():
+    sched = TurnScheduler(max_concurrent=2, max_queue_per_campaign=2)
+    running: list[int] = []
+    active = 0
+
+    async def turn(cid: str):
+        nonlocal active
+        lease = await sched.acquire(cid)
+        try:
+            active += 1
+            running.append(active)
+            await asyncio.sleep(0.02)
+        finally:
+            active -= 1
+            lease.release()
+
+    async def main():
+        await asyncio.gather(*(turn(f"c{i}") for i in range(5)))
+
+    asyncio.run(main())
+    assert max(running) == 2
+
+
+def test_full_campaign_queue_rejects_with_429_and_retry_after():
+    sched = TurnScheduler(max_concurrent=4, max_queue_per_campaign=1)
+
+    async def main():
+        first = await sched.acquire("c1")
+        waiting = asyncio.ensure_future(sched.acquire("c1"))
+        await asyncio.sleep(0)
+        with pytest.raises(TurnRejected) as exc:
+            await sched.acquire("c1")
+        assert sched.queue_depth("c1") == 1
+        first.release()
+        (await waiting).release()
+        return exc.value
+
+    rejected = asyncio.run(main())
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert sched.stats()["rejected_429"] == 1
+
+
+def test_queue_timeout_and_global_limit_reject_with_503():
+    sched = TurnScheduler(max_concurrent=1, max_queue_per_campaign=3, max_queued=1, queue_timeout_s=0.05)
+
+    async def main():
+        lease = await sched.acquire("c1")
+        with pytest.raises(TurnRejected) as timed_out:
+            await sched.acquire("c2")
+        waiting = asyncio.ensure_future(sched.acquire("c2"))
+        await asyncio.sleep(0)
+        with pytest.raises(TurnRejected) as full:
+            await sched.acquire("c3")
+        lease.release()
+        (await waiting).release()
+        return timed_out.value, full.value
+
+    timed_out, full = asyncio.run(main())
+    assert timed_out.status_code == 503 and full.status_code == 503
+    assert sched.stats()["rejected_503"] == 2
+    assert sched.queue_depth() == 0
+
+
+def test_cancelled_waiter_leaves_queue():
+    sched = TurnScheduler(max_concurrent=1)
+
+    async def main():
+        lease = await sched.acquire("c1")
+        waiting = asyncio.ensure_future(sched.acquire("c1"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert sched.queue_depth("c1") == 0
+        lease.release()
+        (await sched.acquire("c1")).release()
+
+    asyncio.run(main())
+
+
+def test_turn_endpoint_returns_429_with_retry_after(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from backend.app.api import v2_campaigns
+    from backend.main import app
+
+    sched = TurnScheduler(max_concurrent=1, max_queue_per_campaign=0)
+    monkeypatch.setattr(v2_campaigns, "get_turn_scheduler", lambda: sched)
+    asyncio.run(sched.acquire("busy"))  # hold the campaign's slot
+
+    r = TestClient(app).post("/v2/campaigns/busy/turn?player_id=p1", json={"user_input": "look"})
+    assert r.status_code == 429, r.text
+    assert int(r.headers["Retry-After"]) >= 1
@@ -0,0 +1,89 @@
+"""Tests for keyed world_state reads and JSON1 partial writes."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend.app.core.world_state_store import (
+    load_world_state,
+    load_world_state_keys,
+    save_world_state,
+    set_world_state_keys,
+)
+from backend.app.db.connection import close_pools, get_connection
+from backend.app.db.migrate import apply_schema
+
+_WS = {
+    "flag": True,
+    "off": False,
+    "nothing": None,
+    "count": 3,
+    "ratio": 0.5,
+    "name": "Mos Eisley",
+    "quest_log": {"q1": {"stage": 2, "done": False}},
+    "news_feed": [{"headline": "Empire tightens grip"}],
+}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db = str(tmp_path / "ws.db")
+    apply_schema(db)
+    c = get_connection(db)
+    c.execute(
+        "INSERT INTO campaigns (id, title, time_period, world_state_json) VALUES (?, ?, ?, ?)",
+        ("c1", "Test", "REBELLION", json.dumps(_WS)),
+    )
+    c.commit()
+    yield c
+    c.close()
+    close_pools()
+
+
+def _version(conn) -> int:
+    return conn.execute("SELECT state_version FROM campaigns WHERE id = 'c1'").fetchone()[0]
+
+
+def test_keyed_read_returns_requested_keys_with_json_types(conn):
+    keys = ["flag", "off", "nothing", "count", "ratio", "name", "quest_log", "news_feed", "absent"]
+    got = load_world_state_keys(conn, "c1", keys)
+    assert got == _WS
+    assert got["flag"] is True and got["off"] is False
+    assert load_world_state_keys(conn, "c1", ["absent"]) == {}
+    assert load_world_state_keys(conn, "missing", ["flag"]) is None
+
+
+def test_set_keys_patches_and_removes_without_touching_other_keys(conn):
+    set_world_state_keys(conn, "c1", {"count": 4, "quest_log": {"q2": {"stage": 1}}, "new": [1, 2]}, remove=["name"])
+    expected = {**_WS, "count": 4, "quest_log": {"q2": {"stage": 1}}, "new": [1, 2]}
+    del expected["name"]
+    assert load_world_state(conn, "c1") == expected
+    set_world_state_keys(conn, "missing", {"count": 1})  # no-op, no error
+
+
+@pytest.mark.parametrize("stored", ["not json", "", "[1, 2]"])
+def test_unpatchable_documents_fall_back_to_full_write(conn, stored):
+    conn.execute("UPDATE campaigns SET world_state_json = ? WHERE id = 'c1'", (stored,))
+    set_world_state_keys(conn, "c1", {"count": 1})
+    assert load_world_state(conn, "c1") == {"count": 1}
+    assert load_world_state_keys(conn, "c1", ["count"]) == {"count": 1}
+
+
+def test_key_that_json_paths_cannot_address_falls_back(conn):
+    set_world_state_keys(conn, "c1", {'say "hi"': 1, "a.b": 2})
+    state = load_world_state(conn, "c1")
+    assert state['say "hi"'] == 1 and state["a.b"] == 2 and state["count"] == 3
+
+
+def test_save_with_previous_writes_only_changed_keys(conn):
+    previous = load_world_state(conn, "c1")
+    before = _version(conn)
+    assert save_world_state(conn, "c1", dict(previous), previous=previous) == 0
+    assert _version(conn) == before  # unchanged state: no UPDATE at all
+
+    new = {**previous, "count": 5, "flag": 1}  # True -> 1 is a change in JSON
+    del new["nothing"]
+    assert save_world_state(conn, "c1", new, previous=previous) == 3
+    assert load_world_state(conn, "c1") == new
+    assert type(load_world_state_keys(conn, "c1", ["flag"])["flag"]) is int
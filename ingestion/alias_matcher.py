@@ -0,0 +1,73 @@
+"""Single-pass multi-alias matching shared by the NPC and character taggers.
+
+Both taggers compile one word-bounded regex per alias and used to run
+``pattern.search(text)`` for every alias on every chunk, so tagging cost grew with
+(aliases x chunks). :class:`AliasMatcher` instead indexes the aliases by their first
+word and finds candidates with one combined regex over the text; only aliases whose
+first word actually occurs are then confirmed with their own pattern, anchored at
+that position. The result is identical to searching every pattern: an alias that
+starts with a word character can only match at the start of a word, and that word
+must equal the alias's first word.
+
+Aliases that do not start with a word character (rare, e.g. "'Bones'") are searched
+the old way.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+_WORD = re.compile(r"\w+")
+
+
+def compile_alias_pattern(alias: str, case_sensitive: bool = False) -> re.Pattern:
+    """Regex for alias with word boundaries and flexible whitespace between words."""
+    escaped = re.escape(alias)
+    # re.escape turns " " into "\\ " (backslash-space); allow any run of whitespace there.
+    escaped = escaped.replace("\\ ", "\\s+")
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(rf"\b{escaped}\b", flags)
+
+
+class AliasMatcher:
+    """Finds which of a list of alias patterns occur in a text, in one scan.
+
+    Built from (alias, compiled pattern) pairs as produced by
+    :func:`compile_alias_pattern`; :meth:`matches` returns the indices of the pairs
+    whose pattern matches somewhere in the text, in list order, so callers keep
+    their first-seen ordering and per-pattern bookkeeping.
+    """
+
+    def __init__(self, aliases: Iterable[tuple[str, re.Pattern]]) -> None:
+        self.patterns: list[re.Pattern] = []
+        # lowercased first word -> indices of patterns starting with that word
+        self._by_word: dict[str, list[int]] = {}
+        self._fallback: list[int] = []
+        for i, (alias, pattern) in enumerate(aliases):
+            self.patterns.append(pattern)
+            first = _WORD.match(alias)
+            if first is None:
+                self._fallback.append(i)
+            else:
+                self._by_word.setdefault(first.group().lower(), []).append(i)
+        # Longest first so a word is never cut short by a shorter alternative.
+        words = sorted(self._by_word, key=len, reverse=True)
+        self._scanner = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+            if words else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def matches(self, text: str) -> list[int]:
+        """Sorted indices of the patterns that match anywhere in text."""
+        if not text:
+            return []
+        hit: set[int] = {i for i in self._fallback if self.patterns[i].search(text)}
+        if self._scanner is not None:
+            for m in self._scanner.finditer(text):
+                for i in self._by_word.get(m.group().lower(), ()):
+                    if i not in hit and self.patterns[i].match(text, m.start()):
+                        hit.add(i)
+        return sorted(hit)
@@ -1,7 +1,8 @@
 """Deterministic character extraction from text via user-editable alias mapping.
 
 Loads data/character_aliases.yml (or path from CHARACTER_ALIASES_PATH env).
-Maps display names/aliases to canonical IDs using word-boundary regex.
+Maps display names/aliases to canonical IDs using word-boundary regex, matched in
+one pass over the text (ingestion.alias_matcher).
 If alias file is missing or invalid: fallback to empty list (do not guess).
 """
 from __future__ import annotations
@@ -12,12 +13,15 @@ import re
 from pathlib import Path
 from typing import List
 
+from ingestion.alias_matcher import AliasMatcher, compile_alias_pattern
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_ALIAS_PATH = "./data/character_aliases.yml"
 ENV_ALIAS_PATH = "CHARACTER_ALIASES_PATH"
 
 _alias_cache: list[tuple[re.Pattern, str]] | None = None
+_matcher_cache: AliasMatcher | None = None
 
 
 def _get_alias_path() -> Path:
@@ -29,20 +33,9 @@ def _get_alias_path() -> Path:
     return root / "data" / "character_aliases.yml"
 
 
-def _compile_pattern(alias: str) -> re.Pattern:
-    """Build case-insensitive regex with word boundaries to avoid partial matches (e.g. Lukewarm)."""
-    # Escape regex metacharacters in the alias
-    escaped = re.escape(alias)
-    # Replace spaces with \s+ to allow flexible whitespace between words.
-    # re.escape turns " " into "\\ " (backslash-space); replace that sequence.
-    escaped = escaped.replace("\\ ", "\\s+")
-    pattern = rf"\b{escaped}\b"
-    return re.compile(pattern, re.IGNORECASE)
-
-
 def _load_aliases() -> list[tuple[re.Pattern, str]]:
     """Load alias file and compile patterns. Returns [(pattern, canonical_id), ...]."""
-    global _alias_cache
+    global _alias_cache, _matcher_cache
     if _alias_cache is not None:
         return _alias_cache
 
@@ -63,6 +56,7 @@ def _load_aliases() -> list[tuple[re.Pattern, str]]:
         return []
 
     result: list[tuple[re.Pattern, str]] = []
+    alias_texts: list[str] = []
     for canonical_id, aliases in data.items():
         if not isinstance(canonical_id, str) or not canonical_id.strip():
             continue
@@ -71,12 +65,14 @@ def _load_aliases() -> list[tuple[re.Pattern, str]]:
         for a in aliases:
             if isinstance(a, str) and a.strip():
                 try:
-                    pat = _compile_pattern(a.strip())
+                    pat = compile_alias_pattern(a.strip())
                     result.append((pat, canonical_id.strip()))
+                    alias_texts.append(a.strip())
                 except re.error as e:
                     logger.warning("Invalid alias pattern for %r: %s; skipping.", a, e)
 
     _alias_cache = result
+    _matcher_cache = AliasMatcher(zip(alias_texts, (pat for pat, _cid in result)))
     return result
 
 
@@ -105,15 +101,14 @@ def extract_characters(text: str) -> List[str]:
         return []
 
     patterns = _load_aliases()
-    if not patterns:
+    if not patterns or _matcher_cache is None:
         return []
 
     seen: set[str] = set()
     order: list[str] = []
-    for pat, canonical_id in patterns:
-        if canonical_id in seen:
-            continue
-        if pat.search(text):
+    for i in _matcher_cache.matches(text):
+        canonical_id = patterns[i][1]
+        if canonical_id not in seen:
             seen.add(canonical_id)
             order.append(canonical_id)
 
@@ -122,5 +117,6 @@ def extract_characters(text: str) -> List[str]:
 
 def reload_aliases() -> None:
     """Clear cached aliases so next extract_characters reloads from disk."""
-    global _alias_cache
+    global _alias_cache, _matcher_cache
     _alias_cache = None
+    _matcher_cache = None
@@ -2,6 +2,7 @@
 
 Model and dimension from shared.config (EMBEDDING_MODEL, EMBEDDING_DIMENSION).
 Default: sentence-transformers/all-MiniLM-L6-v2, 384 dims.
+Backend (PyTorch or int8 ONNX) from EMBEDDING_BACKEND; see shared/embedding_backend.py.
 """
 import logging
 import os
@@ -23,8 +24,8 @@ def get_encoder(model_name: str | None = None):
     if cached is not None:
         return cached
     try:
-        from sentence_transformers import SentenceTransformer
-        encoder = SentenceTransformer(model_name)
+        from shared.embedding_backend import load_sentence_transformer
+        encoder = load_sentence_transformer(model_name)
         logger.info("Loaded embedding model: %s", model_name)
         return set_cache_value(_ENCODER_CACHE_KEY, encoder)
     except ImportError as e:
@@ -9,10 +9,15 @@
 Usage:
   python -m ingestion.ingest_lore --input ./data/lore --setting-id star_wars_legends --period-id rebellion [--time-period REBELLION] [--planet Tatooine] [--faction Empire]
   python -m ingestion.ingest_lore --input ./data/lore --source-type reference --collection lore --book-title "My Sourcebook"
+  python -m ingestion.ingest_lore --input ./data/lore --recursive --workers 8 --embed-workers 2
+
+Files are parsed in a process pool and embedded/written by a pipelined engine
+(see ingestion.lore_pipeline); --workers 1 parses in-process.
 """
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import re
 import sys
@@ -31,9 +36,9 @@ from ingestion.chunking import chunk_text_by_tokens, count_tokens
 from ingestion.classify_document import classify_document
 from ingestion.era_aliases import load_era_aliases
 from ingestion.manifest import input_file_hashes, write_run_manifest, check_chunk_id_scheme
-from ingestion.npc_tagging import apply_npc_tags_to_chunks
-from ingestion.store import LanceStore, stable_chunk_id, file_doc_id, CHUNK_ID_SCHEME
-from ingestion.tagger import apply_tagger_to_chunks
+from ingestion.lore_pipeline import run_lore_pipeline
+from ingestion.npc_tagging import NpcTagSession
+from ingestion.store import LanceStore, TABLE_NAME, stable_chunk_id, file_doc_id, CHUNK_ID_SCHEME
 from ingestion.era_normalization import apply_era_mode, resolve_era_mode, infer_era_from_input_root
 from shared.lore_metadata import default_doc_type, default_section_kind, default_characters
 from shared.config import EMBEDDING_DIMENSION, EMBEDDING_MODEL
@@ -294,25 +299,6 @@ def _resolve_content_coordinates(*, setting_id: str, period_id: str, time_period
     return "star_wars_legends", "rebellion", "rebellion"
 
 
-def _npc_linkage_stats(chunks: list[dict[str, Any]]) -> dict[str, Any]:
-    total = len(chunks)
-    with_links = 0
-    unique: set[str] = set()
-    for c in chunks:
-        md = c.get("metadata") or {}
-        rel = md.get("related_npcs") or []
-        if rel:
-            with_links += 1
-            unique.update(str(x) for x in rel if str(x).strip())
-    ratio = (with_links / total) if total else 0.0
-    return {
-        "chunks_total": total,
-        "chunks_with_related_npcs": with_links,
-        "related_npc_coverage_ratio": round(ratio, 4),
-        "unique_related_npcs": len(unique),
-    }
-
-
 def main() -> int:
     ap = argparse.ArgumentParser(
         description="Enriched RAG: Ingest lore (PDF/EPUB/TXT) with parent-child chunking and context prefixes."
@@ -343,6 +329,10 @@ def main() -> int:
         help="Delete chunks by filter instead of ingesting. Format: era=REBELLION,source=mybook.epub,doc_type=novel,collection=lore,setting_id=star_wars_legends,period_id=rebellion",
     )
     ap.add_argument("--dry-run-delete", action="store_true", help="Preview delete-by matches without deleting rows")
+    ap.add_argument("--workers", type=int, default=None, help="Parse/chunk processes (default: INGEST_WORKERS or CPUs - 1; 1 = in-process)")
+    ap.add_argument("--embed-workers", type=int, default=None, help="Embedding threads (default: INGEST_EMBED_WORKERS or 1)")
+    ap.add_argument("--write-batch-size", type=int, default=None, help="Rows per LanceDB append (default: INGEST_WRITE_BATCH_SIZE or 2048)")
+    ap.add_argument("--no-index", action="store_true", help="Skip building/updating LanceDB indexes after ingestion")
     args = ap.parse_args()
 
     # V2.5: Bulk delete mode (early exit)
@@ -405,28 +395,6 @@ def main() -> int:
         "faction": args.faction.strip(),
     }
     era_aliases = load_era_aliases(args.era_aliases)
-    all_chunks: list[dict] = []
-    file_failures = 0
-    for idx, p in enumerate(paths, 1):
-        logger.info("[%d/%d] Processing: %s", idx, len(paths), p.name)
-        try:
-            all_chunks.extend(ingest_file(
-                p,
-                meta=meta,
-                book_title_override=args.book_title,
-                source_type=args.source_type,
-                collection=args.collection,
-                era_aliases=era_aliases,
-                input_dir=data_dir,
-                era_mode=era_mode,
-            ))
-        except Exception as e:
-            logger.exception("Ingest failed %s: %s", p, e)
-            file_failures += 1
-    if not all_chunks:
-        logger.error("No chunks produced (%d file failures)", file_failures)
-        return 1
-    canonical = _to_canonical_chunks(all_chunks)
     era_pack_id = (args.era_pack or legacy_era or period_id or "").strip()
     era_pack = None
     if args.setting_id and args.period_id:
@@ -440,27 +408,56 @@ def main() -> int:
         except Exception as exc:
             logger.error("Failed to load era pack '%s': %s", era_pack_id, exc, exc_info=True)
     tag_npcs_enabled = args.tag_npcs if args.tag_npcs is not None else bool(era_pack)
-    canonical, npc_tag_stats = apply_npc_tags_to_chunks(
-        canonical,
-        era_pack=era_pack,
-        enabled=tag_npcs_enabled,
-        mode=args.npc_tagging_mode,
+    npc_tagger = NpcTagSession(era_pack, enabled=tag_npcs_enabled, mode=args.npc_tagging_mode)
+
+    parse_file = functools.partial(
+        ingest_file,
+        meta=meta,
+        book_title_override=args.book_title,
+        source_type=args.source_type,
+        collection=args.collection,
+        era_aliases=era_aliases,
+        input_dir=data_dir,
+        era_mode=era_mode,
     )
+    result = run_lore_pipeline(
+        paths,
+        parse_file,
+        _to_canonical_chunks,
+        lambda: LanceStore(args.db, allow_overwrite=args.rebuild),
+        npc_tagger=npc_tagger,
+        workers=args.workers,
+        embed_workers=args.embed_workers,
+        write_batch_size=args.write_batch_size,
+    )
+    file_failures = result.file_failures
+    if not result.chunks:
+        logger.error("No chunks produced (%d file failures)", file_failures)
+        return 1
+    npc_tag_stats = result.npc_tag_stats
     if npc_tag_stats.get("collision_report_path"):
         logger.info("NPC collision report written: %s", npc_tag_stats["collision_report_path"])
-    canonical, tagger_stats = apply_tagger_to_chunks(canonical)
-    npc_linkage = _npc_linkage_stats(canonical)
+    tagger_stats = result.tagger_stats
+    npc_linkage = result.npc_linkage()
     logger.info("NPC linkage coverage: %.2f%% (%d/%d chunks), unique NPCs=%d",
         npc_linkage["related_npc_coverage_ratio"] * 100.0,
         npc_linkage["chunks_with_related_npcs"],
         npc_linkage["chunks_total"],
         npc_linkage["unique_related_npcs"],
     )
-    store = LanceStore(args.db, allow_overwrite=args.rebuild)
-    logger.info("Writing %d chunks to LanceDB (with dedup)...", len(canonical))
-    store_result = store.add_chunks(canonical)
-    added = store_result.get("added", 0) if isinstance(store_result, dict) else len(canonical)
-    skipped = store_result.get("skipped", 0) if isinstance(store_result, dict) else 0
+    added = result.added
+    skipped = result.skipped
+    index_report = None
+    if added and not args.no_index:
+        try:
+            from ingestion.lance_index import build_indexes
+            index_report = build_indexes(LanceStore(args.db).table).to_dict()
+            logger.info("LanceDB indexes: built=%s fresh=%s", index_report["built"], index_report["fresh"])
+        except Exception as e:
+            logger.warning("Index build failed (run `storyteller index` to retry): %s", e)
+    if added:
+        from backend.app.rag.flat_store import refresh_flat_export
+        refresh_flat_export(args.db, TABLE_NAME)
     write_run_manifest(
         run_type="lore",
         input_files=input_hashes,
@@ -478,10 +475,11 @@ def main() -> int:
         vectordb_path=str(args.db),
         chunk_id_scheme=CHUNK_ID_SCHEME,
         counts={
-            "chunks": len(canonical),
+            "chunks": result.chunks,
             "added": added,
             "skipped_dedup": skipped,
             "failed": int(hash_failures) + int(file_failures) + int(tagger_stats.get("failed", 0)),
+            "tagger_cached": int(tagger_stats.get("cached", 0)),
         },
         context={
             "setting_id": setting_id,
@@ -490,23 +488,19 @@ def main() -> int:
             "source_type": args.source_type,
             "collection": args.collection,
             "npc_linkage": npc_linkage,
+            "index": index_report,
         },
     )
     # V2.5: Validate era values for retrieval compatibility
     from ingestion.era_normalization import validate_era_for_retrieval
-    era_values_seen: set[str] = set()
-    for c in canonical:
-        era_val = c.get("era") or c.get("time_period") or ""
-        if era_val:
-            era_values_seen.add(era_val)
-    for ev in era_values_seen:
+    for ev in sorted(result.eras):
         valid, warn_msg = validate_era_for_retrieval(ev, era_mode)
         if not valid:
             logger.warning("Era validation: %s", warn_msg)
 
     logger.info(
         "Lore ingestion complete for %s/%s: %d chunks total, %d added, %d skipped (dedup), %d file failures",
-        setting_id, period_id, len(canonical), added, skipped, file_failures,
+        setting_id, period_id, result.chunks, added, skipped, file_failures,
     )
     return 0
 
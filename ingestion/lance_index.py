@@ -0,0 +1,208 @@
+"""ANN and scalar indexes for the LanceDB lore table (``storyteller index``).
+
+Without indexes every lore query is a brute-force scan of the vector column, and the
+era / doc_type / section_kind / setting_id / period_id where-clauses are evaluated
+row by row. :func:`build_indexes` adds:
+
+- a vector index (IVF_PQ by default, or IVF_HNSW_SQ) once the table has at least
+  LANCE_VECTOR_INDEX_MIN_ROWS rows; below that a flat scan is already fast;
+- a bitmap index on each low-cardinality filter column present in the schema;
+- a label-list index on the characters / related_npcs list columns, which serves
+  the array_has_any() NPC filters (tables still on the *_json columns need
+  scripts/migrate_lance_list_columns.py first);
+- a full-text (BM25) index on ``text`` for hybrid lore search (rag/lore_retriever.py).
+
+LanceDB uses the indexes automatically; query-time nprobes / refine_factor are set
+in backend.app.rag.vector_store. Rows appended after a build are still searched
+(flat) but are "unindexed": :func:`index_status` reports that per index, and the
+next build folds them in with ``optimize()`` instead of retraining. ``rebuild=True``
+retrains from scratch (e.g. after a large ingest changes the data distribution).
+
+Env: LANCE_VECTOR_INDEX_TYPE (IVF_PQ | IVF_HNSW_SQ), LANCE_VECTOR_INDEX_MIN_ROWS
+(default 10000), LANCE_INDEX_NUM_PARTITIONS, LANCE_INDEX_NUM_SUB_VECTORS
+(default: sqrt(rows) partitions, dim/16 sub-vectors).
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pyarrow import types as pa_types
+
+logger = logging.getLogger(__name__)
+
+VECTOR_COLUMN = "vector"
+# Filter columns used by retrieve_lore; all low-cardinality, so bitmap indexes.
+SCALAR_INDEX_COLUMNS = ("era", "doc_type", "section_kind", "setting_id", "period_id")
+# list<string> columns filtered with array_has_any (see ingestion.store.LIST_COLUMNS).
+LIST_INDEX_COLUMNS = ("characters", "related_npcs")
+# Full-text (inverted) index for the lexical half of hybrid search.
+TEXT_INDEX_COLUMNS = ("text",)
+VECTOR_INDEX_TYPES = ("IVF_PQ", "IVF_HNSW_SQ")
+
+LANCE_VECTOR_INDEX_TYPE = os.environ.get("LANCE_VECTOR_INDEX_TYPE", "IVF_PQ").strip().upper() or "IVF_PQ"
+LANCE_VECTOR_INDEX_MIN_ROWS = int(os.environ.get("LANCE_VECTOR_INDEX_MIN_ROWS", "10000") or 10000)
+LANCE_INDEX_NUM_PARTITIONS = int(os.environ.get("LANCE_INDEX_NUM_PARTITIONS", "0") or 0)
+LANCE_INDEX_NUM_SUB_VECTORS = int(os.environ.get("LANCE_INDEX_NUM_SUB_VECTORS", "0") or 0)
+
+
+@dataclass
+class IndexInfo:
+    """One index on the table and how much of the table it covers."""
+
+    name: str
+    index_type: str
+    columns: list[str]
+    indexed_rows: int
+    unindexed_rows: int
+
+    @property
+    def fresh(self) -> bool:
+        return self.unindexed_rows == 0
+
+
+@dataclass
+class IndexReport:
+    """Index state of one table (printed by ``storyteller index``)."""
+
+    table: str
+    rows: int
+    version: int
+    indexes: list[IndexInfo] = field(default_factory=list)
+    # Expected columns that have no index (vector only counted above the row threshold).
+    missing: list[str] = field(default_factory=list)
+    built: list[str] = field(default_factory=list)
+    optimized: bool = False
+
+    @property
+    def fresh(self) -> bool:
+        return not self.missing and all(i.fresh for i in self.indexes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "version": self.version,
+            "fresh": self.fresh,
+            "missing": list(self.missing),
+            "built": list(self.built),
+            "optimized": self.optimized,
+            "indexes": [
+                {
+                    "name": i.name,
+                    "type": i.index_type,
+                    "columns": list(i.columns),
+                    "indexed_rows": i.indexed_rows,
+                    "unindexed_rows": i.unindexed_rows,
+                }
+                for i in self.indexes
+            ],
+        }
+
+
+def open_lance_table(db_path: str | Path, table_name: str) -> Any:
+    import lancedb
+
+    return lancedb.connect(str(db_path)).open_table(table_name)
+
+
+def _vector_dim(table: Any) -> int:
+    return int(table.schema.field(VECTOR_COLUMN).type.list_size)
+
+
+def _expected_columns(table: Any, rows: int, min_rows: int) -> list[str]:
+    names = set(table.schema.names)
+    cols = [c for c in SCALAR_INDEX_COLUMNS if c in names]
+    cols += [c for c in TEXT_INDEX_COLUMNS if c in names]
+    cols += [
+        c for c in LIST_INDEX_COLUMNS
+        if c in names and pa_types.is_list(table.schema.field(c).type)
+    ]
+    if VECTOR_COLUMN in names and rows >= min_rows:
+        cols.insert(0, VECTOR_COLUMN)
+    return cols
+
+
+def index_status(table: Any, *, min_rows: int | None = None) -> IndexReport:
+    """Indexes on table with indexed / unindexed row counts."""
+    min_rows = LANCE_VECTOR_INDEX_MIN_ROWS if min_rows is None else int(min_rows)
+    rows = table.count_rows()
+    report = IndexReport(table=table.name, rows=rows, version=int(table.version))
+    covered: set[str] = set()
+    for cfg in table.list_indices():
+        stats = table.index_stats(cfg.name)
+        report.indexes.append(IndexInfo(
+            name=cfg.name,
+            index_type=str(getattr(stats, "index_type", None) or cfg.index_type),
+            columns=list(cfg.columns),
+            indexed_rows=int(getattr(stats, "num_indexed_rows", 0) or 0),
+            unindexed_rows=int(getattr(stats, "num_unindexed_rows", 0) or 0),
+        ))
+        covered.update(cfg.columns)
+    report.missing = [c for c in _expected_columns(table, rows, min_rows) if c not in covered]
+    return report
+
+
+def _vector_index_config(index_type: str, rows: int, dim: int, num_partitions: int, num_sub_vectors: int) -> Any:
+    from lancedb.index import HnswSq, IvfPq
+
+    # ~sqrt(rows) partitions keeps both the centroid scan and each probed partition small.
+    partitions = num_partitions or max(1, min(int(math.sqrt(rows)), rows // 256 or 1))
+    if index_type == "IVF_HNSW_SQ":
+        return HnswSq(distance_type="l2", num_partitions=partitions)
+    sub_vectors = num_sub_vectors or (dim // 16 if dim % 16 == 0 else None)
+    return IvfPq(distance_type="l2", num_partitions=partitions, num_sub_vectors=sub_vectors)
+
+
+def build_indexes(
+    table: Any,
+    *,
+    rebuild: bool = False,
+    index_type: str | None = None,
+    min_rows: int | None = None,
+    num_partitions: int | None = None,
+    num_sub_vectors: int | None = None,
+) -> IndexReport:
+    """Create missing indexes and fold appended rows into existing ones; returns the new status."""
+    from lancedb.index import FTS, Bitmap, LabelList
+
+    index_type = (index_type or LANCE_VECTOR_INDEX_TYPE).upper()
+    if index_type not in VECTOR_INDEX_TYPES:
+        raise ValueError(f"Unsupported vector index type {index_type!r} (use one of {', '.join(VECTOR_INDEX_TYPES)})")
+    min_rows = LANCE_VECTOR_INDEX_MIN_ROWS if min_rows is None else int(min_rows)
+
+    before = index_status(table, min_rows=min_rows)
+    todo = _expected_columns(table, before.rows, min_rows) if rebuild else before.missing
+    built: list[str] = []
+    for column in todo:
+        if column == VECTOR_COLUMN:
+            config = _vector_index_config(
+                index_type, before.rows, _vector_dim(table),
+                num_partitions or LANCE_INDEX_NUM_PARTITIONS,
+                num_sub_vectors or LANCE_INDEX_NUM_SUB_VECTORS,
+            )
+        elif column in TEXT_INDEX_COLUMNS:
+            config = FTS()
+        elif column in LIST_INDEX_COLUMNS:
+            config = LabelList()
+        else:
+            config = Bitmap()
+        logger.info("Building %s index on %s.%s (%d rows)", type(config).__name__, table.name, column, before.rows)
+        table.create_index(column, config=config, replace=True)
+        built.append(column)
+
+    optimized = False
+    if not rebuild and any(not i.fresh for i in before.indexes):
+        # Incremental: adds the unindexed fragments to each index without retraining.
+        logger.info("Updating indexes on %s with newly appended rows", table.name)
+        table.optimize()
+        optimized = True
+
+    report = index_status(table, min_rows=min_rows)
+    report.built = built
+    report.optimized = optimized
+    return report
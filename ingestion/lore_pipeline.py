@@ -0,0 +1,298 @@
+"""Pipelined lore ingestion engine used by ingestion.ingest_lore.
+
+Stages, with bounded queues between them so memory stays flat on large libraries:
+
+1. parse    ingest_file() per file in a process pool (read, classify, hierarchical chunking).
+            Results are consumed in input order, so tagging and manifests see the
+            same sequence as a serial run; chunk IDs come from stable_chunk_id as before.
+2. prepare  (calling thread) canonical chunks, NPC tags, optional LLM tags, dedup
+            against the table, then fixed-size embedding batches.
+3. embed    ``embed_workers`` threads encoding batches.
+4. write    one thread appending to LanceDB in large batches (LanceDB favours few, big
+            appends over many small ones).
+
+Defaults come from env: INGEST_WORKERS (parse processes; default CPUs - 1, 1 = in-process),
+INGEST_EMBED_WORKERS (default 1), EMBED_BATCH_SIZE (default 128) and
+INGEST_WRITE_BATCH_SIZE (rows per LanceDB append, default 2048).
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ingestion.embedding import encode as embed_texts
+from ingestion.npc_tagging import NpcTagSession
+from ingestion.store import LanceStore
+from ingestion.tagger import apply_tagger_to_chunks
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "0") or 0) or max(1, (os.cpu_count() or 2) - 1)
+INGEST_EMBED_WORKERS = max(1, int(os.environ.get("INGEST_EMBED_WORKERS", "1") or 1))
+EMBED_BATCH_SIZE = max(1, int(os.environ.get("EMBED_BATCH_SIZE", "128") or 128))
+INGEST_WRITE_BATCH_SIZE = max(1, int(os.environ.get("INGEST_WRITE_BATCH_SIZE", "2048") or 2048))
+
+# Seconds between "progress" log lines.
+_PROGRESS_INTERVAL_S = 10.0
+_STOP = object()
+
+
+@dataclass
+class LorePipelineResult:
+    """Totals for one pipeline run (feeds the run manifest and the final log line)."""
+
+    files_total: int = 0
+    files_parsed: int = 0
+    file_failures: int = 0
+    chunks: int = 0
+    added: int = 0
+    skipped: int = 0
+    embedded: int = 0
+    chunks_with_related_npcs: int = 0
+    related_npcs: set[str] = field(default_factory=set)
+    eras: set[str] = field(default_factory=set)
+    npc_tag_stats: dict[str, Any] = field(default_factory=dict)
+    tagger_stats: dict[str, Any] = field(default_factory=dict)
+
+    def npc_linkage(self) -> dict[str, Any]:
+        ratio = (self.chunks_with_related_npcs / self.chunks) if self.chunks else 0.0
+        return {
+            "chunks_total": self.chunks,
+            "chunks_with_related_npcs": self.chunks_with_related_npcs,
+            "related_npc_coverage_ratio": round(ratio, 4),
+            "unique_related_npcs": len(self.related_npcs),
+        }
+
+
+class _Aborted(Exception):
+    """A downstream stage failed; stop feeding the pipeline."""
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> None:
+    """Blocking put that gives up once another stage has failed."""
+    while True:
+        if stop.is_set():
+            raise _Aborted()
+        try:
+            q.put(item, timeout=0.2)
+            return
+        except queue.Full:
+            continue
+
+
+def _parse_results(
+    paths: list[Path],
+    parse_file: Callable[[Path], list[dict[str, Any]]],
+    workers: int,
+) -> Iterator[tuple[Path, list[dict[str, Any]] | None, BaseException | None]]:
+    """Yield (path, hierarchical chunks, error) in input order, parsing up to workers files ahead."""
+    if workers <= 1 or len(paths) <= 1:
+        for p in paths:
+            try:
+                yield p, parse_file(p), None
+            except Exception as e:
+                yield p, None, e
+        return
+    # spawn: the calling process already runs embed/writer threads, and forking with
+    # live threads can deadlock the child.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending: deque[tuple[Path, Future]] = deque()
+        it = iter(paths)
+        for p in it:
+            pending.append((p, pool.submit(parse_file, p)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            p, fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(parse_file, nxt)))
+            try:
+                yield p, fut.result(), None
+            except Exception as e:
+                yield p, None, e
+
+
+def run_lore_pipeline(
+    paths: list[Path],
+    parse_file: Callable[[Path], list[dict[str, Any]]],
+    to_canonical: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    open_store: Callable[[], LanceStore],
+    *,
+    npc_tagger: NpcTagSession | None = None,
+    workers: int | None = None,
+    embed_workers: int | None = None,
+    embed_batch_size: int | None = None,
+    write_batch_size: int | None = None,
+    embed: Callable[[list[str]], list[list[float]]] = embed_texts,
+) -> LorePipelineResult:
+    """Parse, tag, embed and store every path; returns totals.
+
+    parse_file must be picklable (a module-level function or functools.partial of one)
+    when workers > 1. open_store is called once, when the first chunks are ready, so a
+    run that produces nothing leaves the table untouched.
+    """
+    workers = INGEST_WORKERS if workers is None else max(1, int(workers))
+    embed_workers = INGEST_EMBED_WORKERS if embed_workers is None else max(1, int(embed_workers))
+    embed_batch_size = EMBED_BATCH_SIZE if embed_batch_size is None else max(1, int(embed_batch_size))
+    write_batch_size = INGEST_WRITE_BATCH_SIZE if write_batch_size is None else max(1, int(write_batch_size))
+
+    result = LorePipelineResult(files_total=len(paths))
+    tagger_totals: dict[str, Any] = {}
+    embed_q: queue.Queue = queue.Queue(maxsize=embed_workers * 4)
+    write_q: queue.Queue = queue.Queue(maxsize=embed_workers * 4)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    counts_lock = threading.Lock()
+    store: LanceStore | None = None
+    claimed: set[str] = set()
+
+    def _fail(e: BaseException) -> None:
+        errors.append(e)
+        stop.set()
+
+    def _embedder() -> None:
+        # Keeps draining embed_q after a failure so the feeder never blocks on a full queue.
+        while True:
+            batch = embed_q.get()
+            if batch is _STOP:
+                return
+            if stop.is_set():
+                continue
+            try:
+                vectors = embed([c["text"] for c in batch])
+                with counts_lock:
+                    result.embedded += len(batch)
+                _put(write_q, (batch, vectors), stop)
+            except _Aborted:
+                continue
+            except BaseException as e:
+                _fail(e)
+
+    def _writer() -> None:
+        chunks: list[dict] = []
+        vectors: list[list[float]] = []
+        try:
+            while True:
+                item = write_q.get()
+                if item is not _STOP:
+                    if stop.is_set():
+                        continue
+                    chunks.extend(item[0])
+                    vectors.extend(item[1])
+                if chunks and (item is _STOP or len(chunks) >= write_batch_size):
+                    added = store.add_embedded(chunks, vectors)
+                    with counts_lock:
+                        result.added += added
+                    chunks, vectors = [], []
+                if item is _STOP:
+                    return
+        except BaseException as e:
+            _fail(e)
+
+    embedders = [
+        threading.Thread(target=_embedder, name=f"lore-embed-{i}", daemon=True)
+        for i in range(embed_workers)
+    ]
+    writer = threading.Thread(target=_writer, name="lore-writer", daemon=True)
+    started = False
+    last_progress = time.monotonic()
+
+    try:
+        for idx, (path, hierarchical, error) in enumerate(_parse_results(paths, parse_file, workers), 1):
+            if stop.is_set():
+                break
+            if error is not None:
+                logger.error("Ingest failed %s: %s", path, error, exc_info=error)
+                result.file_failures += 1
+                continue
+            result.files_parsed += 1
+            logger.info("[%d/%d] Parsed %s (%d chunks)", idx, len(paths), path.name, len(hierarchical or []))
+            if not hierarchical:
+                continue
+            canonical = to_canonical(hierarchical)
+            if npc_tagger is not None:
+                npc_tagger.tag(canonical)
+            canonical, tagger_stats = apply_tagger_to_chunks(canonical)
+            for key, value in tagger_stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    tagger_totals[key] = value
+                else:
+                    tagger_totals[key] = tagger_totals.get(key, 0) + value
+            for c in canonical:
+                md = c.get("metadata") or {}
+                rel = md.get("related_npcs") or []
+                if rel:
+                    result.chunks_with_related_npcs += 1
+                    result.related_npcs.update(str(x) for x in rel if str(x).strip())
+                era = md.get("era") or md.get("time_period") or ""
+                if era:
+                    result.eras.add(era)
+            result.chunks += len(canonical)
+
+            if store is None:
+                store = open_store()
+            new_chunks, skipped = store.filter_new(canonical)
+            # IDs already queued this run but not yet written count as existing too.
+            fresh = []
+            for c in new_chunks:
+                cid = store.chunk_id(c)
+                if cid and cid in claimed:
+                    skipped += 1
+                    continue
+                claimed.add(cid)
+                fresh.append(c)
+            result.skipped += skipped
+            if not started and fresh:
+                for t in embedders:
+                    t.start()
+                writer.start()
+                started = True
+            for start in range(0, len(fresh), embed_batch_size):
+                _put(embed_q, fresh[start:start + embed_batch_size], stop)
+
+            now = time.monotonic()
+            if now - last_progress >= _PROGRESS_INTERVAL_S:
+                last_progress = now
+                with counts_lock:
+                    logger.info(
+                        "Progress: %d/%d files, %d chunks, %d embedded, %d written, %d skipped",
+                        idx, len(paths), result.chunks, result.embedded, result.added, result.skipped,
+                    )
+    except _Aborted:
+        pass
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if started:
+            for _ in embedders:
+                embed_q.put(_STOP)
+            for t in embedders:
+                t.join()
+            # The writer stops consuming once it has failed; don't block on a full queue then.
+            while writer.is_alive():
+                try:
+                    write_q.put(_STOP, timeout=0.2)
+                    break
+                except queue.Full:
+                    continue
+            writer.join()
+
+    if errors:
+        raise errors[0]
+    if npc_tagger is not None:
+        result.npc_tag_stats = npc_tagger.finish()
+    result.tagger_stats = tagger_totals or apply_tagger_to_chunks([])[1]
+    return result
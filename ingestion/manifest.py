@@ -100,6 +100,9 @@ def write_run_manifest(
         tagger_model=tagger_model,
         root=root,
         context=context,
+        output_table=output_table,
+        run_id=rid,
+        timestamp=payload["timestamp"],
     )
     return out_path
 
@@ -144,19 +147,65 @@ def _write_last_ingest(
     tagger_model: str,
     root: Path | None = None,
     context: dict[str, Any] | None = None,
+    output_table: str = "",
+    run_id: str = "",
+    timestamp: str = "",
 ) -> Path:
     if root is None:
         root = Path(__file__).resolve().parents[1]
     out_path = root / "data" / "last_ingest.json"
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    # Latest run per output table; the backend's retrieval cache keys on these.
+    tables = _read_last_ingest(out_path).get("tables")
+    tables = dict(tables) if isinstance(tables, dict) else {}
+    if output_table:
+        tables[output_table] = {"run_id": run_id, "manifest_path": str(manifest_path), "timestamp": timestamp}
     payload: dict[str, Any] = {
         "vectordb_path": db_path,
         "manifest_path": str(manifest_path),
         "tagger_enabled": bool(tagger_enabled),
         "tagger_model": tagger_model or "",
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "tables": tables,
     }
     if context:
         payload["context"] = context
     out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     return out_path
+
+
+def _read_last_ingest(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+_table_versions_cache: dict[str, tuple[int, dict[str, str]]] = {}
+
+
+def table_versions(root: Path | None = None) -> dict[str, str]:
+    """Run id of the latest manifest per output table (from data/last_ingest.json).
+
+    Re-read only when the file changes, so callers can check it on every lookup.
+    Tables ingested before per-table tracking map to the last run's manifest path
+    under the ``""`` key.
+    """
+    if root is None:
+        root = Path(__file__).resolve().parents[1]
+    path = root / "data" / "last_ingest.json"
+    try:
+        stamp = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _table_versions_cache.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    data = _read_last_ingest(path)
+    versions = {"": str(data.get("manifest_path") or "")}
+    for table, info in (data.get("tables") or {}).items():
+        if isinstance(info, dict):
+            versions[str(table)] = str(info.get("run_id") or info.get("manifest_path") or "")
+    _table_versions_cache[str(path)] = (stamp, versions)
+    return versions
@@ -11,6 +11,7 @@ from typing import Any
 
 from shared.config import MANIFESTS_DIR
 from backend.app.world.era_pack_models import EraPack, EraNpcEntry, NpcMatchRules
+from ingestion.alias_matcher import AliasMatcher, compile_alias_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +25,6 @@ class AliasPattern:
     is_ambiguous: bool
 
 
-def _compile_pattern(alias: str, case_sensitive: bool = False) -> re.Pattern:
-    """Build regex with word boundaries and flexible whitespace."""
-    escaped = re.escape(alias)
-    escaped = escaped.replace("\\ ", "\\s+")
-    flags = 0 if case_sensitive else re.IGNORECASE
-    pattern = rf"\b{escaped}\b"
-    return re.compile(pattern, flags)
-
-
 def _alias_tokens(alias: str) -> int:
     return len([t for t in re.split(r"\s+", alias.strip()) if t])
 
@@ -105,7 +97,7 @@ def _build_alias_index(era_pack: EraPack, mode: str) -> list[AliasPattern]:
             key = alias_clean.lower()
             is_ambiguous = len(alias_to_ids.get(key, set())) > 1
             try:
-                pat = _compile_pattern(alias_clean, case_sensitive=npc.match_rules.case_sensitive)
+                pat = compile_alias_pattern(alias_clean, case_sensitive=npc.match_rules.case_sensitive)
                 patterns.append(AliasPattern(npc_id=npc.id, alias=alias_clean, alias_key=key, pattern=pat, is_ambiguous=is_ambiguous))
             except re.error as e:
                 logger.warning("Invalid alias regex for %r (%s): %s", alias_clean, npc.id, e)
@@ -113,19 +105,29 @@ def _build_alias_index(era_pack: EraPack, mode: str) -> list[AliasPattern]:
     return patterns
 
 
+def build_alias_matcher(patterns: list[AliasPattern]) -> AliasMatcher:
+    """Single-pass matcher over patterns (build once per alias index, reuse per chunk)."""
+    return AliasMatcher((p.alias, p.pattern) for p in patterns)
+
+
 def scan_text_for_npcs(
     text: str,
     patterns: list[AliasPattern],
+    matcher: AliasMatcher | None = None,
 ) -> tuple[list[str], dict[str, dict[str, Any]]]:
-    """Return (related_npcs, collisions) for a text chunk."""
+    """Return (related_npcs, collisions) for a text chunk.
+
+    matcher must be built from the same patterns list (see build_alias_matcher).
+    """
     if not text or not text.strip():
         return [], {}
+    if matcher is None:
+        matcher = build_alias_matcher(patterns)
     seen: set[str] = set()
     ordered: list[str] = []
     collisions: dict[str, dict[str, Any]] = {}
-    for pat in patterns:
-        if not pat.pattern.search(text):
-            continue
+    for i in matcher.matches(text):
+        pat = patterns[i]
         if pat.is_ambiguous:
             item = collisions.setdefault(pat.alias_key, {"alias": pat.alias, "npc_ids": set(), "count": 0})
             item["npc_ids"].add(pat.npc_id)
@@ -173,6 +175,62 @@ def write_collision_report(
     return out_path
 
 
+class NpcTagSession:
+    """Incremental form of apply_npc_tags_to_chunks for pipelines that see chunks in batches.
+
+    tag() each batch as it arrives; finish() aggregates collisions across all batches,
+    writes the single collision report and returns the stats.
+    """
+
+    def __init__(self, era_pack: EraPack | None, *, enabled: bool = True, mode: str = "strict") -> None:
+        self.era_pack = era_pack
+        self.mode = mode
+        self.stats: dict[str, Any] = {
+            "enabled": bool(enabled and era_pack),
+            "mode": mode,
+            "tagged": 0,
+            "collisions": 0,
+            "collision_report_path": "",
+        }
+        self._patterns: list[AliasPattern] = []
+        self._matcher: AliasMatcher | None = None
+        if self.stats["enabled"]:
+            self._patterns = _build_alias_index(era_pack, mode=mode)
+            self._matcher = build_alias_matcher(self._patterns)
+        self._collisions: dict[str, dict[str, Any]] = {}
+
+    def tag(self, chunks: list[dict]) -> list[dict]:
+        """Set metadata.related_npcs on each chunk (no-op when disabled)."""
+        if not self.stats["enabled"]:
+            return chunks
+        for chunk in chunks:
+            text = chunk.get("text") or ""
+            related, collisions = scan_text_for_npcs(text, self._patterns, self._matcher)
+            meta = chunk.get("metadata") or {}
+            meta["related_npcs"] = related
+            chunk["metadata"] = meta
+            self.stats["tagged"] += 1
+            # Aggregate collisions
+            for key, item in collisions.items():
+                agg = self._collisions.setdefault(key, {"alias": item.get("alias"), "npc_ids": set(), "count": 0})
+                agg["npc_ids"].update(item.get("npc_ids", []))
+                agg["count"] += int(item.get("count", 0))
+        return chunks
+
+    def finish(self) -> dict[str, Any]:
+        """Write the collision report (if any) and return stats."""
+        if not self.stats["enabled"]:
+            return self.stats
+        collisions = {
+            key: {**v, "npc_ids": sorted(v["npc_ids"])} for key, v in self._collisions.items()
+        }
+        self.stats["collisions"] = sum(int(v.get("count", 0)) for v in collisions.values())
+        report_path = write_collision_report(collisions, era_id=self.era_pack.era_id, mode=self.mode)
+        if report_path:
+            self.stats["collision_report_path"] = str(report_path)
+        return self.stats
+
+
 def apply_npc_tags_to_chunks(
     chunks: list[dict],
     *,
@@ -181,37 +239,6 @@ def apply_npc_tags_to_chunks(
     mode: str = "strict",
 ) -> tuple[list[dict], dict[str, Any]]:
     """Apply related_npcs tagging to canonical chunks. Returns (chunks, stats)."""
-    stats = {
-        "enabled": bool(enabled and era_pack),
-        "mode": mode,
-        "tagged": 0,
-        "collisions": 0,
-        "collision_report_path": "",
-    }
-    if not enabled or not era_pack:
-        return chunks, stats
-
-    patterns = _build_alias_index(era_pack, mode=mode)
-    collisions_accum: dict[str, dict[str, Any]] = {}
-
-    for chunk in chunks:
-        text = chunk.get("text") or ""
-        related, collisions = scan_text_for_npcs(text, patterns)
-        meta = chunk.get("metadata") or {}
-        meta["related_npcs"] = related
-        chunk["metadata"] = meta
-        stats["tagged"] += 1
-        # Aggregate collisions
-        for key, item in collisions.items():
-            agg = collisions_accum.setdefault(key, {"alias": item.get("alias"), "npc_ids": set(), "count": 0})
-            agg["npc_ids"].update(item.get("npc_ids", []))
-            agg["count"] += int(item.get("count", 0))
-
-    for v in collisions_accum.values():
-        v["npc_ids"] = sorted(v["npc_ids"])
-    stats["collisions"] = sum(int(v.get("count", 0)) for v in collisions_accum.values())
-
-    report_path = write_collision_report(collisions_accum, era_id=era_pack.era_id, mode=mode)
-    if report_path:
-        stats["collision_report_path"] = str(report_path)
-    return chunks, stats
+    session = NpcTagSession(era_pack, enabled=enabled, mode=mode)
+    session.tag(chunks)
+    return chunks, session.finish()
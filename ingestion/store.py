@@ -33,6 +33,11 @@ TABLE_NAME = "lore_chunks"
 #     as the relative layout under input_dir stays the same.
 CHUNK_ID_SCHEME = "v3"
 
+# Native list<string> columns and the legacy JSON string column each one mirrors.
+# Retrieval filters on the list columns (array_has_any, label-list indexed);
+# the JSON columns are still written for older readers.
+LIST_COLUMNS = {"characters": "characters_json", "related_npcs": "related_npcs_json"}
+
 # Embedding batch size for large ingestion runs (configurable via env var)
 _EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "128"))
 
@@ -169,6 +174,8 @@ def _chunk_to_row(chunk: dict, embedding: List[float]) -> dict:
         "section_kind": m.get("section_kind", default_section_kind()),
         "characters_json": _characters_to_json(chars),
         "related_npcs_json": _related_npcs_to_json(related_npcs),
+        "characters": [str(c) for c in chars or []],
+        "related_npcs": [str(n) for n in related_npcs],
         # Unified superset fields for lore ingestion
         "collection": m.get("collection", ""),
         "level": m.get("level", ""),
@@ -187,6 +194,72 @@ def _chunk_to_row(chunk: dict, embedding: List[float]) -> dict:
     }
 
 
+def migrate_list_columns(table, *, batch_size: int = 50_000, dry_run: bool = False) -> dict:
+    """Add the native list columns to an existing table and backfill them from the JSON columns.
+
+    Rows are matched on id (merge_insert), so the vectors are not rewritten. Rows whose
+    list column is still null are backfilled even when the column already exists, so a
+    rerun finishes a migration that was interrupted after add_columns.
+    Returns {added_columns, backfilled_columns, rows_updated, rows_skipped}; rows without
+    an id are skipped.
+    """
+    names = set(table.schema.names)
+    sources = {col: src for col, src in LIST_COLUMNS.items() if src in names}
+    added = [col for col in sources if col not in names]
+    todo = {
+        col: src for col, src in sources.items()
+        if col in added or table.count_rows(f"{col} IS NULL")
+    }
+    result = {
+        "added_columns": sorted(added),
+        "backfilled_columns": sorted(todo),
+        "rows_updated": 0,
+        "rows_skipped": 0,
+    }
+    if not todo or dry_run:
+        return result
+
+    if added:
+        table.add_columns([pa.field(col, pa.list_(pa.string())) for col in added])
+    source = (
+        table.search()
+        .where(" OR ".join(f"{col} IS NULL" for col in todo))
+        .select(["id", *todo.values()])
+        .limit(None)
+        .to_arrow()
+    )
+    ids = source.column("id").to_pylist()
+    keep = [i for i, rid in enumerate(ids) if rid]
+    result["rows_skipped"] = len(ids) - len(keep)
+    columns = {"id": [ids[i] for i in keep]}
+    for col, src in todo.items():
+        values = source.column(src).to_pylist()
+        columns[col] = [_json_list(values[i]) for i in keep]
+    updates = pa.table(
+        columns,
+        schema=pa.schema([pa.field("id", pa.string())] + [pa.field(c, pa.list_(pa.string())) for c in todo]),
+    )
+    for start in range(0, updates.num_rows, batch_size):
+        batch = updates.slice(start, batch_size)
+        table.merge_insert("id").when_matched_update_all().execute(batch)
+        result["rows_updated"] += batch.num_rows
+    logger.info(
+        "Backfilled %s on %d rows (%d without id skipped)",
+        ", ".join(todo), result["rows_updated"], result["rows_skipped"],
+    )
+    return result
+
+
+def _json_list(value) -> list[str]:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return [str(v) for v in parsed] if isinstance(parsed, list) else []
+
+
 class LanceStore:
     """LanceDB-backed store: unified schema for novels + lore chunks."""
 
@@ -216,6 +289,8 @@ class LanceStore:
             pa.field("section_kind", pa.string()),
             pa.field("characters_json", pa.string()),
             pa.field("related_npcs_json", pa.string()),
+            pa.field("characters", pa.list_(pa.string())),
+            pa.field("related_npcs", pa.list_(pa.string())),
             pa.field("collection", pa.string()),
             pa.field("level", pa.string()),
             pa.field("parent_id", pa.string()),
@@ -242,6 +317,13 @@ class LanceStore:
             try:
                 self.table = self.db.open_table(TABLE_NAME)
                 logger.info("Opened existing table %s", TABLE_NAME)
+                missing = [c for c in LIST_COLUMNS if c not in self.table.schema.names]
+                if missing:
+                    logger.warning(
+                        "Table %s has no %s list column(s); NPC/character filters fall back to "
+                        "substring scans. Run: python scripts/migrate_lance_list_columns.py --db %s",
+                        TABLE_NAME, ", ".join(missing), self.db_path,
+                    )
                 return
             except Exception as e:
                 if self._allow_overwrite:
@@ -288,6 +370,39 @@ class LanceStore:
         cache = self._load_id_cache()
         return candidate_ids & cache
 
+    @staticmethod
+    def chunk_id(chunk: dict) -> str:
+        """ID a chunk will be stored under ("" if it has none)."""
+        m = chunk.get("metadata") or {}
+        return str(m.get("chunk_id", chunk.get("chunk_id", chunk.get("id", ""))))
+
+    def filter_new(self, chunks: List[dict]) -> tuple[List[dict], int]:
+        """Split off chunks whose IDs are already in the table. Returns (new_chunks, skipped)."""
+        candidate_ids = {self.chunk_id(c) for c in chunks} - {""}
+        existing_ids = self._existing_ids_for(candidate_ids)
+        new_chunks = []
+        skipped = 0
+        for c in chunks:
+            cid = self.chunk_id(c)
+            if cid and cid in existing_ids:
+                skipped += 1
+                continue
+            new_chunks.append(c)
+        return new_chunks, skipped
+
+    def add_embedded(self, chunks: List[dict], embeddings: List[List[float]]) -> int:
+        """Append chunks with precomputed embeddings in one table write. Returns rows added."""
+        if not chunks:
+            return 0
+        schema_cols = {f.name for f in self.table.schema}
+        full_rows = [_chunk_to_row(c, emb) for c, emb in zip(chunks, embeddings)]
+        rows = [{k: v for k, v in r.items() if k in schema_cols} for r in full_rows]
+        self.table.add(rows)
+        # Keep local cache in sync
+        if self._id_cache is not None:
+            self._id_cache.update(r["id"] for r in rows if r.get("id"))
+        return len(rows)
+
     def add_chunks(self, chunks: List[dict], *, dedupe: bool = True) -> dict:
         """Store chunks with embeddings. Returns {added: int, skipped: int}.
 
@@ -298,46 +413,22 @@ class LanceStore:
         if not chunks:
             return {"added": 0, "skipped": 0}
 
-        # Collect candidate IDs for the incoming batch
-        def _cid(c: dict) -> str:
-            m = c.get("metadata") or {}
-            return str(m.get("chunk_id", c.get("chunk_id", c.get("id", ""))))
-
         # Dedup: check only incoming IDs against the cache
-        existing_ids: set[str] = set()
         if dedupe:
-            candidate_ids = {_cid(c) for c in chunks} - {""}
-            existing_ids = self._existing_ids_for(candidate_ids)
-
-        # Filter out already-present chunks
-        new_chunks = []
-        skipped = 0
-        for c in chunks:
-            cid = _cid(c)
-            if dedupe and cid and cid in existing_ids:
-                skipped += 1
-                continue
-            new_chunks.append(c)
+            new_chunks, skipped = self.filter_new(chunks)
+        else:
+            new_chunks, skipped = list(chunks), 0
 
         if not new_chunks:
             logger.info("All %d chunks already exist (skipped)", skipped)
             return {"added": 0, "skipped": skipped}
 
         # Batch embedding + insertion
-        schema_cols = {f.name for f in self.table.schema}
         total_added = 0
-
         for batch_start in range(0, len(new_chunks), _EMBED_BATCH_SIZE):
             batch = new_chunks[batch_start:batch_start + _EMBED_BATCH_SIZE]
-            texts = [c["text"] for c in batch]
-            embeddings = embed_texts(texts)
-            full_rows = [_chunk_to_row(c, emb) for c, emb in zip(batch, embeddings)]
-            rows = [{k: v for k, v in r.items() if k in schema_cols} for r in full_rows]
-            self.table.add(rows)
-            total_added += len(rows)
-            # Keep local cache in sync
-            if self._id_cache is not None:
-                self._id_cache.update(r["id"] for r in rows if r.get("id"))
+            embeddings = embed_texts([c["text"] for c in batch])
+            total_added += self.add_embedded(batch, embeddings)
 
         logger.info(
             "Added %d chunks to %s (skipped %d duplicates)",
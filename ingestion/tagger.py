@@ -1,19 +1,58 @@
-"""Local ingestion tagger for lore chunks (optional)."""
+"""Local ingestion tagger for lore chunks (optional).
+
+Chunks are tagged with up to INGESTION_TAGGER_CONCURRENCY (default 4) LLM requests in
+flight. Results are cached in SQLite (INGESTION_TAGGER_CACHE, default
+<ingest root>/cache/tagger_cache.sqlite; "off" disables) keyed by chunk text hash, the
+metadata hints sent with it, tagger model and TAGGER_PROMPT_VERSION, and committed as
+they arrive: re-ingesting identical text costs no LLM calls, and an interrupted run
+picks up where it stopped.
+"""
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from backend.app.config import MODEL_CONFIG
 from backend.app.core.agents.base import AgentLLM
+from shared.cache import get_cache_value
 from shared.config import _env_flag
+from shared.ingest_paths import ingest_root
 
 logger = logging.getLogger(__name__)
 
+# Bump when the system prompt or output schema changes so cached results are not reused.
+TAGGER_PROMPT_VERSION = "1"
+
+_DEFAULT_CONCURRENCY = 4
+# Cached results are committed every this many completions (bounds work lost on interrupt).
+_CACHE_FLUSH_EVERY = 16
+
+_SYSTEM_PROMPT = (
+    "You are a metadata tagger for lore chunks. "
+    "Return ONLY valid JSON matching this schema:\n"
+    "{"
+    '"doc_type": "<string|null>", '
+    '"section_kind": "<string|null>", '
+    '"entities": {"characters":[...], "factions":[...], "planets":[...], "items":[...]}, '
+    '"timeline": {"era": "<string|null>", "start": "<string|null>", "end": "<string|null>", "confidence": <float|null>}, '
+    '"summary_1s": "<one sentence|null>", '
+    '"injection_risk": "<low|med|high|unknown>"'
+    "}\n"
+    "Conservative rules: If unsure, set fields to null or 'unknown' and LOWER confidence. "
+    "Use empty lists when no entities are present. No markdown, no extra text."
+)
+
 
 def tagger_enabled() -> bool:
     return _env_flag("INGESTION_TAGGER_ENABLED") or _env_flag("STORYTELLER_INGESTION_TAGGER_ENABLED")
@@ -24,6 +63,13 @@ def tagger_model_name() -> str:
     return cfg.get("model", "") or ""
 
 
+def tagger_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("INGESTION_TAGGER_CONCURRENCY", "") or _DEFAULT_CONCURRENCY))
+    except ValueError:
+        return _DEFAULT_CONCURRENCY
+
+
 class Entities(BaseModel):
     characters: list[str] = Field(default_factory=list)
     factions: list[str] = Field(default_factory=list)
@@ -53,40 +99,122 @@ class TaggerResult:
     error: str | None = None
 
 
-def tag_chunk(text: str, *, llm: AgentLLM | None = None, existing: dict | None = None) -> TaggerResult:
-    if not text:
-        return TaggerResult(output=None, error="empty text")
-    if llm is None:
-        llm = AgentLLM("ingestion_tagger")
-    system = (
-        "You are a metadata tagger for lore chunks. "
-        "Return ONLY valid JSON matching this schema:\n"
-        "{"
-        '"doc_type": "<string|null>", '
-        '"section_kind": "<string|null>", '
-        '"entities": {"characters":[...], "factions":[...], "planets":[...], "items":[...]}, '
-        '"timeline": {"era": "<string|null>", "start": "<string|null>", "end": "<string|null>", "confidence": <float|null>}, '
-        '"summary_1s": "<one sentence|null>", '
-        '"injection_risk": "<low|med|high|unknown>"'
-        "}\n"
-        "Conservative rules: If unsure, set fields to null or 'unknown' and LOWER confidence. "
-        "Use empty lists when no entities are present. No markdown, no extra text."
-    )
+def _meta_hint(existing: dict | None) -> dict[str, str]:
     existing_meta = existing or {}
-    meta_hint = {
+    return {
         "doc_type": existing_meta.get("doc_type") or "",
         "section_kind": existing_meta.get("section_kind") or "",
         "era": existing_meta.get("era") or existing_meta.get("time_period") or "",
         "source": existing_meta.get("source") or existing_meta.get("book_title") or "",
     }
+
+
+def tagger_cache_key(text: str, existing: dict | None = None, model: str | None = None) -> str:
+    """Cache key: everything that determines the tagger prompt, plus the model."""
+    payload = json.dumps([
+        TAGGER_PROMPT_VERSION,
+        tagger_model_name() if model is None else model,
+        hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        _meta_hint(existing),
+    ], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaggerCache:
+    """Persistent cache of successful tagger outputs (one SQLite file, safe across threads)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS tagger_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                output_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, TaggerOutput]:
+        found: dict[str, TaggerOutput] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, output_json FROM tagger_cache WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, raw in rows:
+                    try:
+                        found[key] = TaggerOutput.model_validate_json(raw)
+                    except ValidationError:
+                        continue
+        return found
+
+    def put_many(self, items: list[tuple[str, TaggerOutput]], *, model: str) -> None:
+        if not items:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tagger_cache (key, model, prompt_version, output_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, model, TAGGER_PROMPT_VERSION, out.model_dump_json(), now) for key, out in items],
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM tagger_cache").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def tagger_cache_path() -> Path | None:
+    """Configured cache file, or None when caching is disabled."""
+    raw = os.environ.get("INGESTION_TAGGER_CACHE", "").strip()
+    if raw.lower() in ("0", "off", "false", "no", "none"):
+        return None
+    return Path(raw).expanduser() if raw else ingest_root() / "cache" / "tagger_cache.sqlite"
+
+
+def get_tagger_cache() -> TaggerCache | None:
+    """Process-wide cache for the configured path (None when disabled or unavailable)."""
+    path = tagger_cache_path()
+    if path is None:
+        return None
+    caches: dict[str, TaggerCache | None] = get_cache_value("ingestion_tagger_cache", dict)
+    key = str(path.resolve())
+    if key not in caches:
+        try:
+            caches[key] = TaggerCache(path)
+        except sqlite3.Error as e:
+            logger.warning("Tagger cache unavailable at %s: %s", path, e)
+            caches[key] = None
+    return caches[key]
+
+
+def tag_chunk(text: str, *, llm: AgentLLM | None = None, existing: dict | None = None) -> TaggerResult:
+    if not text:
+        return TaggerResult(output=None, error="empty text")
+    if llm is None:
+        llm = AgentLLM("ingestion_tagger")
     user = (
         "Chunk text:\n"
         f"{text}\n\n"
         "Existing metadata (use as hints, do not invent):\n"
-        f"{json.dumps(meta_hint)}"
+        f"{json.dumps(_meta_hint(existing))}"
     )
     try:
-        raw = llm.complete(system, user, json_mode=True)
+        raw = llm.complete(_SYSTEM_PROMPT, user, json_mode=True)
         data = json.loads(str(raw))
         output = TaggerOutput.model_validate(data)
         return TaggerResult(output=output)
@@ -100,28 +228,95 @@ def apply_tagger_to_chunks(
     *,
     enabled: bool | None = None,
     llm: AgentLLM | None = None,
+    cache: TaggerCache | None = None,
+    concurrency: int | None = None,
 ) -> tuple[list[dict], dict[str, Any]]:
-    """Apply tagger to canonical chunks, returning updated chunks and stats."""
+    """Apply tagger to canonical chunks, returning updated chunks and stats.
+
+    Cached outputs are applied without an LLM call; the rest are tagged with up to
+    concurrency requests in flight and cached as they complete. The default cache
+    (get_tagger_cache) is only used with the configured tagger model, i.e. when no
+    llm is injected. Failures are not cached.
+    """
     if enabled is None:
         enabled = tagger_enabled()
+    model = tagger_model_name()
     stats = {
         "enabled": bool(enabled),
-        "model": tagger_model_name(),
+        "model": model,
         "tagged": 0,
+        "cached": 0,
         "failed": 0,
     }
     if not enabled:
         return chunks, stats
-    for chunk in chunks:
-        text = chunk.get("text") or ""
+    if cache is None and llm is None:
+        cache = get_tagger_cache()
+    concurrency = tagger_concurrency() if concurrency is None else max(1, int(concurrency))
+
+    keys = [tagger_cache_key(c.get("text") or "", c.get("metadata"), model) for c in chunks]
+    cached = cache.get_many(keys) if cache is not None else {}
+    todo: list[int] = []
+    for i, chunk in enumerate(chunks):
+        output = cached.get(keys[i])
+        if output is None:
+            todo.append(i)
+            continue
         meta = chunk.get("metadata") or {}
-        result = tag_chunk(text, llm=llm, existing=meta)
+        _apply_output_to_metadata(meta, output)
+        chunk["metadata"] = meta
+        stats["tagged"] += 1
+        stats["cached"] += 1
+
+    local = threading.local()
+
+    def _tag(i: int) -> TaggerResult:
+        client = llm
+        if client is None:
+            client = getattr(local, "llm", None)
+            if client is None:
+                client = local.llm = AgentLLM("ingestion_tagger")
+        return tag_chunk(chunks[i].get("text") or "", llm=client, existing=chunks[i].get("metadata"))
+
+    pending_cache: list[tuple[str, TaggerOutput]] = []
+
+    def _done(i: int, result: TaggerResult) -> None:
         if not result.output:
             stats["failed"] += 1
-            continue
+            return
+        meta = chunks[i].get("metadata") or {}
+        # Key from the metadata the prompt was built from, before the output updates it.
+        pending_cache.append((keys[i], result.output))
         _apply_output_to_metadata(meta, result.output)
-        chunk["metadata"] = meta
+        chunks[i]["metadata"] = meta
         stats["tagged"] += 1
+        if cache is not None and len(pending_cache) >= _CACHE_FLUSH_EVERY:
+            cache.put_many(pending_cache, model=model)
+            pending_cache.clear()
+
+    try:
+        if concurrency == 1 or len(todo) <= 1:
+            for i in todo:
+                _done(i, _tag(i))
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tagger") as pool:
+                queue = iter(todo)
+                in_flight: dict[Future, int] = {}
+                for i in queue:
+                    in_flight[pool.submit(_tag, i)] = i
+                    if len(in_flight) >= concurrency:
+                        break
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        # Metadata is only written here, on the calling thread.
+                        _done(in_flight.pop(fut), fut.result())
+                        nxt = next(queue, None)
+                        if nxt is not None:
+                            in_flight[pool.submit(_tag, nxt)] = nxt
+    finally:
+        if cache is not None:
+            cache.put_many(pending_cache, model=model)
     return chunks, stats
 
 
@@ -0,0 +1,67 @@
+"""Unit tests for the single-pass alias matcher and the NPC tagger built on it."""
+import unittest
+
+from ingestion.alias_matcher import AliasMatcher, compile_alias_pattern
+from ingestion.npc_tagging import AliasPattern, build_alias_matcher, scan_text_for_npcs
+
+
+def _matcher(*aliases: str, case_sensitive: bool = False) -> AliasMatcher:
+    return AliasMatcher((a, compile_alias_pattern(a, case_sensitive)) for a in aliases)
+
+
+def _npc(npc_id: str, alias: str, ambiguous: bool = False) -> AliasPattern:
+    return AliasPattern(
+        npc_id=npc_id,
+        alias=alias,
+        alias_key=alias.lower(),
+        pattern=compile_alias_pattern(alias),
+        is_ambiguous=ambiguous,
+    )
+
+
+class TestAliasMatcher(unittest.TestCase):
+    """AliasMatcher.matches must agree with searching every pattern."""
+
+    def test_matches_same_as_per_pattern_search(self) -> None:
+        aliases = ["Luke", "Luke Skywalker", "Master Skywalker", "R2-D2", "Obi-Wan", "'Bones'", "Lu"]
+        matcher = _matcher(*aliases)
+        texts = [
+            "Luke   Skywalker met R2-D2.",
+            "The water was lukewarm; obi-wan smiled.",
+            "They called him 'Bones' after that.",
+            "MASTER\nSKYWALKER arrived",
+            "",
+        ]
+        for text in texts:
+            expected = [i for i, p in enumerate(matcher.patterns) if p.search(text)]
+            self.assertEqual(matcher.matches(text), expected, text)
+
+    def test_word_boundaries_and_case_sensitivity(self) -> None:
+        self.assertEqual(_matcher("Luke").matches("Lukewarm tea"), [])
+        self.assertEqual(_matcher("Han", case_sensitive=True).matches("han said"), [])
+        self.assertEqual(_matcher("Han", case_sensitive=True).matches("Han said"), [0])
+
+
+class TestScanTextForNpcs(unittest.TestCase):
+    """scan_text_for_npcs keeps pattern order, dedup and collision counting."""
+
+    def test_order_dedup_and_collisions(self) -> None:
+        patterns = [
+            _npc("npc_vader", "Darth Vader"),
+            _npc("npc_vader", "Vader"),
+            _npc("npc_guard_a", "The Guard", ambiguous=True),
+            _npc("npc_guard_b", "The Guard", ambiguous=True),
+            _npc("npc_mon", "Mon Mothma"),
+        ]
+        text = "Mon Mothma watched the guard salute. Darth Vader entered."
+        related, collisions = scan_text_for_npcs(text, patterns, build_alias_matcher(patterns))
+        self.assertEqual(related, ["npc_vader", "npc_mon"])
+        self.assertEqual(
+            collisions,
+            {"the guard": {"alias": "The Guard", "npc_ids": ["npc_guard_a", "npc_guard_b"], "count": 2}},
+        )
+        self.assertEqual(scan_text_for_npcs(text, patterns), (related, collisions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Tests for the LanceDB index builder behind ``storyteller index``."""
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+lancedb = pytest.importorskip("lancedb")
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+lance_index = pytest.importorskip("ingestion.lance_index")
+build_indexes = lance_index.build_indexes
+index_status = lance_index.index_status
+
+_DIM = 32
+
+
+@pytest.fixture
+def tmp_dir() -> Path:
+    """Replacement for pytest's tmp_path in restricted environments."""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp)
+
+
+def _rows(n: int, start: int = 0) -> pa.Table:
+    rng = np.random.default_rng(start)
+    vectors = rng.standard_normal((n, _DIM)).astype("float32")
+    return pa.table({
+        "id": [f"c{start + i}" for i in range(n)],
+        "vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), _DIM),
+        "text": [f"chunk {start + i}" for i in range(n)],
+        "era": [("rebellion", "legacy")[i % 2] for i in range(n)],
+        "doc_type": ["novel"] * n,
+    })
+
+
+def test_build_then_append_then_refresh(tmp_dir):
+    table = lancedb.connect(str(tmp_dir / "db")).create_table("lore_chunks", _rows(600))
+
+    before = index_status(table, min_rows=256)
+    assert before.indexes == [] and not before.fresh
+    assert before.missing == ["vector", "era", "doc_type", "text"]
+
+    built = build_indexes(table, min_rows=256)
+    assert built.built == ["vector", "era", "doc_type", "text"]
+    assert built.fresh and built.rows == 600
+    assert {tuple(i.columns) for i in built.indexes} == {("vector",), ("era",), ("doc_type",), ("text",)}
+
+    table.add(_rows(50, start=600))
+    stale = index_status(table, min_rows=256)
+    assert not stale.fresh
+    assert all(i.unindexed_rows == 50 for i in stale.indexes)
+
+    refreshed = build_indexes(table, min_rows=256)
+    assert refreshed.built == [] and refreshed.optimized
+    assert refreshed.fresh and refreshed.rows == 650
+
+
+def test_small_tables_only_get_scalar_indexes(tmp_dir):
+    table = lancedb.connect(str(tmp_dir / "db")).create_table("lore_chunks", _rows(100))
+    report = build_indexes(table, min_rows=10_000)
+    assert report.built == ["era", "doc_type", "text"]
+    assert report.fresh
+
+
+def test_indexed_search_respects_filters(tmp_dir):
+    from backend.app.rag.vector_store import LanceDBStore
+
+    db = tmp_dir / "db"
+    table = lancedb.connect(str(db)).create_table("lore_chunks", _rows(600))
+    build_indexes(table, min_rows=256)
+    store = LanceDBStore(db, "lore_chunks", nprobes=2, refine_factor=2)
+    query = _rows(1, start=3).column("vector")[0].as_py()
+    rows = store.search_multi_where(query, top_k=5, where_clauses=["era = 'legacy'", "doc_type = 'novel'"])
+    assert len(rows) == 5
+    assert {r["era"] for r in rows} == {"legacy"}
+
+
+def test_unknown_index_type_is_rejected(tmp_dir):
+    table = lancedb.connect(str(tmp_dir / "db")).create_table("lore_chunks", _rows(10))
+    with pytest.raises(ValueError, match="Unsupported vector index type"):
+        build_indexes(table, index_type="DISKANN")
+
+
+def test_migrate_list_columns_backfills_and_indexes(tmp_dir):
+    import json
+
+    from ingestion.store import migrate_list_columns
+
+    legacy = _rows(300).append_column(
+        "related_npcs_json", pa.array([json.dumps([f"npc_{i % 7}"]) if i % 3 else "[]" for i in range(300)]),
+    )
+    table = lancedb.connect(str(tmp_dir / "db")).create_table("lore_chunks", legacy)
+
+    assert migrate_list_columns(table, dry_run=True)["added_columns"] == ["related_npcs"]
+    assert "related_npcs" not in table.schema.names
+
+    result = migrate_list_columns(table, batch_size=128)
+    assert result == {
+        "added_columns": ["related_npcs"], "backfilled_columns": ["related_npcs"],
+        "rows_updated": 300, "rows_skipped": 0,
+    }
+    expected = sum(1 for i in range(300) if i % 3 and i % 7 in (2, 5))
+    assert table.count_rows("array_has_any(related_npcs, ['npc_2', 'npc_5'])") == expected
+    assert table.count_rows("array_has_any(related_npcs, ['npc_2', 'npc_5'])") == table.count_rows(
+        "related_npcs_json LIKE '%\"npc_2\"%' OR related_npcs_json LIKE '%\"npc_5\"%'"
+    )
+
+    report = build_indexes(table, min_rows=10_000)
+    assert "related_npcs" in report.built
+    assert any(i.columns == ["related_npcs"] and i.index_type.upper() == "LABEL_LIST" for i in report.indexes)
+    assert migrate_list_columns(table)["backfilled_columns"] == []
+
+
+def test_migrate_list_columns_finishes_interrupted_backfill(tmp_dir):
+    import json
+
+    from ingestion.store import migrate_list_columns
+
+    legacy = _rows(50).append_column(
+        "related_npcs_json", pa.array([json.dumps([f"npc_{i % 5}"]) for i in range(50)]),
+    )
+    table = lancedb.connect(str(tmp_dir / "db")).create_table("lore_chunks", legacy)
+    # A previous run stopped after add_columns, before the merge_insert backfill
+    table.add_columns([pa.field("related_npcs", pa.list_(pa.string()))])
+
+    result = migrate_list_columns(table)
+    assert result["added_columns"] == [] and result["backfilled_columns"] == ["related_npcs"]
+    assert result["rows_updated"] == 50
+    assert table.count_rows("related_npcs IS NULL") == 0
+    assert table.count_rows("array_has_any(related_npcs, ['npc_1'])") == 10
@@ -0,0 +1,102 @@
+"""Tests for the pipelined lore ingestion engine (parse pool -> embed workers -> single writer)."""
+from __future__ import annotations
+
+import functools
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from ingestion.ingest_lore import _to_canonical_chunks, ingest_file
+from ingestion.lore_pipeline import run_lore_pipeline
+from ingestion.store import LanceStore
+
+# Use dummy embeddings for tests (fast, no model download); read at encode time
+os.environ["STORYTELLER_DUMMY_EMBEDDINGS"] = "1"
+
+_META = {"time_period": "rebellion", "era": "rebellion", "setting_id": "star_wars_legends", "period_id": "rebellion"}
+
+
+@pytest.fixture
+def tmp_dir() -> Path:
+    """Replacement for pytest's tmp_path in restricted environments."""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp)
+
+
+def _library(root: Path) -> list[Path]:
+    lore = root / "lore"
+    lore.mkdir()
+    paths = []
+    for i in range(3):
+        p = lore / f"novel_{i}.txt"
+        body = " ".join(f"Chapter {i} word{j} on Tatooine near the Empire garrison." for j in range(400))
+        p.write_text(f"# Book {i}\n\n{body}", encoding="utf-8")
+        paths.append(p)
+    return paths
+
+
+def _parse(root: Path):
+    return functools.partial(ingest_file, meta=_META, input_dir=root / "lore")
+
+
+def _ids(store: LanceStore) -> list[str]:
+    return sorted(store.table.to_arrow().column("id").to_pylist())
+
+
+def test_parallel_run_matches_serial_run(tmp_dir):
+    paths = _library(tmp_dir)
+    serial = LanceStore(str(tmp_dir / "serial"))
+    parallel = LanceStore(str(tmp_dir / "parallel"))
+
+    r1 = run_lore_pipeline(paths, _parse(tmp_dir), _to_canonical_chunks, lambda: serial, workers=1)
+    r2 = run_lore_pipeline(
+        paths, _parse(tmp_dir), _to_canonical_chunks, lambda: parallel,
+        workers=2, embed_workers=2, embed_batch_size=5, write_batch_size=7,
+    )
+
+    assert r1.files_parsed == r2.files_parsed == 3
+    assert r1.chunks == r2.chunks == r1.added == r2.added == r2.embedded > 0
+    assert _ids(serial) == _ids(parallel)
+
+
+def test_rerun_skips_existing_chunks(tmp_dir):
+    paths = _library(tmp_dir)
+    store = LanceStore(str(tmp_dir / "db"))
+    first = run_lore_pipeline(paths, _parse(tmp_dir), _to_canonical_chunks, lambda: store, workers=1)
+    again = run_lore_pipeline(paths, _parse(tmp_dir), _to_canonical_chunks, lambda: store, workers=1)
+    assert again.added == 0
+    assert again.skipped == first.chunks
+    assert len(_ids(store)) == first.added
+
+
+def test_file_failures_are_counted_and_others_still_ingested(tmp_dir):
+    paths = _library(tmp_dir)
+    parse = _parse(tmp_dir)
+
+    def _flaky(path: Path):
+        if path.name == "novel_1.txt":
+            raise ValueError("corrupt file")
+        return parse(path)
+
+    store = LanceStore(str(tmp_dir / "db"))
+    result = run_lore_pipeline(paths, _flaky, _to_canonical_chunks, lambda: store, workers=1)
+    assert result.file_failures == 1
+    assert result.files_parsed == 2
+    assert result.added == result.chunks > 0
+
+
+def test_embedding_failure_aborts_run(tmp_dir):
+    paths = _library(tmp_dir)
+
+    def _broken(texts):
+        raise RuntimeError("encoder crashed")
+
+    store = LanceStore(str(tmp_dir / "db"))
+    with pytest.raises(RuntimeError, match="encoder crashed"):
+        run_lore_pipeline(
+            paths, _parse(tmp_dir), _to_canonical_chunks, lambda: store,
+            workers=1, embed_batch_size=4, embed=_broken,
+        )
+    assert _ids(store) == []
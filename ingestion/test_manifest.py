@@ -10,7 +10,7 @@ _root = Path(__file__).resolve().parents[1]
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from ingestion.manifest import write_run_manifest
+from ingestion.manifest import _write_last_ingest, table_versions, write_run_manifest
 
 
 class TestIngestionManifest(unittest.TestCase):
@@ -56,3 +56,38 @@ class TestIngestionManifest(unittest.TestCase):
                     os.environ.pop("MANIFESTS_DIR", None)
                 else:
                     os.environ["MANIFESTS_DIR"] = old_env
+
+    def test_table_versions_track_latest_run_per_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self.assertEqual(table_versions(root), {})
+            for table, run_id in (("lore_chunks", "run-a"), ("style_chunks", "run-b")):
+                _write_last_ingest(
+                    db_path="./data/lancedb",
+                    manifest_path=root / f"{run_id}.json",
+                    tagger_enabled=False,
+                    tagger_model="",
+                    root=root,
+                    output_table=table,
+                    run_id=run_id,
+                )
+            versions = table_versions(root)
+            self.assertEqual(versions["lore_chunks"], "run-a")
+            self.assertEqual(versions["style_chunks"], "run-b")
+            self.assertEqual(versions[""], str(root / "run-b.json"))
+
+            _write_last_ingest(
+                db_path="./data/lancedb",
+                manifest_path=root / "run-c.json",
+                tagger_enabled=False,
+                tagger_model="",
+                root=root,
+                output_table="lore_chunks",
+                run_id="run-c",
+            )
+            path = root / "data" / "last_ingest.json"
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            versions = table_versions(root)
+            self.assertEqual(versions["lore_chunks"], "run-c")
+            self.assertEqual(versions["style_chunks"], "run-b")
@@ -1,5 +1,9 @@
 """Unit tests for ingestion tagger schema parsing."""
+import shutil
 import sys
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 
@@ -7,7 +11,7 @@ _root = Path(__file__).resolve().parents[1]
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from ingestion.tagger import apply_tagger_to_chunks, tag_chunk
+from ingestion.tagger import TaggerCache, apply_tagger_to_chunks, tag_chunk
 
 
 class _DummyLLM:
@@ -24,6 +28,35 @@ class _DummyLLM:
         )
 
 
+class _CountingLLM(_DummyLLM):
+    """Thread-safe call counter that tracks the most requests seen in flight at once."""
+
+    def __init__(self, fail_on: str = "") -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def complete(self, system_prompt: str, user_prompt: str, json_mode: bool = False) -> str:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            if self.fail_on and self.fail_on in user_prompt:
+                return "not json"
+            return super().complete(system_prompt, user_prompt, json_mode)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _chunks(n: int) -> list[dict]:
+    return [{"text": f"Chunk {i} about Tatooine.", "metadata": {"era": "LOTF"}} for i in range(n)]
+
+
 class TestIngestionTagger(unittest.TestCase):
     def test_tagger_schema_parses(self) -> None:
         result = tag_chunk("Luke walks into Mos Eisley.", llm=_DummyLLM())
@@ -47,3 +80,38 @@ class TestIngestionTagger(unittest.TestCase):
         self.assertEqual(meta.get("doc_type"), "sourcebook")
         self.assertIn("entities_json", meta)
         self.assertEqual(meta.get("summary_1s"), "A short summary.")
+
+
+class TestTaggerConcurrencyAndCache(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.cache = TaggerCache(tmp / "tagger_cache.sqlite")
+        self.addCleanup(self.cache.close)
+
+    def test_bounded_concurrency_tags_every_chunk(self) -> None:
+        llm = _CountingLLM()
+        chunks, stats = apply_tagger_to_chunks(_chunks(12), enabled=True, llm=llm, concurrency=3)
+        self.assertEqual(stats["tagged"], 12)
+        self.assertEqual(llm.calls, 12)
+        self.assertLessEqual(llm.max_in_flight, 3)
+        self.assertTrue(all(c["metadata"].get("doc_type") == "sourcebook" for c in chunks))
+
+    def test_rerun_is_served_from_cache(self) -> None:
+        first = _CountingLLM(fail_on="Chunk 2 ")
+        _chunks1, stats1 = apply_tagger_to_chunks(_chunks(5), enabled=True, llm=first, cache=self.cache, concurrency=2)
+        self.assertEqual((stats1["tagged"], stats1["failed"]), (4, 1))
+        self.assertEqual(len(self.cache), 4)  # failures are not cached
+
+        again = _CountingLLM()
+        chunks, stats2 = apply_tagger_to_chunks(_chunks(5), enabled=True, llm=again, cache=self.cache, concurrency=2)
+        self.assertEqual((stats2["tagged"], stats2["cached"]), (5, 4))
+        self.assertEqual(again.calls, 1)  # only the chunk that failed before
+        self.assertEqual(chunks[0]["metadata"].get("summary_1s"), "A short summary.")
+
+    def test_changed_hints_miss_the_cache(self) -> None:
+        apply_tagger_to_chunks(_chunks(1), enabled=True, llm=_CountingLLM(), cache=self.cache)
+        other_era = [{"text": "Chunk 0 about Tatooine.", "metadata": {"era": "REBELLION"}}]
+        llm = _CountingLLM()
+        _chunks_out, stats = apply_tagger_to_chunks(other_era, enabled=True, llm=llm, cache=self.cache)
+        self.assertEqual((stats["cached"], llm.calls), (0, 1))
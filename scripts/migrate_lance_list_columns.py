@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Add native characters / related_npcs list columns to an existing lore table.
+
+Older tables store these only as JSON strings (characters_json, related_npcs_json),
+so retrieve_lore can only filter them with a LIKE substring scan. This adds the
+list<string> columns, backfills them from the JSON (matched on id; vectors are not
+rewritten), then builds the label-list indexes used by array_has_any filters.
+Safe to re-run: only rows whose list columns are still null are backfilled, so a
+run interrupted after the columns were added is finished by the next one.
+
+Usage:
+  python scripts/migrate_lance_list_columns.py [--db ./data/lancedb] [--table lore_chunks] [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Backfill native list columns (characters, related_npcs) and their label-list indexes."
+    )
+    ap.add_argument("--db", type=str, default=None, help="LanceDB path (default: VECTORDB_PATH or ./data/lancedb)")
+    ap.add_argument("--table", type=str, default="lore_chunks", help="Table name (default: lore_chunks)")
+    ap.add_argument("--dry-run", action="store_true", help="Report which columns would be added; change nothing")
+    ap.add_argument("--no-index", action="store_true", help="Skip the index build after backfilling")
+    args = ap.parse_args()
+
+    db_path = Path(args.db or os.environ.get("VECTORDB_PATH", "./data/lancedb"))
+    if not db_path.exists():
+        logger.error("DB path does not exist: %s", db_path)
+        return 1
+
+    from ingestion.lance_index import build_indexes, open_lance_table
+    from ingestion.store import migrate_list_columns
+
+    try:
+        table = open_lance_table(db_path, args.table)
+    except Exception as e:
+        logger.error("Could not open table %s in %s: %s", args.table, db_path, e)
+        return 1
+
+    result = migrate_list_columns(table, dry_run=args.dry_run)
+    if not result["backfilled_columns"]:
+        logger.info("Table %s already has backfilled native list columns", args.table)
+    elif args.dry_run:
+        logger.info("Would backfill: %s", ", ".join(result["backfilled_columns"]))
+        return 0
+    else:
+        logger.info(
+            "Added %s; backfilled %s on %d rows (%d rows without id skipped)",
+            ", ".join(result["added_columns"]) or "no columns", ", ".join(result["backfilled_columns"]),
+            result["rows_updated"], result["rows_skipped"],
+        )
+
+    if not args.no_index and not args.dry_run:
+        report = build_indexes(table)
+        if report.built:
+            logger.info("Built indexes: %s", ", ".join(report.built))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,13 @@ EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "sentence-transformers/all-M
 _emb_dim = os.environ.get("EMBEDDING_DIMENSION", "").strip()
 EMBEDDING_DIMENSION = int(_emb_dim) if _emb_dim else 384
 
+# Encoder backend (shared/embedding_backend.py): "torch" (full-precision SentenceTransformer)
+# or "onnx-int8" (dynamically quantized ONNX export from `storyteller embed-export`;
+# falls back to torch when the export or onnxruntime is missing).
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch").strip().lower() or "torch"
+# Quantization target: avx2 (any x86-64 CPU), avx512, avx512_vnni, arm64.
+EMBEDDING_ONNX_QUANTIZATION = os.environ.get("EMBEDDING_ONNX_QUANTIZATION", "avx2").strip().lower() or "avx2"
+
 # Project root: resolve relative to this file's location
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
@@ -30,6 +37,8 @@ STYLE_DATA_DIR = os.environ.get("STYLE_DATA_DIR", str(style_dir()))
 LORE_DATA_DIR = os.environ.get("LORE_DATA_DIR", str(lore_dir()))
 MANIFESTS_DIR = os.environ.get("MANIFESTS_DIR", str(manifests_dir()))
 ERA_PACK_DIR = os.environ.get("ERA_PACK_DIR", str(_PROJECT_ROOT / "data" / "static" / "era_packs"))
+# Exported ONNX encoders, one subdirectory per model.
+EMBEDDING_ONNX_DIR = os.environ.get("EMBEDDING_ONNX_DIR", str(_PROJECT_ROOT / "data" / "models" / "onnx"))
 
 # Feature flags (shared)
 # Era pack validation: lenient mode logs warnings instead of failing on missing references
@@ -0,0 +1,172 @@
+"""Encoder backend selection: full-precision PyTorch or int8-quantized ONNX.
+
+Both retrieval (backend/app/rag/_cache.py) and ingestion (ingestion/embedding.py)
+construct their SentenceTransformer through ``load_sentence_transformer`` so the
+EMBEDDING_BACKEND setting applies to query and document vectors alike; mixing
+backends between ingest and query only costs the (small) quantization error.
+
+``onnx-int8`` runs a dynamically quantized ONNX export of EMBEDDING_MODEL on
+onnxruntime. Create it once with ``storyteller embed-export``, which also checks
+cosine agreement against the reference model. Requires sentence-transformers>=3.2
+with the ONNX extra (``pip install "sentence-transformers[onnx]"``). When the export
+or onnxruntime is missing the loader logs a warning and uses the PyTorch model.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx-int8")
+QUANTIZATION_TARGETS = ("avx2", "avx512", "avx512_vnni", "arm64")
+
+
+def onnx_model_dir(model_name: str, root: str | Path | None = None) -> Path:
+    """Directory holding the ONNX export of model_name (one subdirectory per model)."""
+    if root is None:
+        from shared.config import EMBEDDING_ONNX_DIR
+        root = EMBEDDING_ONNX_DIR
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "__", model_name.strip()).strip("_") or "model"
+    return Path(root) / slug
+
+
+def quantized_file_name(quantization: str) -> str:
+    """Path of the int8 model inside the export directory (as passed to ``model_kwargs``)."""
+    return f"onnx/model_int8_{quantization}.onnx"
+
+
+def find_quantized_export(model_name: str, quantization: str | None = None, root: str | Path | None = None) -> Path | None:
+    """Return the export directory if it contains the quantized model, else None."""
+    if quantization is None:
+        from shared.config import EMBEDDING_ONNX_QUANTIZATION
+        quantization = EMBEDDING_ONNX_QUANTIZATION
+    export_dir = onnx_model_dir(model_name, root)
+    if (export_dir / quantized_file_name(quantization)).is_file():
+        return export_dir
+    return None
+
+
+def load_sentence_transformer(model_name: str, backend: str | None = None) -> Any:
+    """Construct the encoder for model_name on the configured backend.
+
+    Raises ImportError when sentence-transformers itself is not installed; every
+    ONNX-specific failure falls back to the PyTorch model with a warning.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend is None:
+        from shared.config import EMBEDDING_BACKEND
+        backend = EMBEDDING_BACKEND
+    if backend == "onnx-int8":
+        encoder = _load_onnx_int8(SentenceTransformer, model_name)
+        if encoder is not None:
+            return encoder
+    elif backend != "torch":
+        logger.warning("Unknown EMBEDDING_BACKEND %r (expected one of %s); using torch", backend, ", ".join(BACKENDS))
+    return SentenceTransformer(model_name)
+
+
+def _load_onnx_int8(sentence_transformer_cls: Any, model_name: str) -> Any | None:
+    from shared.config import EMBEDDING_ONNX_QUANTIZATION
+
+    export_dir = find_quantized_export(model_name, EMBEDDING_ONNX_QUANTIZATION)
+    if export_dir is None:
+        logger.warning(
+            "EMBEDDING_BACKEND=onnx-int8 but no %s export of %s in %s; using torch. "
+            "Run: storyteller embed-export",
+            EMBEDDING_ONNX_QUANTIZATION, model_name, onnx_model_dir(model_name).parent,
+        )
+        return None
+    try:
+        encoder = sentence_transformer_cls(
+            str(export_dir),
+            backend="onnx",
+            model_kwargs={"file_name": quantized_file_name(EMBEDDING_ONNX_QUANTIZATION)},
+        )
+    except (ImportError, TypeError, ValueError, OSError) as e:
+        # TypeError: sentence-transformers < 3.2 has no ``backend`` argument.
+        logger.warning("Could not load int8 ONNX encoder from %s (%s); using torch", export_dir, e)
+        return None
+    logger.info("Loaded int8 ONNX encoder for %s from %s", model_name, export_dir)
+    return encoder
+
+
+def export_quantized_onnx(
+    model_name: str,
+    quantization: str = "avx2",
+    root: str | Path | None = None,
+) -> Path:
+    """Export model_name to ONNX and write its int8 dynamic quantization; returns the export dir."""
+    if quantization not in QUANTIZATION_TARGETS:
+        raise ValueError(f"quantization must be one of {', '.join(QUANTIZATION_TARGETS)}, got {quantization!r}")
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    out_dir = onnx_model_dir(model_name, root)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save_pretrained(str(out_dir))
+    export_dynamic_quantized_onnx_model(model, quantization, str(out_dir), file_suffix=f"int8_{quantization}")
+    return out_dir
+
+
+def cosine_agreement(reference: Any, candidate: Any) -> dict[str, float]:
+    """Row-wise cosine similarity between two (N, dim) embedding matrices: mean, min and 5th percentile."""
+    import numpy as np
+
+    ref = np.asarray(reference, dtype="float32")
+    cand = np.asarray(candidate, dtype="float32")
+    if ref.shape != cand.shape:
+        raise ValueError(f"embedding shapes differ: {ref.shape} vs {cand.shape}")
+    if ref.size == 0:
+        return {"mean": 0.0, "min": 0.0, "p5": 0.0}
+    denom = np.linalg.norm(ref, axis=1) * np.linalg.norm(cand, axis=1)
+    cos = np.sum(ref * cand, axis=1) / np.maximum(denom, 1e-12)
+    return {
+        "mean": round(float(cos.mean()), 5),
+        "min": round(float(cos.min()), 5),
+        "p5": round(float(np.percentile(cos, 5)), 5),
+    }
+
+
+def verify_quantized(
+    model_name: str,
+    texts: Sequence[str],
+    quantization: str = "avx2",
+    root: str | Path | None = None,
+    batch_size: int = 32,
+) -> dict[str, Any]:
+    """Encode texts with the reference and int8 ONNX models; report agreement and throughput."""
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = find_quantized_export(model_name, quantization, root)
+    if export_dir is None:
+        raise FileNotFoundError(f"No {quantization} int8 export of {model_name} under {onnx_model_dir(model_name, root)}")
+    texts = list(texts)
+    reference = SentenceTransformer(model_name)
+    quantized = SentenceTransformer(
+        str(export_dir), backend="onnx", model_kwargs={"file_name": quantized_file_name(quantization)},
+    )
+
+    def _timed(model: Any) -> tuple[Any, float]:
+        model.encode(texts[:batch_size], batch_size=batch_size, show_progress_bar=False)  # warm-up
+        start = time.perf_counter()
+        vectors = model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+        elapsed = time.perf_counter() - start
+        return vectors, (len(texts) / elapsed if elapsed > 0 else 0.0)
+
+    ref_vecs, ref_rate = _timed(reference)
+    q_vecs, q_rate = _timed(quantized)
+    return {
+        "model": model_name,
+        "quantization": quantization,
+        "export_dir": str(export_dir),
+        "texts": len(texts),
+        "cosine": cosine_agreement(ref_vecs, q_vecs),
+        "torch_texts_per_sec": round(ref_rate, 1),
+        "onnx_int8_texts_per_sec": round(q_rate, 1),
+        "speedup": round(q_rate / ref_rate, 2) if ref_rate else 0.0,
+    }
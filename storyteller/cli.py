@@ -17,7 +17,7 @@ def main(argv: list[str] | None = None) -> None:
     sub = parser.add_subparsers(dest="command")
 
     # Import and register each command
-    from storyteller.commands import doctor, setup, dev, ingest, query, extract_knowledge, organize_ingest, models, style_audit, build_style_pack, generate_era_content
+    from storyteller.commands import doctor, setup, dev, ingest, query, extract_knowledge, organize_ingest, models, style_audit, build_style_pack, generate_era_content, index, embed_server, embed_export, precompute_context
 
     doctor.register(sub)
     setup.register(sub)
@@ -30,6 +30,10 @@ def main(argv: list[str] | None = None) -> None:
     style_audit.register(sub)
     build_style_pack.register(sub)
     generate_era_content.register(sub)
+    index.register(sub)
+    embed_server.register(sub)
+    embed_export.register(sub)
+    precompute_context.register(sub)
 
     args = parser.parse_args(argv)
 
@@ -0,0 +1,96 @@
+"""``storyteller embed-export`` — export the int8 ONNX encoder and verify it.
+
+Exports EMBEDDING_MODEL to ONNX, writes an int8 dynamically quantized copy under
+EMBEDDING_ONNX_DIR, then encodes a sample of lore chunks with both models and
+reports cosine agreement and throughput. Exits non-zero when the lowest agreement
+(5th percentile) is below ``--min-cosine``. Enable the result with
+EMBEDDING_BACKEND=onnx-int8.
+"""
+from __future__ import annotations
+
+import json
+import random
+
+
+def register(subparsers) -> None:
+    p = subparsers.add_parser("embed-export", help="Export and verify the int8 ONNX embedding encoder")
+    p.add_argument("--model", type=str, default=None, help="Embedding model (default: EMBEDDING_MODEL)")
+    p.add_argument(
+        "--quantization", choices=["avx2", "avx512", "avx512_vnni", "arm64"], default=None,
+        help="Quantization target (default: EMBEDDING_ONNX_QUANTIZATION or avx2)",
+    )
+    p.add_argument("--db", type=str, default=None, help="LanceDB path to sample lore chunks from (default: auto-detect)")
+    p.add_argument("--table", type=str, default=None, help="Table name (default: LORE_TABLE_NAME or lore_chunks)")
+    p.add_argument("--sample", type=int, default=200, help="Lore chunks to compare (default: 200)")
+    p.add_argument("--min-cosine", type=float, default=0.98, help="Fail below this 5th-percentile cosine (default: 0.98)")
+    p.add_argument("--verify-only", action="store_true", help="Skip the export; verify an existing one")
+    p.add_argument("--json", action="store_true", help="Print the verification report as JSON")
+    p.set_defaults(func=run)
+
+
+def _sample_lore_texts(db_path, table_name: str, n: int) -> list[str]:
+    from ingestion.lance_index import open_lance_table
+
+    table = open_lance_table(db_path, table_name)
+    texts = [t for t in table.search().select(["text"]).limit(None).to_arrow().column("text").to_pylist() if t]
+    if len(texts) > n:
+        texts = random.Random(0).sample(texts, n)
+    return texts
+
+
+def run(args) -> int:
+    from backend.app.config import EMBEDDING_MODEL, LORE_TABLE_NAME, resolve_vectordb_path
+    from shared.config import EMBEDDING_ONNX_QUANTIZATION
+    from shared.embedding_backend import export_quantized_onnx, verify_quantized
+
+    model = args.model or EMBEDDING_MODEL
+    quantization = args.quantization or EMBEDDING_ONNX_QUANTIZATION
+    db_path = resolve_vectordb_path(args.db)
+    table_name = args.table or LORE_TABLE_NAME
+    if not db_path.exists():
+        print(f"  ERROR: LanceDB not found at {db_path}; lore chunks are needed to verify the export")
+        print("         Run ingestion first: storyteller ingest --input ./data/lore")
+        return 1
+    try:
+        texts = _sample_lore_texts(db_path, table_name, max(1, args.sample))
+    except Exception as e:
+        print(f"  ERROR: Could not read lore chunks from {table_name!r} in {db_path}: {e}")
+        return 1
+    if not texts:
+        print(f"  ERROR: Table {table_name!r} has no lore text to verify against")
+        return 1
+
+    if not args.verify_only:
+        print(f"\n  Exporting {model} to ONNX ({quantization} int8) ...")
+        try:
+            out_dir = export_quantized_onnx(model, quantization)
+        except ImportError as e:
+            print(f"  ERROR: {e}")
+            print('         Install the ONNX extra: pip install "sentence-transformers[onnx]>=3.2"')
+            return 1
+        except Exception as e:
+            print(f"  ERROR: Export failed: {e}")
+            return 1
+        print(f"  Wrote {out_dir}")
+
+    try:
+        report = verify_quantized(model, texts, quantization)
+    except Exception as e:
+        print(f"  ERROR: Verification failed: {e}")
+        return 1
+    ok = report["cosine"]["p5"] >= args.min_cosine
+
+    if args.json:
+        print(json.dumps({**report, "min_cosine": args.min_cosine, "ok": ok}, indent=2))
+    else:
+        cos = report["cosine"]
+        print(f"\n  Compared {report['texts']} lore chunks against {model}")
+        print(f"  Cosine agreement: mean {cos['mean']:.4f}  p5 {cos['p5']:.4f}  min {cos['min']:.4f}")
+        print(f"  Throughput: torch {report['torch_texts_per_sec']}/s, "
+              f"onnx-int8 {report['onnx_int8_texts_per_sec']}/s ({report['speedup']}x)")
+        if ok:
+            print("  OK — enable with EMBEDDING_BACKEND=onnx-int8")
+        else:
+            print(f"  FAIL — p5 cosine below {args.min_cosine}; keep EMBEDDING_BACKEND=torch "
+                  "or try another --quantization")
+    return 0 if ok else 1
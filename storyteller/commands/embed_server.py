@@ -0,0 +1,79 @@
+"""``storyteller embed-server`` — one shared embedding model for all backend workers.
+
+Start it once, then point every worker at it with STORYTELLER_EMBEDDING_SERVER
+(the same address). Workers encode through it and only load their own model if it
+is unreachable. ``--status`` checks a running server.
+"""
+from __future__ import annotations
+
+import json
+import os
+import signal
+import sys
+
+
+def _default_address() -> str:
+    if sys.platform == "win32":
+        return "127.0.0.1:7799"
+    return "unix:./data/embedding.sock"
+
+
+def register(subparsers) -> None:
+    p = subparsers.add_parser("embed-server", help="Run the shared embedding server for multi-worker deployments")
+    p.add_argument(
+        "--address", type=str, default=None,
+        help="unix:/path/to.sock or host:port (default: STORYTELLER_EMBEDDING_SERVER or "
+             f"{_default_address()})",
+    )
+    p.add_argument("--model", type=str, default=None, help="Embedding model (default: EMBEDDING_MODEL)")
+    p.add_argument(
+        "--batch-window-ms", type=float, default=None,
+        help="Coalesce requests arriving within this window (default: STORYTELLER_EMBEDDING_SERVER_BATCH_WINDOW_MS or 5)",
+    )
+    p.add_argument("--max-batch", type=int, default=None, help="Texts per encoder call (default: 64)")
+    p.add_argument("--status", action="store_true", help="Query a running server and print its stats")
+    p.set_defaults(func=run)
+
+
+def run(args) -> int:
+    from backend.app.config import EMBEDDING_MODEL, EMBEDDING_SERVER_ADDRESS
+    from backend.app.rag.embedding_server import EmbeddingServer, EmbeddingServerClient
+
+    address = args.address or EMBEDDING_SERVER_ADDRESS or _default_address()
+
+    if args.status:
+        client = EmbeddingServerClient(address, timeout=5.0)
+        try:
+            print(json.dumps(client.health(), indent=2))
+        except Exception as e:
+            print(f"  ERROR: No embedding server at {address}: {e}")
+            return 1
+        finally:
+            client.close()
+        return 0
+
+    model = args.model or EMBEDDING_MODEL
+    if address.startswith("unix:"):
+        os.makedirs(os.path.dirname(os.path.abspath(address[len("unix:"):])), exist_ok=True)
+    print(f"\n  Loading {model} ...")
+    try:
+        server = EmbeddingServer(
+            address, model, batch_window_ms=args.batch_window_ms, max_batch=args.max_batch,
+        )
+    except Exception as e:
+        print(f"  ERROR: Could not start embedding server on {address}: {e}")
+        return 1
+    print(f"  Embedding server listening on {address}")
+    print(f"  Point workers at it: STORYTELLER_EMBEDDING_SERVER={address}")
+
+    def _on_sigterm(_signum, _frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n  Shutting down embedding server")
+    finally:
+        server.close()
+    return 0
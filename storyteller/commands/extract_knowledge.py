@@ -2,7 +2,8 @@
 
 Reads parent chunks from LanceDB, extracts entities/relationships/summaries
 via local LLM, and stores results in the SQLite knowledge graph tables.
-Supports resume via checkpoints.
+Batches run concurrently through backend.app.kg.scheduler; supports resume via
+per-batch checkpoints.
 """
 from __future__ import annotations
 
@@ -24,12 +25,17 @@ def register(subparsers) -> None:
     )
     p.add_argument(
         "--resume", action="store_true",
-        help="Resume from last checkpoint (skip completed chapters)",
+        help="Resume from last checkpoint (skip completed chapters and batches)",
     )
     p.add_argument(
         "--batch-size", type=int, default=3,
         help="Parent chunks per LLM call (default: 3)",
     )
+    p.add_argument(
+        "--concurrency", type=int, default=None,
+        help="LLM batches in flight at once (default: STORYTELLER_KG_EXTRACTION_CONCURRENCY or 4; "
+        "set OLLAMA_NUM_PARALLEL to match)",
+    )
     p.add_argument(
         "--db", type=str, default="./data/storyteller.db",
         help="SQLite DB path for knowledge graph storage",
@@ -54,12 +60,15 @@ def run(args) -> int:
     from backend.app.kg.chunk_reader import read_parent_chunks_by_book, estimate_extraction_calls
     from backend.app.kg.store import KGStore
     from backend.app.kg.entity_resolution import build_alias_lookup
-    from backend.app.kg.extractor import extract_from_chunks, store_extraction_result
+    from backend.app.kg.scheduler import plan_batches, run_extraction
+    from backend.app.config import KG_EXTRACTION_CONCURRENCY
 
     era = args.era
+    concurrency = max(1, args.concurrency or KG_EXTRACTION_CONCURRENCY)
     print(f"\n  Knowledge Graph Extraction")
     print(f"  Era: {era}")
     print(f"  Batch size: {args.batch_size}")
+    print(f"  Concurrency: {concurrency}")
     print()
 
     # Load chunks from LanceDB
@@ -105,12 +114,6 @@ def run(args) -> int:
 
     # Phase 1: Per-chapter extraction
     print("\n  === Phase 1: Per-chapter extraction ===\n")
-    total_entities = 0
-    total_triples = 0
-    total_summaries = 0
-    books_processed = 0
-    chapters_processed = 0
-    chapters_skipped = 0
 
     try:
         from tqdm import tqdm
@@ -118,67 +121,34 @@ def run(args) -> int:
     except ImportError:
         has_tqdm = False
 
-    sorted_books = sorted(chunks_by_book.keys())
-    book_iter = tqdm(sorted_books, desc="Books", unit="book") if has_tqdm else sorted_books
-
-    for book_title in book_iter:
-        chapters = chunks_by_book[book_title]
-        sorted_chapters = sorted(chapters.keys())
-
-        for chapter_idx, chapter_title in enumerate(sorted_chapters):
-            # Check checkpoint
-            if args.resume:
-                status = kg_store.get_checkpoint_status(book_title, chapter_title)
-                if status == "completed":
-                    chapters_skipped += 1
-                    continue
-
-            chunks = chapters[chapter_title]
-            if not chunks:
-                continue
-
-            kg_store.set_checkpoint(book_title, "in_progress", chapter_title=chapter_title)
-
-            # Process in batches
-            for batch_start in range(0, len(chunks), args.batch_size):
-                batch = chunks[batch_start:batch_start + args.batch_size]
-                try:
-                    result = extract_from_chunks(
-                        batch, book_title, chapter_title, era,
-                        llm, alias_lookup, known_characters,
-                    )
-                    store_extraction_result(
-                        result, kg_store, book_title, chapter_title, era,
-                        chapter_index=chapter_idx,
-                        source_chunk_ids=[c.get("chunk_id", "") for c in batch],
-                    )
-                    total_entities += len(result.entities)
-                    total_triples += len(result.triples)
-                    if result.chapter_summary:
-                        total_summaries += 1
-                    for w in result.warnings:
-                        logger.warning("[%s/%s] %s", book_title[:30], chapter_title[:20], w)
-                except Exception:
-                    logger.exception("Extraction failed for %s / %s", book_title, chapter_title)
-                    kg_store.set_checkpoint(
-                        book_title, "failed", chapter_title=chapter_title,
-                        error="extraction exception",
-                    )
-                    continue
-
-            kg_store.set_checkpoint(book_title, "completed", chapter_title=chapter_title)
-            chapters_processed += 1
-
-        books_processed += 1
+    batches = plan_batches(chunks_by_book, args.batch_size)
+    bar = tqdm(total=len(batches), desc="Batches", unit="batch") if has_tqdm else None
+    try:
+        stats = run_extraction(
+            batches, kg_store, lambda: AgentLLM("kg_extractor"),
+            era=era,
+            alias_lookup=alias_lookup,
+            known_characters=known_characters,
+            concurrency=concurrency,
+            resume=args.resume,
+            on_batch=(lambda _b: bar.update(1)) if bar is not None else None,
+        )
+    finally:
+        if bar is not None:
+            bar.close()
 
     print(f"\n  Phase 1 complete:")
-    print(f"    Books processed: {books_processed}")
-    print(f"    Chapters processed: {chapters_processed}")
-    if chapters_skipped:
-        print(f"    Chapters skipped (resumed): {chapters_skipped}")
-    print(f"    Entities extracted: {total_entities}")
-    print(f"    Triples extracted: {total_triples}")
-    print(f"    Chapter summaries: {total_summaries}")
+    print(f"    Books processed: {stats.books}")
+    print(f"    Chapters processed: {stats.chapters_completed}")
+    if stats.chapters_skipped:
+        print(f"    Chapters skipped (resumed): {stats.chapters_skipped}")
+    if stats.batches_skipped:
+        print(f"    Batches skipped (resumed): {stats.batches_skipped}")
+    if stats.batches_failed:
+        print(f"    Batches failed: {stats.batches_failed} in {stats.chapters_failed} chapters (rerun with --resume)")
+    print(f"    Entities extracted: {stats.entities}")
+    print(f"    Triples extracted: {stats.triples}")
+    print(f"    Chapter summaries: {stats.summaries}")
     print(f"    Total KG entities: {kg_store.entity_count()}")
     print(f"    Total KG triples: {kg_store.triple_count()}")
 
@@ -0,0 +1,95 @@
+"""``storyteller index`` — build or inspect the LanceDB ANN and scalar indexes.
+
+Lore ingestion runs this automatically at the end of a run (``--no-index`` skips
+it); run it by hand after bulk imports, to retrain with ``--rebuild``, or with
+``--status`` to see whether recent appends are indexed yet. ``--export-flat``
+writes the memory-mapped NumPy copy used by STORYTELLER_VECTOR_STORE_BACKEND=flat
+(ingestion refreshes an existing export automatically).
+"""
+from __future__ import annotations
+
+import json
+
+
+def register(subparsers) -> None:
+    p = subparsers.add_parser("index", help="Build or inspect vector/scalar indexes on the lore table")
+    p.add_argument("--db", type=str, default=None, help="LanceDB path (default: auto-detect)")
+    p.add_argument("--table", type=str, default=None, help="Table name (default: LORE_TABLE_NAME or lore_chunks)")
+    p.add_argument("--status", action="store_true", help="Report index freshness without building anything")
+    p.add_argument("--rebuild", action="store_true", help="Retrain every index from scratch")
+    p.add_argument(
+        "--index-type", choices=["IVF_PQ", "IVF_HNSW_SQ"], default=None,
+        help="Vector index type (default: LANCE_VECTOR_INDEX_TYPE or IVF_PQ)",
+    )
+    p.add_argument(
+        "--min-rows", type=int, default=None,
+        help="Skip the vector index below this many rows (default: LANCE_VECTOR_INDEX_MIN_ROWS or 10000)",
+    )
+    p.add_argument(
+        "--export-flat", action="store_true",
+        help="Export the table to the flat NumPy store (for STORYTELLER_VECTOR_STORE_BACKEND=flat) instead of indexing",
+    )
+    p.add_argument("--json", action="store_true", help="Print the report as JSON")
+    p.set_defaults(func=run)
+
+
+def run(args) -> int:
+    from backend.app.config import LORE_TABLE_NAME, resolve_vectordb_path
+    from ingestion.lance_index import build_indexes, index_status, open_lance_table
+
+    db_path = resolve_vectordb_path(args.db)
+    table_name = args.table or LORE_TABLE_NAME
+    if not db_path.exists():
+        print(f"  ERROR: LanceDB not found at {db_path}")
+        print("         Run ingestion first: storyteller ingest --input ./data/lore")
+        return 1
+    try:
+        table = open_lance_table(db_path, table_name)
+    except Exception as e:
+        print(f"  ERROR: Could not open table {table_name!r} in {db_path}: {e}")
+        return 1
+
+    if args.export_flat:
+        from backend.app.rag.flat_store import export_flat_table, flat_table_dir
+        try:
+            meta = export_flat_table(db_path, table_name)
+        except Exception as e:
+            print(f"  ERROR: Flat export failed: {e}")
+            return 1
+        if args.json:
+            print(json.dumps(meta, indent=2))
+        else:
+            print(f"\n  Exported {table_name} ({meta['rows']} rows, {meta['dim']}d, "
+                  f"version {meta['source_version']}) to {flat_table_dir(db_path, table_name)}")
+        return 0
+
+    if args.status:
+        report = index_status(table, min_rows=args.min_rows)
+    else:
+        try:
+            report = build_indexes(
+                table, rebuild=args.rebuild, index_type=args.index_type, min_rows=args.min_rows,
+            )
+        except Exception as e:
+            print(f"  ERROR: Index build failed: {e}")
+            return 1
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0
+
+    print(f"\n  Table: {report.table} ({report.rows} rows, version {report.version})")
+    if report.built:
+        print(f"  Built: {', '.join(report.built)}")
+    if report.optimized:
+        print("  Folded newly appended rows into existing indexes")
+    if not report.indexes:
+        print("  No indexes")
+    for info in report.indexes:
+        state = "fresh" if info.fresh else f"{info.unindexed_rows} rows unindexed"
+        print(f"    {info.name:<20} {info.index_type:<12} {','.join(info.columns):<14} "
+              f"{info.indexed_rows} rows, {state}")
+    if report.missing:
+        print(f"  Missing: {', '.join(report.missing)} (run `storyteller index`)")
+    print(f"  Status: {'fresh' if report.fresh else 'stale'}")
+    return 0
@@ -34,6 +34,13 @@ def register(subparsers) -> None:
     p.add_argument("--no-tag-npcs", dest="tag_npcs", action="store_false", help="Disable NPC tagging")
     p.set_defaults(tag_npcs=None)
     p.add_argument("--npc-tagging-mode", choices=["strict", "lenient"], default=None, help="NPC tagging mode")
+    p.add_argument("--workers", type=int, default=None, help="Parse/chunk processes for the lore pipeline (default: CPUs - 1)")
+    p.add_argument("--embed-workers", type=int, default=None, help="Embedding threads for the lore pipeline (default: 1)")
+    p.add_argument("--no-index", action="store_true", help="Skip building LanceDB indexes after lore ingestion")
+    p.add_argument(
+        "--precompute-context", action="store_true",
+        help="Rebuild per-location context bundles after lore ingestion (storyteller precompute-context)",
+    )
     p.add_argument("--skip-checks", action="store_true", help="Skip Ollama/model pre-flight checks")
     p.add_argument("--ingest-root", type=str, default=None, help="Portable ingestion root (uses <root>/lore + <root>/lancedb)")
     p.add_argument("--no-venv", action="store_true", help="Skip venv detection, use current Python")
@@ -165,7 +172,10 @@ def run(args) -> int:
 
     # Build argv for the underlying ingestion module
     if args.pipeline == "lore":
-        return _run_lore(args)
+        rc = _run_lore(args)
+        if rc == 0 and getattr(args, "precompute_context", False):
+            rc = _run_precompute_context(args)
+        return rc
     return _run_simple(args)
 
 
@@ -194,6 +204,12 @@ def _run_lore(args) -> int:
         argv.extend(["--npc-tagging-mode", args.npc_tagging_mode])
     if args._resolved_out_db:
         argv.extend(["--db", args._resolved_out_db])
+    if getattr(args, "workers", None):
+        argv.extend(["--workers", str(args.workers)])
+    if getattr(args, "embed_workers", None):
+        argv.extend(["--embed-workers", str(args.embed_workers)])
+    if getattr(args, "no_index", False):
+        argv.append("--no-index")
 
     print(f"\n  Running lore ingestion pipeline ...")
     print(f"  Input: {args._resolved_input}")
@@ -210,6 +226,17 @@ def _run_lore(args) -> int:
         sys.argv = old_argv
 
 
+def _run_precompute_context(args) -> int:
+    """Rebuild context bundles against the freshly ingested table."""
+    from types import SimpleNamespace
+    from storyteller.commands.precompute_context import run as precompute_run
+
+    print("\n  Rebuilding per-location context bundles ...")
+    return precompute_run(SimpleNamespace(
+        era=None, db=args._resolved_out_db, out=None, lore_top_k=None, style_top_k=None, json=False,
+    ))
+
+
 def _run_simple(args) -> int:
     """Dispatch to ingestion.ingest.main()."""
     argv = ["ingest", "--input_dir", str(args._resolved_input)]
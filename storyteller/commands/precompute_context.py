@@ -0,0 +1,62 @@
+"""``storyteller precompute-context`` — build per-location context bundles.
+
+For every era pack location, retrieves the Narrator lore chunks, base + era style
+chunks, the KG location block and relationship lines for the anchor NPCs stationed
+there, and writes them to one JSON file per era under CONTEXT_BUNDLES_DIR. The
+runtime serves these first and runs live retrieval only for the remaining slots.
+Re-run after ingesting lore/style or extracting the KG; bundles built against an
+older table or KG are ignored lane by lane until then. ``storyteller ingest
+--precompute-context`` runs this after a successful lore ingestion.
+"""
+from __future__ import annotations
+
+import json
+
+
+def register(subparsers) -> None:
+    p = subparsers.add_parser("precompute-context", help="Build per-location context bundles from lore, style and the KG")
+    p.add_argument(
+        "--era", action="append", default=None,
+        help="Era pack id to build (repeatable; default: every pack)",
+    )
+    p.add_argument("--db", type=str, default=None, help="LanceDB path (default: auto-detect)")
+    p.add_argument("--out", type=str, default=None, help="Output directory (default: STORYTELLER_CONTEXT_BUNDLES_DIR)")
+    p.add_argument("--lore-top-k", type=int, default=None, help="Lore chunks per location (default: 8)")
+    p.add_argument("--style-top-k", type=int, default=None, help="Style chunks per location (default: 3)")
+    p.add_argument("--json", action="store_true", help="Print the report as JSON")
+    p.set_defaults(func=run)
+
+
+def run(args) -> int:
+    from backend.app.config import resolve_vectordb_path
+    from backend.app.rag.context_bundles import precompute_context_bundles
+
+    db_path = resolve_vectordb_path(args.db)
+    if not db_path.exists():
+        print(f"  WARNING: LanceDB not found at {db_path}; bundles will hold KG context only")
+    try:
+        report = precompute_context_bundles(
+            args.era,
+            out_dir=args.out,
+            db_path=db_path,
+            lore_top_k=args.lore_top_k,
+            style_top_k=args.style_top_k,
+        )
+    except Exception as e:
+        print(f"  ERROR: Context precompute failed: {e}")
+        return 1
+    if not report:
+        wanted = ", ".join(args.era) if args.era else "any era"
+        print(f"  ERROR: No era packs found for {wanted}")
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    for era, info in report.items():
+        print(f"\n  {era}: {info['locations']} locations -> {info['path']}")
+        print(f"    lore chunks {info['lore_chunks']}, style chunks {info['style_chunks']}, "
+              f"KG location blocks {info['kg_locations']}")
+        for warning in info["warnings"]:
+            print(f"    WARNING: {warning}")
+    return 0